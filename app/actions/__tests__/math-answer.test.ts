@@ -6,6 +6,7 @@
 // テスト範囲:
 //   1. sanitizeAnswerConfig() — 正答漏えい防止テスト（6ケース）
 //   2. buildGradeResult 相当のロジック — 正答非表示モードの DTO 検証
+//   3. --typed-columns で投入した selection 行の採点・表示（従来列の併記）
 //
 // 注: Server Actions 自体（getMathQuestionsForAnswering 等）は Supabase 接続が必要なため
 //     ここでは sanitizeAnswerConfig の純粋関数部分をテスト対象とする。
@@ -826,3 +827,81 @@ describe('アトミック RPC 失敗系テスト (Supabase モック)', () => {
     expect(result.error).toBeTruthy()
   })
 })
+
+// ============================================================
+// --typed-columns 投入行（scripts/generate-math-questions-sql.py --typed-columns）
+// ============================================================
+// 型付き列 (unit_id / correct_values / dummy_values) と並べて unit_label / answer_config も埋まっていること。
+// 読み出し側が型付き列に移るまでは、従来の列だけで採点・表示できなければならない。
+
+describe('--typed-columns 投入行 (Supabase モック)', () => {
+  beforeEach(() => {
+    resetMocks()
+    for (const key of Object.keys(tableCounters)) {
+      delete tableCounters[key]
+    }
+  })
+
+  // 生成 SQL の selection 行と同じ値（unit は answer_config にも入る）
+  const typedSelectionRow = {
+    id: 401, question_number: '(1)', section_name: '類題2', answer_type: 'selection',
+    correct_answer: null, unit_label: null, points: 1, display_order: 1,
+    answer_config: { correct_values: ['5', '6', '10'], dummy_values: ['4', '8'], unit: '通り' },
+    unit_id: 3, correct_values: ['5', '6', '10'], dummy_values: ['4', '8'],
+  }
+
+  it('submitAndGradeMathAnswers: typed-columns の selection 行を採点できる', async () => {
+    mockAdminTableResponses['students'] = [
+      { data: { id: 100 } },
+    ]
+    mockAdminRpcResponses['lock_answer_session'] = {
+      data: {
+        id: 5, student_id: 100, question_set_id: 10,
+        status: 'in_progress', attempt_number: 1,
+        answers_revealed: false, is_latest: true,
+      },
+      error: null,
+    }
+    mockAdminTableResponses['questions'] = [
+      { data: [typedSelectionRow], error: null },  // submitAndGrade: 問題取得
+      { data: [typedSelectionRow], error: null },  // buildGradeResult: 問題取得
+    ]
+    mockAdminTableResponses['student_answers'] = [
+      { data: [{ id: 501, question_id: 401, raw_input: '["10", " 5", "6"]', is_correct: null }], error: null },
+      // grading loop: update for q401
+      { data: null, error: null },
+      // buildGradeResult: 解答再取得
+      { data: [{ question_id: 401, raw_input: '["10", " 5", "6"]', is_correct: true }], error: null },
+    ]
+    mockAdminTableResponses['answer_sessions'] = [
+      { data: null, error: null },  // graded へ更新
+      { data: { total_score: 1, max_score: 1, attempt_number: 1, answers_revealed: true }, error: null },
+    ]
+
+    const result = await submitAndGradeMathAnswers({ answerSessionId: 5 })
+
+    expect(result.result).not.toBeNull()
+    const answerUpdates = mockUpdateCalls.filter(c => c.table === 'student_answers')
+    expect(answerUpdates).toHaveLength(1)
+    const updated = answerUpdates[0].data as Record<string, unknown>
+    expect(updated.is_correct).toBe(true)
+    expect(updated.answer_value).toBe('["10","5","6"]')
+  })
+
+  it('getMathQuestionsForAnswering: typed-columns の selection 行の選択肢と単位を返す', async () => {
+    mockAdminTableResponses['question_sets'] = [
+      { data: { id: 10, title: 'テスト', status: 'approved' }, error: null },
+    ]
+    mockAdminTableResponses['questions'] = [
+      { data: [typedSelectionRow], error: null },
+    ]
+
+    const result = await getMathQuestionsForAnswering(10)
+
+    expect(result.questions).toHaveLength(1)
+    const config = result.questions[0].answerConfig as { options: string[]; unit: string | null }
+    expect(config).not.toBeNull()
+    expect(config.options.sort()).toEqual(['10', '4', '5', '6', '8'])
+    expect(config.unit).toBe('通り')
+  })
+})
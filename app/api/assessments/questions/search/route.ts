@@ -0,0 +1,124 @@
+import { NextRequest, NextResponse } from "next/server"
+import { createClient } from "@/lib/supabase/route"
+import { lookupTerms, matchQuestions, queryWords } from "@/lib/question-search"
+import type { SearchTermRow } from "@/lib/question-search"
+
+export const dynamic = "force-dynamic"
+
+// 1回の検索で返す最大件数
+const MAX_RESULTS = 100
+
+/**
+ * 指導者用 算数問題検索API
+ * GET /api/assessments/questions/search?q=類題3 個&grade=5
+ *
+ * 正答・単位・セクション名・プリント名で検索する（空白区切りの語はすべて一致）。
+ * question_search_terms（転置インデックス）の索引参照で候補を絞り、questions は一致したセット・番号の行だけ読む。
+ */
+export async function GET(request: NextRequest) {
+  try {
+    // 認証チェック
+    const supabase = await createClient()
+    const {
+      data: { user },
+      error: authError,
+    } = await supabase.auth.getUser()
+
+    if (authError || !user) {
+      return NextResponse.json({ error: "認証が必要です" }, { status: 401 })
+    }
+
+    // ロールチェック
+    const { data: profile } = await supabase
+      .from("profiles")
+      .select("role")
+      .eq("id", user.id)
+      .single()
+
+    if (!profile || !["coach", "admin"].includes(profile.role)) {
+      return NextResponse.json({ error: "権限がありません" }, { status: 403 })
+    }
+
+    // クエリパラメータ取得
+    const searchParams = request.nextUrl.searchParams
+    const words = queryWords(searchParams.get("q") ?? "")
+    const gradeStr = searchParams.get("grade")
+    const grade = gradeStr ? parseInt(gradeStr, 10) : null
+
+    if (words.length === 0) {
+      return NextResponse.json({ error: "検索語を指定してください" }, { status: 400 })
+    }
+
+    // 転置インデックスから候補を取得
+    const { data: rows, error: termsError } = await supabase
+      .from("question_search_terms")
+      .select("term, kind, question_set_id, display_order")
+      .in("term", lookupTerms(words))
+
+    if (termsError) {
+      console.error("[API] Question search terms error:", termsError)
+      return NextResponse.json({ error: "検索に失敗しました" }, { status: 500 })
+    }
+
+    const hits = matchQuestions(words, (rows ?? []) as SearchTermRow[])
+    if (hits.length === 0) {
+      return NextResponse.json({ results: [], truncated: false, fetchedAt: Date.now() })
+    }
+
+    // 一致したセットの情報（学年で絞り込み）
+    const setIds = [...new Set(hits.map(h => h.questionSetId))]
+    let setsQuery = supabase
+      .from("question_sets")
+      .select("id, grade, title, display_order, session_id")
+      .in("id", setIds)
+    if (grade !== null && !isNaN(grade)) {
+      setsQuery = setsQuery.eq("grade", grade)
+    }
+    const { data: sets } = await setsQuery
+    const setMap = new Map((sets ?? []).map(s => [s.id, s]))
+
+    const filtered = hits.filter(h => setMap.has(h.questionSetId))
+    const limited = filtered.slice(0, MAX_RESULTS)
+
+    // 問題単位の一致は questions から表示用の情報を読む
+    const questionHits = limited.filter(h => h.displayOrder !== null)
+    const { data: questions } = questionHits.length > 0
+      ? await supabase
+          .from("questions")
+          .select("question_set_id, display_order, question_number, section_name, answer_type")
+          .in("question_set_id", [...new Set(questionHits.map(h => h.questionSetId))])
+          .in("display_order", [...new Set(questionHits.map(h => h.displayOrder))])
+      : { data: [] }
+    const questionMap = new Map(
+      (questions ?? []).map(q => [`${q.question_set_id}:${q.display_order}`, q])
+    )
+
+    const results = limited.map(h => {
+      const set = setMap.get(h.questionSetId)!
+      const question = h.displayOrder !== null ? questionMap.get(`${h.questionSetId}:${h.displayOrder}`) : undefined
+      return {
+        questionSetId: h.questionSetId,
+        grade: set.grade,
+        sessionId: set.session_id,
+        setOrder: set.display_order,
+        title: set.title,
+        displayOrder: h.displayOrder,
+        questionNumber: question?.question_number ?? null,
+        sectionName: question?.section_name ?? null,
+        answerType: question?.answer_type ?? null,
+      }
+    })
+
+    return NextResponse.json({
+      results,
+      truncated: filtered.length > MAX_RESULTS,
+      fetchedAt: Date.now(),
+    })
+  } catch (error) {
+    console.error("[API] Question search error:", error)
+    return NextResponse.json(
+      { error: "データの取得に失敗しました" },
+      { status: 500 }
+    )
+  }
+}
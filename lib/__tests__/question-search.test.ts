@@ -0,0 +1,86 @@
+// ============================================================================
+// 算数 問題検索 — 転置インデックス照合の単体テスト
+// ============================================================================
+
+import { describe, it, expect } from 'vitest'
+import {
+  normalizeSearchText,
+  bigrams,
+  queryWords,
+  lookupTerms,
+  matchQuestions,
+  type SearchTermRow,
+} from '@/lib/question-search'
+
+// scripts/generate-math-questions-sql.py search_terms() の出力と同じ形の行
+// セット1: 「第1回① 倍数と約数の利用」 (1) 類題1 11個, (2) 類題1 10個, (3) 計算練習 72
+const rows: SearchTermRow[] = [
+  { term: '第1回1', kind: 'title', question_set_id: 1, display_order: 0 },
+  { term: '倍数と約数の利用', kind: 'title', question_set_id: 1, display_order: 0 },
+  ...bigrams('倍数と約数の利用').map(term => ({ term, kind: 'title', question_set_id: 1, display_order: 0 })),
+  { term: '類題1', kind: 'section', question_set_id: 1, display_order: 1 },
+  { term: '類題', kind: 'section', question_set_id: 1, display_order: 1 },
+  { term: '個', kind: 'unit', question_set_id: 1, display_order: 1 },
+  { term: '11', kind: 'answer', question_set_id: 1, display_order: 1 },
+  { term: '類題1', kind: 'section', question_set_id: 1, display_order: 2 },
+  { term: '類題', kind: 'section', question_set_id: 1, display_order: 2 },
+  { term: '個', kind: 'unit', question_set_id: 1, display_order: 2 },
+  { term: '10', kind: 'answer', question_set_id: 1, display_order: 2 },
+  { term: '計算練習', kind: 'section', question_set_id: 1, display_order: 3 },
+  { term: '72', kind: 'answer', question_set_id: 1, display_order: 3 },
+  // セット2: 計算練習 72 のみ
+  { term: '計算練習', kind: 'section', question_set_id: 2, display_order: 5 },
+  { term: '72', kind: 'answer', question_set_id: 2, display_order: 5 },
+]
+
+describe('normalizeSearchText', () => {
+  it('全角英数・丸数字を NFKC で揃え、小文字化する', () => {
+    expect(normalizeSearchText(' 第１回① ＡＢ ')).toBe('第1回1 ab')
+  })
+})
+
+describe('queryWords', () => {
+  it('空白で区切り、数値は採点と同じく正規化する', () => {
+    expect(queryWords('類題１　042 3.50')).toEqual(['類題1', '42', '3.5'])
+  })
+
+  it('重複と空白だけの入力を除く', () => {
+    expect(queryWords('  72 72 ')).toEqual(['72'])
+    expect(queryWords('   ')).toEqual([])
+  })
+})
+
+describe('lookupTerms', () => {
+  it('3文字以上の語は2文字組も引く', () => {
+    expect(lookupTerms(['約数の', '72'])).toEqual(['約数の', '約数', '数の', '72'])
+  })
+})
+
+describe('matchQuestions', () => {
+  it('正答で問題を引く', () => {
+    expect(matchQuestions(['72'], rows)).toEqual([
+      { questionSetId: 1, displayOrder: 3 },
+      { questionSetId: 2, displayOrder: 5 },
+    ])
+  })
+
+  it('すべての語に一致する問題だけ返す', () => {
+    expect(matchQuestions(['類題', '10'], rows)).toEqual([{ questionSetId: 1, displayOrder: 2 }])
+  })
+
+  it('プリント名の語は同じセットの問題の条件と組み合わせられる', () => {
+    expect(matchQuestions(['倍数と約数の利用', '72'], rows)).toEqual([{ questionSetId: 1, displayOrder: 3 }])
+  })
+
+  it('プリント名の部分一致は2文字組で判定し、セット全体を返す', () => {
+    expect(matchQuestions(['約数の利'], rows)).toEqual([{ questionSetId: 1, displayOrder: null }])
+  })
+
+  it('2文字組が揃わなければ一致しない', () => {
+    expect(matchQuestions(['約数の和'], rows)).toEqual([])
+  })
+
+  it('語がなければ何も返さない', () => {
+    expect(matchQuestions([], rows)).toEqual([])
+  })
+})
@@ -0,0 +1,116 @@
+// ============================================================================
+// 算数 問題検索 — question_search_terms（転置インデックス）の照合（純粋関数、DBアクセスなし）
+// ============================================================================
+// 検索語は scripts/generate-math-questions-sql.py search_terms() が生成する。
+// 正規化規則（normalizeSearchText）と title の2文字組は生成側と揃えること。
+
+import { normalizeNumeric } from '@/lib/math-grading'
+
+export type SearchTermKind = 'answer' | 'unit' | 'section' | 'title'
+
+export interface SearchTermRow {
+  term: string
+  kind: string
+  question_set_id: number
+  display_order: number
+}
+
+export interface QuestionSearchHit {
+  questionSetId: number
+  /** null = セット全体（プリント名だけで一致） */
+  displayOrder: number | null
+}
+
+/**
+ * 検索語の正規化: NFKC・前後の空白除去・小文字化
+ * 生成側 search_text() と同じ規則（全角英数・丸数字・㎠ 等もここで揃う）
+ */
+export function normalizeSearchText(text: string): string {
+  return text.normalize('NFKC').trim().toLowerCase()
+}
+
+/** 2文字組（プリント名の部分一致用） */
+export function bigrams(word: string): string[] {
+  const chars = Array.from(word)
+  const result: string[] = []
+  for (let i = 0; i < chars.length - 1; i++) result.push(chars[i] + chars[i + 1])
+  return result
+}
+
+/**
+ * 検索文字列 → 語のリスト（空白区切り、重複除去）
+ * 数値として読める語は採点と同じく正規化する（"042" → "42"）
+ */
+export function queryWords(query: string): string[] {
+  const words = normalizeSearchText(query)
+    .split(/\s+/)
+    .filter(Boolean)
+    .map(word => normalizeNumeric(word) ?? word)
+  return [...new Set(words)]
+}
+
+/** question_search_terms から引く term の一覧（語そのもの + 3文字以上の語の2文字組） */
+export function lookupTerms(words: string[]): string[] {
+  const terms = new Set<string>()
+  for (const word of words) {
+    terms.add(word)
+    if (Array.from(word).length > 2) bigrams(word).forEach(b => terms.add(b))
+  }
+  return [...terms]
+}
+
+/**
+ * 引いた行から、すべての語に一致する問題（またはセット）を返す
+ *
+ * 語 w は次のどれかで一致する:
+ * - その問題の検索語（answer / unit / section）が w と等しい
+ * - セットの title の語が w と等しい
+ * - w が3文字以上で、その2文字組がすべてセットの title にある（プリント名の部分一致）
+ * すべての語がセット単位（title）で一致した場合は displayOrder: null（セット全体）を返す。
+ */
+export function matchQuestions(words: string[], rows: SearchTermRow[]): QuestionSearchHit[] {
+  if (words.length === 0) return []
+
+  // セット → { title の term 集合, display_order → term 集合 }
+  const sets = new Map<number, { title: Set<string>; questions: Map<number, Set<string>> }>()
+  for (const row of rows) {
+    let set = sets.get(row.question_set_id)
+    if (!set) {
+      set = { title: new Set(), questions: new Map() }
+      sets.set(row.question_set_id, set)
+    }
+    if (row.display_order === 0) {
+      set.title.add(row.term)
+    } else {
+      let terms = set.questions.get(row.display_order)
+      if (!terms) {
+        terms = new Set()
+        set.questions.set(row.display_order, terms)
+      }
+      terms.add(row.term)
+    }
+  }
+
+  const hits: QuestionSearchHit[] = []
+  const setIds = [...sets.keys()].sort((a, b) => a - b)
+  for (const setId of setIds) {
+    const set = sets.get(setId)!
+    const matchesTitle = (word: string) =>
+      set.title.has(word) ||
+      (Array.from(word).length > 2 && bigrams(word).every(b => set.title.has(b)))
+    const remaining = words.filter(word => !matchesTitle(word))
+
+    if (remaining.length === 0) {
+      hits.push({ questionSetId: setId, displayOrder: null })
+      continue
+    }
+    const orders = [...set.questions.keys()].sort((a, b) => a - b)
+    for (const order of orders) {
+      const terms = set.questions.get(order)!
+      if (remaining.every(word => terms.has(word))) {
+        hits.push({ questionSetId: setId, displayOrder: order })
+      }
+    }
+  }
+  return hits
+}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+算数自動採点 設問分析（項目分析）スクリプト
+
+エクスポートした解答ログを generate-math-questions-sql.py の SETS（学年・回・①②・display_order）と突き合わせ、
+設問ごとの難易度（正答率）と識別力を求める。集計は NumPy 配列への一括演算で行い、解答1件ごとの
+Python ループを回さないので、数百万件でも数秒で終わる。
+
+統計:
+  p         正答率（未回答は誤答として数える）
+  omit      未回答率（is_correct が NULL）
+  r_it      修正済み項目-残余相関（同じ解答セッションの、その設問を除いた得点との相関）
+  d_ul      上位-下位 27% の正答率の差（セットごとの得点で上位・下位を分ける）
+
+Usage:
+  python3 scripts/analyze-math-items.py --print-export-sql > /tmp/export.sql   # 本番 DB から書き出す \\copy 文
+  psql "$DSN" -f /tmp/export.sql                                              # → ./math_answers.copy
+  python3 scripts/analyze-math-items.py math_answers.copy --output items.tsv
+  python3 scripts/analyze-math-items.py /tmp/submissions/student_answers.copy --attempts all   # 合成データ
+
+Input:
+  student_answers.copy（generate-synthetic-submissions.py）と同じ列の COPY text 形式。
+  先頭列は生徒の整数 ID（合成データは student_no、本番エクスポートは students.id）。
+
+Output:
+  --output（既定: 標準出力）に設問ごとの統計 (TSV)、標準エラーに学年・answer_type・セクション分類ごとの集計
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import load_script  # noqa: E402
+
+math_questions = load_script('generate-math-questions-sql')
+ANSWER_COLUMNS = load_script('generate-synthetic-submissions').ANSWER_COLUMNS
+
+# ANSWER_COLUMNS のうち読み込む列
+KEY_COLUMNS = ('student_no', 'grade', 'session_number', 'set_order', 'attempt_number', 'display_order')
+CORRECT_COLUMN = 'is_correct'
+
+# 本番 DB からの書き出し（列は ANSWER_COLUMNS と同じ並び。採点済みセッションの解答だけ）
+EXPORT_SQL = (
+    "\\copy (SELECT s.student_id, qs.grade, ss.session_number, qs.display_order, s.attempt_number, q.display_order, "
+    "sa.raw_input, sa.answer_value, sa.is_correct, 0, 0 "
+    "FROM public.student_answers sa "
+    "JOIN public.answer_sessions s ON s.id = sa.answer_session_id AND s.status = 'graded' "
+    "JOIN public.questions q ON q.id = sa.question_id "
+    "JOIN public.question_sets qs ON qs.id = s.question_set_id AND qs.set_type = 'master_print' "
+    "JOIN public.study_sessions ss ON ss.id = qs.session_id "
+    "JOIN public.subjects sub ON sub.id = qs.subject_id AND sub.name = '算数') "
+    "TO 'math_answers.copy'"
+)
+
+# 上位・下位群の割合（d_ul）
+GROUP_FRACTION = 0.27
+
+# flag 列の判定基準
+MIN_RESPONSES = 30     # これ未満は統計が不安定
+EASY_P = 0.95          # 正答率がこれを超えると易しすぎ
+HARD_P = 0.20          # 正答率がこれ未満だと難しすぎ
+LOW_DISCRIMINATION = 0.20  # r_it がこれ未満だと識別力が低い
+
+ITEM_COLUMNS = (
+    'grade', 'session_number', 'set_order', 'display_order', 'question_number', 'title',
+    'section_name', 'section_group', 'answer_type', 'n', 'p', 'omit', 'r_it', 'd_ul', 'flag',
+)
+
+# ============================================================================
+# 問題バンク（SETS）
+# ============================================================================
+
+
+def set_key(grade, session, order):
+    """問題セットの整数キー（スカラーでも NumPy 配列でもよい）"""
+    return (grade * 100 + session) * 10 + order
+
+
+def item_key(grade, session, order, display_order):
+    """設問の整数キー（display_order は 1000 未満）"""
+    return set_key(grade, session, order) * 1000 + display_order
+
+
+def question_bank():
+    """SETS の全設問を SETS の並びで返す（設問ごとの属性の dict のリスト）"""
+    items = []
+    for qs in math_questions.select_sets():
+        display_order = 0
+        for section_name, questions in qs["sections"]:
+            for number, q in enumerate(questions, 1):
+                display_order += 1
+                items.append({
+                    'grade': qs['grade'], 'session_number': qs['session'], 'set_order': qs['order'],
+                    'display_order': display_order, 'question_number': f"({number})", 'title': qs['title'],
+                    'section_name': section_name, 'section_group': math_questions.section_stem(section_name),
+                    'answer_type': q['type'],
+                })
+    return items
+
+
+# ============================================================================
+# 読み込み
+# ============================================================================
+
+
+def load_answers(path):
+    """解答ログを列ごとの配列で読む（数値列と is_correct 列を別々に C 実装の loadtxt で読む）
+
+    戻り値: {列名: ndarray}。correct は 1/0（未回答は 0）、omitted は is_correct が NULL の行。
+    """
+    options = dict(delimiter='\t', comments=None, quotechar=None)
+    keys = np.loadtxt(path, dtype=np.int64, usecols=[ANSWER_COLUMNS.index(c) for c in KEY_COLUMNS],
+                      ndmin=2, **options)
+    flags = np.loadtxt(path, dtype='U2', usecols=ANSWER_COLUMNS.index(CORRECT_COLUMN), ndmin=1, **options)
+    answers = {name: keys[:, i] for i, name in enumerate(KEY_COLUMNS)}
+    answers['correct'] = (flags == 't').astype(np.int64)
+    answers['omitted'] = flags == '\\N'
+    return answers
+
+
+def select_attempts(answers, mode):
+    """集計に使う試行を選ぶ: first = 1回目だけ、latest = 生徒×セットの最終試行だけ、all = すべて"""
+    if mode == 'all':
+        return answers
+    attempt = answers['attempt_number']
+    if mode == 'first':
+        mask = attempt == 1
+    else:
+        student_set = answers['student_no'] * 10_000 + set_key(
+            answers['grade'], answers['session_number'], answers['set_order'])
+        groups, inverse = np.unique(student_set, return_inverse=True)
+        latest = np.zeros(len(groups), dtype=attempt.dtype)
+        np.maximum.at(latest, inverse, attempt)
+        mask = attempt == latest[inverse]
+    return {name: values[mask] for name, values in answers.items()}
+
+
+# ============================================================================
+# 統計
+# ============================================================================
+
+
+def item_statistics(answers, bank):
+    """設問ごとの n, p, omit, r_it, d_ul を bank と同じ並びの配列で返す
+
+    戻り値: (統計の dict, SETS にない設問への解答の件数)
+    """
+    bank_keys = np.array([item_key(i['grade'], i['session_number'], i['set_order'], i['display_order'])
+                          for i in bank], dtype=np.int64)
+    order = np.argsort(bank_keys)
+    sorted_keys = bank_keys[order]
+
+    keys = item_key(answers['grade'], answers['session_number'], answers['set_order'], answers['display_order'])
+    pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    known = sorted_keys[pos] == keys
+    item = order[pos[known]]
+    x = answers['correct'][known].astype(np.float64)
+    omitted = answers['omitted'][known]
+    set_keys = keys[known] // 1000
+    sessions = (answers['student_no'][known] * 10_000 + set_keys) * 100 + answers['attempt_number'][known]
+
+    # 解答セッション（生徒×セット×試行）ごとの得点と、設問を除いた残余得点
+    session_keys, session = np.unique(sessions, return_inverse=True)
+    totals = np.bincount(session, weights=x, minlength=len(session_keys))
+    y = totals[session] - x
+
+    size = len(bank)
+    n = np.bincount(item, minlength=size).astype(np.float64)
+    sx = np.bincount(item, weights=x, minlength=size)
+    sy = np.bincount(item, weights=y, minlength=size)
+    syy = np.bincount(item, weights=y * y, minlength=size)
+    sxy = np.bincount(item, weights=x * y, minlength=size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = sx / n
+        omit = np.bincount(item, weights=omitted, minlength=size) / n
+        # x は 0/1 なので Σx² = Σx
+        r_it = (n * sxy - sx * sy) / np.sqrt((n * sx - sx * sx) * (n * syy - sy * sy))
+
+    # 上位・下位群: セットごとに得点を並べ、上下 GROUP_FRACTION の境界の得点以上・以下のセッション
+    session_set = session_keys // 100 % 10_000
+    sets, set_index = np.unique(session_set, return_inverse=True)
+    ranked = np.lexsort((totals, set_index))
+    counts = np.bincount(set_index, minlength=len(sets))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_totals = totals[ranked]
+    upper_bound = sorted_totals[starts + np.floor((1 - GROUP_FRACTION) * (counts - 1)).astype(np.int64)]
+    lower_bound = sorted_totals[starts + np.ceil(GROUP_FRACTION * (counts - 1)).astype(np.int64)]
+    upper = totals >= upper_bound[set_index]
+    lower = totals <= lower_bound[set_index]
+    both = upper & lower  # 得点の散らばりがないセットはどちらにも入れない
+    upper, lower = (upper & ~both)[session], (lower & ~both)[session]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_upper = np.bincount(item, weights=x * upper, minlength=size) / np.bincount(item, weights=upper, minlength=size)
+        p_lower = np.bincount(item, weights=x * lower, minlength=size) / np.bincount(item, weights=lower, minlength=size)
+
+    stats = {'n': n.astype(np.int64), 'p': p, 'omit': omit, 'r_it': r_it, 'd_ul': p_upper - p_lower}
+    return stats, int((~known).sum())
+
+
+def item_flags(stats):
+    """設問ごとの注意フラグ（カンマ区切り、なければ空）"""
+    conditions = (
+        ('回答少', stats['n'] < MIN_RESPONSES),
+        ('易しすぎ', stats['p'] > EASY_P),
+        ('難しすぎ', stats['p'] < HARD_P),
+        ('識別力低', stats['r_it'] < LOW_DISCRIMINATION),
+    )
+    labels = np.full(len(stats['n']), '', dtype=object)
+    for label, mask in conditions:
+        labels[mask] = np.where(labels[mask] == '', label, labels[mask] + ',' + label)
+    return labels
+
+
+def group_summary(bank, stats, column):
+    """column の値ごとの集計: 設問数・解答数・正答率（解答数で重み付け）・r_it の平均（設問の単純平均）"""
+    labels = np.array([item[column] for item in bank], dtype=object)
+    groups, index = np.unique(labels.astype(str), return_inverse=True)
+    answered = stats['n'] > 0
+    n = np.bincount(index, weights=stats['n'], minlength=len(groups))
+    correct = np.bincount(index, weights=np.where(answered, stats['p'] * stats['n'], 0), minlength=len(groups))
+    valid_r = ~np.isnan(stats['r_it'])
+    r_sum = np.bincount(index, weights=np.where(valid_r, stats['r_it'], 0), minlength=len(groups))
+    r_count = np.bincount(index, weights=valid_r, minlength=len(groups))
+    rows = []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for g, label in enumerate(groups):
+            rows.append((label, int((index == g).sum()), int(n[g]), correct[g] / n[g], r_sum[g] / r_count[g]))
+    return rows
+
+
+# ============================================================================
+# 出力
+# ============================================================================
+
+
+def format_number(value):
+    return '' if np.isnan(value) else f"{value:.3f}"
+
+
+def write_items(out, bank, stats):
+    """設問ごとの統計を TSV で書き出す（SETS の並び）"""
+    flags = item_flags(stats)
+    out.write('\t'.join(ITEM_COLUMNS) + '\n')
+    for i, item in enumerate(bank):
+        values = [str(item[c]) for c in ITEM_COLUMNS[:9]]
+        values += [str(stats['n'][i]), format_number(stats['p'][i]), format_number(stats['omit'][i]),
+                   format_number(stats['r_it'][i]), format_number(stats['d_ul'][i]), flags[i]]
+        out.write('\t'.join(values) + '\n')
+
+
+def report_groups(bank, stats):
+    for column, heading in (('grade', '学年'), ('answer_type', 'answer_type'), ('section_group', 'セクション分類')):
+        print(f"\n[{heading}別]", file=sys.stderr)
+        print(f"  {'':<24} {'設問':>5} {'解答':>10} {'正答率':>7} {'r_it':>7}", file=sys.stderr)
+        for label, items, n, p, r in group_summary(bank, stats, column):
+            print(f"  {label:<24} {items:>5} {n:>10,} {format_number(p):>7} {format_number(r):>7}", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="算数自動採点 設問分析（難易度・識別力）")
+    parser.add_argument('answers', type=Path, nargs='?',
+                        help="解答ログ（student_answers.copy と同じ列の COPY text 形式）")
+    parser.add_argument('--output', type=Path, help="設問ごとの統計 (TSV) の出力先（既定: 標準出力）")
+    parser.add_argument('--attempts', choices=('first', 'latest', 'all'), default='first',
+                        help="集計する試行（既定: first。リトライは正解済みの解答を引き継ぐため1回目が基本）")
+    parser.add_argument('--print-export-sql', action='store_true',
+                        help="本番 DB から解答ログを書き出す psql の \\copy 文を出力して終了する")
+    args = parser.parse_args(argv)
+    if not args.print_export_sql and args.answers is None:
+        parser.error("解答ログのパスを指定してください")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.print_export_sql:
+        print(EXPORT_SQL)
+        return
+    if not args.answers.exists() or args.answers.stat().st_size == 0:
+        print(f"Error: {args.answers} が見つからないか空です", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    answers = load_answers(args.answers)
+    loaded = time.perf_counter()
+    print(f"  読み込み: {len(answers['correct']):,} 件 ({loaded - started:.2f}s)", file=sys.stderr)
+
+    answers = select_attempts(answers, args.attempts)
+    bank = question_bank()
+    stats, unknown = item_statistics(answers, bank)
+    print(f"  集計: {len(answers['correct']) - unknown:,} 件 / {len(bank)} 設問 "
+          f"(--attempts {args.attempts}, {time.perf_counter() - loaded:.2f}s)", file=sys.stderr)
+    if unknown:
+        print(f"  WARNING: SETS にない設問への解答 {unknown:,} 件を除外しました", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            write_items(f, bank, stats)
+        print(f"  出力: {args.output}", file=sys.stderr)
+    else:
+        write_items(sys.stdout, bank, stats)
+    report_groups(bank, stats)
+
+
+if __name__ == '__main__':
+    main()
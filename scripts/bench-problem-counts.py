@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+problem_counts 生成ベンチマーク
+
+合成ワークブック (generate-synthetic-workbook.py) を使い、generate-problem-counts-sql.py の
+取り込み（openpyxl + read_excel_data）・キャッシュ読み込み・SQL レンダリングの時間と出力サイズを測り、
+保存済みベースライン (scripts/bench-baselines/problem-counts.json) と比較する。
+
+Usage:
+  python3 scripts/bench-problem-counts.py                      # real + large を計測して比較
+  python3 scripts/bench-problem-counts.py --scenario xlarge
+  python3 scripts/bench-problem-counts.py --update-baseline    # ベースラインを書き換える
+
+終了コード:
+  0 = 回帰なし / 1 = ベースライン比で許容範囲を超えた指標あり
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import SCRIPTS_DIR, load_script  # noqa: E402
+
+problem_counts = load_script('generate-problem-counts-sql')
+synthetic = load_script('generate-synthetic-workbook')
+
+BASELINE_PATH = SCRIPTS_DIR / "bench-baselines" / "problem-counts.json"
+
+# sessions: 各シートの行数 / extra_sheets: 実13シートに追加する複製シート数
+SCENARIOS = {
+    'real': {'sessions': 19, 'extra_sheets': 0},
+    'large': {'sessions': 1000, 'extra_sheets': 24},
+    'xlarge': {'sessions': 3000, 'extra_sheets': 48},
+}
+DEFAULT_SCENARIOS = ['real', 'large']
+
+# 許容範囲: 時間はマシン差を吸収するため緩め、サイズは決定的なので厳しめ
+TIME_TOLERANCE = 1.5
+SIZE_TOLERANCE = 1.05
+# これ未満の時間差はノイズとして扱う（ミリ秒単位の計測で誤検知しないように）
+TIME_FLOOR_S = 0.05
+
+
+def best_of(repeat, fn):
+    """fn を repeat 回実行し、(最短時間, 最後の戻り値) を返す"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_scenario(name, params, repeat, workdir):
+    """1シナリオを計測して指標の dict を返す"""
+    import openpyxl
+
+    xlsx_path = Path(workdir) / f"{name}.xlsx"
+    content_defs, sheet_names = synthetic.write_synthetic_workbook(xlsx_path, **params)
+
+    original_defs = problem_counts.CONTENT_DEFS
+    original_cache_dir = problem_counts.CACHE_DIR
+    problem_counts.CONTENT_DEFS = content_defs
+    problem_counts.CACHE_DIR = Path(workdir) / "cache"
+    try:
+        def ingest():
+            wb = openpyxl.load_workbook(str(xlsx_path), data_only=True)
+            return problem_counts.read_excel_data(wb, sheet_names)
+
+        ingest_s, excel_data = best_of(repeat, ingest)
+
+        problem_counts.load_excel_data(xlsx_path, sheet_names=sheet_names)  # キャッシュを温める
+        ingest_cached_s, _ = best_of(
+            repeat, lambda: problem_counts.load_excel_data(xlsx_path, sheet_names=sheet_names))
+
+        render_s, sql = best_of(
+            repeat, lambda: '\n'.join(problem_counts.render_full_sql(excel_data)))
+        render_expand_s, sql_expand = best_of(
+            repeat, lambda: '\n'.join(problem_counts.render_full_sql(excel_data, expand_in_sql=True)))
+
+        return {
+            'sheets': len(sheet_names),
+            'sessions': params['sessions'],
+            'problem_counts_rows': len(problem_counts.problem_count_rows(excel_data)),
+            'ingest_s': round(ingest_s, 4),
+            'ingest_cached_s': round(ingest_cached_s, 4),
+            'render_s': round(render_s, 4),
+            'render_expand_s': round(render_expand_s, 4),
+            'output_bytes': len(sql.encode('utf-8')),
+            'output_expand_bytes': len(sql_expand.encode('utf-8')),
+        }
+    finally:
+        problem_counts.CONTENT_DEFS = original_defs
+        problem_counts.CACHE_DIR = original_cache_dir
+
+
+def compare(name, result, baseline):
+    """ベースラインと比較し、回帰した指標のメッセージ一覧を返す"""
+    regressions = []
+    for metric, value in result.items():
+        base = baseline.get(metric)
+        if base is None or not isinstance(value, (int, float)):
+            continue
+        if metric.endswith('_s'):
+            tolerance = TIME_TOLERANCE
+        elif metric.endswith('_bytes'):
+            tolerance = SIZE_TOLERANCE
+        else:
+            continue
+        if metric.endswith('_s') and value - base < TIME_FLOOR_S:
+            continue
+        if base > 0 and value > base * tolerance:
+            regressions.append(f"{name}.{metric}: {value} > {base} × {tolerance}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="problem_counts 生成ベンチマーク")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="計測するシナリオ（複数指定可。既定: real, large）")
+    parser.add_argument('--repeat', type=int, default=3, help="各計測の繰り返し回数（最短値を採用）")
+    parser.add_argument('--update-baseline', action='store_true', help="計測結果でベースラインを更新する")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or DEFAULT_SCENARIOS
+    baselines = {}
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    results = {}
+    regressions = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in scenarios:
+            print(f"[{name}] {SCENARIOS[name]}")
+            result = run_scenario(name, SCENARIOS[name], args.repeat, workdir)
+            results[name] = result
+            for metric, value in result.items():
+                base = baselines.get(name, {}).get(metric)
+                suffix = f"  (baseline: {base})" if base is not None else ""
+                print(f"  {metric}: {value}{suffix}")
+            regressions.extend(compare(name, result, baselines.get(name, {})))
+
+    if args.update_baseline:
+        baselines.update(results)
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline updated: {BASELINE_PATH}")
+        return
+
+    if regressions:
+        print("\nRegressions:")
+        for r in regressions:
+            print(f"  {r}")
+        sys.exit(1)
+    print("\nOK: ベースライン比で回帰なし")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+生成物（シード SQL・マイグレーション）の一括再生成
+
+どの生成物をどのスクリプト・オプションで作るかを STAGES にまとめ、
+各ステージの入力（生成スクリプトと seedgen のソース、データファイル、オプション）のフィンガープリントと
+出力のハッシュを scripts/.cache/build-seeds.json に記録する。
+入力が変わっていない・出力も記録どおりのステージは何もしないので、変更がなければ一括実行はほぼ即座に終わる。
+古いステージは互いに独立なので並列に実行する。
+
+出力は一時ファイルに生成してから置き換える。置き換え前の出力が記録と異なる（手修正された）場合は
+上書きせずに conflict として報告する（--force で上書き）。生成結果が既存ファイルと同一なら記録だけ更新する。
+
+Usage:
+  python3 scripts/build-seeds.py                    # 古いステージだけ再生成
+  python3 scripts/build-seeds.py math-questions     # 指定ステージだけ
+  python3 scripts/build-seeds.py --dry-run          # 何が再生成されるかだけ表示
+  python3 scripts/build-seeds.py --list             # ステージ一覧
+
+NOTE: problem-counts の出力（20260206000002 マイグレーション）は国語・漢字の総合回を 40→80 に手修正済み。
+  再生成結果とは一致しないため conflict になる。--force で上書きした場合は手修正をやり直すこと。
+  supabase/seeds/problem_counts_2026.sql は現行スクリプトの出力ではない（手動管理）ため STAGES に含めない。
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import REPO_ROOT, SCRIPTS_DIR, load_script  # noqa: E402
+
+problem_counts = load_script('generate-problem-counts-sql')
+
+STATE_PATH = SCRIPTS_DIR / ".cache" / "build-seeds.json"
+WORK_DIR = SCRIPTS_DIR / ".cache" / "build-seeds"
+
+# 状態ファイルの形式（変えたら上げる。古い形式の記録は使わない）
+STATE_VERSION = 1
+
+# ステージ定義
+#   script:       scripts/<script>.py
+#   args:         コマンドライン引数（"{output}" は outputs[0] の一時ファイルパスに置き換える）
+#   stdout:       True なら標準出力を outputs[0] に書く
+#   outputs:      生成物（置き換え・手修正検出の対象）
+#   side_outputs: スクリプトがその場で書くファイル（ハッシュを記録するだけ。失敗・conflict 時は元に戻す）
+#   inputs:       スクリプト以外の入力ファイル（無ければステージをスキップ）
+STAGES = [
+    {
+        'name': 'math-questions',
+        'script': 'generate-math-questions-sql',
+        'args': [],
+        'stdout': True,
+        'outputs': [REPO_ROOT / "supabase" / "seeds" / "math_questions_2026.sql"],
+        'side_outputs': [],
+        'inputs': [],
+    },
+    {
+        'name': 'math-dev',
+        'script': 'generate-math-questions-sql',
+        'args': ['--sample'],
+        'stdout': True,
+        'outputs': [REPO_ROOT / "supabase" / "seeds" / "math_questions_dev.sql"],
+        'side_outputs': [],
+        'inputs': [],
+    },
+    {
+        'name': 'math-sqlite',
+        'script': 'generate-math-questions-sql',
+        'args': ['--no-ledger', '--sqlite', '{output}'],
+        'stdout': False,
+        'outputs': [SCRIPTS_DIR / ".cache" / "math_questions.sqlite"],
+        'side_outputs': [],
+        'inputs': [],
+    },
+    {
+        'name': 'problem-counts',
+        'script': 'generate-problem-counts-sql',
+        'args': ['--output', '{output}', '--update-snapshot'],
+        'stdout': False,
+        'outputs': [problem_counts.OUTPUT_PATH],
+        'side_outputs': [problem_counts.SNAPSHOT_PATH],
+        'inputs': [problem_counts.XLSX_PATH],
+    },
+]
+
+# ============================================================================
+# ハッシュ
+# ============================================================================
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_record(path, known=None):
+    """{'size', 'mtime_ns', 'sha256'} を返す（無ければ None）
+
+    known（前回の記録）とサイズ・mtime が同じならハッシュを計算し直さない。
+    """
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    if known and known['size'] == st.st_size and known['mtime_ns'] == st.st_mtime_ns:
+        return known
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256_file(path)}
+
+
+def source_files(stage):
+    """ステージの生成スクリプトと seedgen のソース（どれが変わっても再生成する）"""
+    files = [SCRIPTS_DIR / f"{stage['script']}.py"]
+    files += sorted((SCRIPTS_DIR / "seedgen").glob("*.py"))
+    return files
+
+
+def fingerprint(stage, file_records):
+    """入力（スクリプト・データファイル・オプション）から決まるステージの指紋"""
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        'state_version': STATE_VERSION,
+        'script': stage['script'],
+        'args': stage['args'],
+        'stdout': stage['stdout'],
+        'outputs': [rel(p) for p in stage['outputs']],
+    }, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    for path in source_files(stage) + list(stage['inputs']):
+        record = file_records[str(path)]
+        h.update(f"{rel(path)}\0{record['sha256']}\n".encode('utf-8'))
+    return h.hexdigest()
+
+
+def rel(path):
+    """表示・記録用のパス（リポジトリ内なら相対パス）"""
+    path = Path(path)
+    try:
+        return str(path.resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+# ============================================================================
+# 判定・実行
+# ============================================================================
+
+def plan_stage(stage, state, files):
+    """ステージの状態を判定する → (status, reason, fingerprint)
+
+    status: 'fresh'（何もしない）, 'stale'（再生成）, 'skipped'（入力なし）
+    """
+    for path in stage['inputs']:
+        if files.get(str(path)) is None:
+            return 'skipped', f"入力なし: {rel(path)}", None
+    fp = fingerprint(stage, files)
+    recorded = state['stages'].get(stage['name'])
+    if recorded is None:
+        return 'stale', "未記録", fp
+    if recorded['fingerprint'] != fp:
+        return 'stale', "入力が変更された", fp
+    for path in stage['outputs']:
+        current = files.get(str(path))
+        if current is None:
+            return 'stale', f"出力なし: {rel(path)}", fp
+        if current['sha256'] != recorded['outputs'].get(rel(path)):
+            return 'stale', f"出力が記録と異なる: {rel(path)}", fp
+    return 'fresh', "", fp
+
+
+def run_stage(stage, state, files, force=False):
+    """一時ディレクトリに生成し、出力を置き換える → (status, message, 新しい記録)
+
+    status: 'built', 'unchanged'（生成結果が既存と同一）, 'conflict'（手修正あり、未上書き）, 'failed'
+    """
+    work = WORK_DIR / stage['name']
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+    tmp_outputs = [work / Path(p).name for p in stage['outputs']]
+    args = [a.replace('{output}', str(tmp_outputs[0])) for a in stage['args']]
+    cmd = [sys.executable, str(SCRIPTS_DIR / f"{stage['script']}.py"), *args]
+
+    # side_outputs はスクリプトがその場で書き換えるので、失敗・conflict 時に戻せるよう退避しておく
+    backups = []
+    for i, path in enumerate(stage['side_outputs']):
+        backup = work / f"side{i}.bak"
+        if Path(path).exists():
+            shutil.copy2(path, backup)
+        backups.append((Path(path), backup))
+
+    def restore_side_outputs():
+        for path, backup in backups:
+            if backup.exists():
+                shutil.copy2(backup, path)
+            else:
+                path.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    with open(tmp_outputs[0], 'wb') if stage['stdout'] else open(work / 'stdout.log', 'wb') as out:
+        proc = subprocess.run(cmd, cwd=REPO_ROOT, stdout=out, stderr=subprocess.PIPE)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        restore_side_outputs()
+        stderr = proc.stderr.decode('utf-8', errors='replace').strip().splitlines()
+        return 'failed', f"exit {proc.returncode}: {stderr[-1] if stderr else ''}", None
+
+    recorded = state['stages'].get(stage['name'], {}).get('outputs', {})
+    conflicts, changed = [], []
+    for final, tmp in zip(stage['outputs'], tmp_outputs):
+        current = files.get(str(final))
+        new_hash = sha256_file(tmp)
+        if current is None or current['sha256'] != new_hash:
+            changed.append((final, tmp))
+            # 記録と異なる既存ファイル = 手修正（または記録前からある別物）
+            if current is not None and current['sha256'] != recorded.get(rel(final)) and not force:
+                conflicts.append(rel(final))
+    if conflicts:
+        restore_side_outputs()
+        return 'conflict', f"手修正ありのため上書きしません: {', '.join(conflicts)}。--force で上書き", None
+
+    for final, tmp in changed:
+        Path(final).parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(tmp), str(final))
+    shutil.rmtree(work, ignore_errors=True)
+
+    record = {
+        'outputs': {rel(p): file_record(p)['sha256'] for p in stage['outputs']},
+        'side_outputs': {rel(p): file_record(p)['sha256'] for p in stage['side_outputs'] if Path(p).exists()},
+        'seconds': round(elapsed, 3),
+    }
+    status = 'built' if changed else 'unchanged'
+    return status, f"{elapsed:.2f}s", record
+
+
+def load_state():
+    try:
+        with open(STATE_PATH, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'files': {}, 'stages': {}}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+    tmp.replace(STATE_PATH)
+
+# ============================================================================
+# メイン
+# ============================================================================
+
+def parse_args(argv=None):
+    names = [s['name'] for s in STAGES]
+    parser = argparse.ArgumentParser(description="シード SQL・マイグレーションの一括再生成（変更があったものだけ）")
+    parser.add_argument('stages', nargs='*', metavar='STAGE', help=f"対象ステージ（既定: 全部。{', '.join(names)}）")
+    parser.add_argument('--force', action='store_true', help="手修正された出力も上書きする")
+    parser.add_argument('--dry-run', action='store_true', help="判定だけ表示して生成しない")
+    parser.add_argument('--jobs', type=int, help="並列実行数 (既定: 対象ステージ数)")
+    parser.add_argument('--list', action='store_true', help="ステージ一覧を表示する")
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.stages if s not in names]
+    if unknown:
+        parser.error(f"不明なステージ: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.list:
+        for stage in STAGES:
+            print(f"{stage['name']}: scripts/{stage['script']}.py {' '.join(stage['args'])}".rstrip())
+            for path in stage['outputs']:
+                print(f"    → {rel(path)}")
+        return
+
+    stages = [s for s in STAGES if not args.stages or s['name'] in args.stages]
+    state = load_state()
+
+    # 判定に使うファイルの記録（サイズ・mtime が前回と同じならハッシュを再計算しない）
+    paths = {str(p) for s in stages
+             for p in source_files(s) + s['inputs'] + s['outputs'] + s['side_outputs']}
+    files = {path: file_record(path, state['files'].get(path)) for path in sorted(paths)}
+
+    plans = [(stage, *plan_stage(stage, state, files)) for stage in stages]
+    stale = []
+    for stage, status, reason, fp in plans:
+        print(f"  {stage['name']:<16} {status}{f'（{reason}）' if reason else ''}")
+        if status == 'stale':
+            stale.append((stage, fp))
+
+    failed = False
+    if stale and not args.dry_run:
+        with ThreadPoolExecutor(max_workers=args.jobs or len(stale)) as executor:
+            futures = [(stage, fp, executor.submit(run_stage, stage, state, files, args.force))
+                       for stage, fp in stale]
+            for stage, fp, future in futures:
+                status, message, record = future.result()
+                print(f"  {stage['name']:<16} {status}（{message}）")
+                if record is not None:
+                    state['stages'][stage['name']] = {'fingerprint': fp, **record}
+                else:
+                    failed = True
+
+    # 実行後の状態で記録を更新（次回の判定はサイズ・mtime の比較だけで済む）
+    state['files'] = {path: file_record(path, files.get(path)) for path in sorted(paths)}
+    state['files'] = {path: record for path, record in state['files'].items() if record is not None}
+    if not args.dry_run:
+        save_state(state)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
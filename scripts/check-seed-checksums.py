@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+シード SQL の埋め込みチェックサム検査（適用前に実行する）
+
+with_ledger() で生成した SQL は、ヘッダーのチェックサムが seed_ledger と一致すると
+各 DO ブロックの先頭でスキップされる。チェックサムは生成時に計算したものなので、
+生成後にファイルを手修正すると修正前のチェックサムのまま台帳と一致し、修正が黙って流れない。
+ここでは本文からチェックサムを計算し直し、埋め込み値と合わないファイルを失敗として報告する。
+
+手修正を意図したものなら --restamp でチェックサムを付け直す（台帳と一致しなくなるので次回は適用される）。
+生成スクリプトで直せる修正なら、再生成するほうが望ましい（scripts/build-seeds.py）。
+
+Usage:
+  python3 scripts/check-seed-checksums.py                     # supabase/seeds, supabase/migrations の全 SQL
+  python3 scripts/check-seed-checksums.py FILE...             # 指定ファイルだけ
+  python3 scripts/check-seed-checksums.py --restamp FILE...   # 手修正したファイルのチェックサムを付け直す
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import REPO_ROOT  # noqa: E402
+from seedgen.ledger import checksum_of, restamp, verify  # noqa: E402
+
+DEFAULT_DIRS = [REPO_ROOT / "supabase" / "seeds", REPO_ROOT / "supabase" / "migrations"]
+
+# ============================================================================
+# 検査
+# ============================================================================
+
+def read_body(path):
+    """ファイルを読み、生成時に付いた末尾の改行1つを除いた本文を返す"""
+    text = path.read_text(encoding='utf-8')
+    return text[:-1] if text.endswith("\n") else text
+
+
+def default_files():
+    return [p for d in DEFAULT_DIRS for p in sorted(d.glob("*.sql"))]
+
+
+def rel(path):
+    try:
+        return str(path.resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+# ============================================================================
+# メイン
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="シード SQL の埋め込みチェックサムを本文と照合する")
+    parser.add_argument('files', nargs='*', type=Path, metavar='FILE',
+                        help="対象ファイル（既定: supabase/seeds, supabase/migrations の *.sql）")
+    parser.add_argument('--restamp', action='store_true',
+                        help="一致しないファイルのチェックサムを本文に合わせて付け直す")
+    args = parser.parse_args(argv)
+    if args.restamp and not args.files:
+        parser.error("--restamp はファイルを明示して使う")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    files = args.files or default_files()
+
+    checked = 0
+    mismatched = []
+    for path in files:
+        body = read_body(path)
+        ok = verify(body)
+        if ok is None:
+            if args.files:
+                print(f"  {rel(path)}: チェックサムなし（台帳対応のシードではない）")
+            continue
+        checked += 1
+        if ok:
+            continue
+        if args.restamp:
+            fixed = restamp(body)
+            path.write_text(fixed + "\n", encoding='utf-8')
+            print(f"  {rel(path)}: チェックサムを付け直しました ({checksum_of(body)[:12]} → {checksum_of(fixed)[:12]})")
+        else:
+            print(f"  {rel(path)}: チェックサム不一致（生成後に手修正されている）", file=sys.stderr)
+            mismatched.append(path)
+
+    print(f"{checked} ファイルを検査")
+    if mismatched:
+        print(f"エラー: {len(mismatched)} ファイルの埋め込みチェックサムが本文と一致しません。"
+              "このまま適用すると修正前のチェックサムで seed_ledger と一致し、スキップされます。\n"
+              "  再生成する: python3 scripts/build-seeds.py --force\n"
+              f"  手修正を残す: python3 scripts/check-seed-checksums.py --restamp "
+              f"{' '.join(rel(p) for p in mismatched)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,12 @@
 
 Usage:
     python3 scripts/generate-math-questions-sql.py > supabase/seeds/math_questions_2026.sql
+    python3 scripts/generate-math-questions-sql.py --batch-size 20 > ...  # questions INSERT を20行ごとに分割
+    python3 scripts/generate-math-questions-sql.py --no-ledger > ...      # seed_ledger のチェックを埋め込まない
+    python3 scripts/generate-math-questions-sql.py --typed-columns > ...  # 単位辞書 + 型付き列で投入
+    python3 scripts/generate-math-questions-sql.py --grade 6 --session 3 --order 2 > ...  # 小6 第3回② だけ
+    python3 scripts/generate-math-questions-sql.py --sqlite /tmp/math_questions.sqlite > ...  # SQLite ミラーも出力
+    python3 scripts/generate-math-questions-sql.py --sample > supabase/seeds/math_questions_dev.sql  # 開発用シード
 
 入力: ユーザー提供の模範解答データ (このスクリプト内にハードコード)
 出力: question_sets + questions の INSERT SQL (809問)
@@ -12,8 +18,20 @@ Usage:
     マスタープリント 小6上 第1回〜第4回, 第6回〜第8回 (①②) = 328問
     合計: 809問
 """
+import argparse
+import hashlib
 import json
+import re
 import sys
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen.ledger import with_ledger  # noqa: E402
+from seedgen.sqlgen import (  # noqa: E402
+    Raw, Table, batched, create_temp_table, emit_insert, sql_str, sql_json, sql_text_array, subject_id_prelude,
+    values_from,
+)
 
 # ============================================================================
 # ヘルパー関数: 問題データ構造を生成
@@ -70,6 +88,8 @@ def ratio(a, b):
 #   1. 本番: SQL Editor で該当 question の correct_answer を直接 UPDATE
 #   2. seed: このスクリプトのデータを修正 → SQL再生成 → ローカル適用時は
 #      事前に question_sets.status を 'draft' に戻してから再実行
+#
+# "sections" は問題リストを返すファクトリ（select_sets() で選ばれたセットだけが問題を組み立てる）
 
 SETS = [
     # ================================================================
@@ -77,7 +97,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 1, "order": 1, "title": "第1回① 倍数と約数の利用",
-        "sections": [
+        "sections": lambda: [
             ("類題1", n("11 10 12 12 33 12 28 12 16 9", "個")),
             ("類題2", [
                 sel(["5","6","10","15","30"], ["4","8","12","20","25"]),
@@ -101,7 +121,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 1, "order": 2, "title": "第1回② 倍数と約数の利用",
-        "sections": [
+        "sections": lambda: [
             ("類題（基本問題１(8)）", [
                 sel(["32","62","92"], ["22","52","82"]),
                 sel(["13","25","37"], ["7","19","43"]),
@@ -125,7 +145,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 2, "order": 1, "title": "第2回① いろいろな図形の面積",
-        "sections": [
+        "sections": lambda: [
             ("類題1", n("17 19 36.5 80 53 33 14 18 49", "㎠")),
             ("類題2", n("36.48 16 4.71 20.56 18.24 57 25.12 9.12 20.52", "㎠")),
             ("計算練習", n(
@@ -139,7 +159,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 2, "order": 2, "title": "第2回② いろいろな図形の面積",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("50.24","㎠"), nu("28.26","㎠"), nu("4.71","㎠"),
                 nu("9.42","㎠"), nu("34","㎠"), nu("18.84","㎠"),
@@ -157,7 +177,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 3, "order": 1, "title": "第3回① 割合の利用",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("25","％"), nu("360","mL"), nu("2000","円"),
                 nu("64","％"), nu("320","g"), nu("600","円"),
@@ -175,7 +195,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 3, "order": 2, "title": "第3回② 相当算",
-        "sections": [
+        "sections": lambda: [
             ("類題4", [
                 nu("120","ページ"), nu("1200","円"), nu("6000","円"),
                 nu("120","ページ"), nu("5000","円"), nu("300","ページ"),
@@ -190,7 +210,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 4, "order": 1, "title": "第4回① 差集め算",
-        "sections": [
+        "sections": lambda: [
             ("類題1", n("900 2400 4050 2750 3400 5250", "円")),
             ("類題2", [
                 nu("100","枚"), nu("33","個"), nu("10","本"),
@@ -207,7 +227,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 4, "order": 2, "title": "第4回② 差集め算",
-        "sections": [
+        "sections": lambda: [
             ("類題3", [
                 mp([("A","個"),("B","個")], {"A":"14","B":"11"}),
                 mp([("A","個"),("B","個")], {"A":"34","B":"30"}),
@@ -230,7 +250,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 1, "order": 1, "title": "第1回① 文章題",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("14","個"), nu("23","個"), nu("15","人"), nu("340","円"),
                 nu("12","本"), nu("25","本"), nu("19","本"), nu("22","冊"),
@@ -259,7 +279,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 1, "order": 2, "title": "第1回② 文章題",
-        "sections": [
+        "sections": lambda: [
             ("平均算（合計の利用）", [
                 nu("50.9","点"), nu("75","点"), nu("86","点"), nu("75","点"),
                 nu("97","点"), nu("84","点"), nu("96","点"), nu("80","点"),
@@ -303,7 +323,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 2, "order": 1, "title": "第2回① 規則性",
-        "sections": [
+        "sections": lambda: [
             ("植木算", [
                 nu("32","m"), nu("228","m"), nu("12","本"),
                 mp([("①","㎝"),("②","㎝")], {"①":"37.5","②":"20"}),
@@ -329,7 +349,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 2, "order": 2, "title": "第2回② 規則性",
-        "sections": [
+        "sections": lambda: [
             ("方陣算", [
                 mp([("①","個"),("②","個")], {"①":"225","②":"56"}),
                 mp([("①","個"),("②","個")], {"①":"78","②":"33"}),
@@ -369,7 +389,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 3, "order": 1, "title": "第3回① 平面図形(1)",
-        "sections": [
+        "sections": lambda: [
             ("角度", [
                 mp([("ア","°"),("イ","°")], {"ア":"111","イ":"94"}),
                 nu("76","°"), nu("38","°"), nu("46","°"),
@@ -395,7 +415,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 3, "order": 2, "title": "第3回② 平面図形(1)",
-        "sections": [
+        "sections": lambda: [
             ("多角形の性質", [
                 nu("27","本"), nu("1800","°"), nu("156","°"),
                 sel(["十四角形"], ["十角形","十二角形","十六角形","十八角形"]),
@@ -415,7 +435,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 4, "order": 1, "title": "第4回① 容器と水量・変化とグラフ",
-        "sections": [
+        "sections": lambda: [
             ("底面積と深さ", [
                 nu("7","㎝"),
                 mp([("①","L"),("②","㎠")], {"①":"2.88","②":"144"}),
@@ -438,7 +458,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 4, "order": 2, "title": "第4回② 容器と水量・変化とグラフ",
-        "sections": [
+        "sections": lambda: [
             ("仕切りのある容器", [
                 mp([("①","㎝"),("②","㎝")], {"①":"42","②":"40"}),
                 mp([("①","分"),("②","㎝")], {"①":"25","②":"10"}),
@@ -461,7 +481,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 6, "order": 1, "title": "第6回① 食塩水",
-        "sections": [
+        "sections": lambda: [
             ("Part 1", [
                 nu("12.5","％"), nu("10","％"), nu("20","％"),
                 nu("30","g"), nu("45","g"), nu("150","g"), nu("450","g"),
@@ -497,7 +517,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 6, "order": 2, "title": "第6回② 食塩水",
-        "sections": [
+        "sections": lambda: [
             ("Part 11", [
                 nu("10","％"), nu("8","％"), nu("10","％"),
                 nu("16","％"), nu("15","％"),
@@ -521,7 +541,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 7, "order": 1, "title": "第7回① 売買損益",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("180","円"), nu("420","円"), nu("500","円"),
                 nu("12","％引き"), nu("350","円"), nu("630","円"), nu("800","円"),
@@ -542,7 +562,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 7, "order": 2, "title": "第7回② 売買損益（複数個）",
-        "sections": [
+        "sections": lambda: [
             ("類題5", n("2040 1320 2560 8160", "円")),
             ("類題6", n("100 80 120 200", "個")),
             ("計算練習", n(
@@ -556,7 +576,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 8, "order": 1, "title": "第8回① 多角形の回転移動",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("42","°"), nu("160","°"), nu("55","°"), nu("145","°"),
             ]),
@@ -574,7 +594,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 8, "order": 2, "title": "第8回② 多角形の転がり移動",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 mp([("□",""),("△",""),("②","㎝")],
                    {"□":"A","△":"B","②":"18.84"},
@@ -598,7 +618,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 9, "order": 1, "title": "第9回① 円の回転移動・転がり移動",
-        "sections": [
+        "sections": lambda: [
             ("類題1", [
                 nu("6.28","㎠"),
                 mp([("①","㎠"),("②","㎝")], {"①":"50.24","②":"37.68"}),
@@ -619,7 +639,7 @@ SETS = [
     # ================================================================
     {
         "grade": 5, "session": 9, "order": 2, "title": "第9回② 円の転がり移動2",
-        "sections": [
+        "sections": lambda: [
             ("類題1", n("24 16 14 32", "㎝")),
             ("類題2", [
                 nu("18.84","㎝"),
@@ -640,7 +660,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 6, "order": 1, "title": "第6回① 速さ",
-        "sections": [
+        "sections": lambda: [
             ("速さの三用法", [
                 nu("36","㎞/時"), nu("45","m/分"), nu("10","㎞"), nu("300","m"),
                 nu("80","m/分"), nu("45","分"), nu("12","分"),
@@ -659,7 +679,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 6, "order": 2, "title": "第6回② 速さ",
-        "sections": [
+        "sections": lambda: [
             ("旅人算", [
                 nu("35","分"),
                 nu("14","分後"), nu("6","分後"),
@@ -693,7 +713,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 7, "order": 1, "title": "第7回① 平面図形(2)",
-        "sections": [
+        "sections": lambda: [
             ("ピラミッド型・クロス型の相似", [
                 nu("9","㎝"), ratio(4, 9), nu("9","㎝"),
                 mp([("①","㎝"),("②",""),("③","")],
@@ -747,7 +767,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 7, "order": 2, "title": "第7回② 平面図形(2)",
-        "sections": [
+        "sections": lambda: [
             ("並びの比", [
                 ratio(5, 4), ratio(3, 5), nu("5","㎝"), nu("14","㎝"),
                 mp([("①","㎠"),("②",""),("③","")],
@@ -787,7 +807,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 8, "order": 1, "title": "第8回① 場合の数",
-        "sections": [
+        "sections": lambda: [
             ("樹形図（順列）", [
                 mp([("①","通り"),("②","通り")], {"①":"20","②":"12"}),
                 mp([("①","通り"),("②","通り"),("③","通り")],
@@ -810,7 +830,7 @@ SETS = [
     # ================================================================
     {
         "grade": 6, "session": 8, "order": 2, "title": "第8回② 場合の数",
-        "sections": [
+        "sections": lambda: [
             ("順列（数字カード）", [
                 mp([("①","通り"),("②","通り")], {"①":"30","②":"20"}),
                 mp([("①","通り"),("②","通り")], {"①":"6","②":"12"}),
@@ -843,69 +863,103 @@ SETS = [
     },
 ]
 
+def select_sets(grade=None, session=None, order=None):
+    """条件に合うセットだけ問題を組み立てて返す（None の条件は絞り込まない）
+
+    選ばれなかったセットの sections ファクトリは呼ばれないので、問題の構築・検証・SQL 生成の
+    いずれのコストもかからない。
+    """
+    return [
+        {**qs, "sections": qs["sections"]()}
+        for qs in SETS
+        if (grade is None or qs["grade"] == grade)
+        and (session is None or qs["session"] == session)
+        and (order is None or qs["order"] == order)
+    ]
+
+def sample_rank(qs):
+    """開発用サンプルでの抽出順位（キーのハッシュなので、SETS への追加・並べ替えで他のセットの順位は変わらない）"""
+    return hashlib.sha256(f"{qs['grade']}-{qs['session']}-{qs['order']}".encode()).hexdigest()
+
+def set_answer_types(qs):
+    """セットに含まれる answer_type の集合"""
+    return {q["type"] for _, questions in qs["sections"] for q in questions}
+
+def sample_sets(sets, size):
+    """学年で層別し、size セットを決定的に抽出する（--sample 用）
+
+    1. 学年ごとに、その学年に出てくる answer_type をすべて含むまで、未カバーの型を最も多く含むセットを選ぶ
+    2. 残りの枠は学年のセット数に比例するよう、選択率の最も低い学年から順位順に埋める
+    カバーに必要なセット数が size を超える場合はカバーを優先する。戻り値は sets と同じ順。
+    """
+    ranked = sorted(sets, key=sample_rank)
+    grades = sorted({qs["grade"] for qs in sets})
+    chosen = []
+    for grade in grades:
+        candidates = [qs for qs in ranked if qs["grade"] == grade]
+        uncovered = set().union(*(set_answer_types(qs) for qs in candidates))
+        while uncovered:
+            best = max(candidates, key=lambda qs: len(set_answer_types(qs) & uncovered))
+            candidates.remove(best)
+            chosen.append(best)
+            uncovered -= set_answer_types(best)
+
+    pool = {grade: [qs for qs in ranked if qs["grade"] == grade and qs not in chosen] for grade in grades}
+    totals = {grade: sum(1 for qs in sets if qs["grade"] == grade) for grade in grades}
+    while len(chosen) < size and any(pool.values()):
+        grade = min((g for g in grades if pool[g]),
+                    key=lambda g: (sum(1 for qs in chosen if qs["grade"] == g) / totals[g], g))
+        chosen.append(pool[grade].pop(0))
+    return [qs for qs in sets if qs in chosen]
+
 # ============================================================================
 # バリデーション
 # ============================================================================
 
-def validate():
-    """データの整合性チェック"""
-    errors = []
-    totals = {"numeric": 0, "multi_part": 0, "selection": 0, "fraction": 0}
-    grade_totals = {5: {"numeric": 0, "multi_part": 0, "selection": 0, "fraction": 0},
-                    6: {"numeric": 0, "multi_part": 0, "selection": 0, "fraction": 0}}
+ANSWER_TYPES = ("numeric", "multi_part", "selection", "fraction")
 
-    for qs in SETS:
-        grade = qs["grade"]
-        q_count = 0
-        for section_name, questions in qs["sections"]:
-            for q in questions:
-                q_count += 1
-                qtype = q["type"]
-                totals[qtype] += 1
-                grade_totals[grade][qtype] += 1
-
-                loc = f"{qs['title']} {section_name} ({q_count})"
-
-                # multi_part: 計画 Section 2-4 準拠バリデーション
-                if qtype == "multi_part":
-                    slot_labels = {s["label"] for s in q["slots"]}
-                    cv_keys = set(q["correct_values"].keys())
-                    # (a) slots ≡ correct_values キー集合
-                    if slot_labels != cv_keys:
-                        errors.append(
-                            f"{loc}: slots={slot_labels} != "
-                            f"correct_values={cv_keys}")
-                    # (b) template 内の {label} が slots と完全一致
-                    import re
-                    tpl_labels = set(re.findall(r"\{([^}]+)\}", q["template"]))
-                    if tpl_labels != slot_labels:
-                        errors.append(
-                            f"{loc}: template placeholders={tpl_labels} != "
-                            f"slots={slot_labels}")
-
-                # selection: 計画 Section 2-4 準拠バリデーション
-                if qtype == "selection":
-                    cv = q["correct_values"]
-                    dv = q["dummy_values"]
-                    # (a) correct ∩ dummy = ∅
-                    overlap = set(cv) & set(dv)
-                    if overlap:
-                        errors.append(f"{loc}: correct/dummy overlap: {overlap}")
-                    # (b) correct_values 内重複
-                    if len(cv) != len(set(cv)):
-                        errors.append(f"{loc}: correct_values has duplicates")
-                    # (c) dummy_values 内重複
-                    if len(dv) != len(set(dv)):
-                        errors.append(f"{loc}: dummy_values has duplicates")
-
-        # 問題数の表示
-        print(f"  {qs['title']}: {q_count}問", file=sys.stderr)
-
-    total = sum(totals.values())
+def check_question(q, loc, errors):
+    """1問分の整合性チェック（エラーは errors に追加）"""
+    qtype = q["type"]
+
+    # multi_part: 計画 Section 2-4 準拠バリデーション
+    if qtype == "multi_part":
+        slot_labels = {s["label"] for s in q["slots"]}
+        cv_keys = set(q["correct_values"].keys())
+        # (a) slots ≡ correct_values キー集合
+        if slot_labels != cv_keys:
+            errors.append(
+                f"{loc}: slots={slot_labels} != "
+                f"correct_values={cv_keys}")
+        # (b) template 内の {label} が slots と完全一致
+        tpl_labels = set(re.findall(r"\{([^}]+)\}", q["template"]))
+        if tpl_labels != slot_labels:
+            errors.append(
+                f"{loc}: template placeholders={tpl_labels} != "
+                f"slots={slot_labels}")
+
+    # selection: 計画 Section 2-4 準拠バリデーション
+    if qtype == "selection":
+        cv = q["correct_values"]
+        dv = q["dummy_values"]
+        # (a) correct ∩ dummy = ∅
+        overlap = set(cv) & set(dv)
+        if overlap:
+            errors.append(f"{loc}: correct/dummy overlap: {overlap}")
+        # (b) correct_values 内重複
+        if len(cv) != len(set(cv)):
+            errors.append(f"{loc}: correct_values has duplicates")
+        # (c) dummy_values 内重複
+        if len(dv) != len(set(dv)):
+            errors.append(f"{loc}: dummy_values has duplicates")
+
+def report_stats(stats, errors):
+    """集計結果を stderr に出力し、検証エラーがあれば終了する"""
+    total = sum(stats["types"].values())
     print(f"\n  合計: {total}問", file=sys.stderr)
-    print(f"  内訳: {totals}", file=sys.stderr)
-    print(f"  G5: {grade_totals[5]}", file=sys.stderr)
-    print(f"  G6: {grade_totals[6]}", file=sys.stderr)
+    print(f"  内訳: {stats['types']}", file=sys.stderr)
+    print(f"  G5: {stats['grade_types'][5]}", file=sys.stderr)
+    print(f"  G6: {stats['grade_types'][6]}", file=sys.stderr)
 
     if errors:
         for e in errors:
@@ -918,80 +972,285 @@ def validate():
 # SQL 生成
 # ============================================================================
 
-def sql_str(val):
-    """Python値 → SQL文字列リテラル"""
-    if val is None:
-        return "NULL"
-    return "'" + str(val).replace("'", "''") + "'"
+QUESTIONS = Table("public.questions", (
+    "question_set_id", "question_number", "section_name", "answer_type",
+    "correct_answer", "unit_label", "answer_config", "points", "display_order",
+))
 
-def sql_json(val):
-    """Python dict/list → SQL JSONB リテラル"""
-    if val is None:
-        return "NULL"
-    return "'" + json.dumps(val, ensure_ascii=False).replace("'", "''") + "'"
+# --typed-columns: questions へは math_units との JOIN を挟むので、この列の VALUES 表から INSERT ... SELECT する
+# unit_label / answer_config は読み出し側（app/actions/math-answer.ts, exercise.ts）が型付き列に移るまで従来どおり埋める
+TYPED_QUESTION_COLUMNS = (
+    "question_number", "section_name", "answer_type", "correct_answer", "unit", "unit_label",
+    "correct_values", "dummy_values", "answer_config", "display_order",
+)
 
-def generate_question_sql(q, qs_var, question_number, display_order):
-    """1問分の VALUES 行を生成
-    question_number: セクション内連番 (1, 2, ...)
-    display_order: セット内通番 (1, 2, ..., N)
-    """
-    qtype = q["type"]
-    qn = f"({question_number})"
+MATH_UNITS = Table("public.math_units", ("label",), conflict=("label",), update=())
 
-    if qtype == "numeric":
-        return (f"    ({qs_var}, '{qn}', {{section}}, 'numeric', "
-                f"{sql_str(q['answer'])}, {sql_str(q.get('unit'))}, NULL, 1, {display_order})")
+# copy=True: 全セットの questions 行を DO ブロックの前に COPY で積む一時テーブル（セットは自然キーで引く）
+MATH_QUESTION_SRC = Table("math_question_src", (
+    "grade SMALLINT NOT NULL",
+    "session_number SMALLINT NOT NULL",
+    "set_order SMALLINT NOT NULL",
+    "question_number TEXT NOT NULL",
+    "section_name TEXT NOT NULL",
+    "answer_type TEXT NOT NULL",
+    "correct_answer TEXT",
+    "unit_label TEXT",
+    "answer_config JSONB",
+    "points INTEGER NOT NULL",
+    "display_order INTEGER NOT NULL",
+))
 
-    elif qtype == "fraction":
-        return (f"    ({qs_var}, '{qn}', {{section}}, 'fraction', "
-                f"{sql_str(q['answer'])}, NULL, NULL, 1, {display_order})")
+# セットごとの参照先 ID（study_sessions / assessment_masters / 既存 question_sets）を冒頭でまとめて解決する一時テーブル
+MATH_SET_IDS = Table("math_set_ids", (
+    "grade SMALLINT NOT NULL",
+    "session_number SMALLINT NOT NULL",
+    "set_order SMALLINT NOT NULL",
+    "session_id BIGINT",
+    "assessment_master_id UUID",
+    "existing_id BIGINT",
+    "existing_status VARCHAR(20)",
+))
 
-    elif qtype == "multi_part":
-        config = {
+QUESTION_SEARCH_TERMS = Table("public.question_search_terms",
+                              ("term", "kind", "question_set_id", "display_order"))
+
+def answer_config(q):
+    """questions.answer_config の値（multi_part / selection 用、他タイプは None）"""
+    if q["type"] == "multi_part":
+        return {
             "slots": q["slots"],
             "correct_values": q["correct_values"],
             "template": q["template"],
         }
-        return (f"    ({qs_var}, '{qn}', {{section}}, 'multi_part', "
-                f"NULL, NULL, {sql_json(config)}, 1, {display_order})")
-
-    elif qtype == "selection":
+    if q["type"] == "selection":
         config = {
             "correct_values": q["correct_values"],
             "dummy_values": q["dummy_values"],
         }
         if q.get("unit"):
             config["unit"] = q["unit"]
-        return (f"    ({qs_var}, '{qn}', {{section}}, 'selection', "
-                f"NULL, NULL, {sql_json(config)}, 1, {display_order})")
+        return config
+    return None
+
+def question_row(q, qs_var, section_name, question_number, display_order):
+    """1問分の questions 行
+    question_number: セクション内連番 (1, 2, ...)
+    display_order: セット内通番 (1, 2, ..., N)
+    """
+    qtype = q["type"]
+    qn = f"({question_number})"
+
+    if qtype == "numeric":
+        return QUESTIONS.Row(Raw(qs_var), qn, section_name, qtype, q["answer"], q.get("unit"), None, 1, display_order)
+
+    elif qtype == "fraction":
+        return QUESTIONS.Row(Raw(qs_var), qn, section_name, qtype, q["answer"], None, None, 1, display_order)
+
+    elif qtype in ("multi_part", "selection"):
+        return QUESTIONS.Row(Raw(qs_var), qn, section_name, qtype, None, None, answer_config(q), 1, display_order)
+
+def question_typed_row(q, section_name, question_number, display_order):
+    """1問分の VALUES 行（--typed-columns 用、列は TYPED_QUESTION_COLUMNS）
+
+    unit は math_units との JOIN で unit_id に解決する。
+    selection は correct_values / dummy_values (text[]) にも入れる。
+    unit_label / answer_config は question_row() と同じ値（読み出し側の移行が済むまで型付き列と併記する）。
+    """
+    qtype = q["type"]
+    legacy = question_row(q, "v_qs", section_name, question_number, display_order)
+
+    if qtype == "selection":
+        correct_values, dummy_values = sql_text_array(q["correct_values"]), sql_text_array(q["dummy_values"])
+    else:
+        correct_values = dummy_values = None
+    unit = None if qtype == "multi_part" else q.get("unit")
+    return (legacy.question_number, section_name, qtype, legacy.correct_answer, unit, legacy.unit_label,
+            correct_values, dummy_values, legacy.answer_config, display_order)
+
+# selection の正答から除く前後の空白（str.isspace() の全文字）
+# 20261019000004 の refresh_question_set_answer_keys() の btrim() と同じ集合にしておくこと
+ANSWER_TRIM_CHARS = ("\t\n\v\f\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+                     "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000")
+
+def answer_key_entry(q):
+    """採点キー (question_set_answer_keys.answer_key) の1要素
+
+    採点 (lib/math-grading.ts gradeAnswer) が比較に使う値だけを持つ。
+    selection の正答は採点時と同じく前後の空白除去・重複除去・ソート済みにしておく
+    （トリガーで作り直したキーと一致するよう、空白は ANSWER_TRIM_CHARS で除く）。
+    """
+    qtype = q["type"]
+    if qtype == "multi_part":
+        return {"t": qtype, "a": q["correct_values"], "s": [slot["label"] for slot in q["slots"]], "p": 1}
+    if qtype == "selection":
+        return {"t": qtype, "a": sorted({v.strip(ANSWER_TRIM_CHARS) for v in q["correct_values"]}), "p": 1}
+    return {"t": qtype, "a": q["answer"], "p": 1}
+
+def search_text(value):
+    """検索語の正規化: NFKC・前後の空白除去・小文字化（lib/question-search.ts normalizeSearchText と同じ）"""
+    return unicodedata.normalize("NFKC", value).strip().lower()
+
+def question_answers(q):
+    """検索語にする正答（multi_part は各スロット、selection は正答の選択肢）"""
+    if q["type"] == "multi_part":
+        return [q["correct_values"][slot["label"]] for slot in q["slots"]]
+    if q["type"] == "selection":
+        return q["correct_values"]
+    return [q["answer"]]
+
+def section_stem(section_name):
+    """セクション名から末尾の番号を除いた分類名（"類題3" → "類題", "Part 12" → "Part", "周期算②" → "周期算"）"""
+    stem = section_name
+    while stem and unicodedata.digit(stem[-1], None) is not None:
+        stem = stem[:-1]
+    return stem.rstrip()
+
+def search_terms(title, sections):
+    """セット1つ分の検索語 [(term, kind, display_order)]（重複なし・出現順）
+
+    title の語はセット全体 (display_order 0) に付ける。3文字以上の語は2文字組も入れて部分一致に使う。
+    """
+    terms = []
+    seen = set()
+
+    def add(term, kind, display_order):
+        key = (term, kind, display_order)
+        if term and key not in seen:
+            seen.add(key)
+            terms.append(key)
+
+    for word in search_text(title).split():
+        add(word, "title", 0)
+        if len(word) > 2:
+            for i in range(len(word) - 1):
+                add(word[i:i + 2], "title", 0)
 
-def generate_sql():
-    """全体の SQL を生成"""
+    display_order = 0
+    for section_name, questions in sections:
+        section = search_text(section_name)
+        stem = search_text(section_stem(section_name))
+        for q in questions:
+            display_order += 1
+            add(section, "section", display_order)
+            add(stem, "section", display_order)
+            units = [slot["unit"] for slot in q["slots"]] if q["type"] == "multi_part" else [q.get("unit")]
+            for unit in units:
+                if unit:
+                    add(search_text(unit), "unit", display_order)
+            for answer in question_answers(q):
+                add(search_text(answer), "answer", display_order)
+    return terms
+
+def typed_units(sets):
+    """--typed-columns で math_units に登録する単位（numeric / fraction / selection の unit、ラベル順）"""
+    return sorted({q["unit"] for qs in sets for _, questions in qs["sections"]
+                   for q in questions if q.get("unit")})
+
+def render_set_ids_prelude(sets):
+    """全セットの参照先 ID を1回の JOIN で math_set_ids に解決する（セットごとの SELECT INTO STRICT の代わり）
+
+    study_sessions / assessment_masters が見つからないキーがあれば、その一覧を出して中断する。
+    既存の question_sets は master_print だけを見る（同じ回・display_order の exercise_workbook とは別物）。
+    """
+    lines = []
+    lines.append("  -- 全セットの参照先 ID をまとめて解決（study_sessions / assessment_masters / 既存 question_sets）")
+    lines.extend(create_temp_table(MATH_SET_IDS))
+    lines.append(f"  INSERT INTO math_set_ids ({MATH_SET_IDS.column_list()})")
+    lines.append("  SELECT k.grade, k.session_number, k.set_order, ss.id, am.id, qs.id, qs.status")
+    lines.extend(values_from([(qs["grade"], qs["session"], qs["order"]) for qs in sets], "k",
+                             ("grade", "session_number", "set_order")))
+    lines.append("  LEFT JOIN public.study_sessions ss")
+    lines.append("    ON ss.grade = k.grade AND ss.session_number = k.session_number")
+    lines.append("  LEFT JOIN public.assessment_masters am")
+    lines.append("    ON am.assessment_type = 'math_print' AND am.grade = k.grade::text || '年'")
+    lines.append("   AND am.session_number = k.session_number AND am.attempt_number = k.set_order")
+    lines.append("  LEFT JOIN public.question_sets qs")
+    lines.append("    ON qs.session_id = ss.id AND qs.subject_id = v_math_id")
+    lines.append("   AND qs.display_order = k.set_order AND qs.set_type = 'master_print';")
+    lines.append("")
+    lines.append("  SELECT string_agg(format('小%s 第%s回%s（%s なし）', grade, session_number,")
+    lines.append("           CASE set_order WHEN 1 THEN '①' ELSE '②' END,")
+    lines.append("           CASE WHEN session_id IS NULL THEN 'study_sessions' ELSE 'assessment_masters' END),")
+    lines.append("         ', ' ORDER BY grade, session_number, set_order)")
+    lines.append("  INTO v_missing")
+    lines.append("  FROM math_set_ids")
+    lines.append("  WHERE session_id IS NULL OR assessment_master_id IS NULL;")
+    lines.append("  IF v_missing IS NOT NULL THEN")
+    lines.append("    RAISE EXCEPTION '算数セットの参照先が見つかりません: %', v_missing;")
+    lines.append("  END IF;")
+    lines.append("")
+    return lines
+
+def new_stats():
+    """generate_sql() が走査中に集計する統計"""
+    return {
+        "types": {t: 0 for t in ANSWER_TYPES},
+        "grade_types": {g: {t: 0 for t in ANSWER_TYPES} for g in (5, 6)},
+        "questions": {5: 0, 6: 0},
+        "sets": {5: 0, 6: 0},
+        "sessions": {5: set(), 6: set()},
+    }
+
+def render_header(stats, typed=False, subset=None, sample=None):
+    """集計済みの統計からファイルヘッダーを組み立てる
+
+    subset: 部分生成時の条件の表記, sample: 開発用サンプルの --sample N（None = 本番シード）
+    """
     lines = []
     lines.append("-- ============================================================================")
-    # 実データから問題数を集計
-    g5_count = sum(sum(len(qs) for _, qs in s["sections"])
-                   for s in SETS if s["grade"] == 5)
-    g6_count = sum(sum(len(qs) for _, qs in s["sections"])
-                   for s in SETS if s["grade"] == 6)
-    grand_total = g5_count + g6_count
-    lines.append(f"-- 算数自動採点 — 本番問題データ ({grand_total}問)")
+    grand_total = sum(stats["questions"].values())
+    lines.append(f"-- 算数自動採点 — {'本番問題データ' if sample is None else '開発用サンプルデータ'} ({grand_total}問)")
     lines.append("-- ============================================================================")
     lines.append("-- 生成元: scripts/generate-math-questions-sql.py")
-    lines.append("-- 再生成: python3 scripts/generate-math-questions-sql.py > supabase/seeds/math_questions_2026.sql")
+    if sample is None:
+        lines.append("-- 再生成: python3 scripts/generate-math-questions-sql.py > supabase/seeds/math_questions_2026.sql")
+    else:
+        option = "--sample" if sample == DEFAULT_SAMPLE_SIZE else f"--sample {sample}"
+        lines.append(f"-- 再生成: python3 scripts/generate-math-questions-sql.py {option} > supabase/seeds/math_questions_dev.sql")
     lines.append("--")
-    g5_sets = sum(1 for s in SETS if s["grade"] == 5)
-    g6_sets = sum(1 for s in SETS if s["grade"] == 6)
-    g5_sessions = sorted(set(s["session"] for s in SETS if s["grade"] == 5))
-    g6_sessions = sorted(set(s["session"] for s in SETS if s["grade"] == 6))
-    g5_range = f"第{g5_sessions[0]}回〜第{g5_sessions[-1]}回"
-    g6_range = f"第{g6_sessions[0]}回〜第{g6_sessions[-1]}回"
     lines.append("-- 内容:")
-    lines.append(f"--   小5上 {g5_range} (①②×{len(g5_sessions)} = {g5_sets}セット, {g5_count}問)")
-    lines.append(f"--   小6上 {g6_range} (①②×{len(g6_sessions)} = {g6_sets}セット, {g6_count}問)")
+    for grade in (5, 6):
+        sessions = sorted(stats["sessions"][grade])
+        if not sessions:
+            continue
+        grade_range = f"第{sessions[0]}回〜第{sessions[-1]}回"
+        lines.append(f"--   小{grade}上 {grade_range} (①②×{len(sessions)} = {stats['sets'][grade]}セット, "
+                     f"{stats['questions'][grade]}問)")
+    if subset:
+        lines.append(f"--   （部分生成: {subset}）")
     lines.append("--")
     lines.append("-- 注意: approved済みセットはスキップ、draft は approved に昇格して再投入")
+    if typed:
+        lines.append("-- 形式: --typed-columns（単位は math_units.id、selection の選択肢は text[] 列。unit_label / answer_config も併記）")
     lines.append("")
+    return lines
+
+def generate_sql(batch_size=None, typed=False, sets=None, subset=None, sample=None, copy=False):
+    """SETS を1回だけ走査し、検証・集計・SQL 生成をまとめて行う
+
+    各セットの SQL は本体バッファに書き出し、ヘッダーの統計は走査中に集計した値から最後に組み立てる。
+    検証エラーがあれば一覧を出力して終了する。
+    batch_size: questions の複数行 INSERT 1文あたりの最大行数（None = DEFAULT_BATCH_SIZE, 0 = 分割しない）
+    typed: True なら unit_label / answer_config に加えて unit_id と text[] 列にも投入する
+           (20261019000003_add_math_units_and_typed_answer_columns.sql 適用後に使う。
+           読み出し側はまだ unit_label / answer_config を読むので、従来の列は空けない)
+    sets: select_sets() で絞り込んだセット（None = 全セット）, subset: ヘッダーに書く絞り込み条件
+    sample: sets が sample_sets() の抽出結果なら、その --sample N（ヘッダーの表記に使う）
+    copy: questions の行を DO ブロックの前に COPY ... FROM stdin で読み込み、各セットはそこから INSERT ... SELECT する
+          （psql で流す場合専用。適用時間ベンチマーク用で、typed とは併用できない）
+    戻り値: (sql, 問題数合計)
+    """
+    if copy and typed:
+        raise ValueError("copy と typed は併用できません")
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE
+    if sets is None:
+        sets = select_sets()
+    errors = []
+    stats = new_stats()
+    copy_rows = []
+    lines = []
     lines.append("DO $$")
     lines.append("DECLARE")
     lines.append("  v_math_id         BIGINT;")
@@ -1001,36 +1260,55 @@ def generate_sql():
     lines.append("  v_count           INTEGER := 0;")
     lines.append("  v_existing_id     BIGINT;")
     lines.append("  v_existing_status VARCHAR(20);")
+    lines.append("  v_missing         TEXT;")
     lines.append("BEGIN")
     lines.append("")
     lines.append("  -- 算数の subject_id を取得")
-    lines.append("  SELECT id INTO STRICT v_math_id")
-    lines.append("  FROM public.subjects WHERE name = '算数';")
+    lines.extend(subject_id_prelude(["算数"], strict=True))
     lines.append("")
+    if typed and typed_units(sets):
+        lines.append("  -- 単位辞書を登録（既存の単位はそのまま。ID は DB 側で採番）")
+        lines.extend(emit_insert(MATH_UNITS, [(unit,) for unit in typed_units(sets)], target="upsert"))
+        lines.append("")
+    lines.extend(render_set_ids_prelude(sets))
 
-    for qs in SETS:
+    for qs in sets:
         grade = qs["grade"]
         session = qs["session"]
         order = qs["order"]
         title = qs["title"]
 
+        # 問題の検証・集計・行生成（1問につき1回だけ触る）
+        display_order = 0
+        rows = []
+        answer_key = []
+        for section_name, questions in qs["sections"]:
+            section_num = 0  # セクション内連番
+            for q in questions:
+                display_order += 1
+                section_num += 1
+                check_question(q, f"{title} {section_name} ({display_order})", errors)
+                stats["types"][q["type"]] += 1
+                stats["grade_types"][grade][q["type"]] += 1
+                if typed:
+                    rows.append(question_typed_row(q, section_name, section_num, display_order))
+                else:
+                    rows.append(question_row(q, "v_qs", section_name, section_num, display_order))
+                answer_key.append(answer_key_entry(q))
+        stats["questions"][grade] += display_order
+        stats["sets"][grade] += 1
+        stats["sessions"][grade].add(session)
+        print(f"  {title}: {display_order}問", file=sys.stderr)
+
         # セクションヘッダー
-        total_q = sum(len(questions) for _, questions in qs["sections"])
+        total_q = display_order
         lines.append(f"  -- ========================================")
         lines.append(f"  -- 小{grade} {title} ({total_q}問)")
         lines.append(f"  -- ========================================")
-        grade_label = f"{grade}年"
-        lines.append(f"  SELECT id INTO STRICT v_sid")
-        lines.append(f"  FROM public.study_sessions WHERE grade = {grade} AND session_number = {session};")
-        lines.append(f"")
-        lines.append(f"  SELECT id INTO STRICT v_am_id")
-        lines.append(f"  FROM public.assessment_masters")
-        lines.append(f"  WHERE assessment_type = 'math_print' AND grade = '{grade_label}' AND session_number = {session} AND attempt_number = {order};")
-        lines.append(f"")
         # 3分岐: 既存チェック → (1)なし→INSERT / (2)approved→SKIP / (3)draft→昇格
-        lines.append(f"  SELECT id, status INTO v_existing_id, v_existing_status")
-        lines.append(f"  FROM public.question_sets")
-        lines.append(f"  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = {order};")
+        lines.append(f"  SELECT session_id, assessment_master_id, existing_id, existing_status")
+        lines.append(f"  INTO v_sid, v_am_id, v_existing_id, v_existing_status")
+        lines.append(f"  FROM math_set_ids WHERE grade = {grade} AND session_number = {session} AND set_order = {order};")
         lines.append(f"")
         lines.append(f"  IF v_existing_status = 'approved' THEN")
         lines.append(f"    RAISE NOTICE 'スキップ: 小{grade} {title}（approved済み）';")
@@ -1054,36 +1332,151 @@ def generate_sql():
         lines.append(f"    END IF;")
         lines.append(f"")
 
-        # 問題の INSERT（新規・draft昇格 共通）
-        lines.append(f"    INSERT INTO public.questions")
-        lines.append(f"      (question_set_id, question_number, section_name, answer_type,")
-        lines.append(f"       correct_answer, unit_label, answer_config, points, display_order)")
-        lines.append(f"    VALUES")
+        # 問題の INSERT（新規・draft昇格 共通）: batch_size 行ごとに1文（複数バッチ時は進捗を NOTICE）
+        def progress(inserted):
+            return f"    RAISE NOTICE '  小{grade} {title}: questions {inserted}/{display_order}';"
 
-        display_order = 0
-        value_lines = []
-        for section_name, questions in qs["sections"]:
-            section_num = 0  # セクション内連番
-            for q in questions:
-                display_order += 1
-                section_num += 1
-                line = generate_question_sql(q, "v_qs", section_num, display_order)
-                line = line.replace("{section}", sql_str(section_name))
-                value_lines.append(line)
+        if copy:
+            copy_rows.extend((grade, session, order) + tuple(row[1:]) for row in rows)
+            lines.append(f"    INSERT INTO {QUESTIONS.name} ({QUESTIONS.column_list()})")
+            lines.append(f"    SELECT v_qs, {', '.join(QUESTIONS.columns[1:])}")
+            lines.append(f"    FROM math_question_src WHERE grade = {grade} AND session_number = {session} AND set_order = {order};")
+        elif typed:
+            batches = list(batched(rows, batch_size))
+            inserted = 0
+            for batch in batches:
+                lines.append(f"    INSERT INTO public.questions")
+                lines.append(f"      (question_set_id, question_number, section_name, answer_type,")
+                lines.append(f"       correct_answer, unit_id, unit_label, correct_values, dummy_values, answer_config, points, display_order)")
+                lines.append(f"    SELECT v_qs, v.question_number, v.section_name, v.answer_type,")
+                lines.append(f"           v.correct_answer, u.id, v.unit_label, v.correct_values::text[], v.dummy_values::text[],")
+                lines.append(f"           v.answer_config::jsonb, 1, v.display_order")
+                lines.extend(values_from(batch, "v", TYPED_QUESTION_COLUMNS, indent="    ", row_indent="    "))
+                lines.append(f"    LEFT JOIN public.math_units u ON u.label = v.unit;")
+                inserted += len(batch)
+                if len(batches) > 1:
+                    lines.append(progress(inserted))
+        else:
+            lines.extend(emit_insert(QUESTIONS, rows, batch_size=batch_size, indent="    ", row_indent="    ",
+                                     progress=progress))
+        lines.append(f"")
 
-        # VALUES 行をカンマ区切りで結合
-        lines.append(",\n".join(value_lines) + ";")
+        # 採点キー（display_order 順の正答配列 + questions.id）: 採点時は主キー1行の取得で済む
+        lines.append(f"    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)")
+        lines.append(f"    SELECT v_qs, array_agg(id ORDER BY display_order), {sql_json(answer_key)}::jsonb")
+        lines.append(f"    FROM public.questions WHERE question_set_id = v_qs")
+        lines.append(f"    ON CONFLICT (question_set_id) DO UPDATE")
+        lines.append(f"      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();")
         lines.append(f"")
         lines.append(f"    v_count := v_count + {display_order};")
         lines.append(f"  END IF;  -- approved / ELSE")
         lines.append(f"")
 
+        # 検索語（指導者の問題検索用）: approved 済みでスキップしたセットも毎回作り直す
+        terms = search_terms(title, qs["sections"])
+        lines.append(f"  v_qs := COALESCE(v_existing_id, v_qs);")
+        lines.append(f"  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;")
+        lines.extend(emit_insert(QUESTION_SEARCH_TERMS,
+                                 (QUESTION_SEARCH_TERMS.Row(term, kind, Raw("v_qs"), order) for term, kind, order in terms)))
+        lines.append(f"")
+
     lines.append(f"  RAISE NOTICE '本番問題データ投入完了: %問', v_count;")
     lines.append(f"")
     lines.append(f"END $$;")
     lines.append("")
 
-    return "\n".join(lines)
+    if copy:
+        lines.append("DROP TABLE math_question_src;")
+        lines.append("")
+        copy_lines = list(create_temp_table(MATH_QUESTION_SRC, indent="", on_commit_drop=False))
+        copy_lines.extend(emit_insert(MATH_QUESTION_SRC, copy_rows, target="copy", indent=""))
+        copy_lines.append("ANALYZE math_question_src;")
+        copy_lines.append("")
+        lines = copy_lines + lines
+
+    total = report_stats(stats, errors)
+    return "\n".join(render_header(stats, typed=typed, subset=subset, sample=sample) + lines), total
+
+# ============================================================================
+# SQLite ミラー（--sqlite）
+# ============================================================================
+# Postgres なしでテスト・ローカルツールから実データを引くための自己完結ファイル。
+# question_sets / questions は本番と同じ列名・値（answer_config は JSON 文字列）。
+# study_sessions / subjects は持たないので、session_id / subject_id の代わりに session_number を持つ。
+
+SQLITE_SCHEMA_VERSION = 1  # PRAGMA user_version（列構成を変えたら上げる）
+
+SQLITE_SCHEMA = """
+CREATE TABLE question_sets (
+  id             INTEGER PRIMARY KEY,
+  grade          INTEGER NOT NULL,
+  session_number INTEGER NOT NULL,
+  title          TEXT,
+  display_order  INTEGER NOT NULL,
+  status         TEXT NOT NULL
+);
+CREATE UNIQUE INDEX idx_question_sets_session ON question_sets (grade, session_number, display_order);
+
+CREATE TABLE questions (
+  id              INTEGER PRIMARY KEY,
+  question_set_id INTEGER NOT NULL REFERENCES question_sets(id),
+  question_number TEXT NOT NULL,
+  section_name    TEXT NOT NULL,
+  answer_type     TEXT NOT NULL,
+  correct_answer  TEXT,
+  unit_label      TEXT,
+  answer_config   TEXT,
+  points          INTEGER NOT NULL,
+  display_order   INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX idx_questions_set_order ON questions (question_set_id, display_order);
+"""
+
+def sqlite_rows(sets):
+    """SQLite ミラーの行を返す: (question_sets 行, questions 行)
+
+    ID はセット順・display_order 順の連番（1 始まり）。status は投入後と同じ 'approved'。
+    """
+    set_rows, question_rows = [], []
+    question_id = 0
+    for set_id, qs in enumerate(sets, start=1):
+        set_rows.append((set_id, qs["grade"], qs["session"], qs["title"], qs["order"], "approved"))
+        display_order = 0
+        for section_name, questions in qs["sections"]:
+            for i, q in enumerate(questions, start=1):
+                question_id += 1
+                display_order += 1
+                config = answer_config(q)
+                unit = q.get("unit") if q["type"] == "numeric" else None
+                question_rows.append((
+                    question_id, set_id, f"({i})", section_name, q["type"],
+                    q.get("answer"), unit,
+                    json.dumps(config, ensure_ascii=False) if config is not None else None,
+                    1, display_order,
+                ))
+    return set_rows, question_rows
+
+def write_sqlite(path, sets):
+    """question_sets / questions を SQLite ファイルに書き出す（一時ファイルに作ってから置き換える）"""
+    import sqlite3
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    set_rows, question_rows = sqlite_rows(sets)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript(SQLITE_SCHEMA)
+        conn.executemany("INSERT INTO question_sets VALUES (?, ?, ?, ?, ?, ?)", set_rows)
+        conn.executemany("INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", question_rows)
+        conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    tmp_path.replace(path)
+    return len(set_rows), len(question_rows)
 
 # ============================================================================
 # メイン
@@ -1091,10 +1484,72 @@ def generate_sql():
 
 EXPECTED_TOTAL = 809  # G5: 481 (第1-4,6-9回) + G6: 328 (第1-4,6-8回)
 
+# questions の複数行 INSERT 1文あたりの最大行数（0 = 分割しない）
+DEFAULT_BATCH_SIZE = 500
+
+# seed_ledger 上のシード名（チェックサム一致なら再適用をスキップ）
+SEED_NAME = "math_questions_2026"
+
+# 開発用サンプル（--sample）: ローカルの db reset 用に、本番問題データから層別抽出したシード
+DEFAULT_SAMPLE_SIZE = 4  # セット数
+DEV_SEED_NAME = "math_questions_dev"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="算数自動採点 本番問題データ SQL 生成")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"questions INSERT 1文あたりの最大行数 (既定: {DEFAULT_BATCH_SIZE}, 0 = 分割しない)")
+    parser.add_argument("--typed-columns", action="store_true",
+                        help="unit_id (math_units) と text[] 列にも投入する（要 20261019000003 マイグレーション）")
+    parser.add_argument("--no-ledger", action="store_true",
+                        help="seed_ledger によるスキップ判定・記録を埋め込まない")
+    parser.add_argument("--grade", type=int, choices=(5, 6), help="この学年のセットだけ生成する")
+    parser.add_argument("--session", type=int, help="この回のセットだけ生成する")
+    parser.add_argument("--order", type=int, choices=(1, 2), help="①/② のどちらかだけ生成する")
+    parser.add_argument("--sample", type=int, nargs="?", const=DEFAULT_SAMPLE_SIZE, metavar="N",
+                        help=f"学年・answer_type をすべて含むよう N セットを層別抽出した開発用シードを生成する "
+                             f"(既定: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument("--sqlite", type=Path, metavar="PATH",
+                        help="question_sets / questions の SQLite ミラーも書き出す（テスト・ローカルツール用）")
+    return parser.parse_args(argv)
+
+def subset_label(args):
+    """絞り込み条件の表記とシード名の接尾辞を返す（絞り込みなしなら (None, "")）"""
+    parts, suffix = [], ""
+    if args.grade is not None:
+        parts.append(f"小{args.grade}")
+        suffix += f"_g{args.grade}"
+    if args.session is not None:
+        parts.append(f"第{args.session}回")
+        suffix += f"_s{args.session}"
+    if args.order is not None:
+        parts.append("①②"[args.order - 1])
+        suffix += f"_o{args.order}"
+    return (" ".join(parts) or None), suffix
+
 if __name__ == "__main__":
-    total = validate()
-    assert total == EXPECTED_TOTAL, (
-        f"問題数が期待値と不一致: {total} != {EXPECTED_TOTAL}"
-    )
-    sql = generate_sql()
+    args = parse_args()
+    subset, suffix = subset_label(args)
+    sets = select_sets(grade=args.grade, session=args.session, order=args.order)
+    if not sets:
+        print(f"Error: 該当するセットがありません（{subset}）", file=sys.stderr)
+        sys.exit(1)
+    seed_name = SEED_NAME + suffix
+    if args.sample is not None:
+        sets = sample_sets(sets, args.sample)
+        if len(sets) > args.sample:
+            print(f"  注意: 学年・answer_type のカバーに {len(sets)} セット必要（--sample {args.sample} より優先）",
+                  file=sys.stderr)
+        subset = " ".join(filter(None, [subset, f"開発用サンプル {len(sets)}セット（層別抽出）"]))
+        seed_name = DEV_SEED_NAME + suffix
+    sql, total = generate_sql(batch_size=args.batch_size, typed=args.typed_columns, sets=sets, subset=subset,
+                              sample=args.sample)
+    if subset is None:
+        assert total == EXPECTED_TOTAL, (
+            f"問題数が期待値と不一致: {total} != {EXPECTED_TOTAL}"
+        )
+    if not args.no_ledger:
+        sql = with_ledger(sql.split("\n"), seed_name)
     print(sql)
+    if args.sqlite:
+        set_count, question_count = write_sqlite(args.sqlite, sets)
+        print(f"  SQLite: {args.sqlite} ({set_count}セット, {question_count}問)", file=sys.stderr)
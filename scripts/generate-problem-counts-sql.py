@@ -3,27 +3,85 @@
 
 Excel「2026年四谷大塚DB.xlsx」からデータを読み取り、
 マイグレーションSQL（study_content_types の全面置換 + problem_counts の投入）を生成する。
+学年×コース×回×科目ごとの問題数合計 (problem_count_totals) は problem_counts のトリガーで再集計されるので、ここでは出力しない。
 
 Usage:
-  python3 scripts/generate-problem-counts-sql.py
+  python3 scripts/generate-problem-counts-sql.py [--no-cache] [--expand-in-sql]
+  python3 scripts/generate-problem-counts-sql.py --delta [--output PATH]
+  python3 scripts/generate-problem-counts-sql.py --snapshot-only
+  python3 scripts/generate-problem-counts-sql.py --workbook 2027=PATH
+  python3 scripts/generate-problem-counts-sql.py --workbook 2026=PATH --workbook 2027=PATH --allow-overlap
+
+Options:
+  --no-cache       パース結果キャッシュ (scripts/.cache/problem-counts/) を使わずに Excel を読み直す
+  --delta          前回スナップショット (supabase/seeds/problem_counts_snapshot.json) との差分だけを
+                   INSERT / UPDATE / DELETE する非破壊マイグレーションを生成する
+                   （シートごとの内容ハッシュで変更シートを特定し、変わったセルだけを UPSERT する）
+  --snapshot-only  SQL を書かずにスナップショットだけ更新する（差分運用の初期化用）
+  --update-snapshot --output 指定時もスナップショットを更新する
+                   （既定では既定の出力先に書いたときだけ更新し、試し生成で差分の基準を動かさない）
+  --expand-in-sql  定義をレベル付きで1回だけ出力し、コース展開を SQL 側で行う（出力サイズ縮小）
+  --no-ledger      seed_ledger（チェックサム一致なら適用をスキップ）のチェック・記録を埋め込まない
+  --lookup [PATH]  アプリ用の問題数ルックアップ (lib/constants/problem-counts.generated.ts) も書き出す
+  --batch-size N   複数行 INSERT を N 行ごとに分割し、バッチごとに進捗を RAISE NOTICE する (既定: 500, 0 = 分割しない)
+  --workbook       LABEL=PATH で複数ワークブックを指定（並列パース）。1本のマイグレーションに統合する
+                   （content types は重複なし、セルは和集合で同じセルは後に指定したほうを採用）。
+                   スキーマに年度の次元がないため、年度別の problem_counts を並べて持つことはできない。
+                   2冊以上は --allow-overlap を付けたときだけ受け付ける。
+                   値が食い違うセルは件数を stderr に警告し、生成 SQL のヘッダーにも記録する
+  --allow-overlap  複数の --workbook の統合（同じセルは後勝ちの上書き）を許可する
 
 Output:
   supabase/migrations/20260206000002_update_content_types_and_problem_counts.sql
+  --delta: supabase/migrations/{YYYYMMDD}NNNNNN_delta_content_types_and_problem_counts.sql
+           （今日の日付で、既存マイグレーションの最大バージョンの次の連番。--output で明示もできる）
 
 NOTE: 国語・漢字の総合回（組分けテスト週）は80問に手動修正が必要。
   - 小5: session 5, 9, 14, 18
   - 小6: session 5, 9, 14, 18
   Excelデータは全回40問だが、総合回は実際には80問。
   再生成後は problem_counts_2026.sql の該当行を 40→80 に修正すること。
+  --lookup で書き出したルックアップも同様に該当回を 40→80 に修正すること。
+  problem_count_totals は problem_counts の更新トリガーで再集計されるので、修正は不要。
 """
 
-import openpyxl
+import argparse
+import hashlib
+import json
+import os
+import pickle
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen.ledger import with_ledger  # noqa: E402
+from seedgen.sqlgen import (  # noqa: E402
+    Table, batched, create_temp_table, emit_insert, subject_id_declares, subject_id_prelude,
+    subject_var, values_from,
+)
+
 XLSX_PATH = Path.home() / "Downloads" / "2026年四谷大塚DB.xlsx"
+XLSX_LABEL = "2026"  # --workbook 未指定時のラベル（ヘッダーの年度表記に使う）
 OUTPUT_PATH = Path(__file__).parent.parent / "supabase" / "migrations" / "20260206000002_update_content_types_and_problem_counts.sql"
 
+# read_excel_data() のパース結果キャッシュ
+# read_excel_data() の出力形式・解釈を変えたら PARSER_VERSION を上げること（既存キャッシュが無効になる）
+PARSER_VERSION = 1
+CACHE_DIR = Path(__file__).parent / ".cache" / "problem-counts"
+
+# 差分マイグレーション (--delta) 用: 前回生成時のコース展開結果 + 問題数 + シート内容ハッシュ・セル値
+SNAPSHOT_VERSION = 2
+SNAPSHOT_PATH = Path(__file__).parent.parent / "supabase" / "seeds" / "problem_counts_snapshot.json"
+DELTA_OUTPUT_DIR = Path(__file__).parent.parent / "supabase" / "migrations"
+
+# アプリ用の静的ルックアップ (--lookup): 学習記録フォームが problem_counts を問い合わせずに問題数を引けるようにする
+LOOKUP_PATH = Path(__file__).parent.parent / "lib" / "constants" / "problem-counts.generated.ts"
+
+# 複数行 INSERT の1文あたりの最大行数（Postgres のパース・プランのメモリを抑える。0 = 分割しない）
+DEFAULT_BATCH_SIZE = 500
+
 # コース展開ルール: レベルに応じて利用可能なコース
 LEVEL_TO_COURSES = {
     'A': ['A', 'B', 'C', 'S'],
@@ -92,19 +150,25 @@ CONTENT_DEFS = [
 ]
 
 
-def read_excel_data(wb):
-    """Excelの各データシートを読み込み、{sheet_name: {session_number: {column: value}}} を返す"""
+# 読み込み対象シート（CONTENT_DEFS の excel_sheet と一致させること）
+TARGET_SHEETS = [
+    '小５算数予習', '小５算数演習',
+    '小６算数予習', '小６算数演習',
+    '小５・６国語',
+    '小５理科予習', '小５理科演習',
+    '小６理科予習', '小６理科演習',
+    '小５社会予習', '小５社会演習',
+    '小6社会予習', '小6社会演習',
+]
+
+
+def read_excel_data(wb, sheet_names=None):
+    """Excelの各データシートを読み込み、{sheet_name: {session_number: {column: value}}} を返す
+
+    sheet_names: 読み込むシート（既定: TARGET_SHEETS）。合成ワークブックのベンチマークで差し替える。
+    """
     data = {}
-    target_sheets = [
-        '小５算数予習', '小５算数演習',
-        '小６算数予習', '小６算数演習',
-        '小５・６国語',
-        '小５理科予習', '小５理科演習',
-        '小６理科予習', '小６理科演習',
-        '小５社会予習', '小５社会演習',
-        '小6社会予習', '小6社会演習',
-    ]
-    for sheet_name in target_sheets:
+    for sheet_name in sheet_names or TARGET_SHEETS:
         ws = wb[sheet_name]
         rows = list(ws.iter_rows(min_row=1, values_only=True))
         if not rows:
@@ -132,81 +196,482 @@ def read_excel_data(wb):
     return data
 
 
-def generate_content_types_sql():
-    """study_content_types の INSERT SQL を生成"""
-    lines = []
+def workbook_cache_key(xlsx_path, sheet_names=None):
+    """キャッシュキー (ワークブックの sha256, mtime, パーサーバージョン, 対象シート) を返す"""
+    h = hashlib.sha256()
+    with open(xlsx_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return {
+        'sha256': h.hexdigest(),
+        'mtime_ns': xlsx_path.stat().st_mtime_ns,
+        'parser_version': PARSER_VERSION,
+        'sheets': list(sheet_names or TARGET_SHEETS),
+    }
+
+
+def cache_file_for(xlsx_path):
+    """ワークブックごとのキャッシュファイルパス（パスのハッシュで分離）"""
+    path_digest = hashlib.sha256(str(xlsx_path.resolve()).encode('utf-8')).hexdigest()[:16]
+    return CACHE_DIR / f"{path_digest}.pickle"
+
+
+def load_excel_data(xlsx_path, use_cache=True, sheet_names=None):
+    """read_excel_data() の結果をキャッシュ経由で取得し、(excel_data, cache_hit) を返す
+
+    キーが一致すれば openpyxl を読み込まずにキャッシュから復元する。
+    CONTENT_DEFS / LEVEL_TO_COURSES の変更はキャッシュに影響しない（パース後に適用されるため）。
+    """
+    key = workbook_cache_key(xlsx_path, sheet_names)
+    cache_file = cache_file_for(xlsx_path)
+    if use_cache and cache_file.exists():
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('key') == key:
+                return cached['data'], True
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+            pass  # 壊れたキャッシュは無視して再パース
+
+    import openpyxl  # キャッシュヒット時は import コストも不要
+    wb = openpyxl.load_workbook(str(xlsx_path), data_only=True)
+    excel_data = read_excel_data(wb, sheet_names)
+
+    if use_cache:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')  # 並列パース時の書き込み衝突を避ける
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'key': key, 'data': excel_data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+    return excel_data, False
+
+
+def parse_workbook_specs(specs):
+    """--workbook LABEL=PATH の指定を [(label, Path)] に変換"""
+    workbooks = []
+    for spec in specs:
+        label, sep, path = spec.partition('=')
+        if not sep or not label or not path:
+            print(f"Error: --workbook は LABEL=PATH 形式で指定してください: {spec}")
+            sys.exit(1)
+        if any(label == existing for existing, _ in workbooks):
+            print(f"Error: --workbook のラベルが重複しています: {label}")
+            sys.exit(1)
+        workbooks.append((label, Path(path).expanduser()))
+    return workbooks
+
+
+def load_workbooks(workbooks, use_cache=True, jobs=None):
+    """複数ワークブックを並列にパースし、[(label, excel_data, cache_hit)] を返す
+
+    パース計画（読み込むシート一覧）は全ワークブックで共通の TARGET_SHEETS を使う。
+    openpyxl のパースは CPU バウンドなのでプロセス並列にする（1冊なら並列化しない）。
+    """
+    parse_plan = list(TARGET_SHEETS)
+    if len(workbooks) == 1:
+        label, path = workbooks[0]
+        excel_data, cache_hit = load_excel_data(path, use_cache, parse_plan)
+        return [(label, excel_data, cache_hit)]
+
+    max_workers = jobs or min(len(workbooks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(load_excel_data, path, use_cache, parse_plan)
+            for _, path in workbooks
+        ]
+        results = [future.result() for future in futures]
+    return [(label, excel_data, cache_hit)
+            for (label, _), (excel_data, cache_hit) in zip(workbooks, results)]
+
+
+def merge_excel_data(loaded):
+    """複数ワークブックの excel_data を1つに統合し、(merged, conflicts) を返す
+
+    同じ (シート, 回, 列) に値がある場合は後に指定したワークブックを優先し、
+    値が異なるものを conflicts に [(sheet, session, column, {label: value})] で記録する。
+    """
+    merged = {}
+    origin = {}
+    conflicts = []
+    for label, excel_data, _ in loaded:
+        for sheet_name, sheet_data in excel_data.items():
+            merged_sheet = merged.setdefault(sheet_name, {})
+            for session_num, row_data in sheet_data.items():
+                merged_row = merged_sheet.setdefault(session_num, {})
+                for column, value in row_data.items():
+                    key = (sheet_name, session_num, column)
+                    if column in merged_row and merged_row[column] != value:
+                        conflicts.append((sheet_name, session_num, column,
+                                          {origin[key]: merged_row[column], label: value}))
+                    merged_row[column] = value
+                    origin[key] = label
+    return merged, conflicts
+
+
+def content_type_rows():
+    """study_content_types の行を (grade, subject, course, db_content_name, display_order) で返す"""
+    rows = []
     for grade, subject, name, level, order, _, _ in CONTENT_DEFS:
-        courses = LEVEL_TO_COURSES[level]
-        for course in courses:
-            lines.append(
-                f"  ({grade}, v_{subject_var(subject)}, '{course}', "
-                f"'{sql_escape(name)}', {order})"
-            )
-    return lines
+        for course in LEVEL_TO_COURSES[level]:
+            rows.append((grade, subject, course, name, order))
+    return rows
+
 
+def content_type_id_rows():
+    """study_content_types の投入行（subject_id は subject_id_prelude() で読み込んだ変数）"""
+    return [
+        STUDY_CONTENT_TYPES.Row(grade, subject_var(subject), course, name, order)
+        for grade, subject, course, name, order in content_type_rows()
+    ]
+
+
+def content_type_def_rows():
+    """コース展開前の study_content_types 定義を (grade, subject, name, level, display_order) で返す（--expand-in-sql 用）"""
+    return [
+        (grade, subject, name, level, order)
+        for grade, subject, name, level, order, _, _ in CONTENT_DEFS
+    ]
 
-def generate_problem_counts_sql(excel_data):
-    """problem_counts の INSERT SQL を生成"""
-    lines = []
+
+def problem_count_level_rows(excel_data):
+    """コース展開前の problem_counts を (grade, subject, level, db_content_name, session_number, total_problems) で返す"""
+    rows = []
     for grade, subject, db_name, level, _, sheet_name, col_name in CONTENT_DEFS:
         sheet_data = excel_data.get(sheet_name, {})
-        courses = LEVEL_TO_COURSES[level]
         for session_num, row_data in sorted(sheet_data.items()):
             val = row_data.get(col_name)
             if val and val > 0:
-                for course in courses:
-                    lines.append(
-                        f"    (pg_temp.ct_id({grade}, v_{subject_var(subject)}, '{course}', "
-                        f"'{sql_escape(db_name)}'), "
-                        f"pg_temp.ss_id({grade}, {session_num}), {val})"
-                    )
-    return lines
+                rows.append((grade, subject, level, db_name, session_num, val))
+    return rows
+
+
+def problem_count_rows(excel_data):
+    """problem_counts の行を (grade, subject, course, db_content_name, session_number, total_problems) で返す"""
+    return [
+        (grade, subject, course, db_name, session_num, val)
+        for grade, subject, level, db_name, session_num, val in problem_count_level_rows(excel_data)
+        for course in LEVEL_TO_COURSES[level]
+    ]
+
+
+def level_courses_sql():
+    """LEVEL_TO_COURSES を SQL 側のコース展開表 (VALUES) として表す"""
+    pairs = ", ".join(
+        f"('{level}', '{course}')"
+        for level, courses in LEVEL_TO_COURSES.items()
+        for course in courses
+    )
+    return f"(VALUES {pairs}) AS lc(level, course)"
+
+
+# =============================================================================
+# スナップショット / 差分
+# =============================================================================
+
+def sheet_content_hash(sheet_data):
+    """シート1枚分のパース結果 {session: {column: value}} の内容ハッシュ"""
+    canonical = json.dumps(
+        [[session, sorted(row.items())] for session, row in sorted(sheet_data.items())],
+        ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def content_defs_hash():
+    """CONTENT_DEFS + LEVEL_TO_COURSES のハッシュ（定義変更の検出用）"""
+    canonical = json.dumps([CONTENT_DEFS, LEVEL_TO_COURSES], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def excel_cells(excel_data):
+    """excel_data を [sheet, session, column, value] の行に平坦化"""
+    return [
+        [sheet_name, session_num, column, value]
+        for sheet_name, sheet_data in excel_data.items()
+        for session_num, row_data in sorted(sheet_data.items())
+        for column, value in row_data.items()
+    ]
+
+
+def build_snapshot(excel_data):
+    """生成結果のスナップショットを作る
 
+    content types / problem counts（コース展開後）に加えて、シートごとの内容ハッシュと
+    excel_data そのもの (excel_cells) を保存し、次回はシート単位・セル単位で差分を取れるようにする。
+    """
+    return {
+        'version': SNAPSHOT_VERSION,
+        'content_defs_hash': content_defs_hash(),
+        'sheet_hashes': {name: sheet_content_hash(data) for name, data in excel_data.items()},
+        'content_types': [list(r) for r in content_type_rows()],
+        'problem_counts': [list(r) for r in problem_count_rows(excel_data)],
+        'excel_cells': excel_cells(excel_data),
+    }
 
-def subject_var(subject_name):
-    """科目名を変数名に変換"""
-    mapping = {'算数': 'math_id', '国語': 'japanese_id', '理科': 'science_id', '社会': 'social_id'}
-    return mapping[subject_name]
 
+def write_snapshot(snapshot, path=None):
+    """スナップショットを JSON で保存（1行1レコードで git diff しやすくする）"""
+    path = path or SNAPSHOT_PATH
+    out = ['{']
+    items = list(snapshot.items())
+    for i, (key, value) in enumerate(items):
+        comma = ',' if i < len(items) - 1 else ''
+        if isinstance(value, list):
+            out.append(f'  "{key}": [')
+            out.append(',\n'.join('    ' + json.dumps(r, ensure_ascii=False) for r in value))
+            out.append('  ]' + comma)
+        elif isinstance(value, dict):
+            out.append(f'  "{key}": {{')
+            out.append(',\n'.join(
+                f'    {json.dumps(k, ensure_ascii=False)}: {json.dumps(v, ensure_ascii=False)}'
+                for k, v in value.items()))
+            out.append('  }' + comma)
+        else:
+            out.append(f'  "{key}": {json.dumps(value, ensure_ascii=False)}{comma}')
+    out.append('}')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(out) + '\n')
 
-def sql_escape(s):
-    """SQLの文字列エスケープ"""
-    return s.replace("'", "''")
 
+def load_snapshot(path=None):
+    """前回生成時のスナップショットを読み込む（存在しなければ None）
 
-def main():
-    if not XLSX_PATH.exists():
-        print(f"Error: {XLSX_PATH} not found")
+    旧バージョン (sheet_hashes なし) も読めるが、その場合は行単位の全件比較になる。
+    """
+    path = path or SNAPSHOT_PATH
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version', 0) > SNAPSHOT_VERSION:
+        print(f"Error: snapshot version mismatch ({snapshot.get('version')} > {SNAPSHOT_VERSION}): {path}")
         sys.exit(1)
+    return snapshot
 
-    print(f"Reading {XLSX_PATH}...")
-    wb = openpyxl.load_workbook(str(XLSX_PATH), data_only=True)
-    excel_data = read_excel_data(wb)
 
-    # 統計
-    total_sessions = sum(len(v) for v in excel_data.values())
-    print(f"  Sheets: {len(excel_data)}")
-    print(f"  Total session-rows with data: {total_sessions}")
+def changed_sheets(old, new):
+    """内容ハッシュが変わったシート名の一覧（追加・削除されたシートを含む）"""
+    old_hashes = old.get('sheet_hashes', {})
+    new_hashes = new['sheet_hashes']
+    names = list(new_hashes) + [name for name in old_hashes if name not in new_hashes]
+    return [name for name in names if old_hashes.get(name) != new_hashes.get(name)]
+
+
+def diff_problem_count_cells(old, new, sheets):
+    """変更シート内のセル差分だけから problem_counts の (upsert, delete) を作る
+
+    CONTENT_DEFS / LEVEL_TO_COURSES が前回と同じ場合のみ有効（呼び出し側で確認する）。
+    """
+    sheets = set(sheets)
+    old_cells = {tuple(c[:3]): c[3] for c in old['excel_cells'] if c[0] in sheets}
+    new_cells = {tuple(c[:3]): c[3] for c in new['excel_cells'] if c[0] in sheets}
+    changed = {}
+    for key in list(new_cells) + [k for k in old_cells if k not in new_cells]:
+        if old_cells.get(key) != new_cells.get(key):
+            changed.setdefault(key[:1] + key[2:], []).append(key[1])  # (sheet, column) -> [session]
+
+    pc_upsert, pc_delete = [], []
+    for grade, subject, db_name, level, _, sheet_name, col_name in CONTENT_DEFS:
+        for session_num in sorted(changed.get((sheet_name, col_name), [])):
+            val = new_cells.get((sheet_name, session_num, col_name))
+            for course in LEVEL_TO_COURSES[level]:
+                key = (grade, subject, course, db_name, session_num)
+                if val:
+                    pc_upsert.append(key + (val,))
+                else:
+                    pc_delete.append(key)
+    return pc_upsert, pc_delete
+
+
+def diff_snapshots(old, new):
+    """2つのスナップショットの差分を返す
+
+    content types は (grade, subject, course, content_name) をキーに display_order を比較する。
+    problem counts は、定義が前回と同じならハッシュの変わったシートのセルだけを比較し、
+    それ以外は (grade, subject, course, content_name, session_number) をキーに全行を比較する。
+    削除される content type 配下の problem_counts は CASCADE で消えるため pc_delete には含めない。
+    """
+    old_ct = {tuple(r[:4]): r[4] for r in old['content_types']}
+    new_ct = {tuple(r[:4]): r[4] for r in new['content_types']}
+    ct_delete = [k for k in old_ct if k not in new_ct]
+    ct_insert = [k + (o,) for k, o in new_ct.items() if k not in old_ct]
+    ct_update = [k + (o,) for k, o in new_ct.items() if k in old_ct and old_ct[k] != o]
+
+    if 'excel_cells' in old and old.get('content_defs_hash') == new['content_defs_hash']:
+        pc_upsert, pc_delete = diff_problem_count_cells(old, new, changed_sheets(old, new))
+    else:
+        deleted_ct = set(ct_delete)
+        old_pc = {tuple(r[:5]): r[5] for r in old['problem_counts']}
+        new_pc = {tuple(r[:5]): r[5] for r in new['problem_counts']}
+        pc_delete = [k for k in old_pc if k not in new_pc and k[:4] not in deleted_ct]
+        pc_upsert = [k + (v,) for k, v in new_pc.items() if old_pc.get(k) != v]
+
+    return {
+        'ct_delete': ct_delete,
+        'ct_insert': ct_insert,
+        'ct_update': ct_update,
+        'pc_delete': pc_delete,
+        'pc_upsert': pc_upsert,
+    }
+
+
+# =============================================================================
+# SQL レンダリング
+# =============================================================================
+
+STUDY_CONTENT_TYPES = Table(
+    "public.study_content_types",
+    ("grade", "subject_id", "course", "content_name", "display_order"),
+    conflict=("grade", "subject_id", "course", "content_name"), update=(),
+)
 
-    # study_content_types 行数
-    ct_lines = generate_content_types_sql()
-    print(f"  study_content_types rows: {len(ct_lines)}")
+# problem_counts の自然キー（ID 解決前）を積む一時テーブル
+PC_SRC = Table("pc_src", (
+    "grade SMALLINT NOT NULL",
+    "subject_name TEXT NOT NULL",
+    "course course_level NOT NULL",
+    "content_name TEXT NOT NULL",
+    "session_number SMALLINT NOT NULL",
+    "total_problems SMALLINT NOT NULL",
+))
 
-    # problem_counts 行数
-    pc_lines = generate_problem_counts_sql(excel_data)
-    print(f"  problem_counts rows: {len(pc_lines)}")
+# 差分で削除する study_content_types の自然キー
+CT_DEL = Table("ct_del", (
+    "grade SMALLINT NOT NULL",
+    "subject_name TEXT NOT NULL",
+    "course course_level NOT NULL",
+    "content_name TEXT NOT NULL",
+))
+
+
+# ヘッダーに列挙する値の食い違いの上限（残りは件数だけ書く）
+MAX_CONFLICT_LINES = 20
+
+
+def conflict_header_lines(conflicts):
+    """ワークブック統合で後勝ちにしたセルをヘッダーのコメント行にする（なければ空）"""
+    if not conflicts:
+        return []
+    lines = [f"-- 統合時の値の食い違い: {len(conflicts)} 件（後に指定したワークブックの値を採用）"]
+    for sheet_name, session_num, column, values in conflicts[:MAX_CONFLICT_LINES]:
+        pairs = ", ".join(f"{label}={value}" for label, value in values.items())
+        lines.append(f"--   {sheet_name} 第{session_num}回 {column}: {pairs}")
+    if len(conflicts) > MAX_CONFLICT_LINES:
+        lines.append(f"--   … 他 {len(conflicts) - MAX_CONFLICT_LINES} 件")
+    lines.append("--")
+    return lines
+
+
+def render_problem_counts_block(pc_rows, by_level=False, batch_size=DEFAULT_BATCH_SIZE, copy=False):
+    """problem_counts の UPSERT ブロック（一時テーブル + 1回の JOIN で ID 解決）
+
+    pc_rows は problem_count_rows() の行。by_level=True の場合は problem_count_level_rows() の
+    コース展開前の行で、pc_src への投入時に SQL 側で展開する。
+    pc_src への投入は batch_size 行ごとに分割し、複数バッチになる場合は進捗を RAISE NOTICE する。
+    copy=True の場合は pc_src を DO ブロックの外で作り、COPY ... FROM stdin で読み込む
+    （psql で流す場合専用。by_level とは併用できない）。
+    """
+    if copy and by_level:
+        raise ValueError("copy と by_level は併用できません")
+
+    def progress(loaded):
+        return f"  RAISE NOTICE 'pc_src 読み込み: {loaded}/{len(pc_rows)} 行';"
 
-    # SQL 生成
+    sql = []
+    if copy:
+        sql.extend(create_temp_table(PC_SRC, indent="", on_commit_drop=False))
+        sql.extend(emit_insert(PC_SRC, pc_rows, target="copy", indent=""))
+        sql.append("ANALYZE pc_src;")
+        sql.append("")
+    sql.append("DO $$")
+    sql.append("DECLARE")
+    sql.append("  v_missing TEXT;")
+    sql.append("  v_count INTEGER;")
+    sql.append("BEGIN")
+    if by_level:
+        sql.extend(create_temp_table(PC_SRC))
+        sql.append("")
+        batches = list(batched(pc_rows, batch_size))
+        loaded = 0
+        for batch in batches:
+            sql.append(f"  INSERT INTO pc_src ({PC_SRC.column_list()})")
+            sql.append("  SELECT v.grade, v.subject_name, lc.course::course_level, v.content_name, v.session_number, v.total_problems")
+            sql.extend(values_from(batch, "v", ("grade", "subject_name", "level", "content_name",
+                                                "session_number", "total_problems")))
+            sql.append(f"  JOIN {level_courses_sql()} ON lc.level = v.level;")
+            loaded += len(batch)
+            if len(batches) > 1:
+                sql.append(progress(loaded))
+        sql.append("  ANALYZE pc_src;")
+        sql.append("")
+    elif not copy:
+        sql.extend(create_temp_table(PC_SRC))
+        sql.append("")
+        sql.extend(emit_insert(PC_SRC, pc_rows, batch_size=batch_size, progress=progress))
+        sql.append("  ANALYZE pc_src;")
+        sql.append("")
+    sql.append("  -- 解決できないキーがあれば中断（従来の ct_id / ss_id ヘルパーと同じ安全装置）")
+    sql.append("  SELECT string_agg(format('grade=%s %s %s %s session=%s',")
+    sql.append("           v.grade, v.subject_name, v.course, v.content_name, v.session_number), '; ')")
+    sql.append("  INTO v_missing")
+    sql.append("  FROM pc_src v")
+    sql.append("  LEFT JOIN public.subjects s ON s.name = v.subject_name")
+    sql.append("  LEFT JOIN public.study_content_types sct")
+    sql.append("    ON sct.grade = v.grade AND sct.subject_id = s.id")
+    sql.append("   AND sct.course = v.course AND sct.content_name = v.content_name")
+    sql.append("  LEFT JOIN public.study_sessions ss")
+    sql.append("    ON ss.grade = v.grade AND ss.session_number = v.session_number")
+    sql.append("  WHERE sct.id IS NULL OR ss.id IS NULL;")
+    sql.append("  IF v_missing IS NOT NULL THEN")
+    sql.append("    RAISE EXCEPTION 'problem_counts の参照先が見つかりません: %', v_missing;")
+    sql.append("  END IF;")
+    sql.append("")
+    sql.append("  INSERT INTO public.problem_counts (study_content_type_id, session_id, total_problems)")
+    sql.append("  SELECT sct.id, ss.id, v.total_problems")
+    sql.append("  FROM pc_src v")
+    sql.append("  JOIN public.subjects s ON s.name = v.subject_name")
+    sql.append("  JOIN public.study_content_types sct")
+    sql.append("    ON sct.grade = v.grade AND sct.subject_id = s.id")
+    sql.append("   AND sct.course = v.course AND sct.content_name = v.content_name")
+    sql.append("  JOIN public.study_sessions ss")
+    sql.append("    ON ss.grade = v.grade AND ss.session_number = v.session_number")
+    sql.append("  ON CONFLICT (study_content_type_id, session_id) DO UPDATE SET total_problems = EXCLUDED.total_problems;")
+    sql.append("  GET DIAGNOSTICS v_count = ROW_COUNT;")
+    sql.append("  RAISE NOTICE 'problem_counts 投入完了: % 件', v_count;")
+    sql.append("")
+    sql.append("END $$;")
+    sql.append("")
+    if copy:
+        sql.append("DROP TABLE pc_src;")
+        sql.append("")
+    return sql
+
+
+def render_full_sql(excel_data, expand_in_sql=False, label=XLSX_LABEL, sources=None,
+                    batch_size=DEFAULT_BATCH_SIZE, copy=False, conflicts=()):
+    """全面置換マイグレーション（study_content_types DELETE → INSERT + problem_counts 投入）
+
+    expand_in_sql=True の場合、各定義をレベル付きで1回だけ出力し、コース展開は SQL 側で行う。
+    label: ヘッダーの年度/カリキュラム表記, sources: ヘッダーに記載するワークブック名
+    copy: problem_counts の自然キーを COPY ... FROM stdin で読み込む（psql 専用。適用時間ベンチマーク用）
+    conflicts: merge_excel_data() が返した値の食い違い（ヘッダーに記録する）
+    """
+    title = f"{label}年度" if label.isdigit() else label
+    sources = sources or [XLSX_PATH.name]
+    ct_count = len(content_type_rows())
+    pc_rows = problem_count_rows(excel_data)
+    pc_count = len(pc_rows)
     sql = []
     sql.append("-- =============================================================================")
-    sql.append("-- 2026年度: study_content_types 全面置換 + problem_counts 投入")
+    sql.append(f"-- {title}: study_content_types 全面置換 + problem_counts 投入")
     sql.append("-- 作成日: 2026-02-06")
     sql.append("-- 生成元: scripts/generate-problem-counts-sql.py")
-    sql.append("-- ソース: 2026年四谷大塚DB.xlsx")
+    sql.append(f"-- ソース: {', '.join(sources)}")
     sql.append("--")
-    sql.append(f"-- study_content_types: {len(ct_lines)} 件")
-    sql.append(f"-- problem_counts: {len(pc_lines)} 件")
+    sql.append(f"-- study_content_types: {ct_count} 件")
+    sql.append(f"-- problem_counts: {pc_count} 件")
     sql.append("--")
+    sql.extend(conflict_header_lines(conflicts))
     sql.append("-- 注記:")
     sql.append("-- - study_content_types を DELETE → INSERT で全面置換")
     sql.append("-- - problem_counts は study_content_types への CASCADE で自動削除される")
@@ -215,16 +680,10 @@ def main():
     sql.append("")
     sql.append("DO $$")
     sql.append("DECLARE")
-    sql.append("  v_math_id BIGINT;")
-    sql.append("  v_japanese_id BIGINT;")
-    sql.append("  v_science_id BIGINT;")
-    sql.append("  v_social_id BIGINT;")
+    sql.extend(subject_id_declares())
     sql.append("BEGIN")
     sql.append("  -- 科目ID取得")
-    sql.append("  SELECT id INTO v_math_id FROM public.subjects WHERE name = '算数';")
-    sql.append("  SELECT id INTO v_japanese_id FROM public.subjects WHERE name = '国語';")
-    sql.append("  SELECT id INTO v_science_id FROM public.subjects WHERE name = '理科';")
-    sql.append("  SELECT id INTO v_social_id FROM public.subjects WHERE name = '社会';")
+    sql.extend(subject_id_prelude())
     sql.append("")
     sql.append("  -- =========================================================================")
     sql.append("  -- 1. 既存 study_content_types を削除（CASCADE で problem_counts も削除）")
@@ -233,57 +692,34 @@ def main():
     sql.append("  RAISE NOTICE 'study_content_types 削除完了';")
     sql.append("")
     sql.append("  -- =========================================================================")
-    sql.append("  -- 2. 2026年度 study_content_types を投入")
+    sql.append(f"  -- 2. {title} study_content_types を投入")
     sql.append("  -- =========================================================================")
-    sql.append("  INSERT INTO public.study_content_types (grade, subject_id, course, content_name, display_order) VALUES")
-    sql.append(",\n".join(ct_lines))
-    sql.append("  ON CONFLICT (grade, subject_id, course, content_name) DO NOTHING;")
-    sql.append(f"  RAISE NOTICE 'study_content_types 投入完了: {len(ct_lines)} 件';")
+    if expand_in_sql:
+        sql.append("  -- 定義はレベル付きで1回だけ記述し、コースへの展開は lc (LEVEL_TO_COURSES) との JOIN で行う")
+        sql.append(f"  INSERT INTO {STUDY_CONTENT_TYPES.name} ({STUDY_CONTENT_TYPES.column_list()})")
+        sql.append("  SELECT d.grade, s.id, lc.course::course_level, d.content_name, d.display_order")
+        sql.extend(values_from(content_type_def_rows(), "d",
+                               ("grade", "subject_name", "content_name", "level", "display_order")))
+        sql.append("  JOIN public.subjects s ON s.name = d.subject_name")
+        sql.append(f"  JOIN {level_courses_sql()} ON lc.level = d.level")
+        sql.append(f"  {STUDY_CONTENT_TYPES.on_conflict()};")
+    else:
+        sql.extend(emit_insert(STUDY_CONTENT_TYPES, content_type_id_rows(), target="upsert", row_indent="  "))
+    sql.append(f"  RAISE NOTICE 'study_content_types 投入完了: {ct_count} 件';")
     sql.append("")
     sql.append("END $$;")
     sql.append("")
     sql.append("-- =============================================================================")
     sql.append("-- 3. problem_counts 投入")
     sql.append("-- =============================================================================")
+    sql.append("-- 自然キー (grade, 科目名, course, content_name, session_number) を一時テーブルに積み、")
+    sql.append("-- study_content_types / study_sessions との 1 回の JOIN で ID を解決する（行ごとの関数呼び出しなし）")
     sql.append("")
-    sql.append("-- ヘルパー関数: study_content_type_id を取得")
-    sql.append("CREATE OR REPLACE FUNCTION pg_temp.ct_id(")
-    sql.append("  p_grade INTEGER, p_subject_id BIGINT, p_course course_level, p_name TEXT")
-    sql.append(") RETURNS BIGINT AS $fn$")
-    sql.append("  SELECT id FROM public.study_content_types")
-    sql.append("  WHERE grade = p_grade AND subject_id = p_subject_id")
-    sql.append("    AND course = p_course AND content_name = p_name;")
-    sql.append("$fn$ LANGUAGE SQL STABLE;")
-    sql.append("")
-    sql.append("-- ヘルパー関数: study_session_id を取得")
-    sql.append("CREATE OR REPLACE FUNCTION pg_temp.ss_id(")
-    sql.append("  p_grade INTEGER, p_session_number INTEGER")
-    sql.append(") RETURNS BIGINT AS $fn$")
-    sql.append("  SELECT id FROM public.study_sessions")
-    sql.append("  WHERE grade = p_grade AND session_number = p_session_number;")
-    sql.append("$fn$ LANGUAGE SQL STABLE;")
-    sql.append("")
-
-    # problem_counts を科目・学年ごとにグループ化して INSERT
-    sql.append("DO $$")
-    sql.append("DECLARE")
-    sql.append("  v_math_id BIGINT;")
-    sql.append("  v_japanese_id BIGINT;")
-    sql.append("  v_science_id BIGINT;")
-    sql.append("  v_social_id BIGINT;")
-    sql.append("BEGIN")
-    sql.append("  SELECT id INTO v_math_id FROM public.subjects WHERE name = '算数';")
-    sql.append("  SELECT id INTO v_japanese_id FROM public.subjects WHERE name = '国語';")
-    sql.append("  SELECT id INTO v_science_id FROM public.subjects WHERE name = '理科';")
-    sql.append("  SELECT id INTO v_social_id FROM public.subjects WHERE name = '社会';")
-    sql.append("")
-    sql.append("  INSERT INTO public.problem_counts (study_content_type_id, session_id, total_problems) VALUES")
-    sql.append(",\n".join(pc_lines))
-    sql.append("  ON CONFLICT (study_content_type_id, session_id) DO UPDATE SET total_problems = EXCLUDED.total_problems;")
-    sql.append(f"  RAISE NOTICE 'problem_counts 投入完了: {len(pc_lines)} 件';")
-    sql.append("")
-    sql.append("END $$;")
-    sql.append("")
+    if expand_in_sql:
+        sql.extend(render_problem_counts_block(problem_count_level_rows(excel_data), by_level=True,
+                                               batch_size=batch_size))
+    else:
+        sql.extend(render_problem_counts_block(pc_rows, batch_size=batch_size, copy=copy))
     sql.append("-- =============================================================================")
     sql.append("-- 検証クエリ（実行後に確認用）")
     sql.append("-- =============================================================================")
@@ -292,13 +728,325 @@ def main():
     sql.append("--   JOIN study_content_types sct ON pc.study_content_type_id = sct.id")
     sql.append("--   JOIN subjects s ON sct.subject_id = s.id")
     sql.append("--   GROUP BY s.name, sct.grade ORDER BY sct.grade, s.name;")
+    sql.append("-- SELECT grade, course, sum(total_problems) FROM problem_count_totals GROUP BY grade, course ORDER BY grade, course;")
+
+    return sql
+
+
+def render_delta_sql(delta, batch_size=DEFAULT_BATCH_SIZE):
+    """差分マイグレーション（変更のあった行だけ INSERT / UPDATE / DELETE）"""
+    ct_order_columns = ("grade", "subject_name", "course", "content_name", "display_order")
+
+    sql = []
+    sql.append("-- =============================================================================")
+    sql.append("-- study_content_types / problem_counts 差分マイグレーション")
+    sql.append("-- 生成元: scripts/generate-problem-counts-sql.py --delta")
+    sql.append(f"-- 比較元: {SNAPSHOT_PATH.relative_to(SNAPSHOT_PATH.parents[2])}")
+    sql.append("--")
+    sql.append(f"-- study_content_types: +{len(delta['ct_insert'])} 件 / ~{len(delta['ct_update'])} 件 / -{len(delta['ct_delete'])} 件")
+    sql.append(f"-- problem_counts: upsert {len(delta['pc_upsert'])} 件 / delete {len(delta['pc_delete'])} 件")
+    sql.append("--")
+    sql.append("-- 注記:")
+    sql.append("-- - 変更のない行には触れない（全件 DELETE → 再投入は行わない）")
+    sql.append("-- - 削除対象の study_content_types に study_logs がある場合は中断する（安全装置）")
+    sql.append("-- =============================================================================")
+    sql.append("")
+
+    if delta['ct_delete'] or delta['ct_insert'] or delta['ct_update'] or delta['pc_delete']:
+        sql.append("DO $$")
+        sql.append("DECLARE")
+        sql.append("  v_log_count BIGINT;")
+        sql.append("  v_count INTEGER;")
+        sql.append("BEGIN")
+        if delta['ct_delete']:
+            sql.append("  -- =========================================================================")
+            sql.append("  -- 1. 不要になった study_content_types を削除（CASCADE で problem_counts も削除）")
+            sql.append("  -- =========================================================================")
+            sql.extend(create_temp_table(CT_DEL))
+            sql.extend(emit_insert(CT_DEL, delta['ct_delete']))
+            sql.append("")
+            sql.append("  SELECT count(*) INTO v_log_count")
+            sql.append("  FROM public.study_logs sl")
+            sql.append("  JOIN public.study_content_types sct ON sct.id = sl.study_content_type_id")
+            sql.append("  JOIN public.subjects s ON s.id = sct.subject_id")
+            sql.append("  JOIN ct_del d")
+            sql.append("    ON d.grade = sct.grade AND d.subject_name = s.name")
+            sql.append("   AND d.course = sct.course AND d.content_name = sct.content_name;")
+            sql.append("  IF v_log_count > 0 THEN")
+            sql.append("    RAISE EXCEPTION '削除対象の study_content_types を参照する study_logs が % 件あります（中断）', v_log_count;")
+            sql.append("  END IF;")
+            sql.append("")
+            sql.append("  DELETE FROM public.study_content_types sct")
+            sql.append("  USING public.subjects s, ct_del d")
+            sql.append("  WHERE s.id = sct.subject_id")
+            sql.append("    AND d.grade = sct.grade AND d.subject_name = s.name")
+            sql.append("    AND d.course = sct.course AND d.content_name = sct.content_name;")
+            sql.append("  GET DIAGNOSTICS v_count = ROW_COUNT;")
+            sql.append("  RAISE NOTICE 'study_content_types 削除: % 件', v_count;")
+            sql.append("")
+        if delta['ct_insert']:
+            sql.append("  -- =========================================================================")
+            sql.append("  -- 2. 新規 study_content_types を追加")
+            sql.append("  -- =========================================================================")
+            sql.append("  INSERT INTO public.study_content_types (grade, subject_id, course, content_name, display_order)")
+            sql.append("  SELECT v.grade, s.id, v.course::course_level, v.content_name, v.display_order")
+            sql.extend(values_from(delta['ct_insert'], "v", ct_order_columns))
+            sql.append("  JOIN public.subjects s ON s.name = v.subject_name")
+            sql.append("  ON CONFLICT (grade, subject_id, course, content_name) DO UPDATE SET display_order = EXCLUDED.display_order;")
+            sql.append("  GET DIAGNOSTICS v_count = ROW_COUNT;")
+            sql.append("  RAISE NOTICE 'study_content_types 追加: % 件', v_count;")
+            sql.append("")
+        if delta['ct_update']:
+            sql.append("  -- =========================================================================")
+            sql.append("  -- 3. display_order が変わった study_content_types を更新")
+            sql.append("  -- =========================================================================")
+            sql.append("  UPDATE public.study_content_types sct")
+            sql.append("  SET display_order = v.display_order")
+            sql.extend(values_from(delta['ct_update'], "v", ct_order_columns))
+            sql.append("  JOIN public.subjects s ON s.name = v.subject_name")
+            sql.append("  WHERE sct.subject_id = s.id AND sct.grade = v.grade")
+            sql.append("    AND sct.course = v.course::course_level AND sct.content_name = v.content_name;")
+            sql.append("  GET DIAGNOSTICS v_count = ROW_COUNT;")
+            sql.append("  RAISE NOTICE 'study_content_types 更新: % 件', v_count;")
+            sql.append("")
+        if delta['pc_delete']:
+            sql.append("  -- =========================================================================")
+            sql.append("  -- 4. Excel から消えた problem_counts を削除")
+            sql.append("  -- =========================================================================")
+            sql.append("  DELETE FROM public.problem_counts pc")
+            sql.extend(values_from(delta['pc_delete'], "v",
+                                   ("grade", "subject_name", "course", "content_name", "session_number"),
+                                   keyword="USING", suffix=","))
+            sql.append("    public.subjects s, public.study_content_types sct, public.study_sessions ss")
+            sql.append("  WHERE s.name = v.subject_name")
+            sql.append("    AND sct.subject_id = s.id AND sct.grade = v.grade")
+            sql.append("    AND sct.course = v.course::course_level AND sct.content_name = v.content_name")
+            sql.append("    AND ss.grade = v.grade AND ss.session_number = v.session_number")
+            sql.append("    AND pc.study_content_type_id = sct.id AND pc.session_id = ss.id;")
+            sql.append("  GET DIAGNOSTICS v_count = ROW_COUNT;")
+            sql.append("  RAISE NOTICE 'problem_counts 削除: % 件', v_count;")
+            sql.append("")
+        sql.append("END $$;")
+        sql.append("")
+
+    if delta['pc_upsert']:
+        sql.append("-- =============================================================================")
+        sql.append("-- 5. 追加・変更された problem_counts を UPSERT")
+        sql.append("-- =============================================================================")
+        sql.append("")
+        sql.extend(render_problem_counts_block(delta['pc_upsert'], batch_size=batch_size))
+    return sql
+
+
+# =============================================================================
+# アプリ用ルックアップ (--lookup)
+# =============================================================================
+
+def lookup_entries(excel_data):
+    """ルックアップの行を (grade, subject, content_name, courses, counts) で返す（キー順）
+
+    counts[i] は第 i+1 回の問題数（0 = 登録なし）。末尾の 0 は省く。
+    courses はその学習内容が存在するコースを連結した文字列（例: 'BCS'）。
+    """
+    counts = {}
+    for grade, subject, level, db_name, session_num, val in problem_count_level_rows(excel_data):
+        counts.setdefault((grade, subject, db_name), {})[session_num] = val
+    entries = []
+    for grade, subject, db_name, level, _, _, _ in CONTENT_DEFS:
+        by_session = counts.get((grade, subject, db_name), {})
+        last = max(by_session, default=0)
+        entries.append((grade, subject, db_name, ''.join(LEVEL_TO_COURSES[level]),
+                        [by_session.get(n, 0) for n in range(1, last + 1)]))
+    return sorted(entries)
+
+
+def render_lookup_ts(excel_data, label=XLSX_LABEL, sources=None):
+    """問題数ルックアップの TypeScript モジュール（出力はデータが同じならバイト単位で同一）"""
+    sources = sources or [XLSX_PATH.name]
+    entries = lookup_entries(excel_data)
+    canonical = json.dumps(entries, ensure_ascii=False, separators=(',', ':'))
+    version = f"{label}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]}"
+    ts = []
+    ts.append("/**")
+    ts.append(" * 問題数ルックアップ（自動生成 — 手で編集しないこと）")
+    ts.append(" *")
+    ts.append(" * 生成元: scripts/generate-problem-counts-sql.py --lookup")
+    ts.append(f" * ソース: {', '.join(sources)}")
+    ts.append(" *")
+    ts.append(" * problem_counts と同じデータを (学年, 科目名, 学習内容名) ごとの回別配列で持つ。")
+    ts.append(" * 年度内は変わらないため、学習記録フォームは DB を問い合わせずに問題数を引ける。")
+    ts.append(" */")
+    ts.append("")
+    ts.append("/** ルックアップのバージョン（年度ラベル:内容ハッシュ）。DB 側と突き合わせる場合に使う */")
+    ts.append(f'export const PROBLEM_COUNTS_VERSION = "{version}"')
+    ts.append("")
+    ts.append("/** [学年, 科目名, 学習内容名, 対象コース, 回別問題数（index 0 = 第1回, 0 = 登録なし）] */")
+    ts.append("type ProblemCountEntry = readonly [number, string, string, string, readonly number[]]")
+    ts.append("")
+    ts.append("const ENTRIES: readonly ProblemCountEntry[] = [")
+    for grade, subject, name, courses, values in entries:
+        ts.append(f"  [{grade}, {json.dumps(subject, ensure_ascii=False)}, {json.dumps(name, ensure_ascii=False)}, "
+                  f"\"{courses}\", [{', '.join(str(v) for v in values)}]],")
+    ts.append("]")
+    ts.append("")
+    ts.append("const INDEX = new Map<string, ProblemCountEntry>(")
+    ts.append("  ENTRIES.map((entry) => [`${entry[0]}|${entry[1]}|${entry[2]}`, entry] as const),")
+    ts.append(")")
+    ts.append("")
+    ts.append("/**")
+    ts.append(" * 問題数を取得する（該当なし・対象外コース・登録のない回は 0）")
+    ts.append(" *")
+    ts.append(" * @param grade - 学年 (5 or 6)")
+    ts.append(" * @param course - コースレベル ('A' | 'B' | 'C' | 'S')")
+    ts.append(" * @param subjectName - 科目名（例: '算数'）")
+    ts.append(" * @param contentName - study_content_types.content_name")
+    ts.append(" * @param sessionNumber - study_sessions.session_number")
+    ts.append(" */")
+    ts.append("export function getProblemCount(")
+    ts.append("  grade: number,")
+    ts.append('  course: "A" | "B" | "C" | "S",')
+    ts.append("  subjectName: string,")
+    ts.append("  contentName: string,")
+    ts.append("  sessionNumber: number,")
+    ts.append("): number {")
+    ts.append("  const entry = INDEX.get(`${grade}|${subjectName}|${contentName}`)")
+    ts.append("  if (!entry || !entry[3].includes(course)) return 0")
+    ts.append("  return entry[4][sessionNumber - 1] ?? 0")
+    ts.append("}")
+    return ts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="study_content_types + problem_counts マイグレーションSQL生成")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="パース結果キャッシュを使わずに Excel を読み直す")
+    parser.add_argument('--delta', action='store_true',
+                        help="前回スナップショットとの差分だけを含むマイグレーションを生成する")
+    parser.add_argument('--output', type=Path,
+                        help="出力先 (既定: 全面置換は OUTPUT_PATH, --delta は既存より後のバージョンの新規マイグレーション)")
+    parser.add_argument('--snapshot-only', action='store_true',
+                        help="SQL を書かずにスナップショットだけ更新する（差分運用の初期化用）")
+    parser.add_argument('--update-snapshot', action='store_true',
+                        help="--output を指定してもスナップショットを更新する（既定では既定の出力先に書いたときだけ更新）")
+    parser.add_argument('--expand-in-sql', action='store_true',
+                        help="コース展開を SQL 側 (LEVEL_TO_COURSES の VALUES 表との JOIN) で行い、出力を縮小する")
+    parser.add_argument('--workbook', action='append', metavar='LABEL=PATH',
+                        help="読み込むワークブック（複数指定可。例: 2027=~/Downloads/2027年四谷大塚DB.xlsx）")
+    parser.add_argument('--allow-overlap', action='store_true',
+                        help="複数の --workbook を1つの problem_counts に統合する（年度の次元がないため、同じセルは後に指定したほうで上書きされる）")
+    parser.add_argument('--jobs', type=int, help="ワークブックの並列パース数 (既定: CPU 数)")
+    parser.add_argument('--no-ledger', action='store_true',
+                        help="seed_ledger によるスキップ判定・記録を埋め込まない（シード名は出力ファイル名）")
+    parser.add_argument('--lookup', type=Path, nargs='?', const=LOOKUP_PATH,
+                        help=f"アプリ用の問題数ルックアップ (TypeScript) も書き出す (既定: {LOOKUP_PATH.relative_to(LOOKUP_PATH.parents[2])})")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"複数行 INSERT 1文あたりの最大行数 (既定: {DEFAULT_BATCH_SIZE}, 0 = 分割しない)")
+    args = parser.parse_args(argv)
+    if args.expand_in_sql and args.delta:
+        parser.error("--expand-in-sql は全面置換モードでのみ使用できます")
+    if args.workbook and len(args.workbook) > 1 and not args.allow_overlap:
+        parser.error("複数の --workbook は年度の区別なく1つの problem_counts に統合され、同じセルは後に指定したほうで"
+                     "上書きされます。統合してよい場合だけ --allow-overlap を付けてください")
+    return args
+
+
+def next_migration_path(directory, name, today=None):
+    """既存のマイグレーションより後のバージョンで directory/{version}_{name}.sql を返す
+
+    バージョンは「今日の日付 + 000000」と既存の最大バージョンの大きいほうに 1 を足したもの。
+    同じ日に生成した他のマイグレーション（全面置換・別の差分）とは連番で衝突せず、
+    日付が既存より前でも適用順が逆転しない。
+    """
+    versions = [int(f"{today or date.today():%Y%m%d}000000")]
+    for path in directory.glob("*_*.sql"):
+        version = path.name.split('_', 1)[0]
+        if version.isdigit():
+            versions.append(int(version))
+    return directory / f"{max(versions) + 1}_{name}.sql"
+
+
+def write_sql(path, sql, ledger=True):
+    """SQL を書き出す。ledger=True なら出力ファイル名をシード名として seed_ledger のチェックを埋め込む"""
+    text = with_ledger(sql, path.stem) if ledger else '\n'.join(sql)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workbooks = parse_workbook_specs(args.workbook) if args.workbook else [(XLSX_LABEL, XLSX_PATH)]
+    for _, path in workbooks:
+        if not path.exists():
+            print(f"Error: {path} not found")
+            sys.exit(1)
+
+    for _, path in workbooks:
+        print(f"Reading {path}...")
+    loaded = load_workbooks(workbooks, use_cache=not args.no_cache, jobs=args.jobs)
+    for label, data, cache_hit in loaded:
+        hit = " (cache hit: Excel のパースをスキップ)" if cache_hit else ""
+        print(f"  [{label}] Sheets: {len(data)}, session-rows: {sum(len(v) for v in data.values())}{hit}")
+
+    excel_data, conflicts = merge_excel_data(loaded)
+    for sheet_name, session_num, column, values in conflicts:
+        print(f"  WARNING: 値の不一致 {sheet_name} 第{session_num}回 {column}: {values}（後勝ち）", file=sys.stderr)
+    if conflicts:
+        print(f"WARNING: {len(conflicts)} セルを後に指定したワークブックの値で上書きしました"
+              "（problem_counts に年度の次元はない。生成 SQL のヘッダーにも記録する）", file=sys.stderr)
+    # ヘッダー・ルックアップの年度表記（--workbook 未指定なら XLSX_LABEL）
+    label = '+'.join(label for label, _ in workbooks)
+    sources = [path.name for _, path in workbooks]
+
+    # 統計
+    total_sessions = sum(len(v) for v in excel_data.values())
+    print(f"  Sheets: {len(excel_data)}")
+    print(f"  Total session-rows with data: {total_sessions}")
+
+    snapshot = build_snapshot(excel_data)
+    print(f"  study_content_types rows: {len(snapshot['content_types'])}")
+    print(f"  problem_counts rows: {len(snapshot['problem_counts'])}")
+
+    if args.snapshot_only:
+        write_snapshot(snapshot)
+        print(f"\nSnapshot: {SNAPSHOT_PATH}")
+        print("Done!")
+        return
 
-    # ファイル出力
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(sql) + '\n')
+    if args.delta:
+        previous = load_snapshot()
+        if previous is None:
+            print(f"Error: {SNAPSHOT_PATH} not found (--snapshot-only で初期化してください)")
+            sys.exit(1)
+        if 'sheet_hashes' in previous:
+            sheets = changed_sheets(previous, snapshot)
+            print(f"  変更シート: {', '.join(sheets) if sheets else 'なし'}")
+        delta = diff_snapshots(previous, snapshot)
+        for key, rows in delta.items():
+            print(f"  {key}: {len(rows)}")
+        if not any(delta.values()):
+            print("\n差分なし: マイグレーションは生成しません")
+            return
+        output_path = args.output or next_migration_path(DELTA_OUTPUT_DIR, "delta_content_types_and_problem_counts")
+        write_sql(output_path, render_delta_sql(delta, batch_size=args.batch_size),
+                  ledger=not args.no_ledger)
+    else:
+        output_path = args.output or OUTPUT_PATH
+        write_sql(output_path, render_full_sql(excel_data, expand_in_sql=args.expand_in_sql,
+                                               label=label, sources=sources,
+                                               batch_size=args.batch_size, conflicts=conflicts),
+                  ledger=not args.no_ledger)
 
-    print(f"\nGenerated: {OUTPUT_PATH}")
+    print(f"\nGenerated: {output_path}")
+    if args.lookup:
+        write_sql(args.lookup, render_lookup_ts(excel_data, label=label, sources=sources), ledger=False)
+        print(f"Lookup: {args.lookup}")
+    # 試し生成（--output で既定以外に書いた場合）で差分の基準を動かさない
+    if args.output is None or args.update_snapshot:
+        write_snapshot(snapshot)
+        print(f"Snapshot: {SNAPSHOT_PATH}")
+    else:
+        print("Snapshot: 更新しない（--output 指定。基準を進めるなら --update-snapshot）")
     print("Done!")
 
 
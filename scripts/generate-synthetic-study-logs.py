@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+負荷試験用 学習ログ (study_logs) 生成スクリプト
+
+generate-problem-counts-sql.py と同じワークブック・CONTENT_DEFS・LEVEL_TO_COURSES から
+「その学年・コース・回で実際に選べる学習内容と問題数」を組み立て、合成生徒 N 人分の
+1年度ぶんの学習ログを COPY ファイルとして書き出す。行は生成した順にファイルへ流すので
+生徒数を増やしてもメモリ使用量は一定。
+
+- 学習内容は生徒のコースで利用可能なもの（LEVEL_TO_COURSES）かつ その回の問題数が 1 以上のものだけ
+- total_problems はその回の問題数、correct_count は生徒×科目の正答率による二項分布（必ず問題数以下）
+- 学習日は回の期間内（回の開始日からの日数で持ち、投入時に study_sessions の期間へ丸める）
+- 同じ日に保存したログは同じ batch_id を持つ
+
+Usage:
+  python3 scripts/generate-synthetic-study-logs.py --output-dir /tmp/study-logs
+  python3 scripts/generate-synthetic-study-logs.py --output-dir /tmp/study-logs --students 3000 --xlsx /tmp/synthetic.xlsx
+  psql "$DSN" -f /tmp/study-logs/load.sql
+
+Output (--output-dir):
+  students.copy    合成生徒（login_id = loadtest_NNNNNN、generate-synthetic-submissions.py と共通）
+  study_logs.copy  学習ログ（学年・科目・学習内容名・回の自然キー）
+  load.sql         ID 解決して投入する psql スクリプト
+
+前提: 同じワークブックから生成した problem_counts 投入済みのローカル DB。
+  DB の問題数がワークブックと異なる行（総合回の手修正など）は DB の問題数に合わせて正答数を比例配分する。
+"""
+
+import argparse
+import random
+import sys
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import load_script  # noqa: E402
+from seedgen.copyfile import CopyWriter  # noqa: E402
+from seedgen.loadtest import LOGIN_PREFIX, STUDENT_COLUMNS, students_load_lines, synthetic_students  # noqa: E402
+
+problem_counts = load_script('generate-problem-counts-sql')
+
+LOG_COLUMNS = (
+    'student_no', 'grade', 'subject', 'content_name', 'session_number',
+    'day_offset', 'logged_seconds', 'correct_count', 'total_problems', 'batch_id',
+)
+
+SUBJECTS = ('算数', '国語', '理科', '社会')
+
+# 学習を記録する時間帯（JST、その日の 0:00 からの秒数）: 16:00〜22:30
+LOG_WINDOW = (16 * 3600, 22 * 3600 + 1800)
+
+# ============================================================================
+# 学習内容カタログ
+# ============================================================================
+
+def content_catalog(excel_data):
+    """{(grade, session_number): [(subject, level, db_content_name, total_problems)]} を返す
+
+    problem_count_level_rows() と同じく CONTENT_DEFS の順。問題数 0 / 空欄の学習内容は含まれない。
+    """
+    catalog = {}
+    for grade, subject, level, db_name, session_num, val in problem_counts.problem_count_level_rows(excel_data):
+        catalog.setdefault((grade, session_num), []).append((subject, level, db_name, val))
+    return catalog
+
+
+def available_contents(contents, course):
+    """コース course で選べる学習内容だけに絞る"""
+    return [c for c in contents if course in problem_counts.LEVEL_TO_COURSES[c[1]]]
+
+
+# ============================================================================
+# 生成
+# ============================================================================
+
+def binomial(n, p, rng):
+    return sum(1 for _ in range(n) if rng.random() < p)
+
+
+def generate(out_dir, catalog, args):
+    """COPY ファイルを書き出し、(生徒 writer, 学習ログ writer) を返す"""
+    rng = random.Random(args.seed)
+    grades = tuple(sorted({grade for grade, _ in catalog}))
+    sessions_by_grade = {
+        grade: sorted(session_num for g, session_num in catalog if g == grade)
+        for grade in grades
+    }
+
+    with CopyWriter(out_dir / 'students.copy', STUDENT_COLUMNS) as students, \
+         CopyWriter(out_dir / 'study_logs.copy', LOG_COLUMNS) as logs:
+        for student in synthetic_students(args.students, rng, grades):
+            students.write(*student)
+            student_no, grade, course = student[0], student[3], student[4]
+            mean = args.accuracy
+            ability = {
+                subject: rng.betavariate(mean * args.spread, (1 - mean) * args.spread)
+                for subject in SUBJECTS
+            }
+            diligence = min(max(rng.gauss(args.session_rate, 0.1), 0.05), 1.0)
+
+            for session_num in sessions_by_grade[grade]:
+                if rng.random() >= diligence:
+                    continue
+                contents = available_contents(catalog[(grade, session_num)], course)
+                write_session_logs(logs, student_no, grade, session_num, contents, ability, args, rng)
+
+    return students, logs
+
+
+def write_session_logs(logs, student_no, grade, session_num, contents, ability, args, rng):
+    """1生徒×1回ぶんの学習ログを書き出す
+
+    取り組む学習内容を --content-rate で選び、1〜3 日に振り分けて保存する（同じ日の保存は同じ batch_id）。
+    --repeat-rate の確率で同じ学習内容を別の日にもう一度記録する（解き直し）。
+    """
+    chosen = [c for c in contents if rng.random() < args.content_rate]
+    if not chosen:
+        return
+    days = sorted(rng.sample(range(7), rng.randint(1, 3)))
+    by_day = {day: [] for day in days}
+    for content in chosen:
+        day = rng.choice(days)
+        by_day[day].append((content, 0.0))
+        later = [d for d in days if d > day]
+        if later and rng.random() < args.repeat_rate:
+            by_day[rng.choice(later)].append((content, args.retry_gain))
+
+    for day in days:
+        if not by_day[day]:
+            continue
+        batch_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+        logged = rng.randrange(*LOG_WINDOW)
+        for (subject, _, db_name, total), gain in by_day[day]:
+            p = min(ability[subject] + gain, 0.99)
+            logs.write(student_no, grade, subject, db_name, session_num, day, logged,
+                       binomial(total, p, rng), total, batch_id)
+
+
+def render_load_sql(students, logs):
+    """COPY ファイルを一時テーブルに読み込み、自然キーで ID を解決して study_logs に投入する psql スクリプト"""
+    lines = [
+        "-- ============================================================================",
+        "-- 負荷試験用 学習ログ投入",
+        "-- ============================================================================",
+        "-- 生成元: scripts/generate-synthetic-study-logs.py",
+        f"-- 件数: 生徒 {students.rows} / study_logs {logs.rows}",
+        "-- 実行: psql \"$DSN\" -f load.sql（ローカル DB 専用。本番では実行しないこと）",
+        "",
+        "\\set ON_ERROR_STOP on",
+        "BEGIN;",
+        "",
+    ]
+    lines += students_load_lines(students)
+    lines += [
+        "-- 合成生徒の既存の学習ログを削除し、連続学習日数（streak）を初期化する",
+        "-- （trigger_update_student_streak は学習日順に投入されることを前提に streak を積み上げる）",
+        "DELETE FROM public.study_logs",
+        "WHERE student_id IN (SELECT student_id FROM loadtest_students);",
+        "UPDATE public.students",
+        "SET last_study_date = NULL, current_streak = 0, max_streak = 0",
+        "WHERE id IN (SELECT student_id FROM loadtest_students);",
+        "",
+        "CREATE TEMP TABLE stg_study_logs (",
+        "  student_no     INTEGER NOT NULL,",
+        "  grade          SMALLINT NOT NULL,",
+        "  subject        VARCHAR(20) NOT NULL,",
+        "  content_name   VARCHAR(100) NOT NULL,",
+        "  session_number SMALLINT NOT NULL,",
+        "  day_offset     SMALLINT NOT NULL,",
+        "  logged_seconds INTEGER NOT NULL,",
+        "  correct_count  SMALLINT NOT NULL,",
+        "  total_problems SMALLINT NOT NULL,",
+        "  batch_id       UUID NOT NULL",
+        ") ON COMMIT DROP;",
+        logs.copy_command('stg_study_logs'),
+        "",
+        "-- (学年, 科目, コース, 学習内容名, 回) → study_content_types.id / study_sessions.id / DB の問題数",
+        "CREATE TEMP TABLE stg_resolved ON COMMIT DROP AS",
+        "SELECT st.student_id, ss.id AS session_id, sub.id AS subject_id, ct.id AS study_content_type_id,",
+        "       a.correct_count, a.total_problems, pc.total_problems AS db_total_problems, a.batch_id,",
+        "       LEAST(ss.start_date + a.day_offset, ss.end_date) AS study_date, a.logged_seconds",
+        "FROM stg_study_logs a",
+        "JOIN loadtest_students st USING (student_no)",
+        "JOIN public.subjects sub ON sub.name = a.subject",
+        "JOIN public.study_sessions ss ON ss.grade = a.grade AND ss.session_number = a.session_number",
+        "LEFT JOIN public.study_content_types ct",
+        "  ON ct.grade = a.grade AND ct.subject_id = sub.id AND ct.course = st.course AND ct.content_name = a.content_name",
+        "LEFT JOIN public.problem_counts pc ON pc.study_content_type_id = ct.id AND pc.session_id = ss.id;",
+        "",
+        "DO $$",
+        "DECLARE",
+        "  v_staged     BIGINT;",
+        "  v_resolved   BIGINT;",
+        "  v_unmatched  BIGINT;",
+        "  v_rescaled   BIGINT;",
+        "BEGIN",
+        "  SELECT count(*) INTO v_staged FROM stg_study_logs;",
+        "  SELECT count(*), count(*) FILTER (WHERE db_total_problems IS NULL),",
+        "         count(*) FILTER (WHERE db_total_problems <> total_problems)",
+        "  INTO v_resolved, v_unmatched, v_rescaled",
+        "  FROM stg_resolved;",
+        "  IF v_resolved <> v_staged OR v_unmatched > 0 THEN",
+        "    RAISE EXCEPTION '学習内容・問題数が解決できない行があります: % / %（ワークブックと DB の problem_counts を揃えてください）',",
+        "      v_unmatched + v_staged - v_resolved, v_staged;",
+        "  END IF;",
+        "  IF v_rescaled > 0 THEN",
+        "    RAISE NOTICE 'DB の問題数に合わせて正答数を比例配分: % 行', v_rescaled;",
+        "  END IF;",
+        "END $$;",
+        "",
+        "-- 学習日順に投入する（streak トリガーが日付の昇順を前提にしているため）",
+        "INSERT INTO public.study_logs",
+        "  (student_id, session_id, subject_id, study_content_type_id, correct_count, total_problems,",
+        "   study_date, logged_at, created_at, updated_at, batch_id)",
+        "SELECT r.student_id, r.session_id, r.subject_id, r.study_content_type_id,",
+        "       CASE WHEN r.db_total_problems = r.total_problems THEN r.correct_count",
+        "            ELSE round(r.correct_count * r.db_total_problems::numeric / r.total_problems) END,",
+        "       r.db_total_problems, r.study_date, t.logged_at, t.logged_at, t.logged_at, r.batch_id",
+        "FROM stg_resolved r",
+        "CROSS JOIN LATERAL (",
+        "  SELECT r.study_date::timestamp AT TIME ZONE 'Asia/Tokyo' + make_interval(secs => r.logged_seconds) AS logged_at",
+        ") t",
+        "ORDER BY r.student_id, r.study_date, t.logged_at",
+        "ON CONFLICT ON CONSTRAINT study_logs_unique_per_date DO NOTHING;",
+        "",
+        "COMMIT;",
+        "",
+        "ANALYZE public.study_logs;",
+        "",
+        "-- 削除: DELETE FROM public.study_logs WHERE student_id IN",
+        f"--   (SELECT id FROM public.students WHERE login_id LIKE '{LOGIN_PREFIX}%');",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+# ============================================================================
+# メイン
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="負荷試験用 学習ログ生成（COPY 形式）")
+    parser.add_argument('--output-dir', type=Path, required=True, help="COPY ファイルと load.sql の出力先")
+    parser.add_argument('--xlsx', type=Path, default=problem_counts.XLSX_PATH,
+                        help=f"問題数ワークブック (既定: {problem_counts.XLSX_PATH})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="パース結果キャッシュを使わずに Excel を読み直す")
+    parser.add_argument('--students', type=int, default=1000, help="合成生徒数（小5・小6 に交互に割り当て）")
+    parser.add_argument('--session-rate', type=float, default=0.85, help="各回に学習を記録する平均確率")
+    parser.add_argument('--content-rate', type=float, default=0.7, help="その回の各学習内容に取り組む確率")
+    parser.add_argument('--repeat-rate', type=float, default=0.1, help="同じ学習内容を別の日に解き直す確率")
+    parser.add_argument('--accuracy', type=float, default=0.7, help="生徒の平均正答率")
+    parser.add_argument('--spread', type=float, default=8.0,
+                        help="正答率分布の集中度（Beta 分布の a+b。小さいほど生徒間のばらつきが大きい）")
+    parser.add_argument('--retry-gain', type=float, default=0.1, help="解き直し時の正答率の上昇")
+    parser.add_argument('--seed', type=int, default=2026, help="乱数シード（同じ値なら同じ内容）")
+    args = parser.parse_args(argv)
+    if not 0 < args.accuracy < 1:
+        parser.error("--accuracy は 0 より大きく 1 より小さい値で指定してください")
+    if args.students < 1:
+        parser.error("--students は 1 以上で指定してください")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.xlsx.exists():
+        print(f"Error: {args.xlsx} not found")
+        sys.exit(1)
+
+    excel_data, cache_hit = problem_counts.load_excel_data(args.xlsx, use_cache=not args.no_cache)
+    catalog = content_catalog(excel_data)
+    if not catalog:
+        print(f"Error: {args.xlsx} に問題数のある学習内容がありません")
+        sys.exit(1)
+
+    students, logs = generate(args.output_dir, catalog, args)
+    load_path = args.output_dir / 'load.sql'
+    load_path.write_text(render_load_sql(students, logs), encoding='utf-8')
+
+    hit = " (cache hit)" if cache_hit else ""
+    print(f"Generated: {args.output_dir}{hit}")
+    print(f"  Students: {students.rows}")
+    print(f"  study_logs: {logs.rows}")
+    print(f"  Load: psql \"$DSN\" -f {load_path}")
+
+
+if __name__ == '__main__':
+    main()
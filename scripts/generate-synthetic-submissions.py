@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+算数自動採点 負荷試験用 解答データ生成スクリプト
+
+generate-math-questions-sql.py の SETS（本番と同じ問題）を元に、合成生徒 N 人 × 各プリント最大 M 回の
+解答セッション (answer_sessions) と個別解答 (student_answers) を COPY ファイルとして書き出す。
+行は生成した順にファイルへ流すので、数百万行でもメモリ使用量は一定。
+
+採点結果は lib/math-grading.ts gradeAnswer() と同じ規則で Python 側でも採点して埋める
+（answer_value の正規化・selection の順不同比較・multi_part の全スロット一致）。
+リトライは app/actions/math-answer.ts startMathRetry と同じく、正解済みの解答をそのまま引き継ぐ。
+
+Usage:
+  python3 scripts/generate-synthetic-submissions.py --output-dir /tmp/submissions
+  python3 scripts/generate-synthetic-submissions.py --output-dir /tmp/submissions --students 5000 --attempts 3
+  psql "$DSN" -f /tmp/submissions/load.sql
+
+Output (--output-dir):
+  students.copy         合成生徒（login_id = loadtest_NNNNNN）
+  answer_sessions.copy  解答セッション（問題セットは 学年・回・①② の自然キー、時刻は回の開始日からの秒数）
+  student_answers.copy  個別解答（問題は display_order で特定）
+  load.sql              上記を一時テーブル経由で ID 解決して投入する psql スクリプト
+
+前提: math_questions_2026.sql 投入済みのローカル DB。load.sql は合成生徒の既存の解答を消してから入れ直す。
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import load_script  # noqa: E402
+from seedgen.copyfile import CopyWriter  # noqa: E402
+from seedgen.loadtest import LOGIN_PREFIX, STUDENT_COLUMNS, students_load_lines, synthetic_students  # noqa: E402
+
+math_questions = load_script('generate-math-questions-sql')
+
+SESSION_COLUMNS = (
+    'student_no', 'grade', 'session_number', 'set_order', 'attempt_number', 'is_latest', 'status',
+    'total_score', 'max_score', 'answers_revealed', 'started_offset', 'completed_offset',
+)
+ANSWER_COLUMNS = (
+    'student_no', 'grade', 'session_number', 'set_order', 'attempt_number', 'display_order',
+    'raw_input', 'answer_value', 'is_correct', 'scored_offset', 'answered_offset',
+)
+
+DAY = 24 * 60 * 60
+
+# ============================================================================
+# 採点（lib/math-grading.ts と同じ規則）
+# ============================================================================
+
+NUMERIC_FORMAT = re.compile(r'^-?(\d+\.?\d*|\d*\.?\d+)$')
+
+
+def normalize_numeric(raw):
+    """normalizeNumeric() 相当: "042" → "42", "3.50" → "3.5", 形式外は None"""
+    trimmed = raw.strip()
+    if not NUMERIC_FORMAT.match(trimmed):
+        return None
+    num = float(trimmed)
+    if num.is_integer():
+        return str(int(num))
+    return repr(num)
+
+
+def js_json(val):
+    """JSON.stringify() と同じ区切りの JSON 文字列"""
+    return json.dumps(val, ensure_ascii=False, separators=(',', ':'))
+
+
+def grade_answer(q, raw_input):
+    """gradeAnswer() 相当 → (answer_value, is_correct)。raw_input は非空であること"""
+    qtype = q["type"]
+    if qtype == "numeric":
+        normalized = normalize_numeric(raw_input)
+        if normalized is None:
+            return raw_input.strip(), False
+        return normalized, normalized == q["answer"]
+
+    if qtype == "fraction":
+        normalized = raw_input.strip()
+        return normalized, normalized == q["answer"].strip()
+
+    if qtype == "multi_part":
+        parsed = json.loads(raw_input)
+        labels = [slot["label"] for slot in q["slots"]]
+        all_correct = all(normalize_numeric(parsed.get(lb) or '') == q["correct_values"][lb] for lb in labels)
+        normalized = {lb: normalize_numeric(parsed.get(lb) or '') or parsed.get(lb) or '' for lb in labels}
+        return js_json(normalized), all_correct
+
+    parsed = json.loads(raw_input)
+    student = sorted({str(v).strip() for v in parsed})
+    correct = sorted({v.strip() for v in q["correct_values"]})
+    return js_json(student), student == correct
+
+
+# ============================================================================
+# 入力の合成
+# ============================================================================
+
+def numeric_variant(answer, rng):
+    """正答と同値の表記ゆれ（先頭ゼロ・末尾ゼロ）をときどき混ぜる"""
+    r = rng.random()
+    if r < 0.03 and not answer.startswith('-'):
+        return '0' + answer
+    if r < 0.05:
+        return answer + ('0' if '.' in answer else '.0')
+    return answer
+
+
+def wrong_numeric(answer, rng):
+    """ありがちな誤答（±1, 桁ずれ, 数字の入れ替え）"""
+    try:
+        num = float(answer)
+    except ValueError:
+        return answer + '1'
+    r = rng.random()
+    if r < 0.5:
+        wrong = num + rng.choice((-2, -1, 1, 2))
+    elif r < 0.7:
+        wrong = num * rng.choice((10, 0.1))
+    else:
+        digits = list(answer)
+        if len(digits) >= 2:
+            i = rng.randrange(len(digits) - 1)
+            digits[i], digits[i + 1] = digits[i + 1], digits[i]
+            swapped = ''.join(digits)
+            if swapped != answer and normalize_numeric(swapped) is not None:
+                return swapped
+        wrong = num + 1
+    return normalize_numeric(f"{wrong:.6f}".rstrip('0').rstrip('.')) or answer + '1'
+
+
+def wrong_fraction(answer, rng):
+    """約分忘れ・分子分母の取り違え・分子のずれ"""
+    num, _, den = answer.partition('/')
+    if not den:
+        return wrong_numeric(answer, rng)
+    r = rng.random()
+    if r < 0.4:
+        k = rng.choice((2, 3))
+        return f"{int(num) * k}/{int(den) * k}"
+    if r < 0.6 and num != den:
+        return f"{den}/{num}"
+    return f"{int(num) + rng.choice((-1, 1)) or 1}/{den}"
+
+
+def synth_raw_input(q, p_correct, partial_rate, rng):
+    """1問分の生徒入力（raw_input）を作る"""
+    qtype = q["type"]
+    correct = rng.random() < p_correct
+
+    if qtype == "numeric":
+        return numeric_variant(q["answer"], rng) if correct else wrong_numeric(q["answer"], rng)
+
+    if qtype == "fraction":
+        return q["answer"] if correct else wrong_fraction(q["answer"], rng)
+
+    if qtype == "multi_part":
+        labels = [slot["label"] for slot in q["slots"]]
+        if correct:
+            values = {lb: q["correct_values"][lb] for lb in labels}
+        else:
+            # 部分正解: 一部のスロットだけ正しい / 空欄のスロットがある解答を混ぜる
+            wrong_labels = set(labels)
+            if rng.random() < partial_rate and len(labels) > 1:
+                wrong_labels = set(rng.sample(labels, rng.randint(1, len(labels) - 1)))
+            values = {}
+            for lb in labels:
+                if lb not in wrong_labels:
+                    values[lb] = q["correct_values"][lb]
+                elif rng.random() < 0.15:
+                    values[lb] = ''
+                else:
+                    values[lb] = wrong_numeric(q["correct_values"][lb], rng)
+        return js_json(values)
+
+    # selection: 正答の取りこぼし・ダミーの誤選択（UI の並び順のまま送られる）
+    chosen = list(q["correct_values"])
+    if not correct:
+        dummies = list(q["dummy_values"])
+        r = rng.random()
+        if (r < 0.5 or not dummies) and len(chosen) > 1:
+            chosen.remove(rng.choice(chosen))
+        elif dummies:
+            chosen.append(rng.choice(dummies))
+            if r > 0.8 and len(chosen) > 2:
+                chosen.remove(rng.choice(chosen[:-1]))
+    rng.shuffle(chosen)
+    return js_json(chosen)
+
+
+# ============================================================================
+# 生成
+# ============================================================================
+
+def question_difficulty(sets, rng):
+    """問題ごとの難易度補正（生徒の正答率に足す。セット×display_order で固定）"""
+    return {
+        (qs["grade"], qs["session"], qs["order"]): [
+            rng.gauss(0, 0.15) for _, questions in qs["sections"] for _ in questions
+        ]
+        for qs in sets
+    }
+
+
+def set_questions(qs):
+    return [q for _, questions in qs["sections"] for q in questions]
+
+
+def generate(out_dir, sets, args):
+    """COPY ファイル 3 種を書き出し、(生徒 writer, セッション writer, 解答 writer) を返す"""
+    rng = random.Random(args.seed)
+    difficulty = question_difficulty(sets, rng)
+    questions_by_set = {(qs["grade"], qs["session"], qs["order"]): set_questions(qs) for qs in sets}
+    grades = tuple(sorted({qs["grade"] for qs in sets}))
+
+    with CopyWriter(out_dir / 'students.copy', STUDENT_COLUMNS) as students, \
+         CopyWriter(out_dir / 'answer_sessions.copy', SESSION_COLUMNS) as sessions, \
+         CopyWriter(out_dir / 'student_answers.copy', ANSWER_COLUMNS) as answers:
+        for student in synthetic_students(args.students, rng, grades):
+            students.write(*student)
+            student_no, grade = student[0], student[3]
+            mean = args.accuracy
+            ability = rng.betavariate(mean * args.spread, (1 - mean) * args.spread)
+
+            for key, questions in questions_by_set.items():
+                if key[0] != grade or rng.random() >= args.coverage:
+                    continue
+                write_attempts(sessions, answers, student_no, key, questions, difficulty[key], ability, args, rng)
+
+    return students, sessions, answers
+
+
+def write_attempts(sessions, answers, student_no, key, questions, difficulty, ability, args, rng):
+    """1生徒×1問題セットの全アテンプトを書き出す
+
+    - 2回目以降は前回の正解をそのまま引き継ぎ（採点済み時刻も前回のまま）、残りを解き直す
+    - 全問正解（answers_revealed）になったら終了、それ以外は --retry-rate の確率で次の回へ
+    - 最後のアテンプトは --in-progress-rate の確率で未提出（in_progress、未採点）のまま残す
+    """
+    # 回の開始日 0:00 からの秒数。初回は回の期間（7日）内、リトライはその後数時間〜数日
+    started = rng.randrange(7 * DAY)
+    prev = {}
+    for attempt in range(1, args.attempts + 1):
+        gain = args.retry_gain * (attempt - 1)
+        rows = []
+        cursor = started + rng.randrange(60, 300)
+        for display_order, (q, diff) in enumerate(zip(questions, difficulty), start=1):
+            carried = prev.get(display_order)
+            if carried and carried[2]:
+                rows.append((display_order, *carried, started))
+                continue
+            if rng.random() < args.blank_rate:
+                continue
+            p = min(max(ability + diff + gain, 0.02), 0.99)
+            raw = synth_raw_input(q, p, args.partial_rate, rng)
+            cursor += rng.randrange(20, 240)
+            rows.append((display_order, raw, *grade_answer(q, raw), None, cursor))
+
+        total = sum(1 for r in rows if r[3])
+        revealed = total == len(questions)
+        last = revealed or attempt == args.attempts or rng.random() >= args.retry_rate
+        in_progress = last and not revealed and rng.random() < args.in_progress_rate
+        completed = cursor + rng.randrange(10, 120)
+
+        sessions.write(
+            student_no, *key, attempt, last, 'in_progress' if in_progress else 'graded',
+            None if in_progress else total, None if in_progress else len(questions),
+            revealed and not in_progress, started, None if in_progress else completed,
+        )
+        prev = {}
+        for display_order, raw, value, is_correct, scored, answered in rows:
+            if in_progress and scored is None:
+                value, is_correct = None, None
+            elif scored is None:
+                scored = completed
+            answers.write(student_no, *key, attempt, display_order, raw, value, is_correct, scored, answered)
+            prev[display_order] = (raw, value, is_correct, scored)
+
+        if last:
+            return
+        started = completed + rng.randrange(600, 3 * DAY)
+
+
+def render_load_sql(students, sessions, answers):
+    """COPY ファイルを一時テーブルに読み込み、自然キーで ID を解決して投入する psql スクリプト"""
+    lines = [
+        "-- ============================================================================",
+        "-- 算数自動採点 負荷試験データ投入",
+        "-- ============================================================================",
+        "-- 生成元: scripts/generate-synthetic-submissions.py",
+        f"-- 件数: 生徒 {students.rows} / answer_sessions {sessions.rows} / student_answers {answers.rows}",
+        "-- 実行: psql \"$DSN\" -f load.sql（ローカル DB 専用。本番では実行しないこと）",
+        "",
+        "\\set ON_ERROR_STOP on",
+        "BEGIN;",
+        "",
+    ]
+    lines += students_load_lines(students)
+    lines += [
+        "-- 合成生徒の既存の解答を削除（student_answers は ON DELETE CASCADE）",
+        "DELETE FROM public.answer_sessions",
+        "WHERE student_id IN (SELECT student_id FROM loadtest_students);",
+        "",
+        "-- 算数の問題セット: (学年, 回, ①②) → question_sets.id と回の開始時刻",
+        "-- 同じ回・display_order の exercise_workbook（演習問題集）は対象外（master_print だけ）",
+        "CREATE TEMP TABLE math_sets ON COMMIT DROP AS",
+        "SELECT qs.grade, ss.session_number, qs.display_order AS set_order, qs.id AS question_set_id,",
+        "       ss.start_date::timestamp AT TIME ZONE 'Asia/Tokyo' AS session_start",
+        "FROM public.question_sets qs",
+        "JOIN public.study_sessions ss ON ss.id = qs.session_id",
+        "JOIN public.subjects sub ON sub.id = qs.subject_id AND sub.name = '算数'",
+        "WHERE qs.set_type = 'master_print';",
+        "CREATE UNIQUE INDEX ON math_sets (grade, session_number, set_order);",
+        "",
+        "CREATE TEMP TABLE stg_answer_sessions (",
+        "  student_no       INTEGER NOT NULL,",
+        "  grade            SMALLINT NOT NULL,",
+        "  session_number   SMALLINT NOT NULL,",
+        "  set_order        SMALLINT NOT NULL,",
+        "  attempt_number   SMALLINT NOT NULL,",
+        "  is_latest        BOOLEAN NOT NULL,",
+        "  status           VARCHAR(20) NOT NULL,",
+        "  total_score      SMALLINT,",
+        "  max_score        SMALLINT,",
+        "  answers_revealed BOOLEAN NOT NULL,",
+        "  started_offset   INTEGER NOT NULL,",
+        "  completed_offset INTEGER",
+        ") ON COMMIT DROP;",
+        sessions.copy_command('stg_answer_sessions'),
+        "",
+        "DO $$",
+        "BEGIN",
+        "  IF EXISTS (SELECT 1 FROM stg_answer_sessions a",
+        "             LEFT JOIN math_sets m USING (grade, session_number, set_order)",
+        "             WHERE m.question_set_id IS NULL) THEN",
+        "    RAISE EXCEPTION '問題セットが見つかりません（math_questions_2026.sql を先に投入してください）';",
+        "  END IF;",
+        "END $$;",
+        "",
+        "INSERT INTO public.answer_sessions",
+        "  (student_id, question_set_id, attempt_number, is_latest, status, total_score, max_score,",
+        "   answers_revealed, started_at, completed_at, created_at)",
+        "SELECT st.student_id, m.question_set_id, a.attempt_number, a.is_latest, a.status, a.total_score, a.max_score,",
+        "       a.answers_revealed, m.session_start + make_interval(secs => a.started_offset),",
+        "       m.session_start + make_interval(secs => a.completed_offset),",
+        "       m.session_start + make_interval(secs => a.started_offset)",
+        "FROM stg_answer_sessions a",
+        "JOIN loadtest_students st USING (student_no)",
+        "JOIN math_sets m USING (grade, session_number, set_order);",
+        "",
+        "CREATE TEMP TABLE stg_student_answers (",
+        "  student_no      INTEGER NOT NULL,",
+        "  grade           SMALLINT NOT NULL,",
+        "  session_number  SMALLINT NOT NULL,",
+        "  set_order       SMALLINT NOT NULL,",
+        "  attempt_number  SMALLINT NOT NULL,",
+        "  display_order   SMALLINT NOT NULL,",
+        "  raw_input       VARCHAR(500),",
+        "  answer_value    VARCHAR(500),",
+        "  is_correct      BOOLEAN,",
+        "  scored_offset   INTEGER,",
+        "  answered_offset INTEGER NOT NULL",
+        ") ON COMMIT DROP;",
+        answers.copy_command('stg_student_answers'),
+        "",
+        "INSERT INTO public.student_answers",
+        "  (answer_session_id, question_id, raw_input, answer_value, is_correct, scored_at, answered_at)",
+        "SELECT s.id, q.id, a.raw_input, a.answer_value, a.is_correct,",
+        "       m.session_start + make_interval(secs => a.scored_offset),",
+        "       m.session_start + make_interval(secs => a.answered_offset)",
+        "FROM stg_student_answers a",
+        "JOIN loadtest_students st USING (student_no)",
+        "JOIN math_sets m USING (grade, session_number, set_order)",
+        "JOIN public.answer_sessions s",
+        "  ON s.student_id = st.student_id AND s.question_set_id = m.question_set_id",
+        "  AND s.attempt_number = a.attempt_number",
+        "JOIN public.questions q ON q.question_set_id = m.question_set_id AND q.display_order = a.display_order;",
+        "",
+        "-- 問題数が SETS とずれている（display_order が解決できない）場合は全体を取り消す",
+        "DO $$",
+        "DECLARE",
+        "  v_staged BIGINT;",
+        "  v_loaded BIGINT;",
+        "BEGIN",
+        "  SELECT count(*) INTO v_staged FROM stg_student_answers;",
+        "  SELECT count(*) INTO v_loaded",
+        "  FROM public.student_answers sa",
+        "  JOIN public.answer_sessions s ON s.id = sa.answer_session_id",
+        "  WHERE s.student_id IN (SELECT student_id FROM loadtest_students);",
+        "  IF v_loaded <> v_staged THEN",
+        "    RAISE EXCEPTION 'student_answers の件数不一致: 投入 % / 生成 %', v_loaded, v_staged;",
+        "  END IF;",
+        "END $$;",
+        "",
+        "COMMIT;",
+        "",
+        "ANALYZE public.answer_sessions;",
+        "ANALYZE public.student_answers;",
+        "",
+        "-- 削除: DELETE FROM public.answer_sessions WHERE student_id IN",
+        f"--   (SELECT id FROM public.students WHERE login_id LIKE '{LOGIN_PREFIX}%');",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+# ============================================================================
+# メイン
+# ============================================================================
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="算数自動採点 負荷試験用 解答データ生成（COPY 形式）")
+    parser.add_argument('--output-dir', type=Path, required=True, help="COPY ファイルと load.sql の出力先")
+    parser.add_argument('--students', type=int, default=100, help="合成生徒数（小5・小6 に交互に割り当て）")
+    parser.add_argument('--attempts', type=int, default=3, help="1プリントあたりの最大アテンプト数")
+    parser.add_argument('--grade', type=int, choices=(5, 6), help="指定した学年のプリントだけ使う")
+    parser.add_argument('--coverage', type=float, default=0.8, help="各プリントに取り組む確率")
+    parser.add_argument('--accuracy', type=float, default=0.7, help="生徒の平均正答率")
+    parser.add_argument('--spread', type=float, default=8.0,
+                        help="正答率分布の集中度（Beta 分布の a+b。小さいほど生徒間のばらつきが大きい）")
+    parser.add_argument('--retry-gain', type=float, default=0.15, help="リトライ1回ごとの正答率の上昇")
+    parser.add_argument('--retry-rate', type=float, default=0.6, help="全問正解でないとき次の回に進む確率")
+    parser.add_argument('--blank-rate', type=float, default=0.03, help="未回答にする確率")
+    parser.add_argument('--partial-rate', type=float, default=0.5,
+                        help="multi_part の誤答のうち一部スロットだけ正しい解答の割合")
+    parser.add_argument('--in-progress-rate', type=float, default=0.05,
+                        help="最後のアテンプトを未提出（in_progress）のまま残す確率")
+    parser.add_argument('--seed', type=int, default=2026, help="乱数シード（同じ値なら同じ内容）")
+    args = parser.parse_args(argv)
+    if not 0 < args.accuracy < 1:
+        parser.error("--accuracy は 0 より大きく 1 より小さい値で指定してください")
+    if args.students < 1 or args.attempts < 1:
+        parser.error("--students と --attempts は 1 以上で指定してください")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sets = math_questions.select_sets(grade=args.grade)
+
+    students, sessions, answers = generate(args.output_dir, sets, args)
+    load_path = args.output_dir / 'load.sql'
+    load_path.write_text(render_load_sql(students, sessions, answers), encoding='utf-8')
+
+    print(f"Generated: {args.output_dir}", file=sys.stderr)
+    print(f"  Students: {students.rows}", file=sys.stderr)
+    print(f"  answer_sessions: {sessions.rows}", file=sys.stderr)
+    print(f"  student_answers: {answers.rows}", file=sys.stderr)
+    print(f"  Load: psql \"$DSN\" -f {load_path}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+problem_counts 用 合成ワークブック生成スクリプト
+
+実データ「2026年四谷大塚DB.xlsx」と同じシート名・ヘッダー構成（CONTENT_DEFS 準拠）の
+ワークブックを乱数で生成する。実データなしで read_excel_data() と SQL 生成を動かすためのフィクスチャ。
+回数 (--sessions) とシート数 (--extra-sheets) を増やせば大規模データも作れる。
+
+Usage:
+  python3 scripts/generate-synthetic-workbook.py --output /tmp/synthetic.xlsx
+  python3 scripts/generate-synthetic-workbook.py --output /tmp/large.xlsx --sessions 3000 --extra-sheets 48
+
+Output:
+  .xlsx（read_excel_data() でそのまま読める）
+
+NOTE: --extra-sheets で追加したシートは TARGET_SHEETS / CONTENT_DEFS に含まれないため、
+  読み込み時は synthetic_layout() が返す content_defs / sheet_names を使うこと。
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from seedgen import load_script  # noqa: E402
+
+problem_counts = load_script('generate-problem-counts-sql')
+
+# CONTENT_DEFS にない列（実データの備考欄相当）。パーサーが無視することを確認するために入れる
+NOTE_COLUMN = '備考'
+
+
+def synthetic_layout(extra_sheets=0):
+    """合成ワークブックのレイアウトを返す: (content_defs, sheet_names, sheet_columns)
+
+    extra_sheets > 0 の場合、実シートを順に複製した「<元シート名>#NN」シートと、
+    それに対応する CONTENT_DEFS（content_name にも #NN を付与）を追加する。
+    """
+    content_defs = list(problem_counts.CONTENT_DEFS)
+    sheet_names = list(problem_counts.TARGET_SHEETS)
+    base_sheets = list(problem_counts.TARGET_SHEETS)
+    for k in range(1, extra_sheets + 1):
+        base = base_sheets[(k - 1) % len(base_sheets)]
+        copy_name = f"{base}#{k:02d}"
+        sheet_names.append(copy_name)
+        for grade, subject, name, level, order, sheet, column in problem_counts.CONTENT_DEFS:
+            if sheet == base:
+                content_defs.append((grade, subject, f"{name}#{k:02d}", level, order, copy_name, column))
+
+    sheet_columns = {sheet: [] for sheet in sheet_names}
+    for _, _, _, _, _, sheet, column in content_defs:
+        if column not in sheet_columns[sheet]:
+            sheet_columns[sheet].append(column)
+    return content_defs, sheet_names, sheet_columns
+
+
+def synthetic_cell(rng):
+    """1セル分の値（空欄・「なし」・文字列数値を一定割合で混ぜる）"""
+    r = rng.random()
+    if r < 0.10:
+        return None
+    if r < 0.15:
+        return 'なし'
+    if r < 0.18:
+        return str(rng.randint(1, 40))
+    return rng.randint(1, 40)
+
+
+def write_synthetic_workbook(output_path, sessions=19, extra_sheets=0, seed=2026):
+    """合成ワークブックを書き出し、(content_defs, sheet_names) を返す"""
+    import openpyxl
+
+    content_defs, sheet_names, sheet_columns = synthetic_layout(extra_sheets)
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    for sheet in sheet_names:
+        ws = wb.create_sheet(sheet)
+        columns = sheet_columns[sheet]
+        ws.append(['回'] + columns + [NOTE_COLUMN])
+        for session_num in range(1, sessions + 1):
+            note = '総合回' if session_num % 5 == 0 else None
+            ws.append([session_num] + [synthetic_cell(rng) for _ in columns] + [note])
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(str(output_path))
+    return content_defs, sheet_names
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="problem_counts 用 合成ワークブック生成")
+    parser.add_argument('--output', type=Path, required=True, help="出力 .xlsx パス")
+    parser.add_argument('--sessions', type=int, default=19, help="各シートの回数（行数）")
+    parser.add_argument('--extra-sheets', type=int, default=0, help="実シートを複製して追加するシート数")
+    parser.add_argument('--seed', type=int, default=2026, help="乱数シード（同じ値なら同じ内容）")
+    args = parser.parse_args(argv)
+
+    content_defs, sheet_names = write_synthetic_workbook(
+        args.output, sessions=args.sessions, extra_sheets=args.extra_sheets, seed=args.seed)
+    print(f"Generated: {args.output}")
+    print(f"  Sheets: {len(sheet_names)}")
+    print(f"  Sessions per sheet: {args.sessions}")
+    print(f"  Content defs: {len(content_defs)}")
+
+
+if __name__ == '__main__':
+    main()
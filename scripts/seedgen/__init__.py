@@ -0,0 +1,23 @@
+"""scripts/ 配下のデータ生成スクリプト群の共通ヘルパー
+
+generate-*.py はハイフン付きのファイル名で直接 import できないため、
+ベンチマークや派生ツールからは load_script() 経由で読み込む。
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent
+
+
+def load_script(name):
+    """scripts/<name>.py をモジュールとして読み込む（2回目以降は同じモジュールを返す）"""
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
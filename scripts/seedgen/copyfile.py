@@ -0,0 +1,52 @@
+"""PostgreSQL COPY (text 形式) ファイルの書き出し
+
+合成データ生成スクリプトが数百万行をメモリに溜めずに 1 行ずつ書き出すためのヘルパー。
+出力は psql の \\copy <table> FROM '<file>' でそのまま読める（区切りはタブ、NULL は \\N）。
+"""
+from pathlib import Path
+
+NULL = r'\N'
+
+
+def copy_field(val):
+    """Python 値 → COPY text 形式の1フィールド"""
+    if val is None:
+        return NULL
+    if val is True:
+        return 't'
+    if val is False:
+        return 'f'
+    return (str(val).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class CopyWriter:
+    """COPY ファイルへ行を逐次書き出す（with 文で使う）
+
+    columns は読み込み側の \\copy 文の列リストに使う。rows は書き出した行数。
+    """
+
+    def __init__(self, path, columns):
+        self.path = Path(path)
+        self.columns = tuple(columns)
+        self.rows = 0
+        self._file = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n', buffering=1 << 20)
+        return self
+
+    def __exit__(self, *exc):
+        self._file.close()
+        return False
+
+    def write(self, *values):
+        assert len(values) == len(self.columns), f"{self.path.name}: 列数不一致 {len(values)} != {len(self.columns)}"
+        self._file.write('\t'.join(copy_field(v) for v in values))
+        self._file.write('\n')
+        self.rows += 1
+
+    def copy_command(self, table):
+        """このファイルを table に読み込む psql メタコマンド"""
+        return f"\\copy {table} ({', '.join(self.columns)}) FROM '{self.path.resolve()}'"
@@ -0,0 +1,144 @@
+"""シード適用台帳 (public.seed_ledger) 対応
+
+生成した SQL にチェックサムを埋め込み、同じチェックサムで適用済みなら
+各 DO ブロックの先頭で即座に RETURN するガードを挿入する。
+
+台帳の記録は最後の DO ブロックの末尾で行うので、データと同じトランザクションでしかコミットされない。
+psql を ON_ERROR_STOP なしで流すと失敗した DO ブロックの後も続行するため、DO ブロックが複数あるときは
+各ブロックの完了をセッション設定 (seed_ledger.progress) に残し、次のブロックは前のブロックが
+完了していなければ例外で中断する（失敗したシードが適用済みとして記録されることはない）。
+DO ブロックの外の文（トップレベルの COPY など）はガードされず、再適用のたびに実行される。
+一時テーブルへのステージングのように、繰り返し流しても投入先に影響しないものだけを置くこと。
+
+チェックサムはプレースホルダー入りの SQL 全体の sha256 なので、
+入力データが同じなら出力はバイト単位で同一になる。
+
+生成後に手修正したファイルは、埋め込みチェックサムが本文と合わなくなる。
+そのまま流すと修正前のチェックサムで台帳と一致してスキップされるので、適用前に
+scripts/check-seed-checksums.py で検査し（不一致なら失敗）、--restamp で付け直してから流す。
+"""
+import hashlib
+
+CHECKSUM_PLACEHOLDER = "@@SEED_CHECKSUM@@"
+CHECKSUM_MARKER = "-- チェックサム: sha256:"
+PROGRESS_SETTING = "seed_ledger.progress"
+
+LEDGER_DDL = [
+    "-- シード適用台帳（supabase/migrations/20261019000001_create_seed_ledger.sql と同一定義）",
+    "CREATE TABLE IF NOT EXISTS public.seed_ledger (",
+    "  seed_name  TEXT PRIMARY KEY,",
+    "  checksum   TEXT NOT NULL,",
+    "  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()",
+    ");",
+    "",
+]
+
+
+def guard_lines(seed_name):
+    """DO ブロック先頭に入れる「適用済みならスキップ」ガード"""
+    return [
+        "  -- 同一チェックサムで適用済みならスキップ (seed_ledger)",
+        "  IF EXISTS (SELECT 1 FROM public.seed_ledger",
+        f"             WHERE seed_name = '{seed_name}' AND checksum = '{CHECKSUM_PLACEHOLDER}') THEN",
+        f"    RAISE NOTICE 'スキップ: {seed_name} は適用済み（checksum 一致）';",
+        "    RETURN;",
+        "  END IF;",
+    ]
+
+
+def progress_check_lines(seed_name, block):
+    """2つ目以降の DO ブロックで、前のブロックが完了していなければ中断する"""
+    return [
+        "  -- 前の DO ブロックが完了していなければ中断（ON_ERROR_STOP なしの psql が続行した場合）",
+        f"  IF current_setting('{PROGRESS_SETTING}', true) IS DISTINCT FROM '{CHECKSUM_PLACEHOLDER}:{block - 1}' THEN",
+        f"    RAISE EXCEPTION '{seed_name}: 前の DO ブロックが完了していません（台帳には記録しない）';",
+        "  END IF;",
+    ]
+
+
+def progress_mark_lines(block):
+    """最後以外の DO ブロック末尾で、完了したことをセッション設定に残す"""
+    return [f"  PERFORM set_config('{PROGRESS_SETTING}', '{CHECKSUM_PLACEHOLDER}:{block}', false);"]
+
+
+def record_lines(seed_name, indent=""):
+    """台帳を更新する文（with_ledger() は最後の DO ブロックの末尾に indent="  " で入れる）"""
+    return [
+        f"{indent}-- シード適用台帳を更新",
+        f"{indent}INSERT INTO public.seed_ledger (seed_name, checksum)",
+        f"{indent}VALUES ('{seed_name}', '{CHECKSUM_PLACEHOLDER}')",
+        f"{indent}ON CONFLICT (seed_name) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW();",
+    ]
+
+
+def with_ledger(sql_lines, seed_name):
+    """生成 SQL (行リスト) に台帳チェックを組み込み、チェックサムを埋めたテキストを返す
+
+    - ヘッダーの「-- 生成元:」行の直後にチェックサム行を入れる
+    - 最初の DO ブロックの前に seed_ledger の DDL を入れる
+    - 各 DO ブロックの BEGIN 直後にスキップ用ガード（2つ目以降は前のブロックの完了確認も）を入れる
+    - 最後以外の DO ブロックの末尾で完了を記録し、最後の DO ブロックの末尾で台帳を UPSERT する
+    """
+    blocks = sum(1 for line in sql_lines if line == "DO $$")
+    if not blocks:
+        raise ValueError(f"{seed_name}: DO ブロックがないため台帳のガードを入れられません")
+
+    out = []
+    block = 0
+    in_do_header = False
+    for i, line in enumerate(sql_lines):
+        if line == "DO $$":
+            if not block:
+                out.extend(LEDGER_DDL)
+            block += 1
+            in_do_header = True
+        elif block and line == "END $$;":
+            if out[-1] != "":
+                out.append("")
+            out.extend(progress_mark_lines(block) if block < blocks else record_lines(seed_name, indent="  "))
+        out.append(line)
+        if line.startswith("-- 生成元:"):
+            out.append(f"{CHECKSUM_MARKER}{CHECKSUM_PLACEHOLDER} (seed_ledger: {seed_name})")
+        elif in_do_header and line == "BEGIN":
+            out.extend(guard_lines(seed_name))
+            if block > 1:
+                out.extend(progress_check_lines(seed_name, block))
+            if i + 1 < len(sql_lines) and sql_lines[i + 1] != "":
+                out.append("")
+            in_do_header = False
+
+    return stamp("\n".join(out))
+
+
+def stamp(text):
+    """プレースホルダー入りの SQL にその sha256 を埋める"""
+    checksum = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return text.replace(CHECKSUM_PLACEHOLDER, checksum)
+
+
+def checksum_of(sql_text):
+    """with_ledger() 済みの SQL からヘッダーのチェックサムを取り出す（なければ None）"""
+    for line in sql_text.splitlines():
+        if line.startswith(CHECKSUM_MARKER):
+            return line[len(CHECKSUM_MARKER):].split()[0]
+    return None
+
+
+def verify(sql_text):
+    """埋め込みチェックサムが本文から計算し直した値と一致するか（チェックサムのない SQL は None）
+
+    sql_text は with_ledger() の戻り値そのもの（ファイルなら末尾の改行1つを除いたもの）。
+    """
+    checksum = checksum_of(sql_text)
+    if checksum is None:
+        return None
+    body = sql_text.replace(checksum, CHECKSUM_PLACEHOLDER)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest() == checksum
+
+
+def restamp(sql_text):
+    """手修正後の SQL のチェックサムを本文に合わせて付け直す"""
+    checksum = checksum_of(sql_text)
+    if checksum is None:
+        raise ValueError("チェックサム行がありません")
+    return stamp(sql_text.replace(checksum, CHECKSUM_PLACEHOLDER))
@@ -0,0 +1,71 @@
+"""負荷試験用の合成生徒
+
+合成データは実在の生徒に紐付けず、login_id が LOGIN_PREFIX で始まる専用の生徒を作って載せる。
+auth.users → profiles（on_auth_user_created トリガー）→ students の順に作成し、
+ID は login_id から決定的に導出するので、同じ生徒数で再実行しても同じ生徒が再利用される。
+パスワードは設定しない（ログイン不可、データ量の再現専用）。
+"""
+
+LOGIN_PREFIX = 'loadtest_'
+
+STUDENT_COLUMNS = ('student_no', 'login_id', 'full_name', 'grade', 'course')
+
+# コース分布（course_level: A < B < C < S）
+COURSE_WEIGHTS = (('A', 0.35), ('B', 0.35), ('C', 0.2), ('S', 0.1))
+
+
+def student_login_id(student_no):
+    return f"{LOGIN_PREFIX}{student_no:06d}"
+
+
+def synthetic_students(count, rng, grades=(5, 6)):
+    """(student_no, login_id, full_name, grade, course) を student_no 順に返す"""
+    courses = [c for c, _ in COURSE_WEIGHTS]
+    weights = [w for _, w in COURSE_WEIGHTS]
+    for student_no in range(1, count + 1):
+        grade = grades[(student_no - 1) % len(grades)]
+        course = rng.choices(courses, weights)[0]
+        yield (student_no, student_login_id(student_no), f"負荷試験 {student_no:06d}", grade, course)
+
+
+def students_load_lines(writer):
+    """合成生徒を作成し、student_no → students.id の対応を一時テーブル loadtest_students に作る psql 文
+
+    writer: synthetic_students() の行を書いた CopyWriter
+    """
+    return [
+        "-- 合成生徒（login_id は決定的なので再実行時は既存行を再利用する）",
+        "CREATE TEMP TABLE stg_students (",
+        "  student_no INTEGER PRIMARY KEY,",
+        "  login_id   VARCHAR(50) NOT NULL,",
+        "  full_name  VARCHAR(100) NOT NULL,",
+        "  grade      SMALLINT NOT NULL,",
+        "  course     course_level NOT NULL",
+        ") ON COMMIT DROP;",
+        writer.copy_command('stg_students'),
+        "",
+        "INSERT INTO auth.users (id, instance_id, aud, role, email, created_at, updated_at,",
+        "                        raw_app_meta_data, raw_user_meta_data, is_super_admin,",
+        "                        confirmation_token, recovery_token)",
+        "SELECT md5(st.login_id)::uuid, '00000000-0000-0000-0000-000000000000', 'authenticated', 'authenticated',",
+        "       st.login_id || '@studyspark.local', NOW(), NOW(),",
+        "       '{\"provider\":\"email\",\"providers\":[\"email\"],\"login_type\":\"student_id\"}',",
+        "       jsonb_build_object('login_id', st.login_id, 'full_name', st.full_name), false, '', ''",
+        "FROM stg_students st",
+        "ON CONFLICT (id) DO NOTHING;",
+        "",
+        "INSERT INTO public.students (user_id, login_id, full_name, grade, course)",
+        "SELECT md5(st.login_id)::uuid, st.login_id, st.full_name, st.grade, st.course",
+        "FROM stg_students st",
+        "ON CONFLICT (login_id) DO UPDATE SET",
+        "  full_name = EXCLUDED.full_name,",
+        "  grade = EXCLUDED.grade,",
+        "  course = EXCLUDED.course;",
+        "",
+        "CREATE TEMP TABLE loadtest_students ON COMMIT DROP AS",
+        "SELECT st.student_no, s.id AS student_id, st.grade, st.course",
+        "FROM stg_students st",
+        "JOIN public.students s ON s.login_id = st.login_id;",
+        "CREATE UNIQUE INDEX ON loadtest_students (student_no);",
+        "",
+    ]
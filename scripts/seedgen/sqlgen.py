@@ -0,0 +1,220 @@
+"""SQL 生成の共通部品（リテラル・行モデル・バッチ INSERT・ID の事前解決）
+
+generate-*.py は値の埋め込みと複数行 INSERT の組み立てをここに任せ、
+文の並び（DO ブロック・分岐・JOIN）だけを自前で書く。
+出力は行のイテラブル（改行なし）で返すので、呼び出し側は lines.extend() で積むか、そのまま書き出せる。
+"""
+from collections import namedtuple
+import json
+
+from .copyfile import copy_field
+
+
+# =============================================================================
+# リテラル
+# =============================================================================
+
+class Raw(str):
+    """そのまま埋め込む SQL 式（変数 v_qs、既に組み立てたリテラルなど）"""
+
+
+def sql_str(val):
+    """Python値 → SQL文字列リテラル"""
+    if val is None:
+        return Raw("NULL")
+    return Raw("'" + str(val).replace("'", "''") + "'")
+
+
+def sql_json(val):
+    """Python dict/list → SQL JSONB リテラル"""
+    if val is None:
+        return Raw("NULL")
+    return sql_str(json.dumps(val, ensure_ascii=False))
+
+
+def sql_text_array(values):
+    """Python list → SQL text[] リテラル"""
+    return Raw("ARRAY[" + ", ".join(sql_str(v) for v in values) + "]")
+
+
+def _quote(val):
+    return "'" + val.replace("'", "''") + "'"
+
+
+def sql_literal(val):
+    """Python値 → SQL リテラル（dict / list は JSON、text[] は sql_text_array() で包む）"""
+    if isinstance(val, Raw):
+        return val
+    if val is None:
+        return "NULL"
+    if isinstance(val, bool):
+        return "TRUE" if val else "FALSE"
+    if isinstance(val, (int, float)):
+        return str(val)
+    if isinstance(val, (dict, list)):
+        return sql_json(val)
+    return sql_str(val)
+
+
+# =============================================================================
+# 行モデル
+# =============================================================================
+
+class Table:
+    """投入先テーブルの列定義
+
+    columns は "列名" または "列名 型 制約..." の並び（型は create_temp_table() でだけ使う）。
+    conflict は UPSERT の一意キー、update は衝突時に上書きする列（None = キー以外の全列、() = DO NOTHING）。
+    Row は列順の namedtuple で、emit_insert() にはこれでも素のタプルでも渡せる。
+    """
+
+    def __init__(self, name, columns, conflict=(), update=None):
+        self.name = name
+        self.columns = tuple(c.split()[0] for c in columns)
+        self.types = tuple(c.split(None, 1)[1] if ' ' in c.strip() else None for c in columns)
+        self.conflict = tuple(conflict)
+        self.update = tuple(c for c in self.columns if c not in self.conflict) if update is None else tuple(update)
+        self.Row = namedtuple(name.split('.')[-1] + '_row', self.columns)
+
+    def column_list(self):
+        return ", ".join(self.columns)
+
+    def on_conflict(self):
+        """UPSERT の ON CONFLICT 句（末尾のセミコロンなし）"""
+        if not self.update:
+            return f"ON CONFLICT ({', '.join(self.conflict)}) DO NOTHING"
+        sets = ", ".join(f"{c} = EXCLUDED.{c}" for c in self.update)
+        return f"ON CONFLICT ({', '.join(self.conflict)}) DO UPDATE SET {sets}"
+
+
+def create_temp_table(table, indent="  ", on_commit_drop=True):
+    """列定義どおりの一時テーブル（既定はトランザクション終了で破棄。False なら呼び出し側で DROP する）"""
+    yield f"{indent}CREATE TEMP TABLE {table.name} ("
+    yield ",\n".join(f"{indent}  {name} {type_}" for name, type_ in zip(table.columns, table.types))
+    yield f"{indent}) ON COMMIT DROP;" if on_commit_drop else f"{indent});"
+
+
+# =============================================================================
+# バッチ INSERT
+# =============================================================================
+
+def batched(rows, size):
+    """rows を size 件ずつのリストにして順に返す（size <= 0 なら分割しない）。rows はイテラブルでよい"""
+    if size <= 0:
+        rows = list(rows)
+        if rows:
+            yield rows
+        return
+    if isinstance(rows, list):
+        for start in range(0, len(rows), size):
+            yield rows[start:start + size]
+        return
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def column_literals(values):
+    """1列分の値をまとめて SQL リテラルにする
+
+    型の判定は列ごとに1回（set(map(type, ...)) は C 側で回る）。int だけ・str だけ・Raw だけの列は
+    値ごとの分岐なしで変換し、型が混ざる列だけ sql_literal() に回す。
+    str の列（科目名・コース・学習内容名など）は値の種類が少ないので、異なる値ごとに1回だけクォートする。
+    """
+    types = set(map(type, values))
+    if types <= {int}:
+        return list(map(str, values))
+    if types <= {str}:
+        quoted = {v: _quote(v) for v in set(values)}
+        return list(map(quoted.__getitem__, values))
+    if types <= {Raw}:
+        return values
+    if types <= {str, type(None)}:
+        return ["NULL" if v is None else _quote(v) for v in values]
+    return list(map(sql_literal, values))
+
+
+def values_rows(rows, indent="    "):
+    """複数行分の VALUES タプル（列ごとにリテラルへ変換してから行に組み直す）"""
+    columns = [column_literals(column) for column in zip(*rows)]
+    prefix = indent + "("
+    return [prefix + ", ".join(row) + ")" for row in zip(*columns)]
+
+
+def values_from(rows, alias, columns, indent="  ", row_indent=None, keyword="FROM", suffix=""):
+    """INSERT ... SELECT / UPDATE ... FROM / DELETE ... USING の派生表 (VALUES ...) AS alias(columns)"""
+    row_indent = indent + "  " if row_indent is None else row_indent
+    yield f"{indent}{keyword} (VALUES"
+    yield ",\n".join(values_rows(rows, row_indent))
+    yield f"{indent}) AS {alias}({', '.join(columns)}){suffix}"
+
+
+def emit_insert(table, rows, target="values", batch_size=0, indent="  ", row_indent=None, progress=None):
+    """rows を table へ投入する SQL を行単位で返す（rows は逐次読み出すのでジェネレータでもよい）
+
+    target:
+      values  INSERT INTO ... VALUES（batch_size 行ごとに 1 文）
+      upsert  values + table.on_conflict()
+      copy    COPY ... FROM stdin（psql スクリプトのトップレベル専用。DO ブロック内・Raw 式は使えない）
+    progress: 複数バッチになったとき、各バッチの後に置く行を返す関数（引数は投入済みの行数）
+    """
+    if target == "copy":
+        yield f"{indent}COPY {table.name} ({table.column_list()}) FROM stdin;"
+        for row in rows:
+            yield "\t".join(copy_field(json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v)
+                             for v in row)
+        yield "\\."
+        return
+    if target not in ("values", "upsert"):
+        raise ValueError(f"unknown target: {target}")
+
+    row_indent = indent + "  " if row_indent is None else row_indent
+    batches = batched(rows, batch_size)
+    batch = next(batches, None)
+    loaded = 0
+    multi = False
+    while batch is not None:
+        following = next(batches, None)
+        multi = multi or following is not None
+        yield f"{indent}INSERT INTO {table.name} ({table.column_list()}) VALUES"
+        body = ",\n".join(values_rows(batch, row_indent))
+        if target == "upsert":
+            yield body
+            yield f"{indent}{table.on_conflict()};"
+        else:
+            yield body + ";"
+        loaded += len(batch)
+        if multi and progress:
+            yield progress(loaded)
+        batch = following
+
+
+# =============================================================================
+# ID の事前解決
+# =============================================================================
+
+# 科目名 → PL/pgSQL 変数名
+SUBJECT_VARS = {'算数': 'v_math_id', '国語': 'v_japanese_id', '理科': 'v_science_id', '社会': 'v_social_id'}
+
+
+def subject_var(subject_name):
+    """科目名を変数名に変換"""
+    return Raw(SUBJECT_VARS[subject_name])
+
+
+def subject_id_declares(names=tuple(SUBJECT_VARS), indent="  "):
+    """subject_id_prelude() で使う変数の DECLARE 行"""
+    for name in names:
+        yield f"{indent}{SUBJECT_VARS[name]} BIGINT;"
+
+
+def subject_id_prelude(names=tuple(SUBJECT_VARS), strict=False, indent="  "):
+    """科目 ID を変数に読み込む（本文の先頭で1回だけ。strict=True なら見つからないとき例外）"""
+    into = "INTO STRICT" if strict else "INTO"
+    for name in names:
+        yield f"{indent}SELECT id {into} {SUBJECT_VARS[name]} FROM public.subjects WHERE name = {sql_str(name)};"
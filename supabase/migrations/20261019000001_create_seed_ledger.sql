@@ -0,0 +1,27 @@
+-- ============================================================================
+-- 20261019000001_create_seed_ledger.sql
+-- 説明: 生成シードの適用台帳 (seed_name → checksum)
+-- 目的: scripts/generate-*.py が出力するシード/マイグレーションSQLが、
+--       同じチェックサムで適用済みの場合に1回のインデックス参照で終了できるようにする
+-- ============================================================================
+
+-- ============================================================================
+-- seed_ledger テーブル
+-- ============================================================================
+-- 生成SQL側でも CREATE TABLE IF NOT EXISTS で同じ定義を自己充足している（適用順序に依存しない）
+CREATE TABLE IF NOT EXISTS public.seed_ledger (
+  seed_name  TEXT PRIMARY KEY,                    -- 例: math_questions_2026
+  checksum   TEXT NOT NULL,                       -- 生成SQLの sha256（ヘッダーに記載）
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- RLS有効化（ポリシーなし: シード適用は postgres / service_role のみ）
+ALTER TABLE public.seed_ledger ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE public.seed_ledger IS '生成シードの適用台帳（同一チェックサムの再適用をスキップする）';
+COMMENT ON COLUMN public.seed_ledger.checksum IS '生成SQLの sha256（scripts/seedgen/ledger.py で算出）';
+
+-- ============================================================================
+-- ロールバック
+-- ============================================================================
+-- DROP TABLE IF EXISTS public.seed_ledger;
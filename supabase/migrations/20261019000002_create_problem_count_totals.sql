@@ -0,0 +1,84 @@
+-- ============================================================================
+-- 20261019000002_create_problem_count_totals.sql
+-- 説明: 学年×コース×回×科目ごとの問題数合計（problem_counts の集計済みテーブル）
+-- 目的: ダッシュボード・進捗表示で problem_counts を study_content_types / subjects /
+--       study_sessions と JOIN して毎回集計する代わりに、集計済みの値を読む
+-- 更新: problem_counts / study_content_types を変更した文の後にトリガーで全面再集計する
+--       （生成マイグレーションでの投入も、SQL Editor での問題数の手修正も同じ経路で反映される）
+-- ============================================================================
+
+-- ============================================================================
+-- problem_count_totals テーブル
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS public.problem_count_totals (
+  session_id BIGINT NOT NULL REFERENCES public.study_sessions(id) ON DELETE CASCADE,
+  subject_id BIGINT NOT NULL REFERENCES public.subjects(id) ON DELETE CASCADE,
+  course course_level NOT NULL,
+  grade SMALLINT NOT NULL CHECK (grade IN (5, 6)),
+  content_count SMALLINT NOT NULL,       -- 問題数が登録されている学習内容の数
+  total_problems INTEGER NOT NULL,       -- 学習内容の問題数の合計
+  PRIMARY KEY (session_id, course, subject_id)
+);
+
+-- 学年・コース単位の一覧取得用（回・科目の並びで返す）
+CREATE INDEX IF NOT EXISTS idx_problem_count_totals_grade_course
+  ON public.problem_count_totals(grade, course, session_id);
+
+-- RLS有効化 (全ユーザー閲覧可能、problem_counts と同じ)
+ALTER TABLE public.problem_count_totals ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "All authenticated users can view problem count totals"
+  ON public.problem_count_totals FOR SELECT TO authenticated
+  USING (true);
+
+COMMENT ON TABLE public.problem_count_totals IS '問題数合計 (学年×コース×回×科目, problem_counts からトリガーで再集計)';
+COMMENT ON COLUMN public.problem_count_totals.content_count IS '問題数が登録されている学習内容の数';
+COMMENT ON COLUMN public.problem_count_totals.total_problems IS '学習内容の問題数の合計';
+
+-- ============================================================================
+-- 再集計関数・トリガー
+-- ============================================================================
+-- 数百行の表なので差分管理はせず、変更のあった文ごとに1回だけ全面再集計する（FOR EACH STATEMENT）
+CREATE OR REPLACE FUNCTION public.refresh_problem_count_totals()
+RETURNS VOID AS $$
+BEGIN
+  DELETE FROM public.problem_count_totals;
+  INSERT INTO public.problem_count_totals
+    (session_id, subject_id, course, grade, content_count, total_problems)
+  SELECT pc.session_id, sct.subject_id, sct.course, sct.grade, count(*), sum(pc.total_problems)
+  FROM public.problem_counts pc
+  JOIN public.study_content_types sct ON sct.id = pc.study_content_type_id
+  GROUP BY pc.session_id, sct.subject_id, sct.course, sct.grade;
+END;
+$$ LANGUAGE plpgsql SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.refresh_problem_count_totals_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+  PERFORM public.refresh_problem_count_totals();
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SET search_path = public;
+
+-- study_content_types の DELETE は CASCADE で problem_counts の DELETE として届く
+CREATE TRIGGER trg_problem_counts_refresh_totals
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.problem_counts
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.refresh_problem_count_totals_trigger();
+
+CREATE TRIGGER trg_study_content_types_refresh_totals
+  AFTER UPDATE OF grade, subject_id, course ON public.study_content_types
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.refresh_problem_count_totals_trigger();
+
+-- 既存の problem_counts から初回集計
+SELECT public.refresh_problem_count_totals();
+
+-- ============================================================================
+-- ロールバック
+-- ============================================================================
+-- DROP TRIGGER IF EXISTS trg_study_content_types_refresh_totals ON public.study_content_types;
+-- DROP TRIGGER IF EXISTS trg_problem_counts_refresh_totals ON public.problem_counts;
+-- DROP FUNCTION IF EXISTS public.refresh_problem_count_totals_trigger();
+-- DROP FUNCTION IF EXISTS public.refresh_problem_count_totals();
+-- DROP TABLE IF EXISTS public.problem_count_totals;
@@ -0,0 +1,69 @@
+-- ============================================================================
+-- 単位辞書 (math_units) + questions の型付き解答列
+-- ============================================================================
+-- 目的: unit_label の自由文字列を smallint の単位 ID に置き換え、
+--       selection の正答・ダミーを JSONB ではなく text[] で持てるようにする
+--       （行幅の削減と、採点時の answer_config デコードの削減）
+-- 投入: scripts/generate-math-questions-sql.py --typed-columns の出力
+-- 影響: questions に列を3本追加し、整合性 CHECK を型付き列も受け入れるよう修正
+-- 既存データ: なし（新列は NULL 許容、新制約は既存値をすべて受け入れる）
+-- 冪等性: IF NOT EXISTS / IF EXISTS で何度実行しても安全
+-- ロールバック: 末尾参照
+-- ============================================================================
+
+BEGIN;
+
+-- 1. 単位辞書
+CREATE TABLE IF NOT EXISTS public.math_units (
+  id    SMALLINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+  label VARCHAR(50) NOT NULL UNIQUE              -- "個", "㎠", "通り" 等
+);
+
+ALTER TABLE public.math_units ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "read_math_units" ON public.math_units;
+CREATE POLICY "read_math_units"
+  ON public.math_units FOR SELECT TO authenticated
+  USING (true);
+
+COMMENT ON TABLE public.math_units IS '算数の表示単位辞書（questions.unit_id から参照）';
+
+-- 2. questions の型付き列
+ALTER TABLE public.questions
+  ADD COLUMN IF NOT EXISTS unit_id        SMALLINT REFERENCES public.math_units(id),
+  ADD COLUMN IF NOT EXISTS correct_values TEXT[],
+  ADD COLUMN IF NOT EXISTS dummy_values   TEXT[];
+
+COMMENT ON COLUMN public.questions.unit_id IS '表示単位（math_units.id）。unit_label の代替。NULL=単位なし';
+COMMENT ON COLUMN public.questions.correct_values IS 'selection の正答（answer_config の代替）';
+COMMENT ON COLUMN public.questions.dummy_values IS 'selection のダミー選択肢（answer_config の代替）';
+
+-- 3. 整合性制約: selection は answer_config か correct_values + dummy_values のどちらかがあればよい
+ALTER TABLE public.questions DROP CONSTRAINT IF EXISTS questions_answer_integrity_check;
+ALTER TABLE public.questions
+  ADD CONSTRAINT questions_answer_integrity_check
+  CHECK (
+    (answer_type IN ('numeric', 'fraction') AND correct_answer IS NOT NULL)
+    OR
+    (answer_type IN ('multi_part', 'selection') AND answer_config IS NOT NULL)
+    OR
+    (answer_type = 'selection' AND correct_values IS NOT NULL AND dummy_values IS NOT NULL)
+    OR
+    (answer_type = 'note')
+  );
+
+COMMIT;
+
+-- ============================================================================
+-- ロールバック
+-- ============================================================================
+-- BEGIN;
+-- ALTER TABLE public.questions DROP CONSTRAINT IF EXISTS questions_answer_integrity_check;
+-- ALTER TABLE public.questions ADD CONSTRAINT questions_answer_integrity_check CHECK (
+--   (answer_type IN ('numeric', 'fraction') AND correct_answer IS NOT NULL)
+--   OR (answer_type IN ('multi_part', 'selection') AND answer_config IS NOT NULL)
+--   OR (answer_type = 'note'));
+-- ALTER TABLE public.questions DROP COLUMN IF EXISTS unit_id,
+--   DROP COLUMN IF EXISTS correct_values, DROP COLUMN IF EXISTS dummy_values;
+-- DROP TABLE IF EXISTS public.math_units;
+-- COMMIT;
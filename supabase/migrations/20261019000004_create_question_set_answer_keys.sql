@@ -0,0 +1,126 @@
+-- ============================================================================
+-- question_set_answer_keys: セット単位の採点キー（questions の正答を1行に詰めたもの）
+-- ============================================================================
+-- 目的: プリント1枚の採点を questions の N 行取得ではなく、主キー1行の取得で済ませる
+-- 投入: scripts/generate-math-questions-sql.py（questions と同じブロック内で UPSERT）
+--       既存セットは本マイグレーションで questions から作成する
+-- 同期: questions の INSERT / UPDATE / DELETE（SQL Editor での問題追加・正答修正など）は
+--       文単位のトリガーで触れたセットのキーを作り直す
+--       手動で作り直す場合は SELECT public.refresh_question_set_answer_keys(ARRAY[<question_set_id>]);
+-- 形式: answer_key は display_order 順の配列。要素は
+--         numeric / fraction: {"t": 型, "a": 正答, "p": 配点}
+--         multi_part:         {"t": "multi_part", "a": {ラベル: 正答}, "s": [ラベル...], "p": 配点}
+--         selection:          {"t": "selection", "a": [正答（前後の空白除去・重複除去・ソート済み）], "p": 配点}
+--                             空白は Python の str.isspace() と同じ集合（全角スペース U+3000 を含む）
+--         note:               {"t": "note", "a": null, "p": 配点}
+--       question_ids[i] が answer_key[i] の questions.id（student_answers との対応付け用）
+-- 権限: RLS 有効・ポリシーなし（正答を含むため service_role の採点処理のみが読む）
+-- ロールバック:
+--   DROP TRIGGER IF EXISTS trg_questions_answer_keys_insert ON public.questions;
+--   DROP TRIGGER IF EXISTS trg_questions_answer_keys_update ON public.questions;
+--   DROP TRIGGER IF EXISTS trg_questions_answer_keys_delete ON public.questions;
+--   DROP FUNCTION IF EXISTS public.sync_question_set_answer_keys_trigger();
+--   DROP FUNCTION IF EXISTS public.refresh_question_set_answer_keys(BIGINT[]);
+--   DROP TABLE IF EXISTS public.question_set_answer_keys;
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.question_set_answer_keys (
+  question_set_id BIGINT PRIMARY KEY REFERENCES public.question_sets(id) ON DELETE CASCADE,
+  question_ids    BIGINT[] NOT NULL,
+  answer_key      JSONB NOT NULL CHECK (jsonb_typeof(answer_key) = 'array'),
+  updated_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+
+  CHECK (cardinality(question_ids) = jsonb_array_length(answer_key))
+);
+
+ALTER TABLE public.question_set_answer_keys ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE public.question_set_answer_keys IS 'セット単位の採点キー（display_order 順の正答配列 + 対応する questions.id）';
+COMMENT ON COLUMN public.question_set_answer_keys.answer_key IS 'display_order 順の正答配列（形式は本マイグレーションのヘッダー参照）';
+
+-- 指定セットのキーを questions から作り直す（questions が残っていないセットのキーは削除）
+-- 要素の形式は generate-math-questions-sql.py answer_key_entry() と同じ
+-- selection の前後の空白は ANSWER_TRIM_CHARS と同じ文字で除く（trim() は ASCII の空白しか除かない）
+CREATE OR REPLACE FUNCTION public.refresh_question_set_answer_keys(p_question_set_ids BIGINT[])
+RETURNS VOID AS $$
+BEGIN
+  DELETE FROM public.question_set_answer_keys k
+  WHERE k.question_set_id = ANY (p_question_set_ids)
+    AND NOT EXISTS (SELECT 1 FROM public.questions q WHERE q.question_set_id = k.question_set_id);
+
+  INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+  SELECT
+    q.question_set_id,
+    array_agg(q.id ORDER BY q.display_order),
+    jsonb_agg(
+      CASE q.answer_type
+        WHEN 'multi_part' THEN jsonb_build_object(
+          't', q.answer_type,
+          'a', q.answer_config -> 'correct_values',
+          's', (SELECT jsonb_agg(slot -> 'label' ORDER BY ord)
+                FROM jsonb_array_elements(q.answer_config -> 'slots') WITH ORDINALITY AS t(slot, ord)),
+          'p', q.points)
+        WHEN 'selection' THEN jsonb_build_object(
+          't', q.answer_type,
+          'a', (SELECT jsonb_agg(v ORDER BY v COLLATE "C")
+                FROM (SELECT DISTINCT btrim(x, U&'\0009\000A\000B\000C\000D\001C\001D\001E\001F\0020\0085\00A0\1680'
+                                                 '\2000\2001\2002\2003\2004\2005\2006\2007\2008\2009\200A'
+                                                 '\2028\2029\202F\205F\3000') AS v
+                      FROM unnest(COALESCE(
+                        q.correct_values,
+                        ARRAY(SELECT jsonb_array_elements_text(q.answer_config -> 'correct_values'))
+                      )) AS x) d),
+          'p', q.points)
+        ELSE jsonb_build_object('t', q.answer_type, 'a', q.correct_answer, 'p', q.points)
+      END
+      ORDER BY q.display_order)
+  FROM public.questions q
+  WHERE q.question_set_id = ANY (p_question_set_ids)
+  GROUP BY q.question_set_id
+  ON CONFLICT (question_set_id) DO UPDATE
+    SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+END;
+$$ LANGUAGE plpgsql SET search_path = public;
+
+-- 変更のあった文ごとに、触れたセットだけ作り直す（遷移テーブルでセット ID を集める）
+CREATE OR REPLACE FUNCTION public.sync_question_set_answer_keys_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    PERFORM public.refresh_question_set_answer_keys(
+      ARRAY(SELECT DISTINCT question_set_id FROM new_rows));
+  ELSIF TG_OP = 'DELETE' THEN
+    PERFORM public.refresh_question_set_answer_keys(
+      ARRAY(SELECT DISTINCT question_set_id FROM old_rows));
+  ELSE
+    PERFORM public.refresh_question_set_answer_keys(
+      ARRAY(SELECT question_set_id FROM old_rows UNION SELECT question_set_id FROM new_rows));
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SET search_path = public;
+
+CREATE TRIGGER trg_questions_answer_keys_insert
+  AFTER INSERT ON public.questions
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.sync_question_set_answer_keys_trigger();
+
+CREATE TRIGGER trg_questions_answer_keys_update
+  AFTER UPDATE ON public.questions
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.sync_question_set_answer_keys_trigger();
+
+CREATE TRIGGER trg_questions_answer_keys_delete
+  AFTER DELETE ON public.questions
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.sync_question_set_answer_keys_trigger();
+
+-- 既存セットのキーを questions から作成
+SELECT public.refresh_question_set_answer_keys(ARRAY(SELECT DISTINCT question_set_id FROM public.questions));
+
+COMMIT;
@@ -0,0 +1,48 @@
+-- ============================================================================
+-- question_search_terms: 算数の問題検索用の転置インデックス
+-- ============================================================================
+-- 目的: 指導者が 正答・単位・セクション名（類題3, 計算練習）・プリント名 から問題を引くとき、
+--       questions を LIKE で全件走査せず、検索語の B-tree 索引の参照で済ませる
+-- 投入: scripts/generate-math-questions-sql.py がセットごとに作り直す（approved 済みセットも対象）
+-- 形式: term は NFKC 正規化・小文字化済み（lib/question-search.ts normalizeSearchText と同じ規則）
+--         answer:  正答（numeric / fraction の値、multi_part の各スロット、selection の正答）
+--         unit:    単位（multi_part はスロットの単位）
+--         section: セクション名と末尾の番号を除いた語（"類題3" → "類題3", "類題"）
+--         title:   プリント名の空白区切りの語と、3文字以上の語の2文字組（部分一致用）
+--       display_order は questions.display_order。title はセット全体に付くので 0
+-- 権限: 正答を含むため 指導者・管理者のみ SELECT 可
+-- 冪等性: IF NOT EXISTS / DROP POLICY IF EXISTS で何度実行しても安全
+-- ロールバック: DROP TABLE IF EXISTS public.question_search_terms;
+-- ============================================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.question_search_terms (
+  term            VARCHAR(100) COLLATE "C" NOT NULL,  -- "C" 照合順序で前方一致 (LIKE 'x%') にも索引が効く
+  kind            VARCHAR(10) NOT NULL CHECK (kind IN ('answer', 'unit', 'section', 'title')),
+  question_set_id BIGINT NOT NULL REFERENCES public.question_sets(id) ON DELETE CASCADE,
+  display_order   SMALLINT NOT NULL CHECK (display_order >= 0),
+
+  PRIMARY KEY (term, kind, question_set_id, display_order)
+);
+
+-- セット単位の作り直し (DELETE ... WHERE question_set_id = ?) 用
+CREATE INDEX IF NOT EXISTS idx_question_search_terms_set
+  ON public.question_search_terms (question_set_id);
+
+ALTER TABLE public.question_search_terms ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "coaches_read_question_search_terms" ON public.question_search_terms;
+CREATE POLICY "coaches_read_question_search_terms"
+  ON public.question_search_terms FOR SELECT TO authenticated
+  USING (
+    EXISTS (
+      SELECT 1 FROM public.profiles
+      WHERE id = auth.uid() AND role IN ('coach', 'admin')
+    )
+  );
+
+COMMENT ON TABLE public.question_search_terms IS '算数の問題検索用の転置インデックス（検索語 → セット・display_order）';
+COMMENT ON COLUMN public.question_search_terms.display_order IS 'questions.display_order（title はセット全体なので 0）';
+
+COMMIT;
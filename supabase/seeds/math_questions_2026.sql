@@ -2,6 +2,7 @@
 -- 算数自動採点 — 本番問題データ (809問)
 -- ============================================================================
 -- 生成元: scripts/generate-math-questions-sql.py
+-- チェックサム: sha256:c5da83ed287dbcfd9cc79c18ccf34ed6b61e4e56569f07177e116d8cf484214a (seed_ledger: math_questions_2026)
 -- 再生成: python3 scripts/generate-math-questions-sql.py > supabase/seeds/math_questions_2026.sql
 --
 -- 内容:
@@ -10,6 +11,13 @@
 --
 -- 注意: approved済みセットはスキップ、draft は approved に昇格して再投入
 
+-- シード適用台帳（supabase/migrations/20261019000001_create_seed_ledger.sql と同一定義）
+CREATE TABLE IF NOT EXISTS public.seed_ledger (
+  seed_name  TEXT PRIMARY KEY,
+  checksum   TEXT NOT NULL,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 DO $$
 DECLARE
   v_math_id         BIGINT;
@@ -19,25 +27,88 @@ DECLARE
   v_count           INTEGER := 0;
   v_existing_id     BIGINT;
   v_existing_status VARCHAR(20);
+  v_missing         TEXT;
 BEGIN
+  -- 同一チェックサムで適用済みならスキップ (seed_ledger)
+  IF EXISTS (SELECT 1 FROM public.seed_ledger
+             WHERE seed_name = 'math_questions_2026' AND checksum = 'c5da83ed287dbcfd9cc79c18ccf34ed6b61e4e56569f07177e116d8cf484214a') THEN
+    RAISE NOTICE 'スキップ: math_questions_2026 は適用済み（checksum 一致）';
+    RETURN;
+  END IF;
 
   -- 算数の subject_id を取得
-  SELECT id INTO STRICT v_math_id
-  FROM public.subjects WHERE name = '算数';
+  SELECT id INTO STRICT v_math_id FROM public.subjects WHERE name = '算数';
+
+  -- 全セットの参照先 ID をまとめて解決（study_sessions / assessment_masters / 既存 question_sets）
+  CREATE TEMP TABLE math_set_ids (
+    grade SMALLINT NOT NULL,
+    session_number SMALLINT NOT NULL,
+    set_order SMALLINT NOT NULL,
+    session_id BIGINT,
+    assessment_master_id UUID,
+    existing_id BIGINT,
+    existing_status VARCHAR(20)
+  ) ON COMMIT DROP;
+  INSERT INTO math_set_ids (grade, session_number, set_order, session_id, assessment_master_id, existing_id, existing_status)
+  SELECT k.grade, k.session_number, k.set_order, ss.id, am.id, qs.id, qs.status
+  FROM (VALUES
+    (5, 1, 1),
+    (5, 1, 2),
+    (5, 2, 1),
+    (5, 2, 2),
+    (5, 3, 1),
+    (5, 3, 2),
+    (5, 4, 1),
+    (5, 4, 2),
+    (6, 1, 1),
+    (6, 1, 2),
+    (6, 2, 1),
+    (6, 2, 2),
+    (6, 3, 1),
+    (6, 3, 2),
+    (6, 4, 1),
+    (6, 4, 2),
+    (5, 6, 1),
+    (5, 6, 2),
+    (5, 7, 1),
+    (5, 7, 2),
+    (5, 8, 1),
+    (5, 8, 2),
+    (5, 9, 1),
+    (5, 9, 2),
+    (6, 6, 1),
+    (6, 6, 2),
+    (6, 7, 1),
+    (6, 7, 2),
+    (6, 8, 1),
+    (6, 8, 2)
+  ) AS k(grade, session_number, set_order)
+  LEFT JOIN public.study_sessions ss
+    ON ss.grade = k.grade AND ss.session_number = k.session_number
+  LEFT JOIN public.assessment_masters am
+    ON am.assessment_type = 'math_print' AND am.grade = k.grade::text || '年'
+   AND am.session_number = k.session_number AND am.attempt_number = k.set_order
+  LEFT JOIN public.question_sets qs
+    ON qs.session_id = ss.id AND qs.subject_id = v_math_id
+   AND qs.display_order = k.set_order AND qs.set_type = 'master_print';
+
+  SELECT string_agg(format('小%s 第%s回%s（%s なし）', grade, session_number,
+           CASE set_order WHEN 1 THEN '①' ELSE '②' END,
+           CASE WHEN session_id IS NULL THEN 'study_sessions' ELSE 'assessment_masters' END),
+         ', ' ORDER BY grade, session_number, set_order)
+  INTO v_missing
+  FROM math_set_ids
+  WHERE session_id IS NULL OR assessment_master_id IS NULL;
+  IF v_missing IS NOT NULL THEN
+    RAISE EXCEPTION '算数セットの参照先が見つかりません: %', v_missing;
+  END IF;
 
   -- ========================================
   -- 小5 第1回① 倍数と約数の利用 (40問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 1;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 1 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 1 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第1回① 倍数と約数の利用（approved済み）';
@@ -60,10 +131,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '11', '個', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '10', '個', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '12', '個', NULL, 1, 3),
@@ -105,22 +173,165 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '126', NULL, NULL, 1, 39),
     (v_qs, '(20)', '計算練習', 'numeric', '105', NULL, NULL, 1, 40);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "11", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "selection", "a": ["10", "15", "30", "5", "6"], "p": 1}, {"t": "selection", "a": ["12", "18", "36", "9"], "p": 1}, {"t": "selection", "a": ["14", "21", "42", "7"], "p": 1}, {"t": "selection", "a": ["16", "32"], "p": 1}, {"t": "selection", "a": ["12", "18", "36"], "p": 1}, {"t": "multi_part", "a": {"①": "180", "②": "1020"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "360", "②": "990"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "240", "②": "2016"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "900", "②": "1980"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "840", "②": "560"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "105", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "128", "p": 1}, {"t": "numeric", "a": "144", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "128", "p": 1}, {"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "126", "p": 1}, {"t": "numeric", "a": "105", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 40;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第1回1', 'title', v_qs, 0),
+    ('第1', 'title', v_qs, 0),
+    ('1回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('倍数と約数の利用', 'title', v_qs, 0),
+    ('倍数', 'title', v_qs, 0),
+    ('数と', 'title', v_qs, 0),
+    ('と約', 'title', v_qs, 0),
+    ('約数', 'title', v_qs, 0),
+    ('数の', 'title', v_qs, 0),
+    ('の利', 'title', v_qs, 0),
+    ('利用', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('11', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('10', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('個', 'unit', v_qs, 3),
+    ('12', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('個', 'unit', v_qs, 4),
+    ('12', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('個', 'unit', v_qs, 5),
+    ('33', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('個', 'unit', v_qs, 6),
+    ('12', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('個', 'unit', v_qs, 7),
+    ('28', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('個', 'unit', v_qs, 8),
+    ('12', 'answer', v_qs, 8),
+    ('類題1', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('個', 'unit', v_qs, 9),
+    ('16', 'answer', v_qs, 9),
+    ('類題1', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('個', 'unit', v_qs, 10),
+    ('9', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('5', 'answer', v_qs, 11),
+    ('6', 'answer', v_qs, 11),
+    ('10', 'answer', v_qs, 11),
+    ('15', 'answer', v_qs, 11),
+    ('30', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('9', 'answer', v_qs, 12),
+    ('12', 'answer', v_qs, 12),
+    ('18', 'answer', v_qs, 12),
+    ('36', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('7', 'answer', v_qs, 13),
+    ('14', 'answer', v_qs, 13),
+    ('21', 'answer', v_qs, 13),
+    ('42', 'answer', v_qs, 13),
+    ('類題2', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('16', 'answer', v_qs, 14),
+    ('32', 'answer', v_qs, 14),
+    ('類題2', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('12', 'answer', v_qs, 15),
+    ('18', 'answer', v_qs, 15),
+    ('36', 'answer', v_qs, 15),
+    ('類題3', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('180', 'answer', v_qs, 16),
+    ('1020', 'answer', v_qs, 16),
+    ('類題3', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('360', 'answer', v_qs, 17),
+    ('990', 'answer', v_qs, 17),
+    ('類題3', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('240', 'answer', v_qs, 18),
+    ('2016', 'answer', v_qs, 18),
+    ('類題3', 'section', v_qs, 19),
+    ('類題', 'section', v_qs, 19),
+    ('900', 'answer', v_qs, 19),
+    ('1980', 'answer', v_qs, 19),
+    ('類題3', 'section', v_qs, 20),
+    ('類題', 'section', v_qs, 20),
+    ('840', 'answer', v_qs, 20),
+    ('560', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('72', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('70', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('120', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('64', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('108', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('105', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('72', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('108', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('84', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('75', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('128', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('144', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('96', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('125', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('84', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('128', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('180', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('84', 'answer', v_qs, 38),
+    ('計算練習', 'section', v_qs, 39),
+    ('126', 'answer', v_qs, 39),
+    ('計算練習', 'section', v_qs, 40),
+    ('105', 'answer', v_qs, 40);
+
   -- ========================================
   -- 小5 第1回② 倍数と約数の利用 (35問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 1;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 1 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 1 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第1回② 倍数と約数の利用（approved済み）';
@@ -143,10 +354,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題（基本問題１(8)）', 'selection', NULL, NULL, '{"correct_values": ["32", "62", "92"], "dummy_values": ["22", "52", "82"]}', 1, 1),
     (v_qs, '(2)', '類題（基本問題１(8)）', 'selection', NULL, NULL, '{"correct_values": ["13", "25", "37"], "dummy_values": ["7", "19", "43"]}', 1, 2),
     (v_qs, '(3)', '類題（基本問題１(8)）', 'selection', NULL, NULL, '{"correct_values": ["17", "32", "47"], "dummy_values": ["7", "22", "52"]}', 1, 3),
@@ -183,22 +391,142 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '3', NULL, NULL, 1, 34),
     (v_qs, '(20)', '計算練習', 'numeric', '5', NULL, NULL, 1, 35);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "selection", "a": ["32", "62", "92"], "p": 1}, {"t": "selection", "a": ["13", "25", "37"], "p": 1}, {"t": "selection", "a": ["17", "32", "47"], "p": 1}, {"t": "selection", "a": ["21", "39", "57"], "p": 1}, {"t": "selection", "a": ["25", "49", "73"], "p": 1}, {"t": "selection", "a": ["29", "59", "89"], "p": 1}, {"t": "selection", "a": ["17", "35", "53"], "p": 1}, {"t": "selection", "a": ["22", "46", "70"], "p": 1}, {"t": "selection", "a": ["103", "33", "68"], "p": 1}, {"t": "selection", "a": ["107", "35", "71"], "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "7", "p": 1}, {"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "34", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "42", "p": 1}, {"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "5", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 35;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第1回2', 'title', v_qs, 0),
+    ('第1', 'title', v_qs, 0),
+    ('1回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('倍数と約数の利用', 'title', v_qs, 0),
+    ('倍数', 'title', v_qs, 0),
+    ('数と', 'title', v_qs, 0),
+    ('と約', 'title', v_qs, 0),
+    ('約数', 'title', v_qs, 0),
+    ('数の', 'title', v_qs, 0),
+    ('の利', 'title', v_qs, 0),
+    ('利用', 'title', v_qs, 0),
+    ('類題(基本問題1(8))', 'section', v_qs, 1),
+    ('32', 'answer', v_qs, 1),
+    ('62', 'answer', v_qs, 1),
+    ('92', 'answer', v_qs, 1),
+    ('類題(基本問題1(8))', 'section', v_qs, 2),
+    ('13', 'answer', v_qs, 2),
+    ('25', 'answer', v_qs, 2),
+    ('37', 'answer', v_qs, 2),
+    ('類題(基本問題1(8))', 'section', v_qs, 3),
+    ('17', 'answer', v_qs, 3),
+    ('32', 'answer', v_qs, 3),
+    ('47', 'answer', v_qs, 3),
+    ('類題(基本問題1(8))', 'section', v_qs, 4),
+    ('21', 'answer', v_qs, 4),
+    ('39', 'answer', v_qs, 4),
+    ('57', 'answer', v_qs, 4),
+    ('類題(基本問題1(8))', 'section', v_qs, 5),
+    ('25', 'answer', v_qs, 5),
+    ('49', 'answer', v_qs, 5),
+    ('73', 'answer', v_qs, 5),
+    ('類題5', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('29', 'answer', v_qs, 6),
+    ('59', 'answer', v_qs, 6),
+    ('89', 'answer', v_qs, 6),
+    ('類題5', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('17', 'answer', v_qs, 7),
+    ('35', 'answer', v_qs, 7),
+    ('53', 'answer', v_qs, 7),
+    ('類題5', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('22', 'answer', v_qs, 8),
+    ('46', 'answer', v_qs, 8),
+    ('70', 'answer', v_qs, 8),
+    ('類題5', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('33', 'answer', v_qs, 9),
+    ('68', 'answer', v_qs, 9),
+    ('103', 'answer', v_qs, 9),
+    ('類題5', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('35', 'answer', v_qs, 10),
+    ('71', 'answer', v_qs, 10),
+    ('107', 'answer', v_qs, 10),
+    ('類題7', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('個', 'unit', v_qs, 11),
+    ('20', 'answer', v_qs, 11),
+    ('類題7', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('個', 'unit', v_qs, 12),
+    ('7', 'answer', v_qs, 12),
+    ('類題7', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('個', 'unit', v_qs, 13),
+    ('17', 'answer', v_qs, 13),
+    ('類題7', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('個', 'unit', v_qs, 14),
+    ('33', 'answer', v_qs, 14),
+    ('類題7', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('個', 'unit', v_qs, 15),
+    ('34', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('12', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('14', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('24', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('12', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('12', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('18', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('24', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('42', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('25', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('18', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('4', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('4', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('5', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('4', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('8', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('9', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('3', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('5', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('3', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('5', 'answer', v_qs, 35);
+
   -- ========================================
   -- 小5 第2回① いろいろな図形の面積 (38問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 2;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 2 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 2 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第2回① いろいろな図形の面積（approved済み）';
@@ -221,10 +549,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '17', '㎠', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '19', '㎠', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '36.5', '㎠', NULL, 1, 3),
@@ -264,22 +589,150 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '150', NULL, NULL, 1, 37),
     (v_qs, '(20)', '計算練習', 'numeric', '140', NULL, NULL, 1, 38);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "19", "p": 1}, {"t": "numeric", "a": "36.5", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "53", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "49", "p": 1}, {"t": "numeric", "a": "36.48", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "4.71", "p": 1}, {"t": "numeric", "a": "20.56", "p": 1}, {"t": "numeric", "a": "18.24", "p": 1}, {"t": "numeric", "a": "57", "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "numeric", "a": "9.12", "p": 1}, {"t": "numeric", "a": "20.52", "p": 1}, {"t": "numeric", "a": "3.14", "p": 1}, {"t": "numeric", "a": "6.28", "p": 1}, {"t": "numeric", "a": "9.42", "p": 1}, {"t": "numeric", "a": "12.56", "p": 1}, {"t": "numeric", "a": "15.7", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "numeric", "a": "21.98", "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "numeric", "a": "28.26", "p": 1}, {"t": "numeric", "a": "31.4", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "192", "p": 1}, {"t": "numeric", "a": "140", "p": 1}, {"t": "numeric", "a": "216", "p": 1}, {"t": "numeric", "a": "144", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "140", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 38;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回1', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('いろいろな図形の面積', 'title', v_qs, 0),
+    ('いろ', 'title', v_qs, 0),
+    ('ろい', 'title', v_qs, 0),
+    ('ろな', 'title', v_qs, 0),
+    ('な図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形の', 'title', v_qs, 0),
+    ('の面', 'title', v_qs, 0),
+    ('面積', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm2', 'unit', v_qs, 1),
+    ('17', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm2', 'unit', v_qs, 2),
+    ('19', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm2', 'unit', v_qs, 3),
+    ('36.5', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('80', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('53', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('33', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('14', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('18', 'answer', v_qs, 8),
+    ('類題1', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('49', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('36.48', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('16', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('4.71', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('20.56', 'answer', v_qs, 13),
+    ('類題2', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('18.24', 'answer', v_qs, 14),
+    ('類題2', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('57', 'answer', v_qs, 15),
+    ('類題2', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('cm2', 'unit', v_qs, 16),
+    ('25.12', 'answer', v_qs, 16),
+    ('類題2', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('cm2', 'unit', v_qs, 17),
+    ('9.12', 'answer', v_qs, 17),
+    ('類題2', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('cm2', 'unit', v_qs, 18),
+    ('20.52', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('3.14', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('6.28', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('9.42', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('12.56', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('15.7', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('18.84', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('21.98', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('25.12', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('28.26', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('31.4', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('72', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('125', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('84', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('192', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('140', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('216', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('144', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('120', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('150', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('140', 'answer', v_qs, 38);
+
   -- ========================================
   -- 小5 第2回② いろいろな図形の面積 (38問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 2;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 2 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 2 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第2回② いろいろな図形の面積（approved済み）';
@@ -302,10 +755,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '50.24', '㎠', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '28.26', '㎠', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '4.71', '㎠', NULL, 1, 3),
@@ -345,22 +795,130 @@ BEGIN
     (v_qs, '(29)', '計算練習', 'numeric', '150.72', NULL, NULL, 1, 37),
     (v_qs, '(30)', '計算練習', 'numeric', '200.96', NULL, NULL, 1, 38);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "50.24", "p": 1}, {"t": "numeric", "a": "28.26", "p": 1}, {"t": "numeric", "a": "4.71", "p": 1}, {"t": "numeric", "a": "9.42", "p": 1}, {"t": "numeric", "a": "34", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "numeric", "a": "4.71", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "90", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "54", "p": 1}, {"t": "numeric", "a": "76", "p": 1}, {"t": "numeric", "a": "65", "p": 1}, {"t": "numeric", "a": "51", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "3.14", "p": 1}, {"t": "numeric", "a": "6.28", "p": 1}, {"t": "numeric", "a": "9.42", "p": 1}, {"t": "numeric", "a": "12.56", "p": 1}, {"t": "numeric", "a": "15.7", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "numeric", "a": "21.98", "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "numeric", "a": "28.26", "p": 1}, {"t": "numeric", "a": "31.4", "p": 1}, {"t": "numeric", "a": "37.68", "p": 1}, {"t": "numeric", "a": "43.96", "p": 1}, {"t": "numeric", "a": "50.24", "p": 1}, {"t": "numeric", "a": "56.52", "p": 1}, {"t": "numeric", "a": "62.8", "p": 1}, {"t": "numeric", "a": "75.36", "p": 1}, {"t": "numeric", "a": "100.48", "p": 1}, {"t": "numeric", "a": "113.04", "p": 1}, {"t": "numeric", "a": "150.72", "p": 1}, {"t": "numeric", "a": "200.96", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 38;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回2', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('いろいろな図形の面積', 'title', v_qs, 0),
+    ('いろ', 'title', v_qs, 0),
+    ('ろい', 'title', v_qs, 0),
+    ('ろな', 'title', v_qs, 0),
+    ('な図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形の', 'title', v_qs, 0),
+    ('の面', 'title', v_qs, 0),
+    ('面積', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm2', 'unit', v_qs, 1),
+    ('50.24', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm2', 'unit', v_qs, 2),
+    ('28.26', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm2', 'unit', v_qs, 3),
+    ('4.71', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('9.42', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('34', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('18.84', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('4.71', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('4', 'answer', v_qs, 8),
+    ('計算練習', 'section', v_qs, 9),
+    ('96', 'answer', v_qs, 9),
+    ('計算練習', 'section', v_qs, 10),
+    ('90', 'answer', v_qs, 10),
+    ('計算練習', 'section', v_qs, 11),
+    ('64', 'answer', v_qs, 11),
+    ('計算練習', 'section', v_qs, 12),
+    ('70', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('54', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('76', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('65', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('51', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('72', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('75', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('3.14', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('6.28', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('9.42', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('12.56', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('15.7', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('18.84', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('21.98', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('25.12', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('28.26', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('31.4', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('37.68', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('43.96', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('50.24', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('56.52', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('62.8', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('75.36', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('100.48', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('113.04', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('150.72', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('200.96', 'answer', v_qs, 38);
+
   -- ========================================
   -- 小5 第3回① 割合の利用 (38問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 3;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 3 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 3 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第3回① 割合の利用（approved済み）';
@@ -383,10 +941,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '25', '％', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '360', 'mL', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '2000', '円', NULL, 1, 3),
@@ -426,22 +981,146 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '59', NULL, NULL, 1, 37),
     (v_qs, '(20)', '計算練習', 'numeric', '24', NULL, NULL, 1, 38);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "360", "p": 1}, {"t": "numeric", "a": "2000", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "320", "p": 1}, {"t": "numeric", "a": "600", "p": 1}, {"t": "numeric", "a": "140", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "330", "p": 1}, {"t": "numeric", "a": "50", "p": 1}, {"t": "numeric", "a": "220", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "520", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "300", "p": 1}, {"t": "numeric", "a": "61", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "82", "p": 1}, {"t": "numeric", "a": "73", "p": 1}, {"t": "numeric", "a": "74", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "121", "p": 1}, {"t": "numeric", "a": "119", "p": 1}, {"t": "numeric", "a": "192", "p": 1}, {"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "56", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "numeric", "a": "55", "p": 1}, {"t": "numeric", "a": "48", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "76", "p": 1}, {"t": "numeric", "a": "59", "p": 1}, {"t": "numeric", "a": "24", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 38;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第3回1', 'title', v_qs, 0),
+    ('第3', 'title', v_qs, 0),
+    ('3回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('割合の利用', 'title', v_qs, 0),
+    ('割合', 'title', v_qs, 0),
+    ('合の', 'title', v_qs, 0),
+    ('の利', 'title', v_qs, 0),
+    ('利用', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('%', 'unit', v_qs, 1),
+    ('25', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('ml', 'unit', v_qs, 2),
+    ('360', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('円', 'unit', v_qs, 3),
+    ('2000', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('%', 'unit', v_qs, 4),
+    ('64', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('g', 'unit', v_qs, 5),
+    ('320', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('円', 'unit', v_qs, 6),
+    ('600', 'answer', v_qs, 6),
+    ('類題2', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('ページ', 'unit', v_qs, 7),
+    ('140', 'answer', v_qs, 7),
+    ('類題2', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('問', 'unit', v_qs, 8),
+    ('150', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('ページ', 'unit', v_qs, 9),
+    ('330', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('問', 'unit', v_qs, 10),
+    ('50', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('ページ', 'unit', v_qs, 11),
+    ('220', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('問', 'unit', v_qs, 12),
+    ('60', 'answer', v_qs, 12),
+    ('類題3', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('人', 'unit', v_qs, 13),
+    ('200', 'answer', v_qs, 13),
+    ('類題3', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('人', 'unit', v_qs, 14),
+    ('120', 'answer', v_qs, 14),
+    ('類題3', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('人', 'unit', v_qs, 15),
+    ('180', 'answer', v_qs, 15),
+    ('類題3', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('人', 'unit', v_qs, 16),
+    ('520', 'answer', v_qs, 16),
+    ('類題3', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('人', 'unit', v_qs, 17),
+    ('120', 'answer', v_qs, 17),
+    ('類題3', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('人', 'unit', v_qs, 18),
+    ('300', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('61', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('72', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('82', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('73', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('74', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('100', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('121', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('119', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('192', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('180', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('56', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('28', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('55', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('48', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('18', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('108', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('72', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('76', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('59', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('24', 'answer', v_qs, 38);
+
   -- ========================================
   -- 小5 第3回② 相当算 (28問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 3;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 3 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 3 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第3回② 相当算（approved済み）';
@@ -464,10 +1143,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題4', 'numeric', '120', 'ページ', NULL, 1, 1),
     (v_qs, '(2)', '類題4', 'numeric', '1200', '円', NULL, 1, 2),
     (v_qs, '(3)', '類題4', 'numeric', '6000', '円', NULL, 1, 3),
@@ -497,22 +1173,112 @@ BEGIN
     (v_qs, '(15)', '計算練習', 'numeric', '81', NULL, NULL, 1, 27),
     (v_qs, '(16)', '計算練習', 'numeric', '72', NULL, NULL, 1, 28);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "1200", "p": 1}, {"t": "numeric", "a": "6000", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "5000", "p": 1}, {"t": "numeric", "a": "300", "p": 1}, {"t": "numeric", "a": "185", "p": 1}, {"t": "numeric", "a": "210", "p": 1}, {"t": "numeric", "a": "550", "p": 1}, {"t": "numeric", "a": "2400", "p": 1}, {"t": "numeric", "a": "195", "p": 1}, {"t": "numeric", "a": "975", "p": 1}, {"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "54", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "21", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "36", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "81", "p": 1}, {"t": "numeric", "a": "72", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 28;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第3回2', 'title', v_qs, 0),
+    ('第3', 'title', v_qs, 0),
+    ('3回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('相当算', 'title', v_qs, 0),
+    ('相当', 'title', v_qs, 0),
+    ('当算', 'title', v_qs, 0),
+    ('類題4', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('ページ', 'unit', v_qs, 1),
+    ('120', 'answer', v_qs, 1),
+    ('類題4', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('円', 'unit', v_qs, 2),
+    ('1200', 'answer', v_qs, 2),
+    ('類題4', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('円', 'unit', v_qs, 3),
+    ('6000', 'answer', v_qs, 3),
+    ('類題4', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('ページ', 'unit', v_qs, 4),
+    ('120', 'answer', v_qs, 4),
+    ('類題4', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('円', 'unit', v_qs, 5),
+    ('5000', 'answer', v_qs, 5),
+    ('類題4', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('ページ', 'unit', v_qs, 6),
+    ('300', 'answer', v_qs, 6),
+    ('類題4', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('ページ', 'unit', v_qs, 7),
+    ('185', 'answer', v_qs, 7),
+    ('類題4', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('ページ', 'unit', v_qs, 8),
+    ('210', 'answer', v_qs, 8),
+    ('類題4', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('円', 'unit', v_qs, 9),
+    ('550', 'answer', v_qs, 9),
+    ('類題4', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('円', 'unit', v_qs, 10),
+    ('2400', 'answer', v_qs, 10),
+    ('類題4', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('ページ', 'unit', v_qs, 11),
+    ('195', 'answer', v_qs, 11),
+    ('類題4', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('円', 'unit', v_qs, 12),
+    ('975', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('24', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('18', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('15', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('10', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('12', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('20', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('8', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('32', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('54', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('32', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('21', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('30', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('36', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('32', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('81', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('72', 'answer', v_qs, 28);
+
   -- ========================================
   -- 小5 第4回① 差集め算 (32問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 4;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 4 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 4 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第4回① 差集め算（approved済み）';
@@ -535,10 +1301,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '900', '円', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '2400', '円', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '4050', '円', NULL, 1, 3),
@@ -572,22 +1335,121 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '1260', NULL, NULL, 1, 31),
     (v_qs, '(20)', '計算練習', 'numeric', '1050', NULL, NULL, 1, 32);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "900", "p": 1}, {"t": "numeric", "a": "2400", "p": 1}, {"t": "numeric", "a": "4050", "p": 1}, {"t": "numeric", "a": "2750", "p": 1}, {"t": "numeric", "a": "3400", "p": 1}, {"t": "numeric", "a": "5250", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "78", "p": 1}, {"t": "numeric", "a": "91", "p": 1}, {"t": "numeric", "a": "90", "p": 1}, {"t": "numeric", "a": "720", "p": 1}, {"t": "numeric", "a": "700", "p": 1}, {"t": "numeric", "a": "1200", "p": 1}, {"t": "numeric", "a": "640", "p": 1}, {"t": "numeric", "a": "1080", "p": 1}, {"t": "numeric", "a": "1050", "p": 1}, {"t": "numeric", "a": "720", "p": 1}, {"t": "numeric", "a": "1080", "p": 1}, {"t": "numeric", "a": "840", "p": 1}, {"t": "numeric", "a": "750", "p": 1}, {"t": "numeric", "a": "1280", "p": 1}, {"t": "numeric", "a": "1440", "p": 1}, {"t": "numeric", "a": "960", "p": 1}, {"t": "numeric", "a": "1250", "p": 1}, {"t": "numeric", "a": "840", "p": 1}, {"t": "numeric", "a": "1280", "p": 1}, {"t": "numeric", "a": "1800", "p": 1}, {"t": "numeric", "a": "840", "p": 1}, {"t": "numeric", "a": "1260", "p": 1}, {"t": "numeric", "a": "1050", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 32;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第4回1', 'title', v_qs, 0),
+    ('第4', 'title', v_qs, 0),
+    ('4回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('差集め算', 'title', v_qs, 0),
+    ('差集', 'title', v_qs, 0),
+    ('集め', 'title', v_qs, 0),
+    ('め算', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('円', 'unit', v_qs, 1),
+    ('900', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('円', 'unit', v_qs, 2),
+    ('2400', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('円', 'unit', v_qs, 3),
+    ('4050', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('円', 'unit', v_qs, 4),
+    ('2750', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('円', 'unit', v_qs, 5),
+    ('3400', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('円', 'unit', v_qs, 6),
+    ('5250', 'answer', v_qs, 6),
+    ('類題2', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('枚', 'unit', v_qs, 7),
+    ('100', 'answer', v_qs, 7),
+    ('類題2', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('個', 'unit', v_qs, 8),
+    ('33', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('本', 'unit', v_qs, 9),
+    ('10', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('枚', 'unit', v_qs, 10),
+    ('78', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('個', 'unit', v_qs, 11),
+    ('91', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('本', 'unit', v_qs, 12),
+    ('90', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('720', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('700', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('1200', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('640', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('1080', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('1050', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('720', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('1080', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('840', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('750', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('1280', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('1440', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('960', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('1250', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('840', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('1280', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('1800', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('840', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('1260', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('1050', 'answer', v_qs, 32);
+
   -- ========================================
   -- 小5 第4回② 差集め算 (32問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 4;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 4 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 4 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第4回② 差集め算（approved済み）';
@@ -610,10 +1472,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "A", "unit": "個"}, {"label": "B", "unit": "個"}], "correct_values": {"A": "14", "B": "11"}, "template": "A{A}個，B{B}個"}', 1, 1),
     (v_qs, '(2)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "A", "unit": "個"}, {"label": "B", "unit": "個"}], "correct_values": {"A": "34", "B": "30"}, "template": "A{A}個，B{B}個"}', 1, 2),
     (v_qs, '(3)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "A", "unit": "個"}, {"label": "B", "unit": "個"}], "correct_values": {"A": "25", "B": "20"}, "template": "A{A}個，B{B}個"}', 1, 3),
@@ -647,22 +1506,129 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '14', NULL, NULL, 1, 31),
     (v_qs, '(20)', '計算練習', 'numeric', '6', NULL, NULL, 1, 32);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"A": "14", "B": "11"}, "s": ["A", "B"], "p": 1}, {"t": "multi_part", "a": {"A": "34", "B": "30"}, "s": ["A", "B"], "p": 1}, {"t": "multi_part", "a": {"A": "25", "B": "20"}, "s": ["A", "B"], "p": 1}, {"t": "multi_part", "a": {"A": "18", "B": "12"}, "s": ["A", "B"], "p": 1}, {"t": "numeric", "a": "1540", "p": 1}, {"t": "numeric", "a": "490", "p": 1}, {"t": "numeric", "a": "510", "p": 1}, {"t": "numeric", "a": "620", "p": 1}, {"t": "multi_part", "a": {"60円切手": "11", "90円切手": "4"}, "s": ["60円切手", "90円切手"], "p": 1}, {"t": "multi_part", "a": {"50円切手": "11", "70円切手": "8"}, "s": ["50円切手", "70円切手"], "p": 1}, {"t": "multi_part", "a": {"100円切手": "12", "120円切手": "8"}, "s": ["100円切手", "120円切手"], "p": 1}, {"t": "multi_part", "a": {"50円切手": "5", "80円切手": "8"}, "s": ["50円切手", "80円切手"], "p": 1}, {"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "35", "p": 1}, {"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "36", "p": 1}, {"t": "numeric", "a": "35", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "6", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 32;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第4回2', 'title', v_qs, 0),
+    ('第4', 'title', v_qs, 0),
+    ('4回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('差集め算', 'title', v_qs, 0),
+    ('差集', 'title', v_qs, 0),
+    ('集め', 'title', v_qs, 0),
+    ('め算', 'title', v_qs, 0),
+    ('類題3', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('14', 'answer', v_qs, 1),
+    ('11', 'answer', v_qs, 1),
+    ('類題3', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('34', 'answer', v_qs, 2),
+    ('30', 'answer', v_qs, 2),
+    ('類題3', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('個', 'unit', v_qs, 3),
+    ('25', 'answer', v_qs, 3),
+    ('20', 'answer', v_qs, 3),
+    ('類題3', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('個', 'unit', v_qs, 4),
+    ('18', 'answer', v_qs, 4),
+    ('12', 'answer', v_qs, 4),
+    ('類題4', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('円', 'unit', v_qs, 5),
+    ('1540', 'answer', v_qs, 5),
+    ('類題4', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('円', 'unit', v_qs, 6),
+    ('490', 'answer', v_qs, 6),
+    ('類題4', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('円', 'unit', v_qs, 7),
+    ('510', 'answer', v_qs, 7),
+    ('類題4', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('円', 'unit', v_qs, 8),
+    ('620', 'answer', v_qs, 8),
+    ('類題6', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('枚', 'unit', v_qs, 9),
+    ('11', 'answer', v_qs, 9),
+    ('4', 'answer', v_qs, 9),
+    ('類題6', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('枚', 'unit', v_qs, 10),
+    ('11', 'answer', v_qs, 10),
+    ('8', 'answer', v_qs, 10),
+    ('類題6', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('枚', 'unit', v_qs, 11),
+    ('12', 'answer', v_qs, 11),
+    ('8', 'answer', v_qs, 11),
+    ('類題6', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('枚', 'unit', v_qs, 12),
+    ('5', 'answer', v_qs, 12),
+    ('8', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('24', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('35', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('25', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('45', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('36', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('35', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('16', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('15', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('28', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('75', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('15', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('4', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('15', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('24', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('20', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('64', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('45', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('15', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('14', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('6', 'answer', v_qs, 32);
+
   -- ========================================
   -- 小6 第1回① 文章題 (41問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 1;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 1 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 1 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第1回① 文章題（approved済み）';
@@ -685,10 +1651,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '14', '個', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '23', '個', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '15', '人', NULL, 1, 3),
@@ -731,22 +1694,203 @@ BEGIN
     (v_qs, '(4)', '類題7', 'numeric', '6', '個', NULL, 1, 40),
     (v_qs, '(5)', '類題7', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③", "unit": ""}, {"label": "④", "unit": ""}, {"label": "⑤", "unit": ""}, {"label": "⑥", "unit": ""}, {"label": "⑦", "unit": ""}, {"label": "⑧", "unit": ""}, {"label": "⑨", "unit": ""}], "correct_values": {"①": "4", "②": "8", "③": "12", "④": "16", "⑤": "20", "⑥": "24", "⑦": "28", "⑧": "32", "⑨": "36"}, "template": "①{①}，②{②}，③{③}，④{④}，⑤{⑤}，⑥{⑥}，⑦{⑦}，⑧{⑧}，⑨{⑨}"}', 1, 41);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "23", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "340", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "19", "p": 1}, {"t": "numeric", "a": "22", "p": 1}, {"t": "numeric", "a": "19", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "21", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "26", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "2", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "40", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "600", "p": 1}, {"t": "numeric", "a": "250", "p": 1}, {"t": "numeric", "a": "275", "p": 1}, {"t": "numeric", "a": "130", "p": 1}, {"t": "numeric", "a": "140", "p": 1}, {"t": "numeric", "a": "2", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "multi_part", "a": {"①": "4", "②": "8", "③": "12", "④": "16", "⑤": "20", "⑥": "24", "⑦": "28", "⑧": "32", "⑨": "36"}, "s": ["①", "②", "③", "④", "⑤", "⑥", "⑦", "⑧", "⑨"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 41;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第1回1', 'title', v_qs, 0),
+    ('第1', 'title', v_qs, 0),
+    ('1回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('文章題', 'title', v_qs, 0),
+    ('文章', 'title', v_qs, 0),
+    ('章題', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('14', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('23', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('人', 'unit', v_qs, 3),
+    ('15', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('円', 'unit', v_qs, 4),
+    ('340', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('本', 'unit', v_qs, 5),
+    ('12', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('本', 'unit', v_qs, 6),
+    ('25', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('本', 'unit', v_qs, 7),
+    ('19', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('冊', 'unit', v_qs, 8),
+    ('22', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('歳', 'unit', v_qs, 9),
+    ('19', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('歳', 'unit', v_qs, 10),
+    ('16', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('歳', 'unit', v_qs, 11),
+    ('21', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('歳', 'unit', v_qs, 12),
+    ('14', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('歳', 'unit', v_qs, 13),
+    ('17', 'answer', v_qs, 13),
+    ('類題2', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('歳', 'unit', v_qs, 14),
+    ('26', 'answer', v_qs, 14),
+    ('類題2', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('歳', 'unit', v_qs, 15),
+    ('10', 'answer', v_qs, 15),
+    ('類題2', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('歳', 'unit', v_qs, 16),
+    ('12', 'answer', v_qs, 16),
+    ('類題2', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('歳', 'unit', v_qs, 17),
+    ('14', 'answer', v_qs, 17),
+    ('類題2', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('歳', 'unit', v_qs, 18),
+    ('18', 'answer', v_qs, 18),
+    ('類題3', 'section', v_qs, 19),
+    ('類題', 'section', v_qs, 19),
+    ('班', 'unit', v_qs, 19),
+    ('2', 'answer', v_qs, 19),
+    ('類題3', 'section', v_qs, 20),
+    ('類題', 'section', v_qs, 20),
+    ('冊', 'unit', v_qs, 20),
+    ('6', 'answer', v_qs, 20),
+    ('類題3', 'section', v_qs, 21),
+    ('類題', 'section', v_qs, 21),
+    ('本', 'unit', v_qs, 21),
+    ('4', 'answer', v_qs, 21),
+    ('類題3', 'section', v_qs, 22),
+    ('類題', 'section', v_qs, 22),
+    ('個', 'unit', v_qs, 22),
+    ('4', 'answer', v_qs, 22),
+    ('類題3', 'section', v_qs, 23),
+    ('類題', 'section', v_qs, 23),
+    ('枚', 'unit', v_qs, 23),
+    ('4', 'answer', v_qs, 23),
+    ('類題3', 'section', v_qs, 24),
+    ('類題', 'section', v_qs, 24),
+    ('本', 'unit', v_qs, 24),
+    ('3', 'answer', v_qs, 24),
+    ('類題4', 'section', v_qs, 25),
+    ('類題', 'section', v_qs, 25),
+    ('円', 'unit', v_qs, 25),
+    ('40', 'answer', v_qs, 25),
+    ('類題4', 'section', v_qs, 26),
+    ('類題', 'section', v_qs, 26),
+    ('円', 'unit', v_qs, 26),
+    ('150', 'answer', v_qs, 26),
+    ('類題4', 'section', v_qs, 27),
+    ('類題', 'section', v_qs, 27),
+    ('円', 'unit', v_qs, 27),
+    ('80', 'answer', v_qs, 27),
+    ('類題4', 'section', v_qs, 28),
+    ('類題', 'section', v_qs, 28),
+    ('円', 'unit', v_qs, 28),
+    ('100', 'answer', v_qs, 28),
+    ('類題4', 'section', v_qs, 29),
+    ('類題', 'section', v_qs, 29),
+    ('円', 'unit', v_qs, 29),
+    ('200', 'answer', v_qs, 29),
+    ('類題5', 'section', v_qs, 30),
+    ('類題', 'section', v_qs, 30),
+    ('円', 'unit', v_qs, 30),
+    ('200', 'answer', v_qs, 30),
+    ('類題5', 'section', v_qs, 31),
+    ('類題', 'section', v_qs, 31),
+    ('円', 'unit', v_qs, 31),
+    ('120', 'answer', v_qs, 31),
+    ('類題5', 'section', v_qs, 32),
+    ('類題', 'section', v_qs, 32),
+    ('円', 'unit', v_qs, 32),
+    ('600', 'answer', v_qs, 32),
+    ('類題5', 'section', v_qs, 33),
+    ('類題', 'section', v_qs, 33),
+    ('円', 'unit', v_qs, 33),
+    ('250', 'answer', v_qs, 33),
+    ('類題6', 'section', v_qs, 34),
+    ('類題', 'section', v_qs, 34),
+    ('円', 'unit', v_qs, 34),
+    ('275', 'answer', v_qs, 34),
+    ('類題6', 'section', v_qs, 35),
+    ('類題', 'section', v_qs, 35),
+    ('円', 'unit', v_qs, 35),
+    ('130', 'answer', v_qs, 35),
+    ('類題6', 'section', v_qs, 36),
+    ('類題', 'section', v_qs, 36),
+    ('円', 'unit', v_qs, 36),
+    ('140', 'answer', v_qs, 36),
+    ('類題7', 'section', v_qs, 37),
+    ('類題', 'section', v_qs, 37),
+    ('通り', 'unit', v_qs, 37),
+    ('2', 'answer', v_qs, 37),
+    ('類題7', 'section', v_qs, 38),
+    ('類題', 'section', v_qs, 38),
+    ('本', 'unit', v_qs, 38),
+    ('4', 'answer', v_qs, 38),
+    ('類題7', 'section', v_qs, 39),
+    ('類題', 'section', v_qs, 39),
+    ('個', 'unit', v_qs, 39),
+    ('5', 'answer', v_qs, 39),
+    ('類題7', 'section', v_qs, 40),
+    ('類題', 'section', v_qs, 40),
+    ('個', 'unit', v_qs, 40),
+    ('6', 'answer', v_qs, 40),
+    ('類題7', 'section', v_qs, 41),
+    ('類題', 'section', v_qs, 41),
+    ('4', 'answer', v_qs, 41),
+    ('8', 'answer', v_qs, 41),
+    ('12', 'answer', v_qs, 41),
+    ('16', 'answer', v_qs, 41),
+    ('20', 'answer', v_qs, 41),
+    ('24', 'answer', v_qs, 41),
+    ('28', 'answer', v_qs, 41),
+    ('32', 'answer', v_qs, 41),
+    ('36', 'answer', v_qs, 41);
+
   -- ========================================
   -- 小6 第1回② 文章題 (41問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 1;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 1 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 1 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第1回② 文章題（approved済み）';
@@ -769,10 +1913,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '平均算（合計の利用）', 'numeric', '50.9', '点', NULL, 1, 1),
     (v_qs, '(2)', '平均算（合計の利用）', 'numeric', '75', '点', NULL, 1, 2),
     (v_qs, '(3)', '平均算（合計の利用）', 'numeric', '86', '点', NULL, 1, 3),
@@ -815,22 +1956,174 @@ BEGIN
     (v_qs, '(4)', '集合', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "人"}, {"label": "②", "unit": "人"}, {"label": "③", "unit": "人"}, {"label": "④", "unit": "人"}, {"label": "⑤", "unit": "人"}, {"label": "⑥", "unit": "人"}, {"label": "⑦", "unit": "人"}], "correct_values": {"①": "27", "②": "23", "③": "17", "④": "5", "⑤": "16", "⑥": "12", "⑦": "4"}, "template": "①{①}人，②{②}人，③{③}人，④{④}人，⑤{⑤}人，⑥{⑥}人，⑦{⑦}人"}', 1, 40),
     (v_qs, '(5)', '集合', 'numeric', '3', 'こ', NULL, 1, 41);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "50.9", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "86", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "97", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "83", "p": 1}, {"t": "numeric", "a": "8.25", "p": 1}, {"t": "numeric", "a": "78", "p": 1}, {"t": "numeric", "a": "78", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "78", "p": 1}, {"t": "multi_part", "a": {"A": "15", "B": "35"}, "s": ["A", "B"], "p": 1}, {"t": "numeric", "a": "57", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "264", "p": 1}, {"t": "multi_part", "a": {"ア": "19", "イ": "149"}, "s": ["ア", "イ"], "p": 1}, {"t": "multi_part", "a": {"①": "16", "②": "180"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "230", "p": 1}, {"t": "numeric", "a": "62", "p": 1}, {"t": "numeric", "a": "42", "p": 1}, {"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "1200", "p": 1}, {"t": "numeric", "a": "720", "p": 1}, {"t": "numeric", "a": "600", "p": 1}, {"t": "multi_part", "a": {"①": "4", "②": "12"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "13", "p": 1}, {"t": "multi_part", "a": {"母": "32", "子": "12"}, "s": ["母", "子"], "p": 1}, {"t": "multi_part", "a": {"父": "36", "母": "32", "子": "12"}, "s": ["父", "母", "子"], "p": 1}, {"t": "numeric", "a": "22", "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "5", "③": "2"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "10", "②": "12", "③": "5", "④": "12", "⑤": "3", "⑥": "4"}, "s": ["①", "②", "③", "④", "⑤", "⑥"], "p": 1}, {"t": "multi_part", "a": {"①": "27", "②": "23", "③": "17", "④": "5", "⑤": "16", "⑥": "12", "⑦": "4"}, "s": ["①", "②", "③", "④", "⑤", "⑥", "⑦"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 41;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第1回2', 'title', v_qs, 0),
+    ('第1', 'title', v_qs, 0),
+    ('1回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('文章題', 'title', v_qs, 0),
+    ('文章', 'title', v_qs, 0),
+    ('章題', 'title', v_qs, 0),
+    ('平均算(合計の利用)', 'section', v_qs, 1),
+    ('点', 'unit', v_qs, 1),
+    ('50.9', 'answer', v_qs, 1),
+    ('平均算(合計の利用)', 'section', v_qs, 2),
+    ('点', 'unit', v_qs, 2),
+    ('75', 'answer', v_qs, 2),
+    ('平均算(合計の利用)', 'section', v_qs, 3),
+    ('点', 'unit', v_qs, 3),
+    ('86', 'answer', v_qs, 3),
+    ('平均算(合計の利用)', 'section', v_qs, 4),
+    ('点', 'unit', v_qs, 4),
+    ('75', 'answer', v_qs, 4),
+    ('平均算(合計の利用)', 'section', v_qs, 5),
+    ('点', 'unit', v_qs, 5),
+    ('97', 'answer', v_qs, 5),
+    ('平均算(合計の利用)', 'section', v_qs, 6),
+    ('点', 'unit', v_qs, 6),
+    ('84', 'answer', v_qs, 6),
+    ('平均算(合計の利用)', 'section', v_qs, 7),
+    ('点', 'unit', v_qs, 7),
+    ('96', 'answer', v_qs, 7),
+    ('平均算(合計の利用)', 'section', v_qs, 8),
+    ('点', 'unit', v_qs, 8),
+    ('80', 'answer', v_qs, 8),
+    ('平均算(合計の利用)', 'section', v_qs, 9),
+    ('点', 'unit', v_qs, 9),
+    ('83', 'answer', v_qs, 9),
+    ('平均算(合計の利用)', 'section', v_qs, 10),
+    ('点', 'unit', v_qs, 10),
+    ('8.25', 'answer', v_qs, 10),
+    ('平均算(合計の利用)', 'section', v_qs, 11),
+    ('点', 'unit', v_qs, 11),
+    ('78', 'answer', v_qs, 11),
+    ('平均算(合計の利用)', 'section', v_qs, 12),
+    ('点', 'unit', v_qs, 12),
+    ('78', 'answer', v_qs, 12),
+    ('平均算(面積図)', 'section', v_qs, 13),
+    ('回目', 'unit', v_qs, 13),
+    ('9', 'answer', v_qs, 13),
+    ('平均算(面積図)', 'section', v_qs, 14),
+    ('人', 'unit', v_qs, 14),
+    ('70', 'answer', v_qs, 14),
+    ('平均算(面積図)', 'section', v_qs, 15),
+    ('点', 'unit', v_qs, 15),
+    ('78', 'answer', v_qs, 15),
+    ('平均算(面積図)', 'section', v_qs, 16),
+    ('冊', 'unit', v_qs, 16),
+    ('15', 'answer', v_qs, 16),
+    ('35', 'answer', v_qs, 16),
+    ('平均算(面積図)', 'section', v_qs, 17),
+    ('点', 'unit', v_qs, 17),
+    ('57', 'answer', v_qs, 17),
+    ('平均算(面積図)', 'section', v_qs, 18),
+    ('回目', 'unit', v_qs, 18),
+    ('9', 'answer', v_qs, 18),
+    ('差集め算', 'section', v_qs, 19),
+    ('個', 'unit', v_qs, 19),
+    ('10', 'answer', v_qs, 19),
+    ('差集め算', 'section', v_qs, 20),
+    ('個', 'unit', v_qs, 20),
+    ('264', 'answer', v_qs, 20),
+    ('差集め算', 'section', v_qs, 21),
+    ('19', 'answer', v_qs, 21),
+    ('149', 'answer', v_qs, 21),
+    ('差集め算', 'section', v_qs, 22),
+    ('人', 'unit', v_qs, 22),
+    ('個', 'unit', v_qs, 22),
+    ('16', 'answer', v_qs, 22),
+    ('180', 'answer', v_qs, 22),
+    ('差集め算', 'section', v_qs, 23),
+    ('ml', 'unit', v_qs, 23),
+    ('230', 'answer', v_qs, 23),
+    ('差集め算', 'section', v_qs, 24),
+    ('個', 'unit', v_qs, 24),
+    ('62', 'answer', v_qs, 24),
+    ('差集め算', 'section', v_qs, 25),
+    ('人', 'unit', v_qs, 25),
+    ('42', 'answer', v_qs, 25),
+    ('差集め算', 'section', v_qs, 26),
+    ('脚', 'unit', v_qs, 26),
+    ('17', 'answer', v_qs, 26),
+    ('差集め算', 'section', v_qs, 27),
+    ('m', 'unit', v_qs, 27),
+    ('1200', 'answer', v_qs, 27),
+    ('差集め算', 'section', v_qs, 28),
+    ('円', 'unit', v_qs, 28),
+    ('720', 'answer', v_qs, 28),
+    ('差集め算', 'section', v_qs, 29),
+    ('円', 'unit', v_qs, 29),
+    ('600', 'answer', v_qs, 29),
+    ('差集め算', 'section', v_qs, 30),
+    ('個', 'unit', v_qs, 30),
+    ('人', 'unit', v_qs, 30),
+    ('4', 'answer', v_qs, 30),
+    ('12', 'answer', v_qs, 30),
+    ('年齢算', 'section', v_qs, 31),
+    ('年後', 'unit', v_qs, 31),
+    ('3', 'answer', v_qs, 31),
+    ('年齢算', 'section', v_qs, 32),
+    ('年後', 'unit', v_qs, 32),
+    ('15', 'answer', v_qs, 32),
+    ('年齢算', 'section', v_qs, 33),
+    ('年後', 'unit', v_qs, 33),
+    ('5', 'answer', v_qs, 33),
+    ('年齢算', 'section', v_qs, 34),
+    ('才', 'unit', v_qs, 34),
+    ('13', 'answer', v_qs, 34),
+    ('年齢算', 'section', v_qs, 35),
+    ('才', 'unit', v_qs, 35),
+    ('32', 'answer', v_qs, 35),
+    ('12', 'answer', v_qs, 35),
+    ('年齢算', 'section', v_qs, 36),
+    ('才', 'unit', v_qs, 36),
+    ('36', 'answer', v_qs, 36),
+    ('32', 'answer', v_qs, 36),
+    ('12', 'answer', v_qs, 36),
+    ('集合', 'section', v_qs, 37),
+    ('人', 'unit', v_qs, 37),
+    ('22', 'answer', v_qs, 37),
+    ('集合', 'section', v_qs, 38),
+    ('人', 'unit', v_qs, 38),
+    ('5', 'answer', v_qs, 38),
+    ('2', 'answer', v_qs, 38),
+    ('集合', 'section', v_qs, 39),
+    ('人', 'unit', v_qs, 39),
+    ('10', 'answer', v_qs, 39),
+    ('12', 'answer', v_qs, 39),
+    ('5', 'answer', v_qs, 39),
+    ('3', 'answer', v_qs, 39),
+    ('4', 'answer', v_qs, 39),
+    ('集合', 'section', v_qs, 40),
+    ('人', 'unit', v_qs, 40),
+    ('27', 'answer', v_qs, 40),
+    ('23', 'answer', v_qs, 40),
+    ('17', 'answer', v_qs, 40),
+    ('5', 'answer', v_qs, 40),
+    ('16', 'answer', v_qs, 40),
+    ('12', 'answer', v_qs, 40),
+    ('4', 'answer', v_qs, 40),
+    ('集合', 'section', v_qs, 41),
+    ('こ', 'unit', v_qs, 41),
+    ('3', 'answer', v_qs, 41);
+
   -- ========================================
   -- 小6 第2回① 規則性 (15問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 2;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 2 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 2 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第2回① 規則性（approved済み）';
@@ -853,10 +2146,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '植木算', 'numeric', '32', 'm', NULL, 1, 1),
     (v_qs, '(2)', '植木算', 'numeric', '228', 'm', NULL, 1, 2),
     (v_qs, '(3)', '植木算', 'numeric', '12', '本', NULL, 1, 3),
@@ -873,22 +2163,87 @@ BEGIN
     (v_qs, '(1)', '長方形をならべて', 'numeric', '1100', '㎠', NULL, 1, 14),
     (v_qs, '(2)', '長方形をならべて', 'numeric', '720', '㎠', NULL, 1, 15);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "228", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "multi_part", "a": {"①": "37.5", "②": "20"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "252", "②": "70"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "7", "②": "1", "③": "193"}, "s": ["①", "②", "③"], "p": 1}, {"t": "selection", "a": ["金曜日"], "p": 1}, {"t": "numeric", "a": "49", "p": 1}, {"t": "multi_part", "a": {"①": "21", "②": "20"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "multi_part", "a": {"①": "77", "②": "21", "③": "861"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "176", "②": "34", "③": "3434"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "28", "②": "34", "③": "1717"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "1100", "p": 1}, {"t": "numeric", "a": "720", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 15;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回1', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('規則性', 'title', v_qs, 0),
+    ('規則', 'title', v_qs, 0),
+    ('則性', 'title', v_qs, 0),
+    ('植木算', 'section', v_qs, 1),
+    ('m', 'unit', v_qs, 1),
+    ('32', 'answer', v_qs, 1),
+    ('植木算', 'section', v_qs, 2),
+    ('m', 'unit', v_qs, 2),
+    ('228', 'answer', v_qs, 2),
+    ('植木算', 'section', v_qs, 3),
+    ('本', 'unit', v_qs, 3),
+    ('12', 'answer', v_qs, 3),
+    ('植木算', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('37.5', 'answer', v_qs, 4),
+    ('20', 'answer', v_qs, 4),
+    ('植木算', 'section', v_qs, 5),
+    ('m', 'unit', v_qs, 5),
+    ('本', 'unit', v_qs, 5),
+    ('252', 'answer', v_qs, 5),
+    ('70', 'answer', v_qs, 5),
+    ('周期算', 'section', v_qs, 6),
+    ('7', 'answer', v_qs, 6),
+    ('1', 'answer', v_qs, 6),
+    ('193', 'answer', v_qs, 6),
+    ('周期算', 'section', v_qs, 7),
+    ('金曜日', 'answer', v_qs, 7),
+    ('周期算', 'section', v_qs, 8),
+    ('個', 'unit', v_qs, 8),
+    ('49', 'answer', v_qs, 8),
+    ('周期算', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('個', 'unit', v_qs, 9),
+    ('21', 'answer', v_qs, 9),
+    ('20', 'answer', v_qs, 9),
+    ('周期算', 'section', v_qs, 10),
+    ('9', 'answer', v_qs, 10),
+    ('等差数列', 'section', v_qs, 11),
+    ('個', 'unit', v_qs, 11),
+    ('77', 'answer', v_qs, 11),
+    ('21', 'answer', v_qs, 11),
+    ('861', 'answer', v_qs, 11),
+    ('等差数列', 'section', v_qs, 12),
+    ('個', 'unit', v_qs, 12),
+    ('176', 'answer', v_qs, 12),
+    ('34', 'answer', v_qs, 12),
+    ('3434', 'answer', v_qs, 12),
+    ('等差数列', 'section', v_qs, 13),
+    ('個', 'unit', v_qs, 13),
+    ('28', 'answer', v_qs, 13),
+    ('34', 'answer', v_qs, 13),
+    ('1717', 'answer', v_qs, 13),
+    ('長方形をならべて', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('1100', 'answer', v_qs, 14),
+    ('長方形をならべて', 'section', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('720', 'answer', v_qs, 15);
+
   -- ========================================
   -- 小6 第2回② 規則性 (16問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 2;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 2 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 2 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第2回② 規則性（approved済み）';
@@ -911,10 +2266,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '方陣算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "個"}, {"label": "②", "unit": "個"}], "correct_values": {"①": "225", "②": "56"}, "template": "①{①}個，②{②}個"}', 1, 1),
     (v_qs, '(2)', '方陣算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "個"}, {"label": "②", "unit": "個"}], "correct_values": {"①": "78", "②": "33"}, "template": "①{①}個，②{②}個"}', 1, 2),
     (v_qs, '(3)', '方陣算', 'numeric', '235', '個', NULL, 1, 3),
@@ -932,22 +2284,89 @@ BEGIN
     (v_qs, '(2)', '規則性の入試問題', 'selection', NULL, NULL, '{"correct_values": ["土曜日"], "dummy_values": ["月曜日", "火曜日", "水曜日", "木曜日", "金曜日", "日曜日"]}', 1, 15),
     (v_qs, '(3)', '規則性の入試問題', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③段", "unit": ""}, {"label": "③番", "unit": ""}], "correct_values": {"①": "37", "②": "559", "③段": "13", "③番": "6"}, "template": "①{①}，②{②}，③{③段}段目の{③番}番目"}', 1, 16);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "225", "②": "56"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "78", "②": "33"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "235", "p": 1}, {"t": "multi_part", "a": {"①": "151", "②": "13", "③": "124", "④": "16"}, "s": ["①", "②", "③", "④"], "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "7", "p": 1}, {"t": "multi_part", "a": {"①": "100", "②": "103", "③行": "13", "③列": "6"}, "s": ["①", "②", "③行", "③列"], "p": 1}, {"t": "multi_part", "a": {"①": "512", "②": "49", "③": "171"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "selection", "a": ["木曜日"], "p": 1}, {"t": "selection", "a": ["土曜日"], "p": 1}, {"t": "numeric", "a": "2034", "p": 1}, {"t": "selection", "a": ["月曜日"], "p": 1}, {"t": "selection", "a": ["土曜日"], "p": 1}, {"t": "multi_part", "a": {"①": "37", "②": "559", "③段": "13", "③番": "6"}, "s": ["①", "②", "③段", "③番"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 16;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回2', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('規則性', 'title', v_qs, 0),
+    ('規則', 'title', v_qs, 0),
+    ('則性', 'title', v_qs, 0),
+    ('方陣算', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('225', 'answer', v_qs, 1),
+    ('56', 'answer', v_qs, 1),
+    ('方陣算', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('78', 'answer', v_qs, 2),
+    ('33', 'answer', v_qs, 2),
+    ('方陣算', 'section', v_qs, 3),
+    ('個', 'unit', v_qs, 3),
+    ('235', 'answer', v_qs, 3),
+    ('周期算2', 'section', v_qs, 4),
+    ('周期算', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('枚', 'unit', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('151', 'answer', v_qs, 4),
+    ('13', 'answer', v_qs, 4),
+    ('124', 'answer', v_qs, 4),
+    ('16', 'answer', v_qs, 4),
+    ('周期算2', 'section', v_qs, 5),
+    ('周期算', 'section', v_qs, 5),
+    ('4', 'answer', v_qs, 5),
+    ('周期算2', 'section', v_qs, 6),
+    ('周期算', 'section', v_qs, 6),
+    ('7', 'answer', v_qs, 6),
+    ('数表', 'section', v_qs, 7),
+    ('100', 'answer', v_qs, 7),
+    ('103', 'answer', v_qs, 7),
+    ('13', 'answer', v_qs, 7),
+    ('6', 'answer', v_qs, 7),
+    ('数表', 'section', v_qs, 8),
+    ('512', 'answer', v_qs, 8),
+    ('49', 'answer', v_qs, 8),
+    ('171', 'answer', v_qs, 8),
+    ('日暦算', 'section', v_qs, 9),
+    ('日', 'unit', v_qs, 9),
+    ('6', 'answer', v_qs, 9),
+    ('日暦算', 'section', v_qs, 10),
+    ('日', 'unit', v_qs, 10),
+    ('3', 'answer', v_qs, 10),
+    ('日暦算', 'section', v_qs, 11),
+    ('木曜日', 'answer', v_qs, 11),
+    ('日暦算', 'section', v_qs, 12),
+    ('土曜日', 'answer', v_qs, 12),
+    ('日暦算', 'section', v_qs, 13),
+    ('年', 'unit', v_qs, 13),
+    ('2034', 'answer', v_qs, 13),
+    ('規則性の入試問題', 'section', v_qs, 14),
+    ('月曜日', 'answer', v_qs, 14),
+    ('規則性の入試問題', 'section', v_qs, 15),
+    ('土曜日', 'answer', v_qs, 15),
+    ('規則性の入試問題', 'section', v_qs, 16),
+    ('37', 'answer', v_qs, 16),
+    ('559', 'answer', v_qs, 16),
+    ('13', 'answer', v_qs, 16),
+    ('6', 'answer', v_qs, 16);
+
   -- ========================================
   -- 小6 第3回① 平面図形(1) (32問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 3;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 3 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 3 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第3回① 平面図形(1)（approved済み）';
@@ -970,10 +2389,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '角度', 'multi_part', NULL, NULL, '{"slots": [{"label": "ア", "unit": "°"}, {"label": "イ", "unit": "°"}], "correct_values": {"ア": "111", "イ": "94"}, "template": "ア{ア}°，イ{イ}°"}', 1, 1),
     (v_qs, '(2)', '角度', 'numeric', '76', '°', NULL, 1, 2),
     (v_qs, '(3)', '角度', 'numeric', '38', '°', NULL, 1, 3),
@@ -1007,22 +2423,139 @@ BEGIN
     (v_qs, '(10)', '面積', 'numeric', '36', '㎠', NULL, 1, 31),
     (v_qs, '(11)', '面積', 'numeric', '9', '㎠', NULL, 1, 32);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"ア": "111", "イ": "94"}, "s": ["ア", "イ"], "p": 1}, {"t": "numeric", "a": "76", "p": 1}, {"t": "numeric", "a": "38", "p": 1}, {"t": "numeric", "a": "46", "p": 1}, {"t": "multi_part", "a": {"x": "105", "y": "120"}, "s": ["x", "y"], "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "50", "p": 1}, {"t": "numeric", "a": "105", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "74", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "105", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "multi_part", "a": {"x": "75", "y": "120"}, "s": ["x", "y"], "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "69", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "39", "p": 1}, {"t": "multi_part", "a": {"①": "216", "②": "14.4"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "144", "②": "9"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "4.5", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "49", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "36", "p": 1}, {"t": "numeric", "a": "9", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 32;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第3回1', 'title', v_qs, 0),
+    ('第3', 'title', v_qs, 0),
+    ('3回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('平面図形(1)', 'title', v_qs, 0),
+    ('平面', 'title', v_qs, 0),
+    ('面図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形(', 'title', v_qs, 0),
+    ('(1', 'title', v_qs, 0),
+    ('1)', 'title', v_qs, 0),
+    ('角度', 'section', v_qs, 1),
+    ('°', 'unit', v_qs, 1),
+    ('111', 'answer', v_qs, 1),
+    ('94', 'answer', v_qs, 1),
+    ('角度', 'section', v_qs, 2),
+    ('°', 'unit', v_qs, 2),
+    ('76', 'answer', v_qs, 2),
+    ('角度', 'section', v_qs, 3),
+    ('°', 'unit', v_qs, 3),
+    ('38', 'answer', v_qs, 3),
+    ('角度', 'section', v_qs, 4),
+    ('°', 'unit', v_qs, 4),
+    ('46', 'answer', v_qs, 4),
+    ('角度', 'section', v_qs, 5),
+    ('°', 'unit', v_qs, 5),
+    ('105', 'answer', v_qs, 5),
+    ('120', 'answer', v_qs, 5),
+    ('角度', 'section', v_qs, 6),
+    ('°', 'unit', v_qs, 6),
+    ('70', 'answer', v_qs, 6),
+    ('角度', 'section', v_qs, 7),
+    ('°', 'unit', v_qs, 7),
+    ('75', 'answer', v_qs, 7),
+    ('角度', 'section', v_qs, 8),
+    ('°', 'unit', v_qs, 8),
+    ('50', 'answer', v_qs, 8),
+    ('角度', 'section', v_qs, 9),
+    ('°', 'unit', v_qs, 9),
+    ('105', 'answer', v_qs, 9),
+    ('角度', 'section', v_qs, 10),
+    ('°', 'unit', v_qs, 10),
+    ('33', 'answer', v_qs, 10),
+    ('角度', 'section', v_qs, 11),
+    ('°', 'unit', v_qs, 11),
+    ('74', 'answer', v_qs, 11),
+    ('角度', 'section', v_qs, 12),
+    ('°', 'unit', v_qs, 12),
+    ('60', 'answer', v_qs, 12),
+    ('角度', 'section', v_qs, 13),
+    ('°', 'unit', v_qs, 13),
+    ('105', 'answer', v_qs, 13),
+    ('角度', 'section', v_qs, 14),
+    ('°', 'unit', v_qs, 14),
+    ('30', 'answer', v_qs, 14),
+    ('角度', 'section', v_qs, 15),
+    ('°', 'unit', v_qs, 15),
+    ('15', 'answer', v_qs, 15),
+    ('角度', 'section', v_qs, 16),
+    ('°', 'unit', v_qs, 16),
+    ('75', 'answer', v_qs, 16),
+    ('120', 'answer', v_qs, 16),
+    ('角度', 'section', v_qs, 17),
+    ('°', 'unit', v_qs, 17),
+    ('150', 'answer', v_qs, 17),
+    ('角度', 'section', v_qs, 18),
+    ('°', 'unit', v_qs, 18),
+    ('75', 'answer', v_qs, 18),
+    ('角度', 'section', v_qs, 19),
+    ('°', 'unit', v_qs, 19),
+    ('69', 'answer', v_qs, 19),
+    ('角度', 'section', v_qs, 20),
+    ('°', 'unit', v_qs, 20),
+    ('14', 'answer', v_qs, 20),
+    ('角度', 'section', v_qs, 21),
+    ('°', 'unit', v_qs, 21),
+    ('39', 'answer', v_qs, 21),
+    ('面積', 'section', v_qs, 22),
+    ('cm2', 'unit', v_qs, 22),
+    ('cm', 'unit', v_qs, 22),
+    ('216', 'answer', v_qs, 22),
+    ('14.4', 'answer', v_qs, 22),
+    ('面積', 'section', v_qs, 23),
+    ('cm2', 'unit', v_qs, 23),
+    ('cm', 'unit', v_qs, 23),
+    ('144', 'answer', v_qs, 23),
+    ('9', 'answer', v_qs, 23),
+    ('面積', 'section', v_qs, 24),
+    ('cm', 'unit', v_qs, 24),
+    ('4.5', 'answer', v_qs, 24),
+    ('面積', 'section', v_qs, 25),
+    ('cm', 'unit', v_qs, 25),
+    ('4', 'answer', v_qs, 25),
+    ('面積', 'section', v_qs, 26),
+    ('cm2', 'unit', v_qs, 26),
+    ('32', 'answer', v_qs, 26),
+    ('面積', 'section', v_qs, 27),
+    ('cm2', 'unit', v_qs, 27),
+    ('33', 'answer', v_qs, 27),
+    ('面積', 'section', v_qs, 28),
+    ('cm2', 'unit', v_qs, 28),
+    ('49', 'answer', v_qs, 28),
+    ('面積', 'section', v_qs, 29),
+    ('cm2', 'unit', v_qs, 29),
+    ('14', 'answer', v_qs, 29),
+    ('面積', 'section', v_qs, 30),
+    ('cm2', 'unit', v_qs, 30),
+    ('18', 'answer', v_qs, 30),
+    ('面積', 'section', v_qs, 31),
+    ('cm2', 'unit', v_qs, 31),
+    ('36', 'answer', v_qs, 31),
+    ('面積', 'section', v_qs, 32),
+    ('cm2', 'unit', v_qs, 32),
+    ('9', 'answer', v_qs, 32);
+
   -- ========================================
   -- 小6 第3回② 平面図形(1) (21問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 3;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 3 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 3 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第3回② 平面図形(1)（approved済み）';
@@ -1045,10 +2578,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '多角形の性質', 'numeric', '27', '本', NULL, 1, 1),
     (v_qs, '(2)', '多角形の性質', 'numeric', '1800', '°', NULL, 1, 2),
     (v_qs, '(3)', '多角形の性質', 'numeric', '156', '°', NULL, 1, 3),
@@ -1071,22 +2601,102 @@ BEGIN
     (v_qs, '(10)', '円とおうぎ形', 'numeric', '18.5', '㎠', NULL, 1, 20),
     (v_qs, '(11)', '円とおうぎ形', 'numeric', '69.08', '㎠', NULL, 1, 21);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "27", "p": 1}, {"t": "numeric", "a": "1800", "p": 1}, {"t": "numeric", "a": "156", "p": 1}, {"t": "selection", "a": ["十四角形"], "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "52", "p": 1}, {"t": "numeric", "a": "81", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "multi_part", "a": {"円周": "50.24", "面積": "200.96"}, "s": ["円周", "面積"], "p": 1}, {"t": "multi_part", "a": {"弧": "12.56", "面積": "62.8"}, "s": ["弧", "面積"], "p": 1}, {"t": "numeric", "a": "36.48", "p": 1}, {"t": "numeric", "a": "12.5", "p": 1}, {"t": "numeric", "a": "50", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "5.7", "p": 1}, {"t": "numeric", "a": "0.86", "p": 1}, {"t": "numeric", "a": "18.5", "p": 1}, {"t": "numeric", "a": "69.08", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 21;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第3回2', 'title', v_qs, 0),
+    ('第3', 'title', v_qs, 0),
+    ('3回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('平面図形(1)', 'title', v_qs, 0),
+    ('平面', 'title', v_qs, 0),
+    ('面図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形(', 'title', v_qs, 0),
+    ('(1', 'title', v_qs, 0),
+    ('1)', 'title', v_qs, 0),
+    ('多角形の性質', 'section', v_qs, 1),
+    ('本', 'unit', v_qs, 1),
+    ('27', 'answer', v_qs, 1),
+    ('多角形の性質', 'section', v_qs, 2),
+    ('°', 'unit', v_qs, 2),
+    ('1800', 'answer', v_qs, 2),
+    ('多角形の性質', 'section', v_qs, 3),
+    ('°', 'unit', v_qs, 3),
+    ('156', 'answer', v_qs, 3),
+    ('多角形の性質', 'section', v_qs, 4),
+    ('十四角形', 'answer', v_qs, 4),
+    ('面積の求め方の工夫', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('70', 'answer', v_qs, 5),
+    ('面積の求め方の工夫', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('52', 'answer', v_qs, 6),
+    ('面積の求め方の工夫', 'section', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('81', 'answer', v_qs, 7),
+    ('面積の求め方の工夫', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('20', 'answer', v_qs, 8),
+    ('面積の求め方の工夫', 'section', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('25', 'answer', v_qs, 9),
+    ('面積の求め方の工夫', 'section', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('16', 'answer', v_qs, 10),
+    ('円とおうぎ形', 'section', v_qs, 11),
+    ('cm', 'unit', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('50.24', 'answer', v_qs, 11),
+    ('200.96', 'answer', v_qs, 11),
+    ('円とおうぎ形', 'section', v_qs, 12),
+    ('cm', 'unit', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('12.56', 'answer', v_qs, 12),
+    ('62.8', 'answer', v_qs, 12),
+    ('円とおうぎ形', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('36.48', 'answer', v_qs, 13),
+    ('円とおうぎ形', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('12.5', 'answer', v_qs, 14),
+    ('円とおうぎ形', 'section', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('50', 'answer', v_qs, 15),
+    ('円とおうぎ形', 'section', v_qs, 16),
+    ('cm2', 'unit', v_qs, 16),
+    ('9', 'answer', v_qs, 16),
+    ('円とおうぎ形', 'section', v_qs, 17),
+    ('cm2', 'unit', v_qs, 17),
+    ('16', 'answer', v_qs, 17),
+    ('円とおうぎ形', 'section', v_qs, 18),
+    ('cm', 'unit', v_qs, 18),
+    ('5.7', 'answer', v_qs, 18),
+    ('円とおうぎ形', 'section', v_qs, 19),
+    ('cm', 'unit', v_qs, 19),
+    ('0.86', 'answer', v_qs, 19),
+    ('円とおうぎ形', 'section', v_qs, 20),
+    ('cm2', 'unit', v_qs, 20),
+    ('18.5', 'answer', v_qs, 20),
+    ('円とおうぎ形', 'section', v_qs, 21),
+    ('cm2', 'unit', v_qs, 21),
+    ('69.08', 'answer', v_qs, 21);
+
   -- ========================================
   -- 小6 第4回① 容器と水量・変化とグラフ (9問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 4;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 4 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 4 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第4回① 容器と水量・変化とグラフ（approved済み）';
@@ -1109,10 +2719,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '底面積と深さ', 'numeric', '7', '㎝', NULL, 1, 1),
     (v_qs, '(2)', '底面積と深さ', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "L"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "2.88", "②": "144"}, "template": "①{①}L，②{②}㎠"}', 1, 2),
     (v_qs, '(1)', '水そうグラフ', 'numeric', '1.3', 'L', NULL, 1, 3),
@@ -1123,22 +2730,75 @@ BEGIN
     (v_qs, '(2)', '容器の傾け', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎤"}], "correct_values": {"①": "9", "②": "810"}, "template": "①{①}㎝，②{②}㎤"}', 1, 8),
     (v_qs, '(3)', '容器の傾け', 'numeric', '12', '㎝', NULL, 1, 9);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "7", "p": 1}, {"t": "multi_part", "a": {"①": "2.88", "②": "144"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "1.3", "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "15", "②": "10"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "multi_part", "a": {"a": "14", "b": "16"}, "s": ["a", "b"], "p": 1}, {"t": "multi_part", "a": {"①": "9", "②": "810"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "12", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 9;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第4回1', 'title', v_qs, 0),
+    ('第4', 'title', v_qs, 0),
+    ('4回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('容器と水量・変化とグラフ', 'title', v_qs, 0),
+    ('容器', 'title', v_qs, 0),
+    ('器と', 'title', v_qs, 0),
+    ('と水', 'title', v_qs, 0),
+    ('水量', 'title', v_qs, 0),
+    ('量・', 'title', v_qs, 0),
+    ('・変', 'title', v_qs, 0),
+    ('変化', 'title', v_qs, 0),
+    ('化と', 'title', v_qs, 0),
+    ('とグ', 'title', v_qs, 0),
+    ('グラ', 'title', v_qs, 0),
+    ('ラフ', 'title', v_qs, 0),
+    ('底面積と深さ', 'section', v_qs, 1),
+    ('cm', 'unit', v_qs, 1),
+    ('7', 'answer', v_qs, 1),
+    ('底面積と深さ', 'section', v_qs, 2),
+    ('l', 'unit', v_qs, 2),
+    ('cm2', 'unit', v_qs, 2),
+    ('2.88', 'answer', v_qs, 2),
+    ('144', 'answer', v_qs, 2),
+    ('水そうグラフ', 'section', v_qs, 3),
+    ('l', 'unit', v_qs, 3),
+    ('1.3', 'answer', v_qs, 3),
+    ('水そうグラフ', 'section', v_qs, 4),
+    ('l', 'unit', v_qs, 4),
+    ('2', 'answer', v_qs, 4),
+    ('4', 'answer', v_qs, 4),
+    ('水そうグラフ', 'section', v_qs, 5),
+    ('分後', 'unit', v_qs, 5),
+    ('15', 'answer', v_qs, 5),
+    ('10', 'answer', v_qs, 5),
+    ('水そうグラフ', 'section', v_qs, 6),
+    ('分後', 'unit', v_qs, 6),
+    ('20', 'answer', v_qs, 6),
+    ('容器の傾け', 'section', v_qs, 7),
+    ('cm', 'unit', v_qs, 7),
+    ('14', 'answer', v_qs, 7),
+    ('16', 'answer', v_qs, 7),
+    ('容器の傾け', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('cm3', 'unit', v_qs, 8),
+    ('9', 'answer', v_qs, 8),
+    ('810', 'answer', v_qs, 8),
+    ('容器の傾け', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('12', 'answer', v_qs, 9);
+
   -- ========================================
   -- 小6 第4回② 容器と水量・変化とグラフ (12問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 4;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 4 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 4 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第4回② 容器と水量・変化とグラフ（approved済み）';
@@ -1161,10 +2821,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '仕切りのある容器', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎝"}], "correct_values": {"①": "42", "②": "40"}, "template": "①{①}㎝，②{②}㎝"}', 1, 1),
     (v_qs, '(2)', '仕切りのある容器', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "分"}, {"label": "②", "unit": "㎝"}], "correct_values": {"①": "25", "②": "10"}, "template": "①{①}分，②{②}㎝"}', 1, 2),
     (v_qs, '(1)', '容器の傾け②', 'numeric', '3600', '㎤', NULL, 1, 3),
@@ -1178,22 +2835,88 @@ BEGIN
     (v_qs, '(3)', '物体を沈める問題', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎤"}, {"label": "②", "unit": "㎤"}], "correct_values": {"①": "1600", "②": "6000"}, "template": "①{①}㎤，②{②}㎤"}', 1, 11),
     (v_qs, '(4)', '物体を沈める問題', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎝"}], "correct_values": {"①": "17", "②": "16"}, "template": "①{①}㎝，②{②}㎝"}', 1, 12);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "42", "②": "40"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "25", "②": "10"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "3600", "p": 1}, {"t": "multi_part", "a": {"①": "11", "②": "6200"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "1120", "p": 1}, {"t": "numeric", "a": "1300", "p": 1}, {"t": "numeric", "a": "800", "p": 1}, {"t": "numeric", "a": "1100", "p": 1}, {"t": "multi_part", "a": {"①": "24", "②": "29"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "30", "②": "36"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "1600", "②": "6000"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "17", "②": "16"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 12;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第4回2', 'title', v_qs, 0),
+    ('第4', 'title', v_qs, 0),
+    ('4回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('容器と水量・変化とグラフ', 'title', v_qs, 0),
+    ('容器', 'title', v_qs, 0),
+    ('器と', 'title', v_qs, 0),
+    ('と水', 'title', v_qs, 0),
+    ('水量', 'title', v_qs, 0),
+    ('量・', 'title', v_qs, 0),
+    ('・変', 'title', v_qs, 0),
+    ('変化', 'title', v_qs, 0),
+    ('化と', 'title', v_qs, 0),
+    ('とグ', 'title', v_qs, 0),
+    ('グラ', 'title', v_qs, 0),
+    ('ラフ', 'title', v_qs, 0),
+    ('仕切りのある容器', 'section', v_qs, 1),
+    ('cm', 'unit', v_qs, 1),
+    ('42', 'answer', v_qs, 1),
+    ('40', 'answer', v_qs, 1),
+    ('仕切りのある容器', 'section', v_qs, 2),
+    ('分', 'unit', v_qs, 2),
+    ('cm', 'unit', v_qs, 2),
+    ('25', 'answer', v_qs, 2),
+    ('10', 'answer', v_qs, 2),
+    ('容器の傾け2', 'section', v_qs, 3),
+    ('容器の傾け', 'section', v_qs, 3),
+    ('cm3', 'unit', v_qs, 3),
+    ('3600', 'answer', v_qs, 3),
+    ('容器の傾け2', 'section', v_qs, 4),
+    ('容器の傾け', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('cm3', 'unit', v_qs, 4),
+    ('11', 'answer', v_qs, 4),
+    ('6200', 'answer', v_qs, 4),
+    ('階段グラフ', 'section', v_qs, 5),
+    ('円', 'unit', v_qs, 5),
+    ('1120', 'answer', v_qs, 5),
+    ('階段グラフ', 'section', v_qs, 6),
+    ('円', 'unit', v_qs, 6),
+    ('1300', 'answer', v_qs, 6),
+    ('階段グラフ', 'section', v_qs, 7),
+    ('円', 'unit', v_qs, 7),
+    ('800', 'answer', v_qs, 7),
+    ('階段グラフ', 'section', v_qs, 8),
+    ('円', 'unit', v_qs, 8),
+    ('1100', 'answer', v_qs, 8),
+    ('物体を沈める問題', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('24', 'answer', v_qs, 9),
+    ('29', 'answer', v_qs, 9),
+    ('物体を沈める問題', 'section', v_qs, 10),
+    ('cm', 'unit', v_qs, 10),
+    ('30', 'answer', v_qs, 10),
+    ('36', 'answer', v_qs, 10),
+    ('物体を沈める問題', 'section', v_qs, 11),
+    ('cm3', 'unit', v_qs, 11),
+    ('1600', 'answer', v_qs, 11),
+    ('6000', 'answer', v_qs, 11),
+    ('物体を沈める問題', 'section', v_qs, 12),
+    ('cm', 'unit', v_qs, 12),
+    ('17', 'answer', v_qs, 12),
+    ('16', 'answer', v_qs, 12);
+
   -- ========================================
   -- 小5 第6回① 食塩水 (54問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 6;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 6 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 6 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第6回① 食塩水（approved済み）';
@@ -1216,10 +2939,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', 'Part 1', 'numeric', '12.5', '％', NULL, 1, 1),
     (v_qs, '(2)', 'Part 1', 'numeric', '10', '％', NULL, 1, 2),
     (v_qs, '(3)', 'Part 1', 'numeric', '20', '％', NULL, 1, 3),
@@ -1275,22 +2995,248 @@ BEGIN
     (v_qs, '(4)', 'Part 10', 'numeric', '80', 'g', NULL, 1, 53),
     (v_qs, '(5)', 'Part 10', 'numeric', '300', 'g', NULL, 1, 54);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "12.5", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "450", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "12.5", "p": 1}, {"t": "numeric", "a": "7.5", "p": 1}, {"t": "numeric", "a": "10.8", "p": 1}, {"t": "numeric", "a": "54", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "325", "p": 1}, {"t": "numeric", "a": "7", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "11", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "13", "p": 1}, {"t": "numeric", "a": "11", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "40", "p": 1}, {"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "240", "p": 1}, {"t": "numeric", "a": "90", "p": 1}, {"t": "numeric", "a": "175", "p": 1}, {"t": "numeric", "a": "320", "p": 1}, {"t": "numeric", "a": "280", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "300", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 54;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第6回1', 'title', v_qs, 0),
+    ('第6', 'title', v_qs, 0),
+    ('6回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('食塩水', 'title', v_qs, 0),
+    ('食塩', 'title', v_qs, 0),
+    ('塩水', 'title', v_qs, 0),
+    ('part 1', 'section', v_qs, 1),
+    ('part', 'section', v_qs, 1),
+    ('%', 'unit', v_qs, 1),
+    ('12.5', 'answer', v_qs, 1),
+    ('part 1', 'section', v_qs, 2),
+    ('part', 'section', v_qs, 2),
+    ('%', 'unit', v_qs, 2),
+    ('10', 'answer', v_qs, 2),
+    ('part 1', 'section', v_qs, 3),
+    ('part', 'section', v_qs, 3),
+    ('%', 'unit', v_qs, 3),
+    ('20', 'answer', v_qs, 3),
+    ('part 1', 'section', v_qs, 4),
+    ('part', 'section', v_qs, 4),
+    ('g', 'unit', v_qs, 4),
+    ('30', 'answer', v_qs, 4),
+    ('part 1', 'section', v_qs, 5),
+    ('part', 'section', v_qs, 5),
+    ('g', 'unit', v_qs, 5),
+    ('45', 'answer', v_qs, 5),
+    ('part 1', 'section', v_qs, 6),
+    ('part', 'section', v_qs, 6),
+    ('g', 'unit', v_qs, 6),
+    ('150', 'answer', v_qs, 6),
+    ('part 1', 'section', v_qs, 7),
+    ('part', 'section', v_qs, 7),
+    ('g', 'unit', v_qs, 7),
+    ('450', 'answer', v_qs, 7),
+    ('part 2', 'section', v_qs, 8),
+    ('part', 'section', v_qs, 8),
+    ('%', 'unit', v_qs, 8),
+    ('15', 'answer', v_qs, 8),
+    ('part 2', 'section', v_qs, 9),
+    ('part', 'section', v_qs, 9),
+    ('%', 'unit', v_qs, 9),
+    ('12.5', 'answer', v_qs, 9),
+    ('part 2', 'section', v_qs, 10),
+    ('part', 'section', v_qs, 10),
+    ('%', 'unit', v_qs, 10),
+    ('7.5', 'answer', v_qs, 10),
+    ('part 2', 'section', v_qs, 11),
+    ('part', 'section', v_qs, 11),
+    ('g', 'unit', v_qs, 11),
+    ('10.8', 'answer', v_qs, 11),
+    ('part 2', 'section', v_qs, 12),
+    ('part', 'section', v_qs, 12),
+    ('g', 'unit', v_qs, 12),
+    ('54', 'answer', v_qs, 12),
+    ('part 2', 'section', v_qs, 13),
+    ('part', 'section', v_qs, 13),
+    ('g', 'unit', v_qs, 13),
+    ('125', 'answer', v_qs, 13),
+    ('part 2', 'section', v_qs, 14),
+    ('part', 'section', v_qs, 14),
+    ('g', 'unit', v_qs, 14),
+    ('325', 'answer', v_qs, 14),
+    ('part 3', 'section', v_qs, 15),
+    ('part', 'section', v_qs, 15),
+    ('%', 'unit', v_qs, 15),
+    ('7', 'answer', v_qs, 15),
+    ('part 3', 'section', v_qs, 16),
+    ('part', 'section', v_qs, 16),
+    ('%', 'unit', v_qs, 16),
+    ('9', 'answer', v_qs, 16),
+    ('part 3', 'section', v_qs, 17),
+    ('part', 'section', v_qs, 17),
+    ('%', 'unit', v_qs, 17),
+    ('9', 'answer', v_qs, 17),
+    ('part 3', 'section', v_qs, 18),
+    ('part', 'section', v_qs, 18),
+    ('%', 'unit', v_qs, 18),
+    ('10', 'answer', v_qs, 18),
+    ('part 3', 'section', v_qs, 19),
+    ('part', 'section', v_qs, 19),
+    ('%', 'unit', v_qs, 19),
+    ('12', 'answer', v_qs, 19),
+    ('part 4', 'section', v_qs, 20),
+    ('part', 'section', v_qs, 20),
+    ('%', 'unit', v_qs, 20),
+    ('11', 'answer', v_qs, 20),
+    ('part 4', 'section', v_qs, 21),
+    ('part', 'section', v_qs, 21),
+    ('%', 'unit', v_qs, 21),
+    ('14', 'answer', v_qs, 21),
+    ('part 4', 'section', v_qs, 22),
+    ('part', 'section', v_qs, 22),
+    ('%', 'unit', v_qs, 22),
+    ('17', 'answer', v_qs, 22),
+    ('part 4', 'section', v_qs, 23),
+    ('part', 'section', v_qs, 23),
+    ('%', 'unit', v_qs, 23),
+    ('13', 'answer', v_qs, 23),
+    ('part 4', 'section', v_qs, 24),
+    ('part', 'section', v_qs, 24),
+    ('%', 'unit', v_qs, 24),
+    ('11', 'answer', v_qs, 24),
+    ('part 5', 'section', v_qs, 25),
+    ('part', 'section', v_qs, 25),
+    ('%', 'unit', v_qs, 25),
+    ('10', 'answer', v_qs, 25),
+    ('part 5', 'section', v_qs, 26),
+    ('part', 'section', v_qs, 26),
+    ('%', 'unit', v_qs, 26),
+    ('5', 'answer', v_qs, 26),
+    ('part 5', 'section', v_qs, 27),
+    ('part', 'section', v_qs, 27),
+    ('%', 'unit', v_qs, 27),
+    ('10', 'answer', v_qs, 27),
+    ('part 5', 'section', v_qs, 28),
+    ('part', 'section', v_qs, 28),
+    ('%', 'unit', v_qs, 28),
+    ('9', 'answer', v_qs, 28),
+    ('part 5', 'section', v_qs, 29),
+    ('part', 'section', v_qs, 29),
+    ('%', 'unit', v_qs, 29),
+    ('20', 'answer', v_qs, 29),
+    ('part 6', 'section', v_qs, 30),
+    ('part', 'section', v_qs, 30),
+    ('%', 'unit', v_qs, 30),
+    ('12', 'answer', v_qs, 30),
+    ('part 6', 'section', v_qs, 31),
+    ('part', 'section', v_qs, 31),
+    ('%', 'unit', v_qs, 31),
+    ('10', 'answer', v_qs, 31),
+    ('part 6', 'section', v_qs, 32),
+    ('part', 'section', v_qs, 32),
+    ('%', 'unit', v_qs, 32),
+    ('20', 'answer', v_qs, 32),
+    ('part 6', 'section', v_qs, 33),
+    ('part', 'section', v_qs, 33),
+    ('%', 'unit', v_qs, 33),
+    ('16', 'answer', v_qs, 33),
+    ('part 6', 'section', v_qs, 34),
+    ('part', 'section', v_qs, 34),
+    ('%', 'unit', v_qs, 34),
+    ('6', 'answer', v_qs, 34),
+    ('part 7', 'section', v_qs, 35),
+    ('part', 'section', v_qs, 35),
+    ('g', 'unit', v_qs, 35),
+    ('100', 'answer', v_qs, 35),
+    ('part 7', 'section', v_qs, 36),
+    ('part', 'section', v_qs, 36),
+    ('g', 'unit', v_qs, 36),
+    ('100', 'answer', v_qs, 36),
+    ('part 7', 'section', v_qs, 37),
+    ('part', 'section', v_qs, 37),
+    ('g', 'unit', v_qs, 37),
+    ('80', 'answer', v_qs, 37),
+    ('part 7', 'section', v_qs, 38),
+    ('part', 'section', v_qs, 38),
+    ('g', 'unit', v_qs, 38),
+    ('40', 'answer', v_qs, 38),
+    ('part 7', 'section', v_qs, 39),
+    ('part', 'section', v_qs, 39),
+    ('g', 'unit', v_qs, 39),
+    ('180', 'answer', v_qs, 39),
+    ('part 8', 'section', v_qs, 40),
+    ('part', 'section', v_qs, 40),
+    ('g', 'unit', v_qs, 40),
+    ('240', 'answer', v_qs, 40),
+    ('part 8', 'section', v_qs, 41),
+    ('part', 'section', v_qs, 41),
+    ('g', 'unit', v_qs, 41),
+    ('90', 'answer', v_qs, 41),
+    ('part 8', 'section', v_qs, 42),
+    ('part', 'section', v_qs, 42),
+    ('g', 'unit', v_qs, 42),
+    ('175', 'answer', v_qs, 42),
+    ('part 8', 'section', v_qs, 43),
+    ('part', 'section', v_qs, 43),
+    ('g', 'unit', v_qs, 43),
+    ('320', 'answer', v_qs, 43),
+    ('part 8', 'section', v_qs, 44),
+    ('part', 'section', v_qs, 44),
+    ('g', 'unit', v_qs, 44),
+    ('280', 'answer', v_qs, 44),
+    ('part 9', 'section', v_qs, 45),
+    ('part', 'section', v_qs, 45),
+    ('g', 'unit', v_qs, 45),
+    ('30', 'answer', v_qs, 45),
+    ('part 9', 'section', v_qs, 46),
+    ('part', 'section', v_qs, 46),
+    ('g', 'unit', v_qs, 46),
+    ('80', 'answer', v_qs, 46),
+    ('part 9', 'section', v_qs, 47),
+    ('part', 'section', v_qs, 47),
+    ('g', 'unit', v_qs, 47),
+    ('60', 'answer', v_qs, 47),
+    ('part 9', 'section', v_qs, 48),
+    ('part', 'section', v_qs, 48),
+    ('g', 'unit', v_qs, 48),
+    ('60', 'answer', v_qs, 48),
+    ('part 9', 'section', v_qs, 49),
+    ('part', 'section', v_qs, 49),
+    ('g', 'unit', v_qs, 49),
+    ('150', 'answer', v_qs, 49),
+    ('part 10', 'section', v_qs, 50),
+    ('part', 'section', v_qs, 50),
+    ('g', 'unit', v_qs, 50),
+    ('96', 'answer', v_qs, 50),
+    ('part 10', 'section', v_qs, 51),
+    ('part', 'section', v_qs, 51),
+    ('g', 'unit', v_qs, 51),
+    ('120', 'answer', v_qs, 51),
+    ('part 10', 'section', v_qs, 52),
+    ('part', 'section', v_qs, 52),
+    ('g', 'unit', v_qs, 52),
+    ('45', 'answer', v_qs, 52),
+    ('part 10', 'section', v_qs, 53),
+    ('part', 'section', v_qs, 53),
+    ('g', 'unit', v_qs, 53),
+    ('80', 'answer', v_qs, 53),
+    ('part 10', 'section', v_qs, 54),
+    ('part', 'section', v_qs, 54),
+    ('g', 'unit', v_qs, 54),
+    ('300', 'answer', v_qs, 54);
+
   -- ========================================
   -- 小5 第6回② 食塩水 (20問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 6;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 6 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 6 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第6回② 食塩水（approved済み）';
@@ -1313,10 +3259,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', 'Part 11', 'numeric', '10', '％', NULL, 1, 1),
     (v_qs, '(2)', 'Part 11', 'numeric', '8', '％', NULL, 1, 2),
     (v_qs, '(3)', 'Part 11', 'numeric', '10', '％', NULL, 1, 3),
@@ -1338,22 +3281,112 @@ BEGIN
     (v_qs, '(4)', 'Part 14', 'numeric', '7.5', '％', NULL, 1, 19),
     (v_qs, '(5)', 'Part 14', 'numeric', '7.2', '％', NULL, 1, 20);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "19", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "6.5", "p": 1}, {"t": "numeric", "a": "4.8", "p": 1}, {"t": "numeric", "a": "7.5", "p": 1}, {"t": "numeric", "a": "7.5", "p": 1}, {"t": "numeric", "a": "7.2", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 20;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第6回2', 'title', v_qs, 0),
+    ('第6', 'title', v_qs, 0),
+    ('6回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('食塩水', 'title', v_qs, 0),
+    ('食塩', 'title', v_qs, 0),
+    ('塩水', 'title', v_qs, 0),
+    ('part 11', 'section', v_qs, 1),
+    ('part', 'section', v_qs, 1),
+    ('%', 'unit', v_qs, 1),
+    ('10', 'answer', v_qs, 1),
+    ('part 11', 'section', v_qs, 2),
+    ('part', 'section', v_qs, 2),
+    ('%', 'unit', v_qs, 2),
+    ('8', 'answer', v_qs, 2),
+    ('part 11', 'section', v_qs, 3),
+    ('part', 'section', v_qs, 3),
+    ('%', 'unit', v_qs, 3),
+    ('10', 'answer', v_qs, 3),
+    ('part 11', 'section', v_qs, 4),
+    ('part', 'section', v_qs, 4),
+    ('%', 'unit', v_qs, 4),
+    ('16', 'answer', v_qs, 4),
+    ('part 11', 'section', v_qs, 5),
+    ('part', 'section', v_qs, 5),
+    ('%', 'unit', v_qs, 5),
+    ('15', 'answer', v_qs, 5),
+    ('part 12', 'section', v_qs, 6),
+    ('part', 'section', v_qs, 6),
+    ('%', 'unit', v_qs, 6),
+    ('20', 'answer', v_qs, 6),
+    ('part 12', 'section', v_qs, 7),
+    ('part', 'section', v_qs, 7),
+    ('%', 'unit', v_qs, 7),
+    ('19', 'answer', v_qs, 7),
+    ('part 12', 'section', v_qs, 8),
+    ('part', 'section', v_qs, 8),
+    ('%', 'unit', v_qs, 8),
+    ('16', 'answer', v_qs, 8),
+    ('part 12', 'section', v_qs, 9),
+    ('part', 'section', v_qs, 9),
+    ('%', 'unit', v_qs, 9),
+    ('18', 'answer', v_qs, 9),
+    ('part 12', 'section', v_qs, 10),
+    ('part', 'section', v_qs, 10),
+    ('%', 'unit', v_qs, 10),
+    ('20', 'answer', v_qs, 10),
+    ('part 13', 'section', v_qs, 11),
+    ('part', 'section', v_qs, 11),
+    ('%', 'unit', v_qs, 11),
+    ('6', 'answer', v_qs, 11),
+    ('part 13', 'section', v_qs, 12),
+    ('part', 'section', v_qs, 12),
+    ('%', 'unit', v_qs, 12),
+    ('6', 'answer', v_qs, 12),
+    ('part 13', 'section', v_qs, 13),
+    ('part', 'section', v_qs, 13),
+    ('%', 'unit', v_qs, 13),
+    ('9', 'answer', v_qs, 13),
+    ('part 13', 'section', v_qs, 14),
+    ('part', 'section', v_qs, 14),
+    ('%', 'unit', v_qs, 14),
+    ('10', 'answer', v_qs, 14),
+    ('part 13', 'section', v_qs, 15),
+    ('part', 'section', v_qs, 15),
+    ('%', 'unit', v_qs, 15),
+    ('16', 'answer', v_qs, 15),
+    ('part 14', 'section', v_qs, 16),
+    ('part', 'section', v_qs, 16),
+    ('%', 'unit', v_qs, 16),
+    ('6.5', 'answer', v_qs, 16),
+    ('part 14', 'section', v_qs, 17),
+    ('part', 'section', v_qs, 17),
+    ('%', 'unit', v_qs, 17),
+    ('4.8', 'answer', v_qs, 17),
+    ('part 14', 'section', v_qs, 18),
+    ('part', 'section', v_qs, 18),
+    ('%', 'unit', v_qs, 18),
+    ('7.5', 'answer', v_qs, 18),
+    ('part 14', 'section', v_qs, 19),
+    ('part', 'section', v_qs, 19),
+    ('%', 'unit', v_qs, 19),
+    ('7.5', 'answer', v_qs, 19),
+    ('part 14', 'section', v_qs, 20),
+    ('part', 'section', v_qs, 20),
+    ('%', 'unit', v_qs, 20),
+    ('7.2', 'answer', v_qs, 20);
+
   -- ========================================
   -- 小5 第7回① 売買損益 (45問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 7;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 7 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 7 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第7回① 売買損益（approved済み）';
@@ -1376,10 +3409,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '180', '円', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '420', '円', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '500', '円', NULL, 1, 3),
@@ -1426,22 +3456,175 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '40', NULL, NULL, 1, 44),
     (v_qs, '(20)', '計算練習', 'numeric', '125', NULL, NULL, 1, 45);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "420", "p": 1}, {"t": "numeric", "a": "500", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "350", "p": 1}, {"t": "numeric", "a": "630", "p": 1}, {"t": "numeric", "a": "800", "p": 1}, {"t": "numeric", "a": "25", "p": 1}, {"t": "numeric", "a": "198", "p": 1}, {"t": "numeric", "a": "1680", "p": 1}, {"t": "numeric", "a": "1120", "p": 1}, {"t": "numeric", "a": "35", "p": 1}, {"t": "numeric", "a": "392", "p": 1}, {"t": "numeric", "a": "480", "p": 1}, {"t": "numeric", "a": "720", "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "126", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "105", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "225", "p": 1}, {"t": "numeric", "a": "600", "p": 1}, {"t": "numeric", "a": "500", "p": 1}, {"t": "numeric", "a": "900", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "300", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "40", "p": 1}, {"t": "numeric", "a": "125", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 45;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第7回1', 'title', v_qs, 0),
+    ('第7', 'title', v_qs, 0),
+    ('7回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('売買損益', 'title', v_qs, 0),
+    ('売買', 'title', v_qs, 0),
+    ('買損', 'title', v_qs, 0),
+    ('損益', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('円', 'unit', v_qs, 1),
+    ('180', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('円', 'unit', v_qs, 2),
+    ('420', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('円', 'unit', v_qs, 3),
+    ('500', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('%引き', 'unit', v_qs, 4),
+    ('12', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('円', 'unit', v_qs, 5),
+    ('350', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('円', 'unit', v_qs, 6),
+    ('630', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('円', 'unit', v_qs, 7),
+    ('800', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('%引き', 'unit', v_qs, 8),
+    ('25', 'answer', v_qs, 8),
+    ('類題1', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('円', 'unit', v_qs, 9),
+    ('198', 'answer', v_qs, 9),
+    ('類題1', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('円', 'unit', v_qs, 10),
+    ('1680', 'answer', v_qs, 10),
+    ('類題1', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('円', 'unit', v_qs, 11),
+    ('1120', 'answer', v_qs, 11),
+    ('類題1', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('%引き', 'unit', v_qs, 12),
+    ('35', 'answer', v_qs, 12),
+    ('類題1', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('円', 'unit', v_qs, 13),
+    ('392', 'answer', v_qs, 13),
+    ('類題1', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('円', 'unit', v_qs, 14),
+    ('480', 'answer', v_qs, 14),
+    ('類題1', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('円', 'unit', v_qs, 15),
+    ('720', 'answer', v_qs, 15),
+    ('類題1', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('割', 'unit', v_qs, 16),
+    ('分引き', 'unit', v_qs, 16),
+    ('2', 'answer', v_qs, 16),
+    ('4', 'answer', v_qs, 16),
+    ('類題2', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('円', 'unit', v_qs, 17),
+    ('12', 'answer', v_qs, 17),
+    ('類題2', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('円', 'unit', v_qs, 18),
+    ('32', 'answer', v_qs, 18),
+    ('類題2', 'section', v_qs, 19),
+    ('類題', 'section', v_qs, 19),
+    ('円', 'unit', v_qs, 19),
+    ('60', 'answer', v_qs, 19),
+    ('類題2', 'section', v_qs, 20),
+    ('類題', 'section', v_qs, 20),
+    ('円', 'unit', v_qs, 20),
+    ('12', 'answer', v_qs, 20),
+    ('類題2', 'section', v_qs, 21),
+    ('類題', 'section', v_qs, 21),
+    ('円', 'unit', v_qs, 21),
+    ('28', 'answer', v_qs, 21),
+    ('類題2', 'section', v_qs, 22),
+    ('類題', 'section', v_qs, 22),
+    ('円', 'unit', v_qs, 22),
+    ('16', 'answer', v_qs, 22),
+    ('類題2', 'section', v_qs, 23),
+    ('類題', 'section', v_qs, 23),
+    ('円', 'unit', v_qs, 23),
+    ('126', 'answer', v_qs, 23),
+    ('類題2', 'section', v_qs, 24),
+    ('類題', 'section', v_qs, 24),
+    ('円', 'unit', v_qs, 24),
+    ('75', 'answer', v_qs, 24),
+    ('類題2', 'section', v_qs, 25),
+    ('類題', 'section', v_qs, 25),
+    ('円', 'unit', v_qs, 25),
+    ('200', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('72', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('70', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('120', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('64', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('108', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('105', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('72', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('108', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('84', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('75', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('200', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('225', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('600', 'answer', v_qs, 38),
+    ('計算練習', 'section', v_qs, 39),
+    ('500', 'answer', v_qs, 39),
+    ('計算練習', 'section', v_qs, 40),
+    ('900', 'answer', v_qs, 40),
+    ('計算練習', 'section', v_qs, 41),
+    ('200', 'answer', v_qs, 41),
+    ('計算練習', 'section', v_qs, 42),
+    ('300', 'answer', v_qs, 42),
+    ('計算練習', 'section', v_qs, 43),
+    ('80', 'answer', v_qs, 43),
+    ('計算練習', 'section', v_qs, 44),
+    ('40', 'answer', v_qs, 44),
+    ('計算練習', 'section', v_qs, 45),
+    ('125', 'answer', v_qs, 45);
+
   -- ========================================
   -- 小5 第7回② 売買損益（複数個） (28問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 7;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 7 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 7 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第7回② 売買損益（複数個）（approved済み）';
@@ -1464,10 +3647,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題5', 'numeric', '2040', '円', NULL, 1, 1),
     (v_qs, '(2)', '類題5', 'numeric', '1320', '円', NULL, 1, 2),
     (v_qs, '(3)', '類題5', 'numeric', '2560', '円', NULL, 1, 3),
@@ -1497,22 +3677,110 @@ BEGIN
     (v_qs, '(19)', '計算練習', 'numeric', '45000', NULL, NULL, 1, 27),
     (v_qs, '(20)', '計算練習', 'numeric', '17000', NULL, NULL, 1, 28);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "2040", "p": 1}, {"t": "numeric", "a": "1320", "p": 1}, {"t": "numeric", "a": "2560", "p": 1}, {"t": "numeric", "a": "8160", "p": 1}, {"t": "numeric", "a": "100", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "640", "p": 1}, {"t": "numeric", "a": "750", "p": 1}, {"t": "numeric", "a": "540", "p": 1}, {"t": "numeric", "a": "840", "p": 1}, {"t": "numeric", "a": "960", "p": 1}, {"t": "numeric", "a": "910", "p": 1}, {"t": "numeric", "a": "990", "p": 1}, {"t": "numeric", "a": "375", "p": 1}, {"t": "numeric", "a": "300", "p": 1}, {"t": "numeric", "a": "425", "p": 1}, {"t": "numeric", "a": "4800", "p": 1}, {"t": "numeric", "a": "6000", "p": 1}, {"t": "numeric", "a": "9000", "p": 1}, {"t": "numeric", "a": "9800", "p": 1}, {"t": "numeric", "a": "7200", "p": 1}, {"t": "numeric", "a": "5200", "p": 1}, {"t": "numeric", "a": "5500", "p": 1}, {"t": "numeric", "a": "50000", "p": 1}, {"t": "numeric", "a": "45000", "p": 1}, {"t": "numeric", "a": "17000", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 28;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第7回2', 'title', v_qs, 0),
+    ('第7', 'title', v_qs, 0),
+    ('7回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('売買損益(複数個)', 'title', v_qs, 0),
+    ('売買', 'title', v_qs, 0),
+    ('買損', 'title', v_qs, 0),
+    ('損益', 'title', v_qs, 0),
+    ('益(', 'title', v_qs, 0),
+    ('(複', 'title', v_qs, 0),
+    ('複数', 'title', v_qs, 0),
+    ('数個', 'title', v_qs, 0),
+    ('個)', 'title', v_qs, 0),
+    ('類題5', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('円', 'unit', v_qs, 1),
+    ('2040', 'answer', v_qs, 1),
+    ('類題5', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('円', 'unit', v_qs, 2),
+    ('1320', 'answer', v_qs, 2),
+    ('類題5', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('円', 'unit', v_qs, 3),
+    ('2560', 'answer', v_qs, 3),
+    ('類題5', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('円', 'unit', v_qs, 4),
+    ('8160', 'answer', v_qs, 4),
+    ('類題6', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('個', 'unit', v_qs, 5),
+    ('100', 'answer', v_qs, 5),
+    ('類題6', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('個', 'unit', v_qs, 6),
+    ('80', 'answer', v_qs, 6),
+    ('類題6', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('個', 'unit', v_qs, 7),
+    ('120', 'answer', v_qs, 7),
+    ('類題6', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('個', 'unit', v_qs, 8),
+    ('200', 'answer', v_qs, 8),
+    ('計算練習', 'section', v_qs, 9),
+    ('640', 'answer', v_qs, 9),
+    ('計算練習', 'section', v_qs, 10),
+    ('750', 'answer', v_qs, 10),
+    ('計算練習', 'section', v_qs, 11),
+    ('540', 'answer', v_qs, 11),
+    ('計算練習', 'section', v_qs, 12),
+    ('840', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('960', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('910', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('990', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('375', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('300', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('425', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('4800', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('6000', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('9000', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('9800', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('7200', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('5200', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('5500', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('50000', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('45000', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('17000', 'answer', v_qs, 28);
+
   -- ========================================
   -- 小5 第8回① 多角形の回転移動 (19問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 8;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 8 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 8 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第8回① 多角形の回転移動（approved済み）';
@@ -1535,10 +3803,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '42', '°', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '160', '°', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '55', '°', NULL, 1, 3),
@@ -1559,22 +3824,103 @@ BEGIN
     (v_qs, '(7)', '計算練習', 'numeric', '3', NULL, NULL, 1, 18),
     (v_qs, '(8)', '計算練習', 'numeric', '7', NULL, NULL, 1, 19);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "42", "p": 1}, {"t": "numeric", "a": "160", "p": 1}, {"t": "numeric", "a": "55", "p": 1}, {"t": "numeric", "a": "145", "p": 1}, {"t": "numeric", "a": "9.42", "p": 1}, {"t": "numeric", "a": "12.56", "p": 1}, {"t": "numeric", "a": "15.7", "p": 1}, {"t": "numeric", "a": "6.28", "p": 1}, {"t": "multi_part", "a": {"①": "12.56", "②": "86.8"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "18.84", "②": "289.5"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "18.84", "②": "31.4"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "2", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "7", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 19;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第8回1', 'title', v_qs, 0),
+    ('第8', 'title', v_qs, 0),
+    ('8回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('多角形の回転移動', 'title', v_qs, 0),
+    ('多角', 'title', v_qs, 0),
+    ('角形', 'title', v_qs, 0),
+    ('形の', 'title', v_qs, 0),
+    ('の回', 'title', v_qs, 0),
+    ('回転', 'title', v_qs, 0),
+    ('転移', 'title', v_qs, 0),
+    ('移動', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('°', 'unit', v_qs, 1),
+    ('42', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('°', 'unit', v_qs, 2),
+    ('160', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('°', 'unit', v_qs, 3),
+    ('55', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('°', 'unit', v_qs, 4),
+    ('145', 'answer', v_qs, 4),
+    ('類題2', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm', 'unit', v_qs, 5),
+    ('9.42', 'answer', v_qs, 5),
+    ('類題2', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('12.56', 'answer', v_qs, 6),
+    ('類題2', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm', 'unit', v_qs, 7),
+    ('15.7', 'answer', v_qs, 7),
+    ('類題2', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('6.28', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('12.56', 'answer', v_qs, 9),
+    ('86.8', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('cm', 'unit', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('18.84', 'answer', v_qs, 10),
+    ('289.5', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('cm', 'unit', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('18.84', 'answer', v_qs, 11),
+    ('31.4', 'answer', v_qs, 11),
+    ('計算練習', 'section', v_qs, 12),
+    ('2', 'answer', v_qs, 12),
+    ('計算練習', 'section', v_qs, 13),
+    ('9', 'answer', v_qs, 13),
+    ('計算練習', 'section', v_qs, 14),
+    ('8', 'answer', v_qs, 14),
+    ('計算練習', 'section', v_qs, 15),
+    ('12', 'answer', v_qs, 15),
+    ('計算練習', 'section', v_qs, 16),
+    ('5', 'answer', v_qs, 16),
+    ('計算練習', 'section', v_qs, 17),
+    ('6', 'answer', v_qs, 17),
+    ('計算練習', 'section', v_qs, 18),
+    ('3', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('7', 'answer', v_qs, 19);
+
   -- ========================================
   -- 小5 第8回② 多角形の転がり移動 (8問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 8;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 8 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 8 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第8回② 多角形の転がり移動（approved済み）';
@@ -1597,10 +3943,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'multi_part', NULL, NULL, '{"slots": [{"label": "□", "unit": ""}, {"label": "△", "unit": ""}, {"label": "②", "unit": "㎝"}], "correct_values": {"□": "A", "△": "B", "②": "18.84"}, "template": "□＝{□}，△＝{△}，②{②}㎝"}', 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '25.12', '㎝', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "75.36", "②": "820"}, "template": "①{①}㎝，②{②}㎠"}', 1, 3),
@@ -1610,22 +3953,81 @@ BEGIN
     (v_qs, '(1)', 'チャレンジ', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎝"}], "correct_values": {"①": "9.42", "②": "12.56"}, "template": "①{①}㎝，②{②}㎝"}', 1, 7),
     (v_qs, '(2)', 'チャレンジ', 'numeric', '125.6', '㎠', NULL, 1, 8);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"□": "A", "△": "B", "②": "18.84"}, "s": ["□", "△", "②"], "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "multi_part", "a": {"①": "75.36", "②": "820"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "37.68", "②": "205"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "D", "②": "A", "③": "B", "④": "C", "⑤": "47.1", "⑥": "325.33"}, "s": ["①", "②", "③", "④", "⑤", "⑥"], "p": 1}, {"t": "numeric", "a": "34.54", "p": 1}, {"t": "multi_part", "a": {"①": "9.42", "②": "12.56"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "125.6", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 8;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第8回2', 'title', v_qs, 0),
+    ('第8', 'title', v_qs, 0),
+    ('8回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('多角形の転がり移動', 'title', v_qs, 0),
+    ('多角', 'title', v_qs, 0),
+    ('角形', 'title', v_qs, 0),
+    ('形の', 'title', v_qs, 0),
+    ('の転', 'title', v_qs, 0),
+    ('転が', 'title', v_qs, 0),
+    ('がり', 'title', v_qs, 0),
+    ('り移', 'title', v_qs, 0),
+    ('移動', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm', 'unit', v_qs, 1),
+    ('a', 'answer', v_qs, 1),
+    ('b', 'answer', v_qs, 1),
+    ('18.84', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm', 'unit', v_qs, 2),
+    ('25.12', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm', 'unit', v_qs, 3),
+    ('cm2', 'unit', v_qs, 3),
+    ('75.36', 'answer', v_qs, 3),
+    ('820', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('37.68', 'answer', v_qs, 4),
+    ('205', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm', 'unit', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('d', 'answer', v_qs, 5),
+    ('a', 'answer', v_qs, 5),
+    ('b', 'answer', v_qs, 5),
+    ('c', 'answer', v_qs, 5),
+    ('47.1', 'answer', v_qs, 5),
+    ('325.33', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm', 'unit', v_qs, 6),
+    ('34.54', 'answer', v_qs, 6),
+    ('チャレンジ', 'section', v_qs, 7),
+    ('cm', 'unit', v_qs, 7),
+    ('9.42', 'answer', v_qs, 7),
+    ('12.56', 'answer', v_qs, 7),
+    ('チャレンジ', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('125.6', 'answer', v_qs, 8);
+
   -- ========================================
   -- 小5 第9回① 円の回転移動・転がり移動 (13問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 9;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 9 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 9 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第9回① 円の回転移動・転がり移動（approved済み）';
@@ -1648,10 +4050,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '6.28', '㎠', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": "㎝"}], "correct_values": {"①": "50.24", "②": "37.68"}, "template": "①{①}㎠，②{②}㎝"}', 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '12.56', '㎠', NULL, 1, 3),
@@ -1666,22 +4065,101 @@ BEGIN
     (v_qs, '(6)', '類題2', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "30.28", "②": "60.56"}, "template": "①{①}㎝，②{②}㎠"}', 1, 12),
     (v_qs, '(7)', '類題2', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "22.28", "②": "44.56"}, "template": "①{①}㎝，②{②}㎠"}', 1, 13);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "6.28", "p": 1}, {"t": "multi_part", "a": {"①": "50.24", "②": "37.68"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "12.56", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "numeric", "a": "65.94", "p": 1}, {"t": "multi_part", "a": {"①": "157", "②": "47.1"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "11.14", "p": 1}, {"t": "numeric", "a": "88.26", "p": 1}, {"t": "numeric", "a": "210.24", "p": 1}, {"t": "multi_part", "a": {"①": "22.28", "②": "44.56"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "52.56", "p": 1}, {"t": "multi_part", "a": {"①": "30.28", "②": "60.56"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "22.28", "②": "44.56"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 13;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第9回1', 'title', v_qs, 0),
+    ('第9', 'title', v_qs, 0),
+    ('9回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('円の回転移動・転がり移動', 'title', v_qs, 0),
+    ('円の', 'title', v_qs, 0),
+    ('の回', 'title', v_qs, 0),
+    ('回転', 'title', v_qs, 0),
+    ('転移', 'title', v_qs, 0),
+    ('移動', 'title', v_qs, 0),
+    ('動・', 'title', v_qs, 0),
+    ('・転', 'title', v_qs, 0),
+    ('転が', 'title', v_qs, 0),
+    ('がり', 'title', v_qs, 0),
+    ('り移', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm2', 'unit', v_qs, 1),
+    ('6.28', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm2', 'unit', v_qs, 2),
+    ('cm', 'unit', v_qs, 2),
+    ('50.24', 'answer', v_qs, 2),
+    ('37.68', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm2', 'unit', v_qs, 3),
+    ('12.56', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('18.84', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('65.94', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('157', 'answer', v_qs, 6),
+    ('47.1', 'answer', v_qs, 6),
+    ('類題2', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('11.14', 'answer', v_qs, 7),
+    ('類題2', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('88.26', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('210.24', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('cm', 'unit', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('22.28', 'answer', v_qs, 10),
+    ('44.56', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('52.56', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('cm', 'unit', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('30.28', 'answer', v_qs, 12),
+    ('60.56', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('cm', 'unit', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('22.28', 'answer', v_qs, 13),
+    ('44.56', 'answer', v_qs, 13);
+
   -- ========================================
   -- 小5 第9回② 円の転がり移動2 (13問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 9;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '5年' AND session_number = 9 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 9 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小5 第9回② 円の転がり移動2（approved済み）';
@@ -1704,10 +4182,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '類題1', 'numeric', '24', '㎝', NULL, 1, 1),
     (v_qs, '(2)', '類題1', 'numeric', '16', '㎝', NULL, 1, 2),
     (v_qs, '(3)', '類題1', 'numeric', '14', '㎝', NULL, 1, 3),
@@ -1722,22 +4197,98 @@ BEGIN
     (v_qs, '(2)', '類題3', 'numeric', '38.065', '㎠', NULL, 1, 12),
     (v_qs, '(3)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "19.14", "②": "20.925"}, "template": "①{①}㎠，②{②}㎠"}', 1, 13);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "24", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "multi_part", "a": {"①": "46.26", "②": "277.56"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "24.28", "②": "277.56"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "13.42", "p": 1}, {"t": "multi_part", "a": {"①": "25.12", "②": "50.24"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "37.68", "②": "28.26"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "30.925", "p": 1}, {"t": "numeric", "a": "38.065", "p": 1}, {"t": "multi_part", "a": {"①": "19.14", "②": "20.925"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 13;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第9回2', 'title', v_qs, 0),
+    ('第9', 'title', v_qs, 0),
+    ('9回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('円の転がり移動2', 'title', v_qs, 0),
+    ('円の', 'title', v_qs, 0),
+    ('の転', 'title', v_qs, 0),
+    ('転が', 'title', v_qs, 0),
+    ('がり', 'title', v_qs, 0),
+    ('り移', 'title', v_qs, 0),
+    ('移動', 'title', v_qs, 0),
+    ('動2', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm', 'unit', v_qs, 1),
+    ('24', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm', 'unit', v_qs, 2),
+    ('16', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm', 'unit', v_qs, 3),
+    ('14', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('32', 'answer', v_qs, 4),
+    ('類題2', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm', 'unit', v_qs, 5),
+    ('18.84', 'answer', v_qs, 5),
+    ('類題2', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm', 'unit', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('46.26', 'answer', v_qs, 6),
+    ('277.56', 'answer', v_qs, 6),
+    ('類題2', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm', 'unit', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('24.28', 'answer', v_qs, 7),
+    ('277.56', 'answer', v_qs, 7),
+    ('類題2', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('13.42', 'answer', v_qs, 8),
+    ('類題2', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('25.12', 'answer', v_qs, 9),
+    ('50.24', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('cm', 'unit', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('37.68', 'answer', v_qs, 10),
+    ('28.26', 'answer', v_qs, 10),
+    ('類題3', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('30.925', 'answer', v_qs, 11),
+    ('類題3', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('38.065', 'answer', v_qs, 12),
+    ('類題3', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('19.14', 'answer', v_qs, 13),
+    ('20.925', 'answer', v_qs, 13);
+
   -- ========================================
   -- 小6 第6回① 速さ (19問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 6;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 6 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 6 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第6回① 速さ（approved済み）';
@@ -1760,10 +4311,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '速さの三用法', 'numeric', '36', '㎞/時', NULL, 1, 1),
     (v_qs, '(2)', '速さの三用法', 'numeric', '45', 'm/分', NULL, 1, 2),
     (v_qs, '(3)', '速さの三用法', 'numeric', '10', '㎞', NULL, 1, 3),
@@ -1784,22 +4332,91 @@ BEGIN
     (v_qs, '(2)', 'ダイヤグラム', 'numeric', '14', '分', NULL, 1, 18),
     (v_qs, '(3)', 'ダイヤグラム', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m/分"}], "correct_values": {"①": "600", "②": "54"}, "template": "①{①}m，②{②}m/分"}', 1, 19);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "36", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "300", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "160", "p": 1}, {"t": "numeric", "a": "32", "p": 1}, {"t": "numeric", "a": "50", "p": 1}, {"t": "numeric", "a": "60", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "200", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "multi_part", "a": {"①": "900", "②": "15"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "600", "②": "54"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 19;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第6回1', 'title', v_qs, 0),
+    ('第6', 'title', v_qs, 0),
+    ('6回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('速さ', 'title', v_qs, 0),
+    ('速さの三用法', 'section', v_qs, 1),
+    ('km/時', 'unit', v_qs, 1),
+    ('36', 'answer', v_qs, 1),
+    ('速さの三用法', 'section', v_qs, 2),
+    ('m/分', 'unit', v_qs, 2),
+    ('45', 'answer', v_qs, 2),
+    ('速さの三用法', 'section', v_qs, 3),
+    ('km', 'unit', v_qs, 3),
+    ('10', 'answer', v_qs, 3),
+    ('速さの三用法', 'section', v_qs, 4),
+    ('m', 'unit', v_qs, 4),
+    ('300', 'answer', v_qs, 4),
+    ('速さの三用法', 'section', v_qs, 5),
+    ('m/分', 'unit', v_qs, 5),
+    ('80', 'answer', v_qs, 5),
+    ('速さの三用法', 'section', v_qs, 6),
+    ('分', 'unit', v_qs, 6),
+    ('45', 'answer', v_qs, 6),
+    ('速さの三用法', 'section', v_qs, 7),
+    ('分', 'unit', v_qs, 7),
+    ('12', 'answer', v_qs, 7),
+    ('速さの三用法', 'section', v_qs, 8),
+    ('m/分', 'unit', v_qs, 8),
+    ('160', 'answer', v_qs, 8),
+    ('速さの三用法', 'section', v_qs, 9),
+    ('km', 'unit', v_qs, 9),
+    ('32', 'answer', v_qs, 9),
+    ('速さの三用法', 'section', v_qs, 10),
+    ('分', 'unit', v_qs, 10),
+    ('50', 'answer', v_qs, 10),
+    ('平均の速さ', 'section', v_qs, 11),
+    ('m/分', 'unit', v_qs, 11),
+    ('60', 'answer', v_qs, 11),
+    ('平均の速さ', 'section', v_qs, 12),
+    ('m/分', 'unit', v_qs, 12),
+    ('96', 'answer', v_qs, 12),
+    ('平均の速さ', 'section', v_qs, 13),
+    ('m/分', 'unit', v_qs, 13),
+    ('200', 'answer', v_qs, 13),
+    ('平均の速さ', 'section', v_qs, 14),
+    ('m/分', 'unit', v_qs, 14),
+    ('150', 'answer', v_qs, 14),
+    ('平均の速さ', 'section', v_qs, 15),
+    ('m/分', 'unit', v_qs, 15),
+    ('125', 'answer', v_qs, 15),
+    ('平均の速さ', 'section', v_qs, 16),
+    ('m/分', 'unit', v_qs, 16),
+    ('80', 'answer', v_qs, 16),
+    ('ダイヤグラム', 'section', v_qs, 17),
+    ('m', 'unit', v_qs, 17),
+    ('分', 'unit', v_qs, 17),
+    ('900', 'answer', v_qs, 17),
+    ('15', 'answer', v_qs, 17),
+    ('ダイヤグラム', 'section', v_qs, 18),
+    ('分', 'unit', v_qs, 18),
+    ('14', 'answer', v_qs, 18),
+    ('ダイヤグラム', 'section', v_qs, 19),
+    ('m', 'unit', v_qs, 19),
+    ('m/分', 'unit', v_qs, 19),
+    ('600', 'answer', v_qs, 19),
+    ('54', 'answer', v_qs, 19);
+
   -- ========================================
   -- 小6 第6回② 速さ (16問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 6;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 6 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 6 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第6回② 速さ（approved済み）';
@@ -1822,10 +4439,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '旅人算', 'numeric', '35', '分', NULL, 1, 1),
     (v_qs, '(2)', '旅人算', 'numeric', '14', '分後', NULL, 1, 2),
     (v_qs, '(3)', '旅人算', 'numeric', '6', '分後', NULL, 1, 3),
@@ -1843,22 +4457,93 @@ BEGIN
     (v_qs, '(1)', '速さとつるかめ算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m"}], "correct_values": {"①": "3040", "②": "2400"}, "template": "①{①}m，②{②}m"}', 1, 15),
     (v_qs, '(2)', '速さとつるかめ算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③", "unit": "分間"}], "correct_values": {"①": "1", "②": "5", "③": "4"}, "template": "①{①}：{②}，②{③}分間"}', 1, 16);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "35", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "130", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "numeric", "a": "1400", "p": 1}, {"t": "multi_part", "a": {"①": "160", "②": "240"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "60", "②": "90"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "4500", "②": "1", "③": "30"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "3"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "30", "③": "7.5"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "3", "③": "720"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "3040", "②": "2400"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "1", "②": "5", "③": "4"}, "s": ["①", "②", "③"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 16;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第6回2', 'title', v_qs, 0),
+    ('第6', 'title', v_qs, 0),
+    ('6回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('速さ', 'title', v_qs, 0),
+    ('旅人算', 'section', v_qs, 1),
+    ('分', 'unit', v_qs, 1),
+    ('35', 'answer', v_qs, 1),
+    ('旅人算', 'section', v_qs, 2),
+    ('分後', 'unit', v_qs, 2),
+    ('14', 'answer', v_qs, 2),
+    ('旅人算', 'section', v_qs, 3),
+    ('分後', 'unit', v_qs, 3),
+    ('6', 'answer', v_qs, 3),
+    ('旅人算', 'section', v_qs, 4),
+    ('m/分', 'unit', v_qs, 4),
+    ('130', 'answer', v_qs, 4),
+    ('旅人算', 'section', v_qs, 5),
+    ('分後', 'unit', v_qs, 5),
+    ('15', 'answer', v_qs, 5),
+    ('旅人算', 'section', v_qs, 6),
+    ('m', 'unit', v_qs, 6),
+    ('1400', 'answer', v_qs, 6),
+    ('旅人算', 'section', v_qs, 7),
+    ('m/分', 'unit', v_qs, 7),
+    ('160', 'answer', v_qs, 7),
+    ('240', 'answer', v_qs, 7),
+    ('旅人算', 'section', v_qs, 8),
+    ('m/分', 'unit', v_qs, 8),
+    ('60', 'answer', v_qs, 8),
+    ('90', 'answer', v_qs, 8),
+    ('旅人算', 'section', v_qs, 9),
+    ('m', 'unit', v_qs, 9),
+    ('時間', 'unit', v_qs, 9),
+    ('分後', 'unit', v_qs, 9),
+    ('4500', 'answer', v_qs, 9),
+    ('1', 'answer', v_qs, 9),
+    ('30', 'answer', v_qs, 9),
+    ('速さと比', 'section', v_qs, 10),
+    ('5', 'answer', v_qs, 10),
+    ('3', 'answer', v_qs, 10),
+    ('速さと比', 'section', v_qs, 11),
+    ('時間', 'unit', v_qs, 11),
+    ('分', 'unit', v_qs, 11),
+    ('km', 'unit', v_qs, 11),
+    ('2', 'answer', v_qs, 11),
+    ('30', 'answer', v_qs, 11),
+    ('7.5', 'answer', v_qs, 11),
+    ('速さと比', 'section', v_qs, 12),
+    ('m', 'unit', v_qs, 12),
+    ('2', 'answer', v_qs, 12),
+    ('3', 'answer', v_qs, 12),
+    ('720', 'answer', v_qs, 12),
+    ('運転間隔', 'section', v_qs, 13),
+    ('3', 'answer', v_qs, 13),
+    ('1', 'answer', v_qs, 13),
+    ('運転間隔', 'section', v_qs, 14),
+    ('5', 'answer', v_qs, 14),
+    ('1', 'answer', v_qs, 14),
+    ('速さとつるかめ算', 'section', v_qs, 15),
+    ('m', 'unit', v_qs, 15),
+    ('3040', 'answer', v_qs, 15),
+    ('2400', 'answer', v_qs, 15),
+    ('速さとつるかめ算', 'section', v_qs, 16),
+    ('分間', 'unit', v_qs, 16),
+    ('1', 'answer', v_qs, 16),
+    ('5', 'answer', v_qs, 16),
+    ('4', 'answer', v_qs, 16);
+
   -- ========================================
   -- 小6 第7回① 平面図形(2) (36問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 7;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 7 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 7 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第7回① 平面図形(2)（approved済み）';
@@ -1881,10 +4566,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', 'ピラミッド型・クロス型の相似', 'numeric', '9', '㎝', NULL, 1, 1),
     (v_qs, '(2)', 'ピラミッド型・クロス型の相似', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "4", "②": "9"}, "template": "{①}：{②}"}', 1, 2),
     (v_qs, '(3)', 'ピラミッド型・クロス型の相似', 'numeric', '9', '㎝', NULL, 1, 3),
@@ -1922,22 +4604,167 @@ BEGIN
     (v_qs, '(3)', '縮尺', 'numeric', '20', '㎝', NULL, 1, 35),
     (v_qs, '(4)', '縮尺', 'numeric', '3', '㎢', NULL, 1, 36);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "9", "p": 1}, {"t": "multi_part", "a": {"①": "4", "②": "9"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "multi_part", "a": {"①": "12", "②": "9", "③": "16"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "3"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "10", "②": "20"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "3"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "9"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "1", "②": "5"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "25", "②": "4", "③": "16", "④": "33"}, "s": ["①", "②", "③", "④"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "50", "p": 1}, {"t": "multi_part", "a": {"①": "7", "②": "5", "③": "98"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "3"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "multi_part", "a": {"①": "9", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "5"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "8", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "multi_part", "a": {"①": "49", "②": "16"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "2", "③": "24"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "8", "③": "104", "④": "64"}, "s": ["①", "②", "③", "④"], "p": 1}, {"t": "multi_part", "a": {"①": "12", "②": "7", "③": "49"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "7", "③": "441"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "1", "②": "3", "③": "36"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "4", "③": "144"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "5", "③": "900"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "750", "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "numeric", "a": "3", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 36;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第7回1', 'title', v_qs, 0),
+    ('第7', 'title', v_qs, 0),
+    ('7回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('平面図形(2)', 'title', v_qs, 0),
+    ('平面', 'title', v_qs, 0),
+    ('面図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形(', 'title', v_qs, 0),
+    ('(2', 'title', v_qs, 0),
+    ('2)', 'title', v_qs, 0),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 1),
+    ('cm', 'unit', v_qs, 1),
+    ('9', 'answer', v_qs, 1),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 2),
+    ('4', 'answer', v_qs, 2),
+    ('9', 'answer', v_qs, 2),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 3),
+    ('cm', 'unit', v_qs, 3),
+    ('9', 'answer', v_qs, 3),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('12', 'answer', v_qs, 4),
+    ('9', 'answer', v_qs, 4),
+    ('16', 'answer', v_qs, 4),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 5),
+    ('2', 'answer', v_qs, 5),
+    ('3', 'answer', v_qs, 5),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 6),
+    ('cm', 'unit', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('10', 'answer', v_qs, 6),
+    ('20', 'answer', v_qs, 6),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 7),
+    ('2', 'answer', v_qs, 7),
+    ('3', 'answer', v_qs, 7),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('15', 'answer', v_qs, 8),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 9),
+    ('5', 'answer', v_qs, 9),
+    ('9', 'answer', v_qs, 9),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 10),
+    ('1', 'answer', v_qs, 10),
+    ('5', 'answer', v_qs, 10),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 11),
+    ('25', 'answer', v_qs, 11),
+    ('4', 'answer', v_qs, 11),
+    ('16', 'answer', v_qs, 11),
+    ('33', 'answer', v_qs, 11),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 12),
+    ('3', 'answer', v_qs, 12),
+    ('4', 'answer', v_qs, 12),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 13),
+    ('cm', 'unit', v_qs, 13),
+    ('50', 'answer', v_qs, 13),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('7', 'answer', v_qs, 14),
+    ('5', 'answer', v_qs, 14),
+    ('98', 'answer', v_qs, 14),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 15),
+    ('3', 'answer', v_qs, 15),
+    ('4', 'answer', v_qs, 15),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 16),
+    ('cm', 'unit', v_qs, 16),
+    ('8', 'answer', v_qs, 16),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 17),
+    ('2', 'answer', v_qs, 17),
+    ('3', 'answer', v_qs, 17),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 18),
+    ('cm', 'unit', v_qs, 18),
+    ('3', 'answer', v_qs, 18),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 19),
+    ('9', 'answer', v_qs, 19),
+    ('4', 'answer', v_qs, 19),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 20),
+    ('3', 'answer', v_qs, 20),
+    ('5', 'answer', v_qs, 20),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 21),
+    ('cm', 'unit', v_qs, 21),
+    ('8', 'answer', v_qs, 21),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 22),
+    ('cm', 'unit', v_qs, 22),
+    ('15', 'answer', v_qs, 22),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 23),
+    ('49', 'answer', v_qs, 23),
+    ('16', 'answer', v_qs, 23),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 24),
+    ('cm2', 'unit', v_qs, 24),
+    ('3', 'answer', v_qs, 24),
+    ('2', 'answer', v_qs, 24),
+    ('24', 'answer', v_qs, 24),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 25),
+    ('cm2', 'unit', v_qs, 25),
+    ('5', 'answer', v_qs, 25),
+    ('8', 'answer', v_qs, 25),
+    ('104', 'answer', v_qs, 25),
+    ('64', 'answer', v_qs, 25),
+    ('ピラミッド型・クロス型の相似', 'section', v_qs, 26),
+    ('cm2', 'unit', v_qs, 26),
+    ('12', 'answer', v_qs, 26),
+    ('7', 'answer', v_qs, 26),
+    ('49', 'answer', v_qs, 26),
+    ('内接正方形', 'section', v_qs, 27),
+    ('cm', 'unit', v_qs, 27),
+    ('6', 'answer', v_qs, 27),
+    ('内接正方形', 'section', v_qs, 28),
+    ('cm', 'unit', v_qs, 28),
+    ('10', 'answer', v_qs, 28),
+    ('内接正方形', 'section', v_qs, 29),
+    ('cm2', 'unit', v_qs, 29),
+    ('3', 'answer', v_qs, 29),
+    ('7', 'answer', v_qs, 29),
+    ('441', 'answer', v_qs, 29),
+    ('内接正方形', 'section', v_qs, 30),
+    ('cm2', 'unit', v_qs, 30),
+    ('1', 'answer', v_qs, 30),
+    ('3', 'answer', v_qs, 30),
+    ('36', 'answer', v_qs, 30),
+    ('内接正方形', 'section', v_qs, 31),
+    ('cm2', 'unit', v_qs, 31),
+    ('3', 'answer', v_qs, 31),
+    ('4', 'answer', v_qs, 31),
+    ('144', 'answer', v_qs, 31),
+    ('内接正方形', 'section', v_qs, 32),
+    ('cm2', 'unit', v_qs, 32),
+    ('3', 'answer', v_qs, 32),
+    ('5', 'answer', v_qs, 32),
+    ('900', 'answer', v_qs, 32),
+    ('縮尺', 'section', v_qs, 33),
+    ('cm', 'unit', v_qs, 33),
+    ('20', 'answer', v_qs, 33),
+    ('縮尺', 'section', v_qs, 34),
+    ('m', 'unit', v_qs, 34),
+    ('750', 'answer', v_qs, 34),
+    ('縮尺', 'section', v_qs, 35),
+    ('cm', 'unit', v_qs, 35),
+    ('20', 'answer', v_qs, 35),
+    ('縮尺', 'section', v_qs, 36),
+    ('km2', 'unit', v_qs, 36),
+    ('3', 'answer', v_qs, 36);
+
   -- ========================================
   -- 小6 第7回② 平面図形(2) (28問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 7;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 7 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 7 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第7回② 平面図形(2)（approved済み）';
@@ -1960,10 +4787,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "5", "②": "4"}, "template": "{①}：{②}"}', 1, 1),
     (v_qs, '(2)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "3", "②": "5"}, "template": "{①}：{②}"}', 1, 2),
     (v_qs, '(3)', '並びの比', 'numeric', '5', '㎝', NULL, 1, 3),
@@ -1993,22 +4817,132 @@ BEGIN
     (v_qs, '(3)', '影', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m"}], "correct_values": {"①": "2", "②": "1.2"}, "template": "①{①}m，②{②}m"}', 1, 27),
     (v_qs, '(4)', '影', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m"}], "correct_values": {"①": "1.2", "②": "4.8"}, "template": "①{①}m，②{②}m"}', 1, 28);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "5", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "5"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "150", "②": "13", "③": "17"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "13"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "1", "②": "2"}, "s": ["①", "②"], "p": 1}, {"t": "fraction", "a": "3/10", "p": 1}, {"t": "multi_part", "a": {"①": "60", "②": "3", "③": "2"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "1", "③": "12"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "6", "②": "80"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "multi_part", "a": {"①": "4", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "multi_part", "a": {"①": "26", "②": "270"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "multi_part", "a": {"①": "10", "②": "30"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "2", "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "1.2"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "1.2", "②": "4.8"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 28;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第7回2', 'title', v_qs, 0),
+    ('第7', 'title', v_qs, 0),
+    ('7回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('平面図形(2)', 'title', v_qs, 0),
+    ('平面', 'title', v_qs, 0),
+    ('面図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形(', 'title', v_qs, 0),
+    ('(2', 'title', v_qs, 0),
+    ('2)', 'title', v_qs, 0),
+    ('並びの比', 'section', v_qs, 1),
+    ('5', 'answer', v_qs, 1),
+    ('4', 'answer', v_qs, 1),
+    ('並びの比', 'section', v_qs, 2),
+    ('3', 'answer', v_qs, 2),
+    ('5', 'answer', v_qs, 2),
+    ('並びの比', 'section', v_qs, 3),
+    ('cm', 'unit', v_qs, 3),
+    ('5', 'answer', v_qs, 3),
+    ('並びの比', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('14', 'answer', v_qs, 4),
+    ('並びの比', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('150', 'answer', v_qs, 5),
+    ('13', 'answer', v_qs, 5),
+    ('17', 'answer', v_qs, 5),
+    ('並びの比', 'section', v_qs, 6),
+    ('2', 'answer', v_qs, 6),
+    ('1', 'answer', v_qs, 6),
+    ('並びの比', 'section', v_qs, 7),
+    ('5', 'answer', v_qs, 7),
+    ('13', 'answer', v_qs, 7),
+    ('並びの比', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('3', 'answer', v_qs, 8),
+    ('並びの比', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('14', 'answer', v_qs, 9),
+    ('並びの比', 'section', v_qs, 10),
+    ('1', 'answer', v_qs, 10),
+    ('2', 'answer', v_qs, 10),
+    ('並びの比', 'section', v_qs, 11),
+    ('3/10', 'answer', v_qs, 11),
+    ('並びの比', 'section', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('60', 'answer', v_qs, 12),
+    ('3', 'answer', v_qs, 12),
+    ('2', 'answer', v_qs, 12),
+    ('並びの比', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('18', 'answer', v_qs, 13),
+    ('並びの比', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('3', 'answer', v_qs, 14),
+    ('1', 'answer', v_qs, 14),
+    ('12', 'answer', v_qs, 14),
+    ('並びの比', 'section', v_qs, 15),
+    ('cm', 'unit', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('6', 'answer', v_qs, 15),
+    ('80', 'answer', v_qs, 15),
+    ('並びの比', 'section', v_qs, 16),
+    ('cm2', 'unit', v_qs, 16),
+    ('20', 'answer', v_qs, 16),
+    ('並びの比', 'section', v_qs, 17),
+    ('4', 'answer', v_qs, 17),
+    ('1', 'answer', v_qs, 17),
+    ('並びの比', 'section', v_qs, 18),
+    ('cm', 'unit', v_qs, 18),
+    ('5', 'answer', v_qs, 18),
+    ('図形の折り返し', 'section', v_qs, 19),
+    ('cm', 'unit', v_qs, 19),
+    ('cm2', 'unit', v_qs, 19),
+    ('26', 'answer', v_qs, 19),
+    ('270', 'answer', v_qs, 19),
+    ('図形の折り返し', 'section', v_qs, 20),
+    ('cm', 'unit', v_qs, 20),
+    ('10', 'answer', v_qs, 20),
+    ('正六角形', 'section', v_qs, 21),
+    ('cm2', 'unit', v_qs, 21),
+    ('10', 'answer', v_qs, 21),
+    ('正六角形', 'section', v_qs, 22),
+    ('cm2', 'unit', v_qs, 22),
+    ('10', 'answer', v_qs, 22),
+    ('30', 'answer', v_qs, 22),
+    ('正六角形', 'section', v_qs, 23),
+    ('cm2', 'unit', v_qs, 23),
+    ('30', 'answer', v_qs, 23),
+    ('正六角形', 'section', v_qs, 24),
+    ('cm2', 'unit', v_qs, 24),
+    ('30', 'answer', v_qs, 24),
+    ('影', 'section', v_qs, 25),
+    ('m', 'unit', v_qs, 25),
+    ('5', 'answer', v_qs, 25),
+    ('影', 'section', v_qs, 26),
+    ('m', 'unit', v_qs, 26),
+    ('2', 'answer', v_qs, 26),
+    ('影', 'section', v_qs, 27),
+    ('m', 'unit', v_qs, 27),
+    ('2', 'answer', v_qs, 27),
+    ('1.2', 'answer', v_qs, 27),
+    ('影', 'section', v_qs, 28),
+    ('m', 'unit', v_qs, 28),
+    ('1.2', 'answer', v_qs, 28),
+    ('4.8', 'answer', v_qs, 28);
+
   -- ========================================
   -- 小6 第8回① 場合の数 (20問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 8;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 8 AND attempt_number = 1;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 1;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 8 AND set_order = 1;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第8回① 場合の数（approved済み）';
@@ -2031,10 +4965,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '樹形図（順列）', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "20", "②": "12"}, "template": "①{①}通り，②{②}通り"}', 1, 1),
     (v_qs, '(2)', '樹形図（順列）', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}, {"label": "③", "unit": "通り"}], "correct_values": {"①": "9", "②": "2", "③": "7"}, "template": "①{①}通り，②{②}通り，③{③}通り"}', 1, 2),
     (v_qs, '(3)', '樹形図（順列）', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "8", "②": "5"}, "template": "①{①}通り，②{②}通り"}', 1, 3),
@@ -2056,22 +4987,100 @@ BEGIN
     (v_qs, '(4)', '道順', 'numeric', '9', '通り', NULL, 1, 19),
     (v_qs, '(5)', '道順', 'numeric', '12', '通り', NULL, 1, 20);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "20", "②": "12"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "9", "②": "2", "③": "7"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "8", "②": "5"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "13", "②": "7", "③": "7"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "7", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "27", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "35", "②": "18"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "56", "②": "30"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "165", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "numeric", "a": "12", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 20;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第8回1', 'title', v_qs, 0),
+    ('第8', 'title', v_qs, 0),
+    ('8回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('場合の数', 'title', v_qs, 0),
+    ('場合', 'title', v_qs, 0),
+    ('合の', 'title', v_qs, 0),
+    ('の数', 'title', v_qs, 0),
+    ('樹形図(順列)', 'section', v_qs, 1),
+    ('通り', 'unit', v_qs, 1),
+    ('20', 'answer', v_qs, 1),
+    ('12', 'answer', v_qs, 1),
+    ('樹形図(順列)', 'section', v_qs, 2),
+    ('通り', 'unit', v_qs, 2),
+    ('9', 'answer', v_qs, 2),
+    ('2', 'answer', v_qs, 2),
+    ('7', 'answer', v_qs, 2),
+    ('樹形図(順列)', 'section', v_qs, 3),
+    ('通り', 'unit', v_qs, 3),
+    ('8', 'answer', v_qs, 3),
+    ('5', 'answer', v_qs, 3),
+    ('樹形図(順列)', 'section', v_qs, 4),
+    ('通り', 'unit', v_qs, 4),
+    ('13', 'answer', v_qs, 4),
+    ('7', 'answer', v_qs, 4),
+    ('樹形図(組合せ)', 'section', v_qs, 5),
+    ('通り', 'unit', v_qs, 5),
+    ('3', 'answer', v_qs, 5),
+    ('樹形図(組合せ)', 'section', v_qs, 6),
+    ('通り', 'unit', v_qs, 6),
+    ('6', 'answer', v_qs, 6),
+    ('樹形図(組合せ)', 'section', v_qs, 7),
+    ('通り', 'unit', v_qs, 7),
+    ('9', 'answer', v_qs, 7),
+    ('樹形図(組合せ)', 'section', v_qs, 8),
+    ('通り', 'unit', v_qs, 8),
+    ('3', 'answer', v_qs, 8),
+    ('樹形図(組合せ)', 'section', v_qs, 9),
+    ('通り', 'unit', v_qs, 9),
+    ('7', 'answer', v_qs, 9),
+    ('さいころ', 'section', v_qs, 10),
+    ('通り', 'unit', v_qs, 10),
+    ('6', 'answer', v_qs, 10),
+    ('さいころ', 'section', v_qs, 11),
+    ('通り', 'unit', v_qs, 11),
+    ('6', 'answer', v_qs, 11),
+    ('さいころ', 'section', v_qs, 12),
+    ('通り', 'unit', v_qs, 12),
+    ('6', 'answer', v_qs, 12),
+    ('さいころ', 'section', v_qs, 13),
+    ('通り', 'unit', v_qs, 13),
+    ('27', 'answer', v_qs, 13),
+    ('さいころ', 'section', v_qs, 14),
+    ('通り', 'unit', v_qs, 14),
+    ('4', 'answer', v_qs, 14),
+    ('さいころ', 'section', v_qs, 15),
+    ('通り', 'unit', v_qs, 15),
+    ('14', 'answer', v_qs, 15),
+    ('道順', 'section', v_qs, 16),
+    ('通り', 'unit', v_qs, 16),
+    ('35', 'answer', v_qs, 16),
+    ('18', 'answer', v_qs, 16),
+    ('道順', 'section', v_qs, 17),
+    ('通り', 'unit', v_qs, 17),
+    ('56', 'answer', v_qs, 17),
+    ('30', 'answer', v_qs, 17),
+    ('道順', 'section', v_qs, 18),
+    ('通り', 'unit', v_qs, 18),
+    ('165', 'answer', v_qs, 18),
+    ('道順', 'section', v_qs, 19),
+    ('通り', 'unit', v_qs, 19),
+    ('9', 'answer', v_qs, 19),
+    ('道順', 'section', v_qs, 20),
+    ('通り', 'unit', v_qs, 20),
+    ('12', 'answer', v_qs, 20);
+
   -- ========================================
   -- 小6 第8回② 場合の数 (22問)
   -- ========================================
-  SELECT id INTO STRICT v_sid
-  FROM public.study_sessions WHERE grade = 6 AND session_number = 8;
-
-  SELECT id INTO STRICT v_am_id
-  FROM public.assessment_masters
-  WHERE assessment_type = 'math_print' AND grade = '6年' AND session_number = 8 AND attempt_number = 2;
-
-  SELECT id, status INTO v_existing_id, v_existing_status
-  FROM public.question_sets
-  WHERE session_id = v_sid AND subject_id = v_math_id AND display_order = 2;
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 8 AND set_order = 2;
 
   IF v_existing_status = 'approved' THEN
     RAISE NOTICE 'スキップ: 小6 第8回② 場合の数（approved済み）';
@@ -2094,10 +5103,7 @@ BEGIN
       RETURNING id INTO v_qs;
     END IF;
 
-    INSERT INTO public.questions
-      (question_set_id, question_number, section_name, answer_type,
-       correct_answer, unit_label, answer_config, points, display_order)
-    VALUES
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
     (v_qs, '(1)', '順列（数字カード）', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "30", "②": "20"}, "template": "①{①}通り，②{②}通り"}', 1, 1),
     (v_qs, '(2)', '順列（数字カード）', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "6", "②": "12"}, "template": "①{①}通り，②{②}通り"}', 1, 2),
     (v_qs, '(3)', '順列（数字カード）', 'numeric', '12', '通り', NULL, 1, 3),
@@ -2121,10 +5127,109 @@ BEGIN
     (v_qs, '(2)', 'フィボナッチ数列', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "34", "②": "89"}, "template": "①{①}通り，②{②}通り"}', 1, 21),
     (v_qs, '(3)', 'フィボナッチ数列', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "通り"}, {"label": "②", "unit": "通り"}], "correct_values": {"①": "5", "②": "21"}, "template": "①{①}通り，②{②}通り"}', 1, 22);
 
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "30", "②": "20"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "6", "②": "12"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "15", "p": 1}, {"t": "multi_part", "a": {"①": "10", "②": "6"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "45", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "multi_part", "a": {"①": "15", "②": "20"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "multi_part", "a": {"①": "120", "②": "12", "③": "12"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "24", "②": "48"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "24", "②": "72"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "24", "②": "48"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "21", "②": "55", "③": "144"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "34", "②": "89"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "21"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
     v_count := v_count + 22;
   END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第8回2', 'title', v_qs, 0),
+    ('第8', 'title', v_qs, 0),
+    ('8回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('場合の数', 'title', v_qs, 0),
+    ('場合', 'title', v_qs, 0),
+    ('合の', 'title', v_qs, 0),
+    ('の数', 'title', v_qs, 0),
+    ('順列(数字カード)', 'section', v_qs, 1),
+    ('通り', 'unit', v_qs, 1),
+    ('30', 'answer', v_qs, 1),
+    ('20', 'answer', v_qs, 1),
+    ('順列(数字カード)', 'section', v_qs, 2),
+    ('通り', 'unit', v_qs, 2),
+    ('6', 'answer', v_qs, 2),
+    ('12', 'answer', v_qs, 2),
+    ('順列(数字カード)', 'section', v_qs, 3),
+    ('通り', 'unit', v_qs, 3),
+    ('12', 'answer', v_qs, 3),
+    ('順列(数字カード)', 'section', v_qs, 4),
+    ('通り', 'unit', v_qs, 4),
+    ('10', 'answer', v_qs, 4),
+    ('組合せ', 'section', v_qs, 5),
+    ('通り', 'unit', v_qs, 5),
+    ('10', 'answer', v_qs, 5),
+    ('組合せ', 'section', v_qs, 6),
+    ('通り', 'unit', v_qs, 6),
+    ('6', 'answer', v_qs, 6),
+    ('組合せ', 'section', v_qs, 7),
+    ('通り', 'unit', v_qs, 7),
+    ('15', 'answer', v_qs, 7),
+    ('組合せ', 'section', v_qs, 8),
+    ('通り', 'unit', v_qs, 8),
+    ('10', 'answer', v_qs, 8),
+    ('6', 'answer', v_qs, 8),
+    ('組合せ', 'section', v_qs, 9),
+    ('通り', 'unit', v_qs, 9),
+    ('18', 'answer', v_qs, 9),
+    ('組合せ', 'section', v_qs, 10),
+    ('通り', 'unit', v_qs, 10),
+    ('30', 'answer', v_qs, 10),
+    ('組合せ', 'section', v_qs, 11),
+    ('試合', 'unit', v_qs, 11),
+    ('45', 'answer', v_qs, 11),
+    ('組合せ', 'section', v_qs, 12),
+    ('試合', 'unit', v_qs, 12),
+    ('28', 'answer', v_qs, 12),
+    ('組合せ', 'section', v_qs, 13),
+    ('個', 'unit', v_qs, 13),
+    ('15', 'answer', v_qs, 13),
+    ('20', 'answer', v_qs, 13),
+    ('順列(並べ方)', 'section', v_qs, 14),
+    ('通り', 'unit', v_qs, 14),
+    ('12', 'answer', v_qs, 14),
+    ('順列(並べ方)', 'section', v_qs, 15),
+    ('通り', 'unit', v_qs, 15),
+    ('4', 'answer', v_qs, 15),
+    ('順列(並べ方)', 'section', v_qs, 16),
+    ('通り', 'unit', v_qs, 16),
+    ('120', 'answer', v_qs, 16),
+    ('12', 'answer', v_qs, 16),
+    ('塗り分け', 'section', v_qs, 17),
+    ('通り', 'unit', v_qs, 17),
+    ('24', 'answer', v_qs, 17),
+    ('48', 'answer', v_qs, 17),
+    ('塗り分け', 'section', v_qs, 18),
+    ('通り', 'unit', v_qs, 18),
+    ('24', 'answer', v_qs, 18),
+    ('72', 'answer', v_qs, 18),
+    ('塗り分け', 'section', v_qs, 19),
+    ('通り', 'unit', v_qs, 19),
+    ('24', 'answer', v_qs, 19),
+    ('48', 'answer', v_qs, 19),
+    ('フィボナッチ数列', 'section', v_qs, 20),
+    ('21', 'answer', v_qs, 20),
+    ('55', 'answer', v_qs, 20),
+    ('144', 'answer', v_qs, 20),
+    ('フィボナッチ数列', 'section', v_qs, 21),
+    ('通り', 'unit', v_qs, 21),
+    ('34', 'answer', v_qs, 21),
+    ('89', 'answer', v_qs, 21),
+    ('フィボナッチ数列', 'section', v_qs, 22),
+    ('通り', 'unit', v_qs, 22),
+    ('5', 'answer', v_qs, 22),
+    ('21', 'answer', v_qs, 22);
+
   RAISE NOTICE '本番問題データ投入完了: %問', v_count;
 
+  -- シード適用台帳を更新
+  INSERT INTO public.seed_ledger (seed_name, checksum)
+  VALUES ('math_questions_2026', 'c5da83ed287dbcfd9cc79c18ccf34ed6b61e4e56569f07177e116d8cf484214a')
+  ON CONFLICT (seed_name) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW();
 END $$;
 
@@ -1,195 +1,818 @@
 -- ============================================================================
--- 算数自動採点 — 開発用サンプルデータ
+-- 算数自動採点 — 開発用サンプルデータ (122問)
 -- ============================================================================
--- 目的: 全4 answer_type をカバーするテストデータ（E2E動作確認用）
--- 実行: psql -h 127.0.0.1 -p 54322 -U postgres -d postgres -f supabase/seeds/math_questions_dev.sql
--- 注意: 本番データは別ファイルで管理（ユーザー提供の模範解答を元に作成）
+-- 生成元: scripts/generate-math-questions-sql.py
+-- チェックサム: sha256:4fa770f40c53465087d9e08d5bbb63280ff62b3aa2ac474bb6490c85fee03d6b (seed_ledger: math_questions_dev)
+-- 再生成: python3 scripts/generate-math-questions-sql.py --sample > supabase/seeds/math_questions_dev.sql
 --
--- 投入内容:
---   小5 第1回① (question_set 1): 10問 (numeric×5, fraction×1, multi_part×2, selection×2)
---   小5 第1回② (question_set 2): 6問  (numeric×4, multi_part×1, selection×1)
---   合計: 16問
+-- 内容:
+--   小5上 第1回〜第2回 (①②×2 = 2セット, 78問)
+--   小6上 第2回〜第7回 (①②×2 = 2セット, 44問)
+--   （部分生成: 開発用サンプル 4セット（層別抽出））
+--
+-- 注意: approved済みセットはスキップ、draft は approved に昇格して再投入
+
+-- シード適用台帳（supabase/migrations/20261019000001_create_seed_ledger.sql と同一定義）
+CREATE TABLE IF NOT EXISTS public.seed_ledger (
+  seed_name  TEXT PRIMARY KEY,
+  checksum   TEXT NOT NULL,
+  applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
 
 DO $$
 DECLARE
-  v_math_id    BIGINT;
-  v_session_id BIGINT;
-  v_qs1_id     BIGINT;
-  v_qs2_id     BIGINT;
+  v_math_id         BIGINT;
+  v_sid             BIGINT;
+  v_qs              BIGINT;
+  v_am_id           UUID;
+  v_count           INTEGER := 0;
+  v_existing_id     BIGINT;
+  v_existing_status VARCHAR(20);
+  v_missing         TEXT;
 BEGIN
+  -- 同一チェックサムで適用済みならスキップ (seed_ledger)
+  IF EXISTS (SELECT 1 FROM public.seed_ledger
+             WHERE seed_name = 'math_questions_dev' AND checksum = '4fa770f40c53465087d9e08d5bbb63280ff62b3aa2ac474bb6490c85fee03d6b') THEN
+    RAISE NOTICE 'スキップ: math_questions_dev は適用済み（checksum 一致）';
+    RETURN;
+  END IF;
 
   -- 算数の subject_id を取得
-  SELECT id INTO STRICT v_math_id
-  FROM public.subjects WHERE name = '算数';
-
-  -- 小5 第1回の session_id を取得
-  SELECT id INTO STRICT v_session_id
-  FROM public.study_sessions WHERE grade = 5 AND session_number = 1;
-
-  -- ============================================================
-  -- question_sets: 小5 第1回 ①②
-  -- ============================================================
-  INSERT INTO public.question_sets
-    (session_id, subject_id, grade, title, display_order, status)
-  VALUES
-    (v_session_id, v_math_id, 5, '第1回①', 1, 'approved')
-  RETURNING id INTO v_qs1_id;
-
-  INSERT INTO public.question_sets
-    (session_id, subject_id, grade, title, display_order, status)
-  VALUES
-    (v_session_id, v_math_id, 5, '第1回②', 2, 'approved')
-  RETURNING id INTO v_qs2_id;
-
-  -- ============================================================
-  -- questions: 第1回① (10問)
-  -- ============================================================
-
-  -- (1) numeric: 面積計算 42 cm²
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(1)', '類題1', 'numeric',
-     '42', 'cm²', NULL, 1, 1);
-
-  -- (2) numeric: 体積計算 150 cm³
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(2)', '類題1', 'numeric',
-     '150', 'cm³', NULL, 1, 2);
-
-  -- (3) fraction: 3/4
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(3)', '類題1', 'fraction',
-     '3/4', NULL, NULL, 1, 3);
-
-  -- (4) numeric: 小数 3.14
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(4)', '類題2', 'numeric',
-     '3.14', NULL, NULL, 1, 4);
-
-  -- (5) numeric: 負数 -7
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(5)', '類題2', 'numeric',
-     '-7', NULL, NULL, 1, 5);
-
-  -- (6) multi_part: Aは14個、Bは11個
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(6)', '計算練習', 'multi_part',
-     NULL, NULL,
-     '{"slots": [{"label": "A", "unit": "個"}, {"label": "B", "unit": "個"}], "correct_values": {"A": "14", "B": "11"}, "template": "Aは{A}個、Bは{B}個"}',
-     1, 6);
-
-  -- (7) multi_part: 50円切手5枚、80円切手8枚
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(7)', '計算練習', 'multi_part',
-     NULL, NULL,
-     '{"slots": [{"label": "50円切手", "unit": "枚"}, {"label": "80円切手", "unit": "枚"}], "correct_values": {"50円切手": "5", "80円切手": "8"}, "template": "50円切手{50円切手}枚、80円切手{80円切手}枚"}',
-     1, 7);
-
-  -- (8) numeric: 大きい数 12345
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(8)', '基本問題', 'numeric',
-     '12345', NULL, NULL, 1, 8);
-
-  -- (9) selection: 約数を選ぶ（12の約数: 1,2,3,4,6,12 から3つ）
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(9)', '基本問題', 'selection',
-     NULL, NULL,
-     '{"correct_values": ["3", "6", "12"], "dummy_values": ["5", "8", "10"]}',
-     1, 9);
-
-  -- (10) selection: 奇数を選ぶ
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs1_id, '(10)', '基本問題', 'selection',
-     NULL, NULL,
-     '{"correct_values": ["1", "3", "7"], "dummy_values": ["2", "4", "6", "8"]}',
-     1, 10);
-
-  -- ============================================================
-  -- questions: 第1回② (6問)
-  -- ============================================================
-
-  -- (1) numeric: 72
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(1)', '類題1', 'numeric',
-     '72', 'cm²', NULL, 1, 1);
-
-  -- (2) numeric: 256
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(2)', '類題1', 'numeric',
-     '256', NULL, NULL, 1, 2);
-
-  -- (3) numeric: 0.75
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(3)', '類題2', 'numeric',
-     '0.75', NULL, NULL, 1, 3);
-
-  -- (4) numeric: 99
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(4)', '類題2', 'numeric',
-     '99', '点', NULL, 1, 4);
-
-  -- (5) multi_part: 赤3個、青5個
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(5)', '基本問題', 'multi_part',
-     NULL, NULL,
-     '{"slots": [{"label": "赤", "unit": "個"}, {"label": "青", "unit": "個"}], "correct_values": {"赤": "3", "青": "5"}, "template": "赤{赤}個、青{青}個"}',
-     1, 5);
-
-  -- (6) selection: テキスト選択（曜日）
-  INSERT INTO public.questions
-    (question_set_id, question_number, section_name, answer_type,
-     correct_answer, unit_label, answer_config, points, display_order)
-  VALUES
-    (v_qs2_id, '(6)', '基本問題', 'selection',
-     NULL, NULL,
-     '{"correct_values": ["金曜日"], "dummy_values": ["月曜日", "火曜日", "水曜日", "木曜日", "土曜日", "日曜日"]}',
-     1, 6);
-
-  RAISE NOTICE '開発用サンプルデータ投入完了: question_set_id=%, % (16問)',
-    v_qs1_id, v_qs2_id;
+  SELECT id INTO STRICT v_math_id FROM public.subjects WHERE name = '算数';
+
+  -- 全セットの参照先 ID をまとめて解決（study_sessions / assessment_masters / 既存 question_sets）
+  CREATE TEMP TABLE math_set_ids (
+    grade SMALLINT NOT NULL,
+    session_number SMALLINT NOT NULL,
+    set_order SMALLINT NOT NULL,
+    session_id BIGINT,
+    assessment_master_id UUID,
+    existing_id BIGINT,
+    existing_status VARCHAR(20)
+  ) ON COMMIT DROP;
+  INSERT INTO math_set_ids (grade, session_number, set_order, session_id, assessment_master_id, existing_id, existing_status)
+  SELECT k.grade, k.session_number, k.set_order, ss.id, am.id, qs.id, qs.status
+  FROM (VALUES
+    (5, 1, 1),
+    (5, 2, 1),
+    (6, 2, 2),
+    (6, 7, 2)
+  ) AS k(grade, session_number, set_order)
+  LEFT JOIN public.study_sessions ss
+    ON ss.grade = k.grade AND ss.session_number = k.session_number
+  LEFT JOIN public.assessment_masters am
+    ON am.assessment_type = 'math_print' AND am.grade = k.grade::text || '年'
+   AND am.session_number = k.session_number AND am.attempt_number = k.set_order
+  LEFT JOIN public.question_sets qs
+    ON qs.session_id = ss.id AND qs.subject_id = v_math_id
+   AND qs.display_order = k.set_order AND qs.set_type = 'master_print';
+
+  SELECT string_agg(format('小%s 第%s回%s（%s なし）', grade, session_number,
+           CASE set_order WHEN 1 THEN '①' ELSE '②' END,
+           CASE WHEN session_id IS NULL THEN 'study_sessions' ELSE 'assessment_masters' END),
+         ', ' ORDER BY grade, session_number, set_order)
+  INTO v_missing
+  FROM math_set_ids
+  WHERE session_id IS NULL OR assessment_master_id IS NULL;
+  IF v_missing IS NOT NULL THEN
+    RAISE EXCEPTION '算数セットの参照先が見つかりません: %', v_missing;
+  END IF;
+
+  -- ========================================
+  -- 小5 第1回① 倍数と約数の利用 (40問)
+  -- ========================================
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 1 AND set_order = 1;
+
+  IF v_existing_status = 'approved' THEN
+    RAISE NOTICE 'スキップ: 小5 第1回① 倍数と約数の利用（approved済み）';
+  ELSE
+    -- 新規 or draft昇格
+    IF v_existing_id IS NOT NULL THEN
+      -- draft → approved に昇格、既存 questions を入れ替え
+      DELETE FROM public.questions WHERE question_set_id = v_existing_id;
+      UPDATE public.question_sets
+      SET status = 'approved', title = '第1回① 倍数と約数の利用', assessment_master_id = v_am_id, updated_at = now()
+      WHERE id = v_existing_id;
+      v_qs := v_existing_id;
+      RAISE NOTICE 'draft昇格: 小5 第1回① 倍数と約数の利用';
+    ELSE
+      -- 新規INSERT
+      INSERT INTO public.question_sets
+        (session_id, subject_id, grade, title, display_order, status, assessment_master_id)
+      VALUES
+        (v_sid, v_math_id, 5, '第1回① 倍数と約数の利用', 1, 'approved', v_am_id)
+      RETURNING id INTO v_qs;
+    END IF;
+
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
+    (v_qs, '(1)', '類題1', 'numeric', '11', '個', NULL, 1, 1),
+    (v_qs, '(2)', '類題1', 'numeric', '10', '個', NULL, 1, 2),
+    (v_qs, '(3)', '類題1', 'numeric', '12', '個', NULL, 1, 3),
+    (v_qs, '(4)', '類題1', 'numeric', '12', '個', NULL, 1, 4),
+    (v_qs, '(5)', '類題1', 'numeric', '33', '個', NULL, 1, 5),
+    (v_qs, '(6)', '類題1', 'numeric', '12', '個', NULL, 1, 6),
+    (v_qs, '(7)', '類題1', 'numeric', '28', '個', NULL, 1, 7),
+    (v_qs, '(8)', '類題1', 'numeric', '12', '個', NULL, 1, 8),
+    (v_qs, '(9)', '類題1', 'numeric', '16', '個', NULL, 1, 9),
+    (v_qs, '(10)', '類題1', 'numeric', '9', '個', NULL, 1, 10),
+    (v_qs, '(1)', '類題2', 'selection', NULL, NULL, '{"correct_values": ["5", "6", "10", "15", "30"], "dummy_values": ["4", "8", "12", "20", "25"]}', 1, 11),
+    (v_qs, '(2)', '類題2', 'selection', NULL, NULL, '{"correct_values": ["9", "12", "18", "36"], "dummy_values": ["6", "15", "24", "30"]}', 1, 12),
+    (v_qs, '(3)', '類題2', 'selection', NULL, NULL, '{"correct_values": ["7", "14", "21", "42"], "dummy_values": ["6", "12", "28", "35"]}', 1, 13),
+    (v_qs, '(4)', '類題2', 'selection', NULL, NULL, '{"correct_values": ["16", "32"], "dummy_values": ["8", "24", "48"]}', 1, 14),
+    (v_qs, '(5)', '類題2', 'selection', NULL, NULL, '{"correct_values": ["12", "18", "36"], "dummy_values": ["9", "15", "24"]}', 1, 15),
+    (v_qs, '(1)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "180", "②": "1020"}, "template": "①{①}，②{②}"}', 1, 16),
+    (v_qs, '(2)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "360", "②": "990"}, "template": "①{①}，②{②}"}', 1, 17),
+    (v_qs, '(3)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "240", "②": "2016"}, "template": "①{①}，②{②}"}', 1, 18),
+    (v_qs, '(4)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "900", "②": "1980"}, "template": "①{①}，②{②}"}', 1, 19),
+    (v_qs, '(5)', '類題3', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "840", "②": "560"}, "template": "①{①}，②{②}"}', 1, 20),
+    (v_qs, '(1)', '計算練習', 'numeric', '72', NULL, NULL, 1, 21),
+    (v_qs, '(2)', '計算練習', 'numeric', '70', NULL, NULL, 1, 22),
+    (v_qs, '(3)', '計算練習', 'numeric', '120', NULL, NULL, 1, 23),
+    (v_qs, '(4)', '計算練習', 'numeric', '64', NULL, NULL, 1, 24),
+    (v_qs, '(5)', '計算練習', 'numeric', '108', NULL, NULL, 1, 25),
+    (v_qs, '(6)', '計算練習', 'numeric', '105', NULL, NULL, 1, 26),
+    (v_qs, '(7)', '計算練習', 'numeric', '72', NULL, NULL, 1, 27),
+    (v_qs, '(8)', '計算練習', 'numeric', '108', NULL, NULL, 1, 28),
+    (v_qs, '(9)', '計算練習', 'numeric', '84', NULL, NULL, 1, 29),
+    (v_qs, '(10)', '計算練習', 'numeric', '75', NULL, NULL, 1, 30),
+    (v_qs, '(11)', '計算練習', 'numeric', '128', NULL, NULL, 1, 31),
+    (v_qs, '(12)', '計算練習', 'numeric', '144', NULL, NULL, 1, 32),
+    (v_qs, '(13)', '計算練習', 'numeric', '96', NULL, NULL, 1, 33),
+    (v_qs, '(14)', '計算練習', 'numeric', '125', NULL, NULL, 1, 34),
+    (v_qs, '(15)', '計算練習', 'numeric', '84', NULL, NULL, 1, 35),
+    (v_qs, '(16)', '計算練習', 'numeric', '128', NULL, NULL, 1, 36),
+    (v_qs, '(17)', '計算練習', 'numeric', '180', NULL, NULL, 1, 37),
+    (v_qs, '(18)', '計算練習', 'numeric', '84', NULL, NULL, 1, 38),
+    (v_qs, '(19)', '計算練習', 'numeric', '126', NULL, NULL, 1, 39),
+    (v_qs, '(20)', '計算練習', 'numeric', '105', NULL, NULL, 1, 40);
+
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "11", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "28", "p": 1}, {"t": "numeric", "a": "12", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "9", "p": 1}, {"t": "selection", "a": ["10", "15", "30", "5", "6"], "p": 1}, {"t": "selection", "a": ["12", "18", "36", "9"], "p": 1}, {"t": "selection", "a": ["14", "21", "42", "7"], "p": 1}, {"t": "selection", "a": ["16", "32"], "p": 1}, {"t": "selection", "a": ["12", "18", "36"], "p": 1}, {"t": "multi_part", "a": {"①": "180", "②": "1020"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "360", "②": "990"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "240", "②": "2016"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "900", "②": "1980"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "840", "②": "560"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "70", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "64", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "105", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "108", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "75", "p": 1}, {"t": "numeric", "a": "128", "p": 1}, {"t": "numeric", "a": "144", "p": 1}, {"t": "numeric", "a": "96", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "128", "p": 1}, {"t": "numeric", "a": "180", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "126", "p": 1}, {"t": "numeric", "a": "105", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
+    v_count := v_count + 40;
+  END IF;  -- approved / ELSE
+
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第1回1', 'title', v_qs, 0),
+    ('第1', 'title', v_qs, 0),
+    ('1回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('倍数と約数の利用', 'title', v_qs, 0),
+    ('倍数', 'title', v_qs, 0),
+    ('数と', 'title', v_qs, 0),
+    ('と約', 'title', v_qs, 0),
+    ('約数', 'title', v_qs, 0),
+    ('数の', 'title', v_qs, 0),
+    ('の利', 'title', v_qs, 0),
+    ('利用', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('11', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('10', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('個', 'unit', v_qs, 3),
+    ('12', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('個', 'unit', v_qs, 4),
+    ('12', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('個', 'unit', v_qs, 5),
+    ('33', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('個', 'unit', v_qs, 6),
+    ('12', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('個', 'unit', v_qs, 7),
+    ('28', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('個', 'unit', v_qs, 8),
+    ('12', 'answer', v_qs, 8),
+    ('類題1', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('個', 'unit', v_qs, 9),
+    ('16', 'answer', v_qs, 9),
+    ('類題1', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('個', 'unit', v_qs, 10),
+    ('9', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('5', 'answer', v_qs, 11),
+    ('6', 'answer', v_qs, 11),
+    ('10', 'answer', v_qs, 11),
+    ('15', 'answer', v_qs, 11),
+    ('30', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('9', 'answer', v_qs, 12),
+    ('12', 'answer', v_qs, 12),
+    ('18', 'answer', v_qs, 12),
+    ('36', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('7', 'answer', v_qs, 13),
+    ('14', 'answer', v_qs, 13),
+    ('21', 'answer', v_qs, 13),
+    ('42', 'answer', v_qs, 13),
+    ('類題2', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('16', 'answer', v_qs, 14),
+    ('32', 'answer', v_qs, 14),
+    ('類題2', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('12', 'answer', v_qs, 15),
+    ('18', 'answer', v_qs, 15),
+    ('36', 'answer', v_qs, 15),
+    ('類題3', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('180', 'answer', v_qs, 16),
+    ('1020', 'answer', v_qs, 16),
+    ('類題3', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('360', 'answer', v_qs, 17),
+    ('990', 'answer', v_qs, 17),
+    ('類題3', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('240', 'answer', v_qs, 18),
+    ('2016', 'answer', v_qs, 18),
+    ('類題3', 'section', v_qs, 19),
+    ('類題', 'section', v_qs, 19),
+    ('900', 'answer', v_qs, 19),
+    ('1980', 'answer', v_qs, 19),
+    ('類題3', 'section', v_qs, 20),
+    ('類題', 'section', v_qs, 20),
+    ('840', 'answer', v_qs, 20),
+    ('560', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('72', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('70', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('120', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('64', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('108', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('105', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('72', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('108', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('84', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('75', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('128', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('144', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('96', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('125', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('84', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('128', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('180', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('84', 'answer', v_qs, 38),
+    ('計算練習', 'section', v_qs, 39),
+    ('126', 'answer', v_qs, 39),
+    ('計算練習', 'section', v_qs, 40),
+    ('105', 'answer', v_qs, 40);
+
+  -- ========================================
+  -- 小5 第2回① いろいろな図形の面積 (38問)
+  -- ========================================
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 5 AND session_number = 2 AND set_order = 1;
+
+  IF v_existing_status = 'approved' THEN
+    RAISE NOTICE 'スキップ: 小5 第2回① いろいろな図形の面積（approved済み）';
+  ELSE
+    -- 新規 or draft昇格
+    IF v_existing_id IS NOT NULL THEN
+      -- draft → approved に昇格、既存 questions を入れ替え
+      DELETE FROM public.questions WHERE question_set_id = v_existing_id;
+      UPDATE public.question_sets
+      SET status = 'approved', title = '第2回① いろいろな図形の面積', assessment_master_id = v_am_id, updated_at = now()
+      WHERE id = v_existing_id;
+      v_qs := v_existing_id;
+      RAISE NOTICE 'draft昇格: 小5 第2回① いろいろな図形の面積';
+    ELSE
+      -- 新規INSERT
+      INSERT INTO public.question_sets
+        (session_id, subject_id, grade, title, display_order, status, assessment_master_id)
+      VALUES
+        (v_sid, v_math_id, 5, '第2回① いろいろな図形の面積', 1, 'approved', v_am_id)
+      RETURNING id INTO v_qs;
+    END IF;
+
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
+    (v_qs, '(1)', '類題1', 'numeric', '17', '㎠', NULL, 1, 1),
+    (v_qs, '(2)', '類題1', 'numeric', '19', '㎠', NULL, 1, 2),
+    (v_qs, '(3)', '類題1', 'numeric', '36.5', '㎠', NULL, 1, 3),
+    (v_qs, '(4)', '類題1', 'numeric', '80', '㎠', NULL, 1, 4),
+    (v_qs, '(5)', '類題1', 'numeric', '53', '㎠', NULL, 1, 5),
+    (v_qs, '(6)', '類題1', 'numeric', '33', '㎠', NULL, 1, 6),
+    (v_qs, '(7)', '類題1', 'numeric', '14', '㎠', NULL, 1, 7),
+    (v_qs, '(8)', '類題1', 'numeric', '18', '㎠', NULL, 1, 8),
+    (v_qs, '(9)', '類題1', 'numeric', '49', '㎠', NULL, 1, 9),
+    (v_qs, '(1)', '類題2', 'numeric', '36.48', '㎠', NULL, 1, 10),
+    (v_qs, '(2)', '類題2', 'numeric', '16', '㎠', NULL, 1, 11),
+    (v_qs, '(3)', '類題2', 'numeric', '4.71', '㎠', NULL, 1, 12),
+    (v_qs, '(4)', '類題2', 'numeric', '20.56', '㎠', NULL, 1, 13),
+    (v_qs, '(5)', '類題2', 'numeric', '18.24', '㎠', NULL, 1, 14),
+    (v_qs, '(6)', '類題2', 'numeric', '57', '㎠', NULL, 1, 15),
+    (v_qs, '(7)', '類題2', 'numeric', '25.12', '㎠', NULL, 1, 16),
+    (v_qs, '(8)', '類題2', 'numeric', '9.12', '㎠', NULL, 1, 17),
+    (v_qs, '(9)', '類題2', 'numeric', '20.52', '㎠', NULL, 1, 18),
+    (v_qs, '(1)', '計算練習', 'numeric', '3.14', NULL, NULL, 1, 19),
+    (v_qs, '(2)', '計算練習', 'numeric', '6.28', NULL, NULL, 1, 20),
+    (v_qs, '(3)', '計算練習', 'numeric', '9.42', NULL, NULL, 1, 21),
+    (v_qs, '(4)', '計算練習', 'numeric', '12.56', NULL, NULL, 1, 22),
+    (v_qs, '(5)', '計算練習', 'numeric', '15.7', NULL, NULL, 1, 23),
+    (v_qs, '(6)', '計算練習', 'numeric', '18.84', NULL, NULL, 1, 24),
+    (v_qs, '(7)', '計算練習', 'numeric', '21.98', NULL, NULL, 1, 25),
+    (v_qs, '(8)', '計算練習', 'numeric', '25.12', NULL, NULL, 1, 26),
+    (v_qs, '(9)', '計算練習', 'numeric', '28.26', NULL, NULL, 1, 27),
+    (v_qs, '(10)', '計算練習', 'numeric', '31.4', NULL, NULL, 1, 28),
+    (v_qs, '(11)', '計算練習', 'numeric', '72', NULL, NULL, 1, 29),
+    (v_qs, '(12)', '計算練習', 'numeric', '125', NULL, NULL, 1, 30),
+    (v_qs, '(13)', '計算練習', 'numeric', '84', NULL, NULL, 1, 31),
+    (v_qs, '(14)', '計算練習', 'numeric', '192', NULL, NULL, 1, 32),
+    (v_qs, '(15)', '計算練習', 'numeric', '140', NULL, NULL, 1, 33),
+    (v_qs, '(16)', '計算練習', 'numeric', '216', NULL, NULL, 1, 34),
+    (v_qs, '(17)', '計算練習', 'numeric', '144', NULL, NULL, 1, 35),
+    (v_qs, '(18)', '計算練習', 'numeric', '120', NULL, NULL, 1, 36),
+    (v_qs, '(19)', '計算練習', 'numeric', '150', NULL, NULL, 1, 37),
+    (v_qs, '(20)', '計算練習', 'numeric', '140', NULL, NULL, 1, 38);
+
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "numeric", "a": "17", "p": 1}, {"t": "numeric", "a": "19", "p": 1}, {"t": "numeric", "a": "36.5", "p": 1}, {"t": "numeric", "a": "80", "p": 1}, {"t": "numeric", "a": "53", "p": 1}, {"t": "numeric", "a": "33", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "numeric", "a": "49", "p": 1}, {"t": "numeric", "a": "36.48", "p": 1}, {"t": "numeric", "a": "16", "p": 1}, {"t": "numeric", "a": "4.71", "p": 1}, {"t": "numeric", "a": "20.56", "p": 1}, {"t": "numeric", "a": "18.24", "p": 1}, {"t": "numeric", "a": "57", "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "numeric", "a": "9.12", "p": 1}, {"t": "numeric", "a": "20.52", "p": 1}, {"t": "numeric", "a": "3.14", "p": 1}, {"t": "numeric", "a": "6.28", "p": 1}, {"t": "numeric", "a": "9.42", "p": 1}, {"t": "numeric", "a": "12.56", "p": 1}, {"t": "numeric", "a": "15.7", "p": 1}, {"t": "numeric", "a": "18.84", "p": 1}, {"t": "numeric", "a": "21.98", "p": 1}, {"t": "numeric", "a": "25.12", "p": 1}, {"t": "numeric", "a": "28.26", "p": 1}, {"t": "numeric", "a": "31.4", "p": 1}, {"t": "numeric", "a": "72", "p": 1}, {"t": "numeric", "a": "125", "p": 1}, {"t": "numeric", "a": "84", "p": 1}, {"t": "numeric", "a": "192", "p": 1}, {"t": "numeric", "a": "140", "p": 1}, {"t": "numeric", "a": "216", "p": 1}, {"t": "numeric", "a": "144", "p": 1}, {"t": "numeric", "a": "120", "p": 1}, {"t": "numeric", "a": "150", "p": 1}, {"t": "numeric", "a": "140", "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
+    v_count := v_count + 38;
+  END IF;  -- approved / ELSE
 
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回1', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回1', 'title', v_qs, 0),
+    ('いろいろな図形の面積', 'title', v_qs, 0),
+    ('いろ', 'title', v_qs, 0),
+    ('ろい', 'title', v_qs, 0),
+    ('ろな', 'title', v_qs, 0),
+    ('な図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形の', 'title', v_qs, 0),
+    ('の面', 'title', v_qs, 0),
+    ('面積', 'title', v_qs, 0),
+    ('類題1', 'section', v_qs, 1),
+    ('類題', 'section', v_qs, 1),
+    ('cm2', 'unit', v_qs, 1),
+    ('17', 'answer', v_qs, 1),
+    ('類題1', 'section', v_qs, 2),
+    ('類題', 'section', v_qs, 2),
+    ('cm2', 'unit', v_qs, 2),
+    ('19', 'answer', v_qs, 2),
+    ('類題1', 'section', v_qs, 3),
+    ('類題', 'section', v_qs, 3),
+    ('cm2', 'unit', v_qs, 3),
+    ('36.5', 'answer', v_qs, 3),
+    ('類題1', 'section', v_qs, 4),
+    ('類題', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('80', 'answer', v_qs, 4),
+    ('類題1', 'section', v_qs, 5),
+    ('類題', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('53', 'answer', v_qs, 5),
+    ('類題1', 'section', v_qs, 6),
+    ('類題', 'section', v_qs, 6),
+    ('cm2', 'unit', v_qs, 6),
+    ('33', 'answer', v_qs, 6),
+    ('類題1', 'section', v_qs, 7),
+    ('類題', 'section', v_qs, 7),
+    ('cm2', 'unit', v_qs, 7),
+    ('14', 'answer', v_qs, 7),
+    ('類題1', 'section', v_qs, 8),
+    ('類題', 'section', v_qs, 8),
+    ('cm2', 'unit', v_qs, 8),
+    ('18', 'answer', v_qs, 8),
+    ('類題1', 'section', v_qs, 9),
+    ('類題', 'section', v_qs, 9),
+    ('cm2', 'unit', v_qs, 9),
+    ('49', 'answer', v_qs, 9),
+    ('類題2', 'section', v_qs, 10),
+    ('類題', 'section', v_qs, 10),
+    ('cm2', 'unit', v_qs, 10),
+    ('36.48', 'answer', v_qs, 10),
+    ('類題2', 'section', v_qs, 11),
+    ('類題', 'section', v_qs, 11),
+    ('cm2', 'unit', v_qs, 11),
+    ('16', 'answer', v_qs, 11),
+    ('類題2', 'section', v_qs, 12),
+    ('類題', 'section', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('4.71', 'answer', v_qs, 12),
+    ('類題2', 'section', v_qs, 13),
+    ('類題', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('20.56', 'answer', v_qs, 13),
+    ('類題2', 'section', v_qs, 14),
+    ('類題', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('18.24', 'answer', v_qs, 14),
+    ('類題2', 'section', v_qs, 15),
+    ('類題', 'section', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('57', 'answer', v_qs, 15),
+    ('類題2', 'section', v_qs, 16),
+    ('類題', 'section', v_qs, 16),
+    ('cm2', 'unit', v_qs, 16),
+    ('25.12', 'answer', v_qs, 16),
+    ('類題2', 'section', v_qs, 17),
+    ('類題', 'section', v_qs, 17),
+    ('cm2', 'unit', v_qs, 17),
+    ('9.12', 'answer', v_qs, 17),
+    ('類題2', 'section', v_qs, 18),
+    ('類題', 'section', v_qs, 18),
+    ('cm2', 'unit', v_qs, 18),
+    ('20.52', 'answer', v_qs, 18),
+    ('計算練習', 'section', v_qs, 19),
+    ('3.14', 'answer', v_qs, 19),
+    ('計算練習', 'section', v_qs, 20),
+    ('6.28', 'answer', v_qs, 20),
+    ('計算練習', 'section', v_qs, 21),
+    ('9.42', 'answer', v_qs, 21),
+    ('計算練習', 'section', v_qs, 22),
+    ('12.56', 'answer', v_qs, 22),
+    ('計算練習', 'section', v_qs, 23),
+    ('15.7', 'answer', v_qs, 23),
+    ('計算練習', 'section', v_qs, 24),
+    ('18.84', 'answer', v_qs, 24),
+    ('計算練習', 'section', v_qs, 25),
+    ('21.98', 'answer', v_qs, 25),
+    ('計算練習', 'section', v_qs, 26),
+    ('25.12', 'answer', v_qs, 26),
+    ('計算練習', 'section', v_qs, 27),
+    ('28.26', 'answer', v_qs, 27),
+    ('計算練習', 'section', v_qs, 28),
+    ('31.4', 'answer', v_qs, 28),
+    ('計算練習', 'section', v_qs, 29),
+    ('72', 'answer', v_qs, 29),
+    ('計算練習', 'section', v_qs, 30),
+    ('125', 'answer', v_qs, 30),
+    ('計算練習', 'section', v_qs, 31),
+    ('84', 'answer', v_qs, 31),
+    ('計算練習', 'section', v_qs, 32),
+    ('192', 'answer', v_qs, 32),
+    ('計算練習', 'section', v_qs, 33),
+    ('140', 'answer', v_qs, 33),
+    ('計算練習', 'section', v_qs, 34),
+    ('216', 'answer', v_qs, 34),
+    ('計算練習', 'section', v_qs, 35),
+    ('144', 'answer', v_qs, 35),
+    ('計算練習', 'section', v_qs, 36),
+    ('120', 'answer', v_qs, 36),
+    ('計算練習', 'section', v_qs, 37),
+    ('150', 'answer', v_qs, 37),
+    ('計算練習', 'section', v_qs, 38),
+    ('140', 'answer', v_qs, 38);
+
+  -- ========================================
+  -- 小6 第2回② 規則性 (16問)
+  -- ========================================
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 2 AND set_order = 2;
+
+  IF v_existing_status = 'approved' THEN
+    RAISE NOTICE 'スキップ: 小6 第2回② 規則性（approved済み）';
+  ELSE
+    -- 新規 or draft昇格
+    IF v_existing_id IS NOT NULL THEN
+      -- draft → approved に昇格、既存 questions を入れ替え
+      DELETE FROM public.questions WHERE question_set_id = v_existing_id;
+      UPDATE public.question_sets
+      SET status = 'approved', title = '第2回② 規則性', assessment_master_id = v_am_id, updated_at = now()
+      WHERE id = v_existing_id;
+      v_qs := v_existing_id;
+      RAISE NOTICE 'draft昇格: 小6 第2回② 規則性';
+    ELSE
+      -- 新規INSERT
+      INSERT INTO public.question_sets
+        (session_id, subject_id, grade, title, display_order, status, assessment_master_id)
+      VALUES
+        (v_sid, v_math_id, 6, '第2回② 規則性', 2, 'approved', v_am_id)
+      RETURNING id INTO v_qs;
+    END IF;
+
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
+    (v_qs, '(1)', '方陣算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "個"}, {"label": "②", "unit": "個"}], "correct_values": {"①": "225", "②": "56"}, "template": "①{①}個，②{②}個"}', 1, 1),
+    (v_qs, '(2)', '方陣算', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "個"}, {"label": "②", "unit": "個"}], "correct_values": {"①": "78", "②": "33"}, "template": "①{①}個，②{②}個"}', 1, 2),
+    (v_qs, '(3)', '方陣算', 'numeric', '235', '個', NULL, 1, 3),
+    (v_qs, '(1)', '周期算②', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": "枚"}, {"label": "③", "unit": "㎝"}, {"label": "④", "unit": "枚"}], "correct_values": {"①": "151", "②": "13", "③": "124", "④": "16"}, "template": "①{①}㎠，②{②}枚，③{③}㎝，④{④}枚"}', 1, 4),
+    (v_qs, '(2)', '周期算②', 'numeric', '4', NULL, NULL, 1, 5),
+    (v_qs, '(3)', '周期算②', 'numeric', '7', NULL, NULL, 1, 6),
+    (v_qs, '(1)', '数表', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③行", "unit": ""}, {"label": "③列", "unit": ""}], "correct_values": {"①": "100", "②": "103", "③行": "13", "③列": "6"}, "template": "①{①}，②{②}，③{③行}行目の{③列}列目"}', 1, 7),
+    (v_qs, '(2)', '数表', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③", "unit": ""}], "correct_values": {"①": "512", "②": "49", "③": "171"}, "template": "①{①}，②{②}，③{③}"}', 1, 8),
+    (v_qs, '(1)', '日暦算', 'numeric', '6', '日', NULL, 1, 9),
+    (v_qs, '(2)', '日暦算', 'numeric', '3', '日', NULL, 1, 10),
+    (v_qs, '(3)', '日暦算', 'selection', NULL, NULL, '{"correct_values": ["木曜日"], "dummy_values": ["月曜日", "火曜日", "水曜日", "金曜日", "土曜日", "日曜日"]}', 1, 11),
+    (v_qs, '(4)', '日暦算', 'selection', NULL, NULL, '{"correct_values": ["土曜日"], "dummy_values": ["月曜日", "火曜日", "水曜日", "木曜日", "金曜日", "日曜日"]}', 1, 12),
+    (v_qs, '(5)', '日暦算', 'numeric', '2034', '年', NULL, 1, 13),
+    (v_qs, '(1)', '規則性の入試問題', 'selection', NULL, NULL, '{"correct_values": ["月曜日"], "dummy_values": ["火曜日", "水曜日", "木曜日", "金曜日", "土曜日", "日曜日"]}', 1, 14),
+    (v_qs, '(2)', '規則性の入試問題', 'selection', NULL, NULL, '{"correct_values": ["土曜日"], "dummy_values": ["月曜日", "火曜日", "水曜日", "木曜日", "金曜日", "日曜日"]}', 1, 15),
+    (v_qs, '(3)', '規則性の入試問題', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③段", "unit": ""}, {"label": "③番", "unit": ""}], "correct_values": {"①": "37", "②": "559", "③段": "13", "③番": "6"}, "template": "①{①}，②{②}，③{③段}段目の{③番}番目"}', 1, 16);
+
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "225", "②": "56"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "78", "②": "33"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "235", "p": 1}, {"t": "multi_part", "a": {"①": "151", "②": "13", "③": "124", "④": "16"}, "s": ["①", "②", "③", "④"], "p": 1}, {"t": "numeric", "a": "4", "p": 1}, {"t": "numeric", "a": "7", "p": 1}, {"t": "multi_part", "a": {"①": "100", "②": "103", "③行": "13", "③列": "6"}, "s": ["①", "②", "③行", "③列"], "p": 1}, {"t": "multi_part", "a": {"①": "512", "②": "49", "③": "171"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "6", "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "selection", "a": ["木曜日"], "p": 1}, {"t": "selection", "a": ["土曜日"], "p": 1}, {"t": "numeric", "a": "2034", "p": 1}, {"t": "selection", "a": ["月曜日"], "p": 1}, {"t": "selection", "a": ["土曜日"], "p": 1}, {"t": "multi_part", "a": {"①": "37", "②": "559", "③段": "13", "③番": "6"}, "s": ["①", "②", "③段", "③番"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
+    v_count := v_count + 16;
+  END IF;  -- approved / ELSE
+
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第2回2', 'title', v_qs, 0),
+    ('第2', 'title', v_qs, 0),
+    ('2回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('規則性', 'title', v_qs, 0),
+    ('規則', 'title', v_qs, 0),
+    ('則性', 'title', v_qs, 0),
+    ('方陣算', 'section', v_qs, 1),
+    ('個', 'unit', v_qs, 1),
+    ('225', 'answer', v_qs, 1),
+    ('56', 'answer', v_qs, 1),
+    ('方陣算', 'section', v_qs, 2),
+    ('個', 'unit', v_qs, 2),
+    ('78', 'answer', v_qs, 2),
+    ('33', 'answer', v_qs, 2),
+    ('方陣算', 'section', v_qs, 3),
+    ('個', 'unit', v_qs, 3),
+    ('235', 'answer', v_qs, 3),
+    ('周期算2', 'section', v_qs, 4),
+    ('周期算', 'section', v_qs, 4),
+    ('cm2', 'unit', v_qs, 4),
+    ('枚', 'unit', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('151', 'answer', v_qs, 4),
+    ('13', 'answer', v_qs, 4),
+    ('124', 'answer', v_qs, 4),
+    ('16', 'answer', v_qs, 4),
+    ('周期算2', 'section', v_qs, 5),
+    ('周期算', 'section', v_qs, 5),
+    ('4', 'answer', v_qs, 5),
+    ('周期算2', 'section', v_qs, 6),
+    ('周期算', 'section', v_qs, 6),
+    ('7', 'answer', v_qs, 6),
+    ('数表', 'section', v_qs, 7),
+    ('100', 'answer', v_qs, 7),
+    ('103', 'answer', v_qs, 7),
+    ('13', 'answer', v_qs, 7),
+    ('6', 'answer', v_qs, 7),
+    ('数表', 'section', v_qs, 8),
+    ('512', 'answer', v_qs, 8),
+    ('49', 'answer', v_qs, 8),
+    ('171', 'answer', v_qs, 8),
+    ('日暦算', 'section', v_qs, 9),
+    ('日', 'unit', v_qs, 9),
+    ('6', 'answer', v_qs, 9),
+    ('日暦算', 'section', v_qs, 10),
+    ('日', 'unit', v_qs, 10),
+    ('3', 'answer', v_qs, 10),
+    ('日暦算', 'section', v_qs, 11),
+    ('木曜日', 'answer', v_qs, 11),
+    ('日暦算', 'section', v_qs, 12),
+    ('土曜日', 'answer', v_qs, 12),
+    ('日暦算', 'section', v_qs, 13),
+    ('年', 'unit', v_qs, 13),
+    ('2034', 'answer', v_qs, 13),
+    ('規則性の入試問題', 'section', v_qs, 14),
+    ('月曜日', 'answer', v_qs, 14),
+    ('規則性の入試問題', 'section', v_qs, 15),
+    ('土曜日', 'answer', v_qs, 15),
+    ('規則性の入試問題', 'section', v_qs, 16),
+    ('37', 'answer', v_qs, 16),
+    ('559', 'answer', v_qs, 16),
+    ('13', 'answer', v_qs, 16),
+    ('6', 'answer', v_qs, 16);
+
+  -- ========================================
+  -- 小6 第7回② 平面図形(2) (28問)
+  -- ========================================
+  SELECT session_id, assessment_master_id, existing_id, existing_status
+  INTO v_sid, v_am_id, v_existing_id, v_existing_status
+  FROM math_set_ids WHERE grade = 6 AND session_number = 7 AND set_order = 2;
+
+  IF v_existing_status = 'approved' THEN
+    RAISE NOTICE 'スキップ: 小6 第7回② 平面図形(2)（approved済み）';
+  ELSE
+    -- 新規 or draft昇格
+    IF v_existing_id IS NOT NULL THEN
+      -- draft → approved に昇格、既存 questions を入れ替え
+      DELETE FROM public.questions WHERE question_set_id = v_existing_id;
+      UPDATE public.question_sets
+      SET status = 'approved', title = '第7回② 平面図形(2)', assessment_master_id = v_am_id, updated_at = now()
+      WHERE id = v_existing_id;
+      v_qs := v_existing_id;
+      RAISE NOTICE 'draft昇格: 小6 第7回② 平面図形(2)';
+    ELSE
+      -- 新規INSERT
+      INSERT INTO public.question_sets
+        (session_id, subject_id, grade, title, display_order, status, assessment_master_id)
+      VALUES
+        (v_sid, v_math_id, 6, '第7回② 平面図形(2)', 2, 'approved', v_am_id)
+      RETURNING id INTO v_qs;
+    END IF;
+
+    INSERT INTO public.questions (question_set_id, question_number, section_name, answer_type, correct_answer, unit_label, answer_config, points, display_order) VALUES
+    (v_qs, '(1)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "5", "②": "4"}, "template": "{①}：{②}"}', 1, 1),
+    (v_qs, '(2)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "3", "②": "5"}, "template": "{①}：{②}"}', 1, 2),
+    (v_qs, '(3)', '並びの比', 'numeric', '5', '㎝', NULL, 1, 3),
+    (v_qs, '(4)', '並びの比', 'numeric', '14', '㎝', NULL, 1, 4),
+    (v_qs, '(5)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": ""}, {"label": "③", "unit": ""}], "correct_values": {"①": "150", "②": "13", "③": "17"}, "template": "①{①}㎠，②{②}：{③}"}', 1, 5),
+    (v_qs, '(6)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "2", "②": "1"}, "template": "{①}：{②}"}', 1, 6),
+    (v_qs, '(7)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "5", "②": "13"}, "template": "{①}：{②}"}', 1, 7),
+    (v_qs, '(8)', '並びの比', 'numeric', '3', '㎝', NULL, 1, 8),
+    (v_qs, '(9)', '並びの比', 'numeric', '14', '㎝', NULL, 1, 9),
+    (v_qs, '(10)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "1", "②": "2"}, "template": "{①}：{②}"}', 1, 10),
+    (v_qs, '(11)', '並びの比', 'fraction', '3/10', NULL, NULL, 1, 11),
+    (v_qs, '(12)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": ""}, {"label": "③", "unit": ""}], "correct_values": {"①": "60", "②": "3", "③": "2"}, "template": "①{①}㎠，②{②}：{③}"}', 1, 12),
+    (v_qs, '(13)', '並びの比', 'numeric', '18', '㎠', NULL, 1, 13),
+    (v_qs, '(14)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}, {"label": "③", "unit": "㎠"}], "correct_values": {"①": "3", "②": "1", "③": "12"}, "template": "①{①}：{②}，②{③}㎠"}', 1, 14),
+    (v_qs, '(15)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "6", "②": "80"}, "template": "①{①}㎝，②{②}㎠"}', 1, 15),
+    (v_qs, '(16)', '並びの比', 'numeric', '20', '㎠', NULL, 1, 16),
+    (v_qs, '(17)', '並びの比', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": ""}, {"label": "②", "unit": ""}], "correct_values": {"①": "4", "②": "1"}, "template": "{①}：{②}"}', 1, 17),
+    (v_qs, '(18)', '並びの比', 'numeric', '5', '㎝', NULL, 1, 18),
+    (v_qs, '(1)', '図形の折り返し', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎝"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "26", "②": "270"}, "template": "①{①}㎝，②{②}㎠"}', 1, 19),
+    (v_qs, '(2)', '図形の折り返し', 'numeric', '10', '㎝', NULL, 1, 20),
+    (v_qs, '(1)', '正六角形', 'numeric', '10', '㎠', NULL, 1, 21),
+    (v_qs, '(2)', '正六角形', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "㎠"}, {"label": "②", "unit": "㎠"}], "correct_values": {"①": "10", "②": "30"}, "template": "①{①}㎠，②{②}㎠"}', 1, 22),
+    (v_qs, '(3)', '正六角形', 'numeric', '30', '㎠', NULL, 1, 23),
+    (v_qs, '(4)', '正六角形', 'numeric', '30', '㎠', NULL, 1, 24),
+    (v_qs, '(1)', '影', 'numeric', '5', 'm', NULL, 1, 25),
+    (v_qs, '(2)', '影', 'numeric', '2', 'm', NULL, 1, 26),
+    (v_qs, '(3)', '影', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m"}], "correct_values": {"①": "2", "②": "1.2"}, "template": "①{①}m，②{②}m"}', 1, 27),
+    (v_qs, '(4)', '影', 'multi_part', NULL, NULL, '{"slots": [{"label": "①", "unit": "m"}, {"label": "②", "unit": "m"}], "correct_values": {"①": "1.2", "②": "4.8"}, "template": "①{①}m，②{②}m"}', 1, 28);
+
+    INSERT INTO public.question_set_answer_keys (question_set_id, question_ids, answer_key)
+    SELECT v_qs, array_agg(id ORDER BY display_order), '[{"t": "multi_part", "a": {"①": "5", "②": "4"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "5"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "150", "②": "13", "③": "17"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "5", "②": "13"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "3", "p": 1}, {"t": "numeric", "a": "14", "p": 1}, {"t": "multi_part", "a": {"①": "1", "②": "2"}, "s": ["①", "②"], "p": 1}, {"t": "fraction", "a": "3/10", "p": 1}, {"t": "multi_part", "a": {"①": "60", "②": "3", "③": "2"}, "s": ["①", "②", "③"], "p": 1}, {"t": "numeric", "a": "18", "p": 1}, {"t": "multi_part", "a": {"①": "3", "②": "1", "③": "12"}, "s": ["①", "②", "③"], "p": 1}, {"t": "multi_part", "a": {"①": "6", "②": "80"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "20", "p": 1}, {"t": "multi_part", "a": {"①": "4", "②": "1"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "multi_part", "a": {"①": "26", "②": "270"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "numeric", "a": "10", "p": 1}, {"t": "multi_part", "a": {"①": "10", "②": "30"}, "s": ["①", "②"], "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "30", "p": 1}, {"t": "numeric", "a": "5", "p": 1}, {"t": "numeric", "a": "2", "p": 1}, {"t": "multi_part", "a": {"①": "2", "②": "1.2"}, "s": ["①", "②"], "p": 1}, {"t": "multi_part", "a": {"①": "1.2", "②": "4.8"}, "s": ["①", "②"], "p": 1}]'::jsonb
+    FROM public.questions WHERE question_set_id = v_qs
+    ON CONFLICT (question_set_id) DO UPDATE
+      SET question_ids = EXCLUDED.question_ids, answer_key = EXCLUDED.answer_key, updated_at = now();
+
+    v_count := v_count + 28;
+  END IF;  -- approved / ELSE
+
+  v_qs := COALESCE(v_existing_id, v_qs);
+  DELETE FROM public.question_search_terms WHERE question_set_id = v_qs;
+  INSERT INTO public.question_search_terms (term, kind, question_set_id, display_order) VALUES
+    ('第7回2', 'title', v_qs, 0),
+    ('第7', 'title', v_qs, 0),
+    ('7回', 'title', v_qs, 0),
+    ('回2', 'title', v_qs, 0),
+    ('平面図形(2)', 'title', v_qs, 0),
+    ('平面', 'title', v_qs, 0),
+    ('面図', 'title', v_qs, 0),
+    ('図形', 'title', v_qs, 0),
+    ('形(', 'title', v_qs, 0),
+    ('(2', 'title', v_qs, 0),
+    ('2)', 'title', v_qs, 0),
+    ('並びの比', 'section', v_qs, 1),
+    ('5', 'answer', v_qs, 1),
+    ('4', 'answer', v_qs, 1),
+    ('並びの比', 'section', v_qs, 2),
+    ('3', 'answer', v_qs, 2),
+    ('5', 'answer', v_qs, 2),
+    ('並びの比', 'section', v_qs, 3),
+    ('cm', 'unit', v_qs, 3),
+    ('5', 'answer', v_qs, 3),
+    ('並びの比', 'section', v_qs, 4),
+    ('cm', 'unit', v_qs, 4),
+    ('14', 'answer', v_qs, 4),
+    ('並びの比', 'section', v_qs, 5),
+    ('cm2', 'unit', v_qs, 5),
+    ('150', 'answer', v_qs, 5),
+    ('13', 'answer', v_qs, 5),
+    ('17', 'answer', v_qs, 5),
+    ('並びの比', 'section', v_qs, 6),
+    ('2', 'answer', v_qs, 6),
+    ('1', 'answer', v_qs, 6),
+    ('並びの比', 'section', v_qs, 7),
+    ('5', 'answer', v_qs, 7),
+    ('13', 'answer', v_qs, 7),
+    ('並びの比', 'section', v_qs, 8),
+    ('cm', 'unit', v_qs, 8),
+    ('3', 'answer', v_qs, 8),
+    ('並びの比', 'section', v_qs, 9),
+    ('cm', 'unit', v_qs, 9),
+    ('14', 'answer', v_qs, 9),
+    ('並びの比', 'section', v_qs, 10),
+    ('1', 'answer', v_qs, 10),
+    ('2', 'answer', v_qs, 10),
+    ('並びの比', 'section', v_qs, 11),
+    ('3/10', 'answer', v_qs, 11),
+    ('並びの比', 'section', v_qs, 12),
+    ('cm2', 'unit', v_qs, 12),
+    ('60', 'answer', v_qs, 12),
+    ('3', 'answer', v_qs, 12),
+    ('2', 'answer', v_qs, 12),
+    ('並びの比', 'section', v_qs, 13),
+    ('cm2', 'unit', v_qs, 13),
+    ('18', 'answer', v_qs, 13),
+    ('並びの比', 'section', v_qs, 14),
+    ('cm2', 'unit', v_qs, 14),
+    ('3', 'answer', v_qs, 14),
+    ('1', 'answer', v_qs, 14),
+    ('12', 'answer', v_qs, 14),
+    ('並びの比', 'section', v_qs, 15),
+    ('cm', 'unit', v_qs, 15),
+    ('cm2', 'unit', v_qs, 15),
+    ('6', 'answer', v_qs, 15),
+    ('80', 'answer', v_qs, 15),
+    ('並びの比', 'section', v_qs, 16),
+    ('cm2', 'unit', v_qs, 16),
+    ('20', 'answer', v_qs, 16),
+    ('並びの比', 'section', v_qs, 17),
+    ('4', 'answer', v_qs, 17),
+    ('1', 'answer', v_qs, 17),
+    ('並びの比', 'section', v_qs, 18),
+    ('cm', 'unit', v_qs, 18),
+    ('5', 'answer', v_qs, 18),
+    ('図形の折り返し', 'section', v_qs, 19),
+    ('cm', 'unit', v_qs, 19),
+    ('cm2', 'unit', v_qs, 19),
+    ('26', 'answer', v_qs, 19),
+    ('270', 'answer', v_qs, 19),
+    ('図形の折り返し', 'section', v_qs, 20),
+    ('cm', 'unit', v_qs, 20),
+    ('10', 'answer', v_qs, 20),
+    ('正六角形', 'section', v_qs, 21),
+    ('cm2', 'unit', v_qs, 21),
+    ('10', 'answer', v_qs, 21),
+    ('正六角形', 'section', v_qs, 22),
+    ('cm2', 'unit', v_qs, 22),
+    ('10', 'answer', v_qs, 22),
+    ('30', 'answer', v_qs, 22),
+    ('正六角形', 'section', v_qs, 23),
+    ('cm2', 'unit', v_qs, 23),
+    ('30', 'answer', v_qs, 23),
+    ('正六角形', 'section', v_qs, 24),
+    ('cm2', 'unit', v_qs, 24),
+    ('30', 'answer', v_qs, 24),
+    ('影', 'section', v_qs, 25),
+    ('m', 'unit', v_qs, 25),
+    ('5', 'answer', v_qs, 25),
+    ('影', 'section', v_qs, 26),
+    ('m', 'unit', v_qs, 26),
+    ('2', 'answer', v_qs, 26),
+    ('影', 'section', v_qs, 27),
+    ('m', 'unit', v_qs, 27),
+    ('2', 'answer', v_qs, 27),
+    ('1.2', 'answer', v_qs, 27),
+    ('影', 'section', v_qs, 28),
+    ('m', 'unit', v_qs, 28),
+    ('1.2', 'answer', v_qs, 28),
+    ('4.8', 'answer', v_qs, 28);
+
+  RAISE NOTICE '本番問題データ投入完了: %問', v_count;
+
+  -- シード適用台帳を更新
+  INSERT INTO public.seed_ledger (seed_name, checksum)
+  VALUES ('math_questions_dev', '4fa770f40c53465087d9e08d5bbb63280ff62b3aa2ac474bb6490c85fee03d6b')
+  ON CONFLICT (seed_name) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW();
 END $$;
+
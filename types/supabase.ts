@@ -914,6 +914,21 @@ export type Database = {
         }
         Relationships: []
       }
+      math_units: {
+        Row: {
+          id: number
+          label: string
+        }
+        Insert: {
+          id?: never
+          label: string
+        }
+        Update: {
+          id?: never
+          label?: string
+        }
+        Relationships: []
+      }
       parent_child_relations: {
         Row: {
           created_at: string
@@ -1035,6 +1050,48 @@ export type Database = {
           },
         ]
       }
+      problem_count_totals: {
+        Row: {
+          content_count: number
+          course: Database["public"]["Enums"]["course_level"]
+          grade: number
+          session_id: number
+          subject_id: number
+          total_problems: number
+        }
+        Insert: {
+          content_count: number
+          course: Database["public"]["Enums"]["course_level"]
+          grade: number
+          session_id: number
+          subject_id: number
+          total_problems: number
+        }
+        Update: {
+          content_count?: number
+          course?: Database["public"]["Enums"]["course_level"]
+          grade?: number
+          session_id?: number
+          subject_id?: number
+          total_problems?: number
+        }
+        Relationships: [
+          {
+            foreignKeyName: "problem_count_totals_session_id_fkey"
+            columns: ["session_id"]
+            isOneToOne: false
+            referencedRelation: "study_sessions"
+            referencedColumns: ["id"]
+          },
+          {
+            foreignKeyName: "problem_count_totals_subject_id_fkey"
+            columns: ["subject_id"]
+            isOneToOne: false
+            referencedRelation: "subjects"
+            referencedColumns: ["id"]
+          },
+        ]
+      }
       problem_counts: {
         Row: {
           created_at: string
@@ -1116,6 +1173,64 @@ export type Database = {
         }
         Relationships: []
       }
+      question_search_terms: {
+        Row: {
+          display_order: number
+          kind: string
+          question_set_id: number
+          term: string
+        }
+        Insert: {
+          display_order: number
+          kind: string
+          question_set_id: number
+          term: string
+        }
+        Update: {
+          display_order?: number
+          kind?: string
+          question_set_id?: number
+          term?: string
+        }
+        Relationships: [
+          {
+            foreignKeyName: "question_search_terms_question_set_id_fkey"
+            columns: ["question_set_id"]
+            isOneToOne: false
+            referencedRelation: "question_sets"
+            referencedColumns: ["id"]
+          },
+        ]
+      }
+      question_set_answer_keys: {
+        Row: {
+          answer_key: Json
+          question_ids: number[]
+          question_set_id: number
+          updated_at: string
+        }
+        Insert: {
+          answer_key: Json
+          question_ids: number[]
+          question_set_id: number
+          updated_at?: string
+        }
+        Update: {
+          answer_key?: Json
+          question_ids?: number[]
+          question_set_id?: number
+          updated_at?: string
+        }
+        Relationships: [
+          {
+            foreignKeyName: "question_set_answer_keys_question_set_id_fkey"
+            columns: ["question_set_id"]
+            isOneToOne: true
+            referencedRelation: "question_sets"
+            referencedColumns: ["id"]
+          },
+        ]
+      }
       question_sets: {
         Row: {
           assessment_master_id: string | null
@@ -1201,42 +1316,51 @@ export type Database = {
           answer_config: Json | null
           answer_type: string
           correct_answer: string | null
+          correct_values: string[] | null
           created_at: string
           display_order: number
+          dummy_values: string[] | null
           id: number
           min_course: Database["public"]["Enums"]["course_level"] | null
           points: number
           question_number: string
           question_set_id: number
           section_name: string
+          unit_id: number | null
           unit_label: string | null
         }
         Insert: {
           answer_config?: Json | null
           answer_type: string
           correct_answer?: string | null
+          correct_values?: string[] | null
           created_at?: string
           display_order: number
+          dummy_values?: string[] | null
           id?: number
           min_course?: Database["public"]["Enums"]["course_level"] | null
           points?: number
           question_number: string
           question_set_id: number
           section_name: string
+          unit_id?: number | null
           unit_label?: string | null
         }
         Update: {
           answer_config?: Json | null
           answer_type?: string
           correct_answer?: string | null
+          correct_values?: string[] | null
           created_at?: string
           display_order?: number
+          dummy_values?: string[] | null
           id?: number
           min_course?: Database["public"]["Enums"]["course_level"] | null
           points?: number
           question_number?: string
           question_set_id?: number
           section_name?: string
+          unit_id?: number | null
           unit_label?: string | null
         }
         Relationships: [
@@ -1247,6 +1371,13 @@ export type Database = {
             referencedRelation: "question_sets"
             referencedColumns: ["id"]
           },
+          {
+            foreignKeyName: "questions_unit_id_fkey"
+            columns: ["unit_id"]
+            isOneToOne: false
+            referencedRelation: "math_units"
+            referencedColumns: ["id"]
+          },
         ]
       }
       rate_limit_logs: {
@@ -2176,6 +2307,11 @@ export type Database = {
           isSetofReturn: false
         }
       }
+      refresh_problem_count_totals: { Args: never; Returns: undefined }
+      refresh_question_set_answer_keys: {
+        Args: { p_question_set_ids: number[] }
+        Returns: undefined
+      }
       register_parent_with_children: {
         Args: {
           p_children: Json